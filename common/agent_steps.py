@@ -14,6 +14,7 @@ import urllib.parse
 import urllib.request
 from typing import cast
 
+from lib.apt_sources import refresh_apt_metadata
 from lib.atomic_io import write_text_atomic
 from lib.config import SetupConfig
 from lib.remote_utils import install_package, is_dry_run, run
@@ -202,7 +203,8 @@ def install_github_cli(config: SetupConfig) -> None:
     with open("/etc/apt/sources.list.d/github-cli.list", "w", encoding="utf-8") as file_obj:
         file_obj.write(source_line)
 
-    run("apt-get update -qq")
+    if refresh_apt_metadata(run).returncode != 0:
+        raise RuntimeError("could not refresh the GitHub CLI repository")
     if not install_package("GitHub CLI", "gh", "apt-get install -y -qq gh"):
         raise RuntimeError("GitHub CLI installation failed")
 
@@ -14,10 +14,11 @@ from typing import Optional
 
 from lib.atomic_io import write_text_atomic
 from lib.maintenance_systemd import configure_maintenance_timer
-from lib.apt_sources import ensure_debian_package_sources
+from lib.apt_sources import ensure_debian_package_sources, refresh_apt_metadata
 from lib.config import SetupConfig
 from lib.machine_state import can_manage_time_sync
 from lib.remote_utils import (
+    ensure_apt_packages,
     file_contains,
     install_package,
     is_dry_run,
@@ -175,7 +176,7 @@ def update_and_upgrade_packages(config: SetupConfig) -> None:
 
     print("  Updating package lists (APT may wait for another package operation)...")
     os.environ["DEBIAN_FRONTEND"] = "noninteractive"
-    update_result = run("apt-get -o DPkg::Lock::Timeout=120 -o Dpkg::Use-Pty=0 update -q", check=False)
+    update_result = refresh_apt_metadata(run, "apt-get -o DPkg::Lock::Timeout=120 -o Dpkg::Use-Pty=0 update -q")
     if update_result.returncode != 0:
         details = getattr(update_result, "stderr", "") or "check network connectivity and APT sources"
         raise RuntimeError(f"APT package list update failed: {str(details).strip()[:300]}")
@@ -486,50 +487,30 @@ def install_cli_tools(config: SetupConfig) -> None:
     """Install the small command-line baseline shared by development profiles."""
 
     del config
-    missing = [
-        package for package in CLI_TOOL_PACKAGES if not is_package_installed(package)
-    ]
-    if not missing:
+    result = ensure_apt_packages(CLI_TOOL_PACKAGES)
+    if result.failed:
+        raise RuntimeError(f"CLI tool installation failed: {', '.join(result.failed)}")
+    if not result.installed:
         print("  ✓ CLI tools already installed")
         return
 
-    os.environ["DEBIAN_FRONTEND"] = "noninteractive"
-    package_args = " ".join(shlex.quote(package) for package in missing)
-    result = run(f"apt-get install -y -qq {package_args}", check=False)
-    remaining = [
-        package for package in missing if not is_package_installed(package)
-    ]
-    if result.returncode != 0 or remaining:
-        failed = ", ".join(remaining or missing)
-        raise RuntimeError(f"CLI tool installation failed: {failed}")
-
-    print(f"  ✓ Installed CLI tools: {', '.join(missing)}")
+    print(f"  ✓ Installed CLI tools: {', '.join(result.installed)}")
 
 
 def install_data_analysis_tools(config: SetupConfig) -> None:
     """Install the opt-in Python data-analysis and notebook bundle."""
 
     del config
-    missing = [
-        package
-        for package in DATA_ANALYSIS_PACKAGES
-        if not is_package_installed(package)
-    ]
-    if not missing:
+    result = ensure_apt_packages(DATA_ANALYSIS_PACKAGES)
+    if result.failed:
+        raise RuntimeError(
+            f"Data-analysis tool installation failed: {', '.join(result.failed)}"
+        )
+    if not result.installed:
         print("  ✓ Data-analysis tools already installed")
         return
 
-    os.environ["DEBIAN_FRONTEND"] = "noninteractive"
-    package_args = " ".join(shlex.quote(package) for package in missing)
-    result = run(f"apt-get install -y -qq {package_args}", check=False)
-    remaining = [
-        package for package in missing if not is_package_installed(package)
-    ]
-    if result.returncode != 0 or remaining:
-        failed = ", ".join(remaining or missing)
-        raise RuntimeError(f"Data-analysis tool installation failed: {failed}")
-
-    print(f"  ✓ Installed data-analysis tools: {', '.join(missing)}")
+    print(f"  ✓ Installed data-analysis tools: {', '.join(result.installed)}")
 
 
 CONTROL_PLANE_PACKAGES = (
@@ -574,28 +555,16 @@ def install_control_plane_tools(config: SetupConfig) -> None:
         )
         return
 
-    missing = [
-        package
-        for package in CONTROL_PLANE_PACKAGES
-        if not is_package_installed(package)
-    ]
-    if not missing:
+    result = ensure_apt_packages(CONTROL_PLANE_PACKAGES)
+    if result.failed:
+        raise RuntimeError(
+            f"Control-plane tool installation failed: {', '.join(result.failed)}"
+        )
+    if not result.installed:
         print("  ✓ Control-plane administrator tools already installed")
         return
 
-    os.environ["DEBIAN_FRONTEND"] = "noninteractive"
-    package_args = " ".join(shlex.quote(package) for package in missing)
-    result = run(f"apt-get install -y -qq {package_args}", check=False)
-    remaining = [
-        package
-        for package in missing
-        if not is_package_installed(package)
-    ]
-    if result.returncode != 0 or remaining:
-        failed = ", ".join(remaining or missing)
-        raise RuntimeError(f"Control-plane tool installation failed: {failed}")
-
-    print(f"  ✓ Installed control-plane tools: {', '.join(missing)}")
+    print(f"  ✓ Installed control-plane tools: {', '.join(result.installed)}")
 
 
 def check_restart_required(config: SetupConfig) -> None:
@@ -1101,18 +1070,14 @@ def install_apt_packages(config: SetupConfig) -> None:
     if not config.apt_packages:
         return
     
-    os.environ["DEBIAN_FRONTEND"] = "noninteractive"
     print("  Installing custom apt packages...")
-    for package in config.apt_packages:
-        if is_package_installed(package):
-            print(f"  ✓ {package} already installed")
-        else:
-            print(f"  Installing {package}...")
-            run(f"apt-get install -y -qq {shlex.quote(package)}", check=False)
-            if is_package_installed(package):
-                print(f"  ✓ {package} installed")
-            else:
-                print(f"  ⚠ Failed to install {package}")
+    result = ensure_apt_packages(config.apt_packages)
+    for package in result.already_installed:
+        print(f"  ✓ {package} already installed")
+    for package in result.installed:
+        print(f"  ✓ {package} installed")
+    for package in result.failed:
+        print(f"  ⚠ Failed to install {package}")
 
 
 def install_flatpak_packages(config: SetupConfig) -> None:
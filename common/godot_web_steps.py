@@ -454,9 +454,14 @@ def _base_url(identities: list[str]) -> str:
     return f"https://{_url_host(preferred)}:{GODOT_WEB_HTTPS_PORT}"
 
 
-def render_nginx_config(cert_path: str, key_path: str) -> str:
-    """Render the isolated HTTPS static host for web games and tools."""
+def render_nginx_config(cert_path: str, key_path: str, brotli_static: bool = False) -> str:
+    """Render the isolated HTTPS static host for web games and tools.
 
+    With ``brotli_static``, browsers that accept brotli receive the
+    publisher's ``.br`` variants and everyone else falls back to ``.gz``.
+    """
+
+    brotli_line = "\n    brotli_static on;" if brotli_static else ""
     return f"""{_NGINX_MARKER}
 server {{
     listen {GODOT_WEB_HTTPS_PORT} ssl;
@@ -475,7 +480,7 @@ server {{
     charset utf-8;
     autoindex off;
     gzip on;
-    gzip_static on;
+    gzip_static on;{brotli_line}
     gzip_vary on;
     gzip_types application/wasm application/octet-stream;
 
@@ -568,6 +573,24 @@ def _ensure_nginx() -> None:
         run("systemctl enable --now nginx", check=True)
 
 
+def _ensure_brotli_support() -> bool:
+    """Install Nginx's brotli static module and the brotli CLI when packaged."""
+
+    # The module goes first so published .br files are never left unserved.
+    for name, package in (
+        ("Nginx brotli static module", "libnginx-mod-http-brotli-static"),
+        ("brotli", "brotli"),
+    ):
+        if not is_package_installed(package) and not install_package(
+            name,
+            package,
+            f"apt-get -o DPkg::Lock::Timeout=60 install -y -qq {package}",
+        ):
+            print("  ℹ Brotli precompression unavailable; serving gzip variants only")
+            return False
+    return True
+
+
 def _configure_user_roots(users: list[str]) -> bool:
     changed = False
     _ensure_managed_directory(GODOT_WEB_GAMES_ROOT, 0o755)
@@ -775,6 +798,7 @@ def configure_godot_web_host(
     )
     normalized_users = list(dict.fromkeys(users))
     _ensure_nginx()
+    brotli_static = _ensure_brotli_support()
     _ensure_managed_directory(GODOT_WEB_ROOT, 0o755)
     changed = _configure_user_roots(normalized_users)
     cert_path, key_path, local_ca, certificate_changed = _certificate_for_identities(
@@ -803,7 +827,7 @@ def configure_godot_web_host(
     changed = _write_if_changed(GODOT_WEB_URL_FILE, base_url + "\n", 0o644) or changed
     changed = _install_publisher_links() or changed
     changed = _configure_nginx_site(
-        render_nginx_config(cert_path, key_path),
+        render_nginx_config(cert_path, key_path, brotli_static),
         reload_required=certificate_changed or not local_ca,
     ) or changed
     changed = _configure_web_policy(
@@ -3,10 +3,13 @@
 
 from __future__ import annotations
 
+import argparse
+import itertools
 import json
 import os
 import re
 import shutil
+import statistics
 import subprocess
 import sys
 import time
@@ -14,7 +17,7 @@ from logging import ERROR, INFO, WARNING, DEBUG
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
 
-from lib.disk_utils import get_disk_usage_details
+from lib.disk_utils import usage_percent
 from lib.logging_utils import get_service_logger, log_event
 from lib.atomic_io import write_json_atomic
 from lib.maintenance_defaults import (
@@ -29,16 +32,23 @@ from lib.maintenance_defaults import (
     STALE_CRASH_REPORT_MAX_AGE_DAYS,
     STALE_INFRA_TMP_MAX_AGE_DAYS,
     STORAGE_CRITICAL_PERCENT,
+    STORAGE_FORECAST_HORIZON_HOURS,
+    STORAGE_FORECAST_INFRA_TMP_MAX_AGE_DAYS,
+    STORAGE_FORECAST_MAX_SAMPLES,
+    STORAGE_FORECAST_MIN_SAMPLES,
+    STORAGE_FORECAST_MIN_SPAN_HOURS,
     STORAGE_WARNING_PERCENT,
 )
 from lib.machine_state import is_container
 from lib.notifications import load_notification_configs_from_state, send_notification_safe
-from lib.types import JSONDict
+from lib.types import BYTES_PER_MB, JSONDict
 from lib.validation import validate_filesystem_path, validate_positive_integer
 
 
 logger = get_service_logger('cleanup_maintenance', 'common', use_syslog=True)
 STATE_FILE = "/var/lib/infra_tools/cleanup_maintenance_state.json"
+STORAGE_SAMPLES_FILE = "/var/lib/infra_tools/storage_usage_samples.json"
+_STORAGE_SAMPLES_VERSION = 1
 _INFRA_TMP_RE = re.compile(rf"^(?:{'|'.join(INFRA_TMP_PATTERNS)})$")
 _CRASH_REPORT_RE = re.compile(rf"^(?:{'|'.join(CRASH_REPORT_PATTERNS)})$")
 _REMOTE_FILESYSTEM_TYPES = {
@@ -81,6 +91,32 @@ def _storage_pressure_fingerprint(crowded: dict[str, dict[str, int]]) -> str:
     return json.dumps(pressure, sort_keys=True, separators=(",", ":"))
 
 
+def _load_storage_samples() -> dict[str, list[list[int]]]:
+    """Load per-mount ``[timestamp, free_mb]`` samples, dropping malformed ones."""
+    try:
+        with open(STORAGE_SAMPLES_FILE, "r", encoding="utf-8") as handle:
+            document = json.load(handle)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(document, dict) or document.get("version") != _STORAGE_SAMPLES_VERSION:
+        return {}
+    mounts = document.get("mounts")
+    if not isinstance(mounts, dict):
+        return {}
+    samples_by_mount: dict[str, list[list[int]]] = {}
+    for mount_point, samples in mounts.items():
+        if not isinstance(samples, list):
+            continue
+        samples_by_mount[mount_point] = [
+            sample
+            for sample in samples
+            if isinstance(sample, list)
+            and len(sample) == 2
+            and all(isinstance(value, int) and not isinstance(value, bool) for value in sample)
+        ]
+    return samples_by_mount
+
+
 def run_command(
     command: list[str],
     env: dict[str, str] | None = None,
@@ -472,13 +508,13 @@ def discover_local_mount_points() -> list[str]:
 
 
 def collect_local_storage_usage() -> dict[str, dict[str, int]]:
-    """Collect block and inode usage once per real local filesystem."""
+    """Collect block and inode usage once per real local filesystem.
+
+    Each mount costs one ``statvfs``; block figures match ``shutil.disk_usage``.
+    """
     usage_by_mount: dict[str, dict[str, int]] = {}
     seen_filesystems: set[tuple[int, int, int, int]] = set()
     for mount_point in discover_local_mount_points():
-        usage = get_disk_usage_details(mount_point)
-        if usage.get("total_mb", 0) <= 0:
-            continue
         try:
             stat_result = os.stat(mount_point)
             filesystem_stats = os.statvfs(mount_point)
@@ -492,16 +528,24 @@ def collect_local_storage_usage() -> dict[str, dict[str, int]]:
             )
             continue
 
+        total_bytes = filesystem_stats.f_blocks * filesystem_stats.f_frsize
+        if total_bytes // BYTES_PER_MB <= 0:
+            continue
+        used_bytes = (filesystem_stats.f_blocks - filesystem_stats.f_bfree) * filesystem_stats.f_frsize
         inode_total = filesystem_stats.f_files
         inode_used = max(0, inode_total - filesystem_stats.f_ffree)
-        usage["inode_usage_percent"] = (
-            int((inode_used / inode_total) * 100) if inode_total > 0 else 0
-        )
+        usage = {
+            "total_mb": total_bytes // BYTES_PER_MB,
+            "used_mb": used_bytes // BYTES_PER_MB,
+            "free_mb": filesystem_stats.f_bavail * filesystem_stats.f_frsize // BYTES_PER_MB,
+            "usage_percent": usage_percent(used_bytes, total_bytes),
+            "inode_usage_percent": int((inode_used / inode_total) * 100) if inode_total > 0 else 0,
+        }
         signature = (
             stat_result.st_dev,
-            usage.get("total_mb", 0),
-            usage.get("used_mb", 0),
-            usage.get("free_mb", 0),
+            usage["total_mb"],
+            usage["used_mb"],
+            usage["free_mb"],
         )
         if signature in seen_filesystems:
             continue
@@ -510,6 +554,69 @@ def collect_local_storage_usage() -> dict[str, dict[str, int]]:
     return usage_by_mount
 
 
+def record_storage_samples(
+    usage_by_mount: dict[str, dict[str, int]],
+    now: float | None = None,
+) -> dict[str, list[list[int]]]:
+    """Append one free-space sample per mount and persist the bounded history.
+
+    Each mount keeps its newest ``STORAGE_FORECAST_MAX_SAMPLES`` samples, and
+    mounts that are no longer present are dropped.
+    """
+    timestamp = int(time.time() if now is None else now)
+    previous = _load_storage_samples()
+    samples_by_mount: dict[str, list[list[int]]] = {}
+    for mount_point, usage in usage_by_mount.items():
+        samples = previous.get(mount_point, [])
+        samples.append([timestamp, int(usage.get("free_mb", 0))])
+        samples_by_mount[mount_point] = samples[-STORAGE_FORECAST_MAX_SAMPLES:]
+    validate_filesystem_path(STORAGE_SAMPLES_FILE, must_exist=False)
+    write_json_atomic(
+        STORAGE_SAMPLES_FILE,
+        {"version": _STORAGE_SAMPLES_VERSION, "mounts": samples_by_mount},
+        mode=0o600,
+        sort_keys=True,
+        indent=None,
+    )
+    return samples_by_mount
+
+
+def forecast_hours_until_full(samples: list[list[int]]) -> float | None:
+    """Return the hours until free space runs out at the recent trend.
+
+    The trend is the Theil-Sen slope, the median slope over every pair of
+    samples, so a short-lived spike such as a large temporary download does
+    not swing it. None means there is too little history or free space is not
+    shrinking.
+    """
+    if (
+        len(samples) < STORAGE_FORECAST_MIN_SAMPLES
+        or samples[-1][0] - samples[0][0] < STORAGE_FORECAST_MIN_SPAN_HOURS * 60 * 60
+    ):
+        return None
+    slopes = [
+        (later_free - earlier_free) / (later_time - earlier_time)
+        for (earlier_time, earlier_free), (later_time, later_free) in itertools.combinations(samples, 2)
+        if later_time > earlier_time
+    ]
+    if not slopes:
+        return None
+    mb_per_second = statistics.median(slopes)
+    if mb_per_second >= 0:
+        return None
+    return max(0.0, samples[-1][1] / -mb_per_second / (60 * 60))
+
+
+def forecast_filling_mounts(samples_by_mount: dict[str, list[list[int]]]) -> dict[str, float]:
+    """Return mounts forecast to fill within the horizon, with hours remaining."""
+    filling: dict[str, float] = {}
+    for mount_point, samples in samples_by_mount.items():
+        hours = forecast_hours_until_full(samples)
+        if hours is not None and hours <= STORAGE_FORECAST_HORIZON_HOURS:
+            filling[mount_point] = hours
+    return filling
+
+
 def notify_if_storage_still_low(notification_configs) -> None:
     """Notify on storage-pressure transitions, not every maintenance run."""
     usage_by_mount = collect_local_storage_usage()
@@ -602,6 +709,128 @@ def notify_if_storage_still_low(notification_configs) -> None:
         _save_state(state)
 
 
+def notify_if_storage_filling(
+    notification_configs,
+    filling: dict[str, float],
+    usage_by_mount: dict[str, dict[str, int]],
+) -> None:
+    """Notify when the set of filesystems forecast to fill soon changes."""
+    state = _load_state() if notification_configs else {}
+    previous_fingerprint = state.get("storage_forecast_fingerprint")
+    if not isinstance(previous_fingerprint, str):
+        previous_fingerprint = ""
+
+    if not filling:
+        if previous_fingerprint:
+            delivered = send_notification_safe(
+                notification_configs,
+                subject="Info: storage no longer forecast to fill",
+                job="cleanup_maintenance",
+                status="info",
+                message="No monitored local filesystem is forecast to fill soon.",
+                details="The previous storage forecast has cleared.",
+                logger=logger,
+                event_type="maintenance.storage_forecast",
+                state="resolved",
+                dedup_key="cleanup:storage-forecast",
+            )
+            if delivered:
+                state.pop("storage_forecast_fingerprint", None)
+                _save_state(state)
+        return
+
+    fingerprint = json.dumps(sorted(filling), separators=(",", ":"))
+    if fingerprint == previous_fingerprint:
+        log_event(
+            logger,
+            "Storage forecast unchanged; notification suppressed",
+            fingerprint=fingerprint,
+        )
+        return
+
+    details = "\n".join(
+        f"{mount_point}: full in about {hours:.0f} h at the current rate, "
+        f"free={usage_by_mount.get(mount_point, {}).get('free_mb', 0)} MB"
+        for mount_point, hours in sorted(filling.items(), key=lambda item: item[1])
+    )
+    delivered = send_notification_safe(
+        notification_configs,
+        subject="Warning: storage forecast to fill",
+        job="cleanup_maintenance",
+        status="warning",
+        message=(
+            f"{len(filling)} local filesystem(s) will fill within "
+            f"{STORAGE_FORECAST_HORIZON_HOURS} hours at the current rate"
+        ),
+        details=details,
+        logger=logger,
+        event_type="maintenance.storage_forecast",
+        state="firing",
+        dedup_key="cleanup:storage-forecast",
+        actions=["Review what is consuming space on the affected filesystems before writes fail."],
+    )
+    if delivered and notification_configs:
+        state["storage_forecast_fingerprint"] = fingerprint
+        _save_state(state)
+
+
+def run_storage_forecast() -> int:
+    """Sample local storage and clean up early where a filesystem will fill soon."""
+    notification_configs = load_notification_configs_from_state(logger)
+    usage_by_mount = collect_local_storage_usage()
+    try:
+        samples_by_mount = record_storage_samples(usage_by_mount)
+    except (OSError, ValueError) as exc:
+        log_event(logger, "Could not record storage samples", level=ERROR, error=str(exc))
+        return 1
+
+    filling = forecast_filling_mounts(samples_by_mount)
+    failures: list[str] = []
+    if filling:
+        log_event(
+            logger,
+            "Storage forecast to fill; running early cleanup",
+            level=WARNING,
+            hours_until_full=json.dumps(
+                {mount_point: round(hours, 1) for mount_point, hours in sorted(filling.items())},
+                separators=(",", ":"),
+            ),
+        )
+        failures.extend(cleanup_apt_cache())
+        for tmp_dir in INFRA_TMP_DIRS:
+            failures.extend(
+                cleanup_stale_infra_tmp_artifacts(
+                    tmp_dir=tmp_dir,
+                    max_age_days=STORAGE_FORECAST_INFRA_TMP_MAX_AGE_DAYS,
+                )
+            )
+    notify_if_storage_filling(notification_configs, filling, usage_by_mount)
+
+    if failures:
+        log_event(
+            logger,
+            "Early storage cleanup failed",
+            level=WARNING,
+            failure_count=len(failures),
+            details="\n".join(failures),
+        )
+        return 1
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse cleanup maintenance options."""
+    parser = argparse.ArgumentParser(
+        description="Run bounded system cleanup and post-cleanup capacity checks.",
+    )
+    parser.add_argument(
+        "--forecast",
+        action="store_true",
+        help="Only sample storage usage, and clean up early where a filesystem is forecast to fill",
+    )
+    return parser.parse_args(argv)
+
+
 def main() -> int:
     """Run system cleanup tasks and notify on failures."""
     log_event(logger, "Starting cleanup maintenance")
@@ -665,4 +894,5 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    _args = parse_args()
+    sys.exit(run_storage_forecast() if _args.forecast else main())
@@ -6,6 +6,7 @@ from __future__ import annotations
 import argparse
 import fcntl
 import gzip
+import hashlib
 import html
 import json
 import os
@@ -17,6 +18,7 @@ import sys
 import tempfile
 import time
 import webbrowser
+from concurrent.futures import Future, ThreadPoolExecutor
 
 
 GAMES_ROOT = "/srv/infra-tools/web/games"
@@ -28,6 +30,10 @@ _PROJECT_NAME_PATTERN = re.compile(
     r'^\s*config/name\s*=\s*(?:"(?P<quoted>.*)"|(?P<plain>[^;#]+))\s*$'
 )
 _COMPRESS_SUFFIXES = (".pck", ".wasm")
+# A variant must save at least this fraction of the original to be kept;
+# otherwise Nginx serves the original rather than a marginally smaller copy.
+_COMPRESSION_MIN_SAVINGS = 0.05
+_VARIANT_SUFFIXES = {"gzip": ".gz", "br": ".br"}
 
 
 def _parser() -> argparse.ArgumentParser:
@@ -67,7 +73,7 @@ def _parser() -> argparse.ArgumentParser:
         dest="precompress",
         action="store_false",
         default=True,
-        help="Do not create deterministic gzip copies of .wasm and .pck files",
+        help="Do not create deterministic gzip and brotli copies of .wasm and .pck files",
     )
     parser.add_argument(
         "--json",
@@ -162,31 +168,206 @@ def _replace_export(staging_dir: str, destination_dir: str) -> None:
             shutil.rmtree(backup_dir, ignore_errors=True)
 
 
-def _precompress_export(export_dir: str) -> list[str]:
-    """Create reproducible gzip assets for large Godot web payloads."""
+def _available_codecs() -> tuple[str, ...]:
+    """Return the precompression codecs this host can produce."""
+
+    return ("gzip", "br") if shutil.which("brotli") else ("gzip",)
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_obj:
+        for chunk in iter(lambda: file_obj.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-    compressed: list[str] = []
-    for current_dir, _directory_names, file_names in os.walk(export_dir):
-        for name in file_names:
-            if not name.endswith(_COMPRESS_SUFFIXES):
-                continue
-            source_path = os.path.join(current_dir, name)
-            destination_path = source_path + ".gz"
-            with open(source_path, "rb") as source, open(
-                destination_path, "wb"
-            ) as destination:
-                with gzip.GzipFile(
-                    filename="",
-                    mode="wb",
-                    compresslevel=9,
-                    fileobj=destination,
-                    mtime=0,
-                ) as compressed_file:
-                    shutil.copyfileobj(source, compressed_file)
-                destination.flush()
-                os.fsync(destination.fileno())
-            compressed.append(os.path.relpath(destination_path, export_dir))
-    return sorted(compressed)
+
+def _write_gzip(source_path: str, destination_path: str) -> None:
+    with open(source_path, "rb") as source, open(destination_path, "wb") as destination:
+        with gzip.GzipFile(
+            filename="",
+            mode="wb",
+            compresslevel=9,
+            fileobj=destination,
+            mtime=0,
+        ) as compressed_file:
+            shutil.copyfileobj(source, compressed_file, 1024 * 1024)
+        destination.flush()
+        os.fsync(destination.fileno())
+
+
+def _write_brotli(source_path: str, destination_path: str) -> None:
+    result = subprocess.run(
+        ["brotli", "--quality=11", "--force", f"--output={destination_path}", source_path],
+        check=False,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        detail = (result.stderr or result.stdout or "").strip()
+        raise RuntimeError(f"brotli failed for {os.path.basename(source_path)}: {detail}")
+
+
+def _compress_variant(source_path: str, codec: str, original_size: int) -> dict[str, object]:
+    """Write one compressed variant and drop it when it saves too little."""
+
+    destination_path = source_path + _VARIANT_SUFFIXES[codec]
+    started = time.monotonic()
+    if codec == "gzip":
+        _write_gzip(source_path, destination_path)
+    else:
+        _write_brotli(source_path, destination_path)
+    elapsed = time.monotonic() - started
+    size = os.path.getsize(destination_path)
+    kept = size <= original_size * (1 - _COMPRESSION_MIN_SAVINGS)
+    if not kept:
+        os.unlink(destination_path)
+    return {
+        "kept": kept,
+        "ratio": round(size / original_size, 4) if original_size else 1.0,
+        "reused": False,
+        "seconds": round(elapsed, 3),
+        "size": size,
+    }
+
+
+def _reuse_variant(
+    previous_dir: str,
+    export_dir: str,
+    relative_path: str,
+    codec: str,
+    previous: object,
+) -> dict[str, object] | None:
+    """Carry over a variant from an export whose source file is unchanged."""
+
+    if (
+        not isinstance(previous, dict)
+        or not isinstance(previous.get("kept"), bool)
+        or not all(
+            isinstance(previous.get(key), (int, float)) and not isinstance(previous.get(key), bool)
+            for key in ("ratio", "seconds", "size")
+        )
+    ):
+        return None
+    if previous["kept"]:
+        suffix = _VARIANT_SUFFIXES[codec]
+        previous_path = os.path.join(previous_dir, relative_path + suffix)
+        if os.path.islink(previous_path) or not os.path.isfile(previous_path):
+            return None
+        destination_path = os.path.join(export_dir, relative_path + suffix)
+        try:
+            os.link(previous_path, destination_path)
+        except OSError:
+            shutil.copyfile(previous_path, destination_path)
+    return {
+        "kept": previous["kept"],
+        "ratio": previous["ratio"],
+        "reused": True,
+        "seconds": previous["seconds"],
+        "size": previous["size"],
+    }
+
+
+def _precompress_export(
+    export_dir: str,
+    previous_dir: str | None = None,
+) -> dict[str, dict[str, object]]:
+    """Create reproducible gzip and brotli assets for large Godot web payloads.
+
+    Files are hashed and compressed concurrently, one job per file and codec.
+    Variants of files whose hash matches the previous export's metadata are
+    linked from that export instead of being compressed again. Returns a
+    per-file report with the hash, size, and each variant's ratio and time.
+    """
+
+    sources = sorted(
+        os.path.relpath(os.path.join(current_dir, name), export_dir)
+        for current_dir, _directory_names, file_names in os.walk(export_dir)
+        for name in file_names
+        if name.endswith(_COMPRESS_SUFFIXES)
+    )
+    if not sources:
+        return {}
+    previous_report: dict[str, object] = {}
+    if previous_dir is not None:
+        recorded = _metadata_for_game(previous_dir).get("compression")
+        if isinstance(recorded, dict):
+            previous_report = recorded
+
+    codecs = _available_codecs()
+    report: dict[str, dict[str, object]] = {}
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        hashes = dict(
+            zip(
+                sources,
+                pool.map(lambda path: _file_sha256(os.path.join(export_dir, path)), sources),
+            )
+        )
+        pending: dict[tuple[str, str], Future[dict[str, object]]] = {}
+        variants_by_file: dict[str, dict[str, object]] = {}
+        for relative_path in sources:
+            source_path = os.path.join(export_dir, relative_path)
+            size = os.path.getsize(source_path)
+            variants = variants_by_file[relative_path] = {}
+            report[relative_path] = {
+                "sha256": hashes[relative_path],
+                "size": size,
+                "variants": variants,
+            }
+            previous = previous_report.get(relative_path)
+            previous_variants = (
+                previous.get("variants")
+                if isinstance(previous, dict) and previous.get("sha256") == hashes[relative_path]
+                else None
+            )
+            for codec in codecs:
+                reused = None
+                if previous_dir is not None and isinstance(previous_variants, dict):
+                    reused = _reuse_variant(
+                        previous_dir,
+                        export_dir,
+                        relative_path,
+                        codec,
+                        previous_variants.get(codec),
+                    )
+                if reused is not None:
+                    variants[codec] = reused
+                else:
+                    pending[(relative_path, codec)] = pool.submit(
+                        _compress_variant,
+                        source_path,
+                        codec,
+                        size,
+                    )
+        for (relative_path, codec), future in pending.items():
+            variants_by_file[relative_path][codec] = future.result()
+    return report
+
+
+def _precompressed_files(report: dict[str, dict[str, object]]) -> list[str]:
+    return sorted(
+        relative_path + _VARIANT_SUFFIXES[codec]
+        for relative_path, entry in report.items()
+        for codec, variant in entry["variants"].items()
+        if variant["kept"]
+    )
+
+
+def _format_compression_report(report: dict[str, dict[str, object]]) -> list[str]:
+    lines = []
+    for relative_path, entry in sorted(report.items()):
+        parts = []
+        for codec, variant in sorted(entry["variants"].items()):
+            detail = f"{codec} {variant['ratio']:.0%}"
+            if variant["reused"]:
+                detail += " (unchanged)"
+            else:
+                detail += f" in {variant['seconds']:.1f}s"
+            if not variant["kept"]:
+                detail += ", original kept"
+            parts.append(detail)
+        lines.append(f"  {relative_path}: " + "; ".join(parts))
+    return lines
 
 
 def _make_export_readable(export_dir: str) -> None:
@@ -351,12 +532,23 @@ def _publish(args: argparse.Namespace) -> tuple[str, str, dict[str, object]]:
                     raise RuntimeError("Godot did not create index.html")
                 raise RuntimeError(f"Godot export failed with exit code {result.returncode}")
 
-            compressed = _precompress_export(staging_dir) if args.precompress else []
+            destination_dir = os.path.join(user_root, game)
+            compression = (
+                _precompress_export(
+                    staging_dir,
+                    destination_dir
+                    if os.path.isdir(destination_dir) and not os.path.islink(destination_dir)
+                    else None,
+                )
+                if args.precompress
+                else {}
+            )
             published_url = _published_url(account.pw_name, game)
             metadata: dict[str, object] = {
+                "compression": compression,
                 "debug": bool(args.debug),
                 "game": game,
-                "precompressed": compressed,
+                "precompressed": _precompressed_files(compression),
                 "preset": preset,
                 "project": project_dir,
                 "published_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -364,7 +556,6 @@ def _publish(args: argparse.Namespace) -> tuple[str, str, dict[str, object]]:
                 "url": published_url,
             }
             _write_metadata(os.path.join(staging_dir, METADATA_FILE), metadata)
-            destination_dir = os.path.join(user_root, game)
             _make_export_readable(staging_dir)
             _replace_export(staging_dir, destination_dir)
             write_user_catalog(user_root, account.pw_name)
@@ -397,6 +588,11 @@ def main(argv: list[str] | None = None) -> int:
             )
         )
     else:
+        compression = metadata.get("compression")
+        if isinstance(compression, dict) and compression:
+            print("Precompressed:")
+            for line in _format_compression_report(compression):
+                print(line)
         print(f"Published {game} to {published_url}")
     if args.open:
         webbrowser.open(published_url)
@@ -10,6 +10,7 @@ import json
 import os
 import pwd
 import re
+import shlex
 import shutil
 import socket
 import ssl
@@ -26,6 +27,7 @@ if SOURCE_ROOT not in sys.path:
     sys.path.insert(0, SOURCE_ROOT)
 
 from common.service_tools import godot_web_publish
+from lib.ufw_rules import DesiredUfwRule, UfwFirewall
 
 
 POLICY_FILE = "/etc/infra-tools/internal-web/policy.json"
@@ -38,7 +40,6 @@ _FORWARD_RULE_PREFIX = "infra_tools HTTPS forward"
 _NAME_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,62}$")
 _USERNAME_PATTERN = re.compile(r"^[a-z_][a-z0-9_-]{0,31}$")
 _SAFE_PATH_PATTERN = re.compile(r"^/[A-Za-z0-9_./-]+$")
-_UFW_NUMBERED_RULE_RE = re.compile(r"^\[\s*(\d+)\]\s+(.*)$")
 _PROFILES = ("general", "godot")
 
 
@@ -387,23 +388,16 @@ def _run_checked(command: list[str], label: str) -> subprocess.CompletedProcess[
     return result
 
 
-def _ufw_rules() -> list[tuple[int, str, str]]:
-    result = _run_checked(["ufw", "status", "numbered"], "Could not inspect UFW")
-    rules: list[tuple[int, str, str]] = []
-    for line in result.stdout.splitlines():
-        match = _UFW_NUMBERED_RULE_RE.match(line.strip())
-        if not match:
-            continue
-        comment = line.split("#", 1)[1].strip() if "#" in line else ""
-        rules.append((int(match.group(1)), comment, line))
-    return rules
+def _run_ufw(command: str, *, check: bool = False, **_options: object) -> subprocess.CompletedProcess[str]:
+    """Run a UFW command for :class:`UfwFirewall`; output is always captured."""
+    return subprocess.run(shlex.split(command), check=check, capture_output=True, text=True)
 
 
 def _desired_firewall_rules(
     routes: list[dict[str, object]],
     policy: dict[str, object],
-) -> dict[str, list[str]]:
-    desired: dict[str, list[str]] = {}
+) -> list[DesiredUfwRule]:
+    desired: list[DesiredUfwRule] = []
     sources = policy["access_sources"]
     for route in routes:
         port = int(route["listen"])
@@ -411,23 +405,22 @@ def _desired_firewall_rules(
         if sources:
             for source in sources:
                 comment = f"{_FORWARD_RULE_PREFIX} {name} {port}/tcp source {source}"
-                desired[comment] = [
-                    "ufw",
-                    "allow",
-                    "from",
-                    str(source),
-                    "to",
-                    "any",
-                    "port",
-                    str(port),
-                    "proto",
-                    "tcp",
-                    "comment",
-                    comment,
-                ]
+                desired.append(
+                    DesiredUfwRule(
+                        f"allow from {shlex.quote(str(source))} to any port {port} proto tcp",
+                        comment,
+                        failure=f"Could not add UFW rule for {comment}",
+                    )
+                )
         else:
             comment = f"{_FORWARD_RULE_PREFIX} {name} {port}/tcp global"
-            desired[comment] = ["ufw", "allow", f"{port}/tcp", "comment", comment]
+            desired.append(
+                DesiredUfwRule(
+                    f"allow {port}/tcp",
+                    comment,
+                    failure=f"Could not add UFW rule for {comment}",
+                )
+            )
     return desired
 
 
@@ -443,49 +436,31 @@ def _reconcile_firewall(
         if not routes:
             return
         raise RuntimeError("HTTPS forwarding requires UFW")
-    status = _run_checked(["ufw", "status"], "Could not inspect UFW status")
-    if "Status: active" not in status.stdout:
+    firewall = UfwFirewall(_run_ufw, require_status=True)
+    status = firewall.status()
+    if not status.active:
         if not routes:
             return
         raise RuntimeError("HTTPS forwarding requires an active UFW firewall")
-    existing = _ufw_rules()
-    managed_comments = {
-        comment for _number, comment, _line in existing if comment.startswith(_FORWARD_RULE_PREFIX)
-    }
     for route in routes:
         listen_port = int(route["listen"])
         conflicts = [
-            line
-            for _number, comment, line in existing
-            if _ufw_rule_matches_port(line, listen_port)
-            and "ALLOW IN" in line
-            and not comment.startswith(_FORWARD_RULE_PREFIX)
+            rule
+            for rule in status.rules
+            if _ufw_rule_matches_port(rule.to, listen_port)
+            and rule.action == "ALLOW IN"
+            and not rule.comment.startswith(_FORWARD_RULE_PREFIX)
         ]
         if conflicts:
             raise RuntimeError(
                 f"Unmanaged UFW rules already expose HTTPS forward port {route['listen']}"
             )
 
-    desired = _desired_firewall_rules(routes, policy)
-    for comment, command in desired.items():
-        if comment not in managed_comments:
-            _run_checked(command, f"Could not add UFW rule for {comment}")
-
-    observed = _ufw_rules()
-    observed_comments = {comment for _number, comment, _line in observed}
-    missing = set(desired) - observed_comments
-    if missing:
-        raise RuntimeError("UFW did not retain requested HTTPS forward rules")
-    stale_numbers = [
-        number
-        for number, comment, _line in observed
-        if comment.startswith(_FORWARD_RULE_PREFIX) and comment not in desired
-    ]
-    for number in sorted(stale_numbers, reverse=True):
-        _run_checked(
-            ["ufw", "--force", "delete", str(number)],
-            "Could not remove stale HTTPS forward firewall rule",
-        )
+    firewall.reconcile(
+        _desired_firewall_rules(routes, policy),
+        owned=lambda rule: rule.comment.startswith(_FORWARD_RULE_PREFIX),
+        verify=True,
+    )
 
 
 def _ensure_forward_link() -> bool:
@@ -4,18 +4,27 @@
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import pwd
 import shlex
 import shutil
+import stat
 import subprocess
 import sys
+import threading
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from logging import INFO, WARNING
+from typing import Callable
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../.."))
 
+from lib.atomic_io import write_json_atomic
+from lib.disk_utils import bytes_over_usage_percent
 from lib.logging_utils import get_service_logger, log_event
 from lib.maintenance_defaults import (
     CLEANUP_COMMAND_TIMEOUT_SECONDS,
@@ -27,6 +36,7 @@ from lib.maintenance_defaults import (
     PIP_CACHE_MAX_BYTES,
     STALE_USER_TOOL_CACHE_MAX_AGE_DAYS,
     STALE_USER_TOOL_TMP_MAX_AGE_DAYS,
+    USER_CACHE_EVICTION_TARGET_PERCENT,
 )
 from lib.types import BYTES_PER_MB
 from lib.validation import validate_filesystem_path
@@ -34,6 +44,23 @@ from lib.validation import validate_filesystem_path
 
 logger = get_service_logger("user_cache_maintenance", "common", use_syslog=True)
 _TOOL_NOT_FOUND_EXIT = 77
+_USAGE_SUMMARY_VERSION = 2
+# Directory summaries are trusted while the directory's mtime is unchanged,
+# which misses files rewritten in place. They therefore only supply byte
+# totals for size limits; file ages that gate a deletion are always re-read. Each weekly run rescans the quarter
+# of directories whose rotation slot matches the week, and any summary older
+# than the rotation is rescanned regardless.
+_USAGE_SUMMARY_ROTATION_WEEKS = 4
+_SECONDS_PER_WEEK = 7 * 24 * 60 * 60
+_USAGE_SUMMARY_MAX_AGE_SECONDS = _USAGE_SUMMARY_ROTATION_WEEKS * _SECONDS_PER_WEEK
+# Directories modified this recently may still change within the same mtime
+# tick, so their summaries are not recorded.
+_USAGE_SUMMARY_SETTLE_SECONDS = 2
+_INVENTORY_WORKERS = 4
+# Lowest best-effort I/O priority: eviction yields to interactive disk use
+# without the unbounded starvation of the idle class.
+_EVICTION_IONICE_ARGS = ("-c", "2", "-n", "7")
+_SECONDS_PER_DAY = 24 * 60 * 60
 
 
 @dataclass(frozen=True)
@@ -53,6 +80,145 @@ class CacheUsage:
     newest_mtime: float | None
 
 
+@dataclass(frozen=True)
+class EvictionCandidate:
+    """One idle cache the pressure planner may evict as a whole.
+
+    An empty ``clean_command`` means the directory itself is removed; tool
+    caches are evicted through the tool's own clean command instead.
+    """
+
+    label: str
+    path: str
+    size_bytes: int
+    last_used: float
+    process_names: tuple[str, ...]
+    clean_command: tuple[str, ...] = ()
+    load_nvm: bool = False
+
+
+@dataclass(frozen=True)
+class _ToolCache:
+    label: str
+    path_queries: tuple[tuple[str, ...], ...]
+    clean_args: tuple[str, ...]
+    process_names: tuple[str, ...]
+    load_nvm: bool = False
+
+
+_EVICTABLE_TOOL_CACHES = (
+    _ToolCache("npm", (("npm", "config", "get", "cache"),), ("cache", "clean", "--force"), ("npm",), True),
+    _ToolCache(
+        "pip",
+        (("pip3", "cache", "dir"), ("pip", "cache", "dir")),
+        ("cache", "purge"),
+        ("pip", "pip3"),
+    ),
+    _ToolCache("uv", (("uv", "cache", "dir"),), ("cache", "clean"), ("uv",)),
+    _ToolCache(
+        "Go build cache",
+        (("go", "env", "GOCACHE"),),
+        ("clean", "-cache", "-testcache", "-fuzzcache"),
+        ("go",),
+    ),
+    _ToolCache("Go module cache", (("go", "env", "GOMODCACHE"),), ("clean", "-modcache"), ("go",)),
+)
+# Rebuildable agent cache directories relative to the user's home.
+_EVICTABLE_AGENT_CACHES = (
+    ("OpenCode", (".cache", "opencode"), ("opencode", "opencode-cli")),
+    ("Codex", (".codex", "cache"), ("codex",)),
+)
+
+
+def _summary_expired(directory: str, scanned_at: float, now: float) -> bool:
+    """Return whether ``directory``'s summary is due for a rescan at ``now``."""
+    if now - scanned_at > _USAGE_SUMMARY_MAX_AGE_SECONDS:
+        return True
+    week = int(now // _SECONDS_PER_WEEK)
+    slot = zlib.crc32(directory.encode("utf-8", "surrogateescape")) % _USAGE_SUMMARY_ROTATION_WEEKS
+    return week % _USAGE_SUMMARY_ROTATION_WEEKS == slot and scanned_at < week * _SECONDS_PER_WEEK
+
+
+class DirectorySummaryCache:
+    """Persisted per-directory file totals reused while a directory is unchanged.
+
+    Each summary records a directory's mtime, the total size of its direct
+    file children, and its subdirectory names. An unchanged directory
+    then costs one ``lstat`` per subdirectory instead of a ``scandir`` plus a
+    ``stat`` per file. Only summaries used during this run are saved, so
+    removed directories drop out.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path
+        self._loaded: dict[str, list[object]] = {}
+        self._current: dict[str, list[object]] = {}
+        self._lock = threading.Lock()
+        if path is None:
+            return
+        try:
+            with open(path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return
+        if isinstance(data, dict) and data.get("version") == _USAGE_SUMMARY_VERSION:
+            directories = data.get("directories")
+            if isinstance(directories, dict):
+                self._loaded = directories
+
+    def lookup(self, directory: str, mtime_ns: int) -> tuple[int, list[str]] | None:
+        """Return ``(file_bytes, subdirectories)`` if still valid."""
+        entry = self._loaded.get(directory)
+        if not isinstance(entry, list) or len(entry) != 4 or entry[0] != mtime_ns:
+            return None
+        _mtime_ns, file_bytes, subdirectories, scanned_at = entry
+        if (
+            not isinstance(file_bytes, int)
+            or not isinstance(subdirectories, list)
+            or not isinstance(scanned_at, (int, float))
+            or _summary_expired(directory, scanned_at, time.time())
+        ):
+            return None
+        with self._lock:
+            self._current[directory] = entry
+        return file_bytes, subdirectories
+
+    def store(
+        self,
+        directory: str,
+        mtime_ns: int,
+        file_bytes: int,
+        subdirectories: list[str],
+    ) -> None:
+        if time.time_ns() - mtime_ns < _USAGE_SUMMARY_SETTLE_SECONDS * 1_000_000_000:
+            return
+        with self._lock:
+            self._current[directory] = [mtime_ns, file_bytes, subdirectories, time.time()]
+
+    def save(self) -> None:
+        """Write the summaries used in this run; failures only lose the speedup."""
+        if self.path is None:
+            return
+        with self._lock:
+            data = {"version": _USAGE_SUMMARY_VERSION, "directories": dict(self._current)}
+        try:
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            write_json_atomic(self.path, data, mode=0o600, indent=None)
+        except OSError as exc:
+            log_event(
+                logger,
+                "Could not save user cache usage summaries",
+                level=WARNING,
+                path=self.path,
+                error=str(exc),
+            )
+
+
+def usage_summary_path(context: UserContext) -> str:
+    """Return where directory usage summaries are kept for ``context``."""
+    return os.path.join(context.home, ".cache", "infra_tools", "user-cache-usage.json")
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse direct maintenance-script options."""
     parser = argparse.ArgumentParser(
@@ -253,41 +419,88 @@ def is_safe_managed_path(context: UserContext, path: str, label: str) -> bool:
     return True
 
 
-def cache_usage(path: str) -> CacheUsage:
-    """Measure a cache tree without following symbolic links."""
-    if not os.path.exists(path):
+def cache_usage(path: str, summaries: DirectorySummaryCache | None = None) -> CacheUsage:
+    """Measure a cache tree without following symbolic links.
+
+    Directories are listed with ``os.scandir`` so file types come from the
+    directory entries; only regular entries are ``stat``-ed. With
+    ``summaries``, directories whose mtime is unchanged reuse their recorded
+    file totals instead of being listed again. Summaries cannot see files
+    rewritten in place, so a summary-backed measurement reports only the size
+    and leaves ``newest_mtime`` unset; callers that act on a cache's age must
+    measure without summaries.
+    """
+    try:
+        root_stat = os.lstat(path)
+    except FileNotFoundError:
+        return CacheUsage(0, None)
+    if stat.S_ISLNK(root_stat.st_mode):
         return CacheUsage(0, None)
+    if not stat.S_ISDIR(root_stat.st_mode):
+        return CacheUsage(root_stat.st_size, root_stat.st_mtime)
 
     size_bytes = 0
-    newest_mtime: float | None = None
-    pending_paths = [path]
-    while pending_paths:
-        current_path = pending_paths.pop()
-        stat_result = os.lstat(current_path)
-        if os.path.islink(current_path):
-            continue
-        if newest_mtime is None or stat_result.st_mtime > newest_mtime:
-            newest_mtime = stat_result.st_mtime
-        if not os.path.isdir(current_path):
-            size_bytes += stat_result.st_size
-            continue
-
-        with os.scandir(current_path) as entries:
-            pending_paths.extend(entry.path for entry in entries)
+    newest_mtime = root_stat.st_mtime
+    pending_directories = [(path, root_stat)]
+    while pending_directories:
+        directory, directory_stat = pending_directories.pop()
+        newest_mtime = max(newest_mtime, directory_stat.st_mtime)
+        summary = summaries.lookup(directory, directory_stat.st_mtime_ns) if summaries else None
+        if summary is not None:
+            file_bytes, subdirectories = summary
+            newest_file_mtime = None
+            for name in subdirectories:
+                subdirectory = os.path.join(directory, name)
+                try:
+                    subdirectory_stat = os.lstat(subdirectory)
+                except FileNotFoundError:
+                    continue
+                if stat.S_ISDIR(subdirectory_stat.st_mode):
+                    pending_directories.append((subdirectory, subdirectory_stat))
+        else:
+            file_bytes = 0
+            newest_file_mtime = None
+            subdirectories = []
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_symlink():
+                        continue
+                    try:
+                        entry_stat = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.name)
+                        pending_directories.append((entry.path, entry_stat))
+                        continue
+                    file_bytes += entry_stat.st_size
+                    if newest_file_mtime is None or entry_stat.st_mtime > newest_file_mtime:
+                        newest_file_mtime = entry_stat.st_mtime
+            if summaries is not None:
+                summaries.store(
+                    directory,
+                    directory_stat.st_mtime_ns,
+                    file_bytes,
+                    subdirectories,
+                )
+        size_bytes += file_bytes
+        if newest_file_mtime is not None:
+            newest_mtime = max(newest_mtime, newest_file_mtime)
 
-    return CacheUsage(size_bytes, newest_mtime)
+    return CacheUsage(size_bytes, None if summaries is not None else newest_mtime)
 
 
 def inventory_cache(
     context: UserContext,
     label: str,
     path: str,
+    summaries: DirectorySummaryCache | None = None,
 ) -> tuple[CacheUsage | None, str | None]:
     """Validate, measure, and log one user-owned cache."""
     if not is_safe_managed_path(context, path, label):
         return None, None
     try:
-        usage = cache_usage(path)
+        usage = cache_usage(path, summaries)
     except OSError as exc:
         details = str(exc)
         log_event(
@@ -351,7 +564,11 @@ def cleanup_managed_directory(
     process_names: tuple[str, ...],
     dry_run: bool,
 ) -> list[str]:
-    """Remove a rebuildable cache when stale or oversized and its tool is idle."""
+    """Remove a rebuildable cache when stale or oversized and its tool is idle.
+
+    The cache is measured without directory summaries because its age can
+    remove it.
+    """
     usage, failure = inventory_cache(context, label, path)
     if failure:
         return [failure]
@@ -484,7 +701,12 @@ def cleanup_stale_children(
     return failures
 
 
-def cleanup_npm_cache(context: UserContext, *, dry_run: bool) -> list[str]:
+def cleanup_npm_cache(
+    context: UserContext,
+    *,
+    dry_run: bool,
+    summaries: DirectorySummaryCache | None = None,
+) -> list[str]:
     """Garbage-collect npm cache data and enforce a high-water size limit."""
     path, executable, failure = query_cache_path(
         context,
@@ -497,7 +719,7 @@ def cleanup_npm_cache(context: UserContext, *, dry_run: bool) -> list[str]:
     if path is None or executable is None:
         return []
 
-    usage, inventory_failure = inventory_cache(context, "npm", path)
+    usage, inventory_failure = inventory_cache(context, "npm", path, summaries)
     failures = [inventory_failure] if inventory_failure else []
     if usage is None:
         return failures
@@ -511,7 +733,7 @@ def cleanup_npm_cache(context: UserContext, *, dry_run: bool) -> list[str]:
     if verify_failure:
         failures.append(verify_failure)
     elif not dry_run:
-        usage, post_verify_failure = inventory_cache(context, "npm", path)
+        usage, post_verify_failure = inventory_cache(context, "npm", path, summaries)
         if post_verify_failure:
             failures.append(post_verify_failure)
     if (
@@ -531,7 +753,12 @@ def cleanup_npm_cache(context: UserContext, *, dry_run: bool) -> list[str]:
     return failures
 
 
-def cleanup_pip_cache(context: UserContext, *, dry_run: bool) -> list[str]:
+def cleanup_pip_cache(
+    context: UserContext,
+    *,
+    dry_run: bool,
+    summaries: DirectorySummaryCache | None = None,
+) -> list[str]:
     """Purge pip's cache only after it exceeds its configured size limit."""
     path, executable, failure = query_cache_path(
         context,
@@ -543,7 +770,7 @@ def cleanup_pip_cache(context: UserContext, *, dry_run: bool) -> list[str]:
     if path is None or executable is None:
         return []
 
-    usage, inventory_failure = inventory_cache(context, "pip", path)
+    usage, inventory_failure = inventory_cache(context, "pip", path, summaries)
     failures = [inventory_failure] if inventory_failure else []
     if usage is not None and usage.size_bytes > PIP_CACHE_MAX_BYTES:
         cleanup_failure = run_cleanup_command(
@@ -557,7 +784,12 @@ def cleanup_pip_cache(context: UserContext, *, dry_run: bool) -> list[str]:
     return failures
 
 
-def cleanup_uv_cache(context: UserContext, *, dry_run: bool) -> list[str]:
+def cleanup_uv_cache(
+    context: UserContext,
+    *,
+    dry_run: bool,
+    summaries: DirectorySummaryCache | None = None,
+) -> list[str]:
     """Use uv's supported periodic pruning operation."""
     path, executable, failure = query_cache_path(
         context,
@@ -569,7 +801,7 @@ def cleanup_uv_cache(context: UserContext, *, dry_run: bool) -> list[str]:
     if path is None or executable is None:
         return []
 
-    usage, inventory_failure = inventory_cache(context, "uv", path)
+    usage, inventory_failure = inventory_cache(context, "uv", path, summaries)
     failures = [inventory_failure] if inventory_failure else []
     if usage is None:
         return failures
@@ -592,6 +824,7 @@ def cleanup_go_cache(
     max_bytes: int,
     clean_args: list[str],
     dry_run: bool,
+    summaries: DirectorySummaryCache | None = None,
 ) -> list[str]:
     """Clean one Go cache through the go command after it exceeds its limit."""
     path, executable, failure = query_cache_path(
@@ -604,7 +837,7 @@ def cleanup_go_cache(
     if path is None or executable is None:
         return []
 
-    usage, inventory_failure = inventory_cache(context, cache_name, path)
+    usage, inventory_failure = inventory_cache(context, cache_name, path, summaries)
     failures = [inventory_failure] if inventory_failure else []
     if usage is not None and usage.size_bytes > max_bytes:
         cleanup_failure = run_cleanup_command(
@@ -658,33 +891,252 @@ def cleanup_agent_caches(context: UserContext, *, dry_run: bool) -> list[str]:
     return failures
 
 
+def eviction_bytes_needed(
+    path: str,
+    target_percent: int = USER_CACHE_EVICTION_TARGET_PERCENT,
+) -> int:
+    """Return how many bytes must be freed on ``path``'s filesystem to reach the target."""
+    usage = shutil.disk_usage(path)
+    # Same used/total measure as the storage warnings, so eviction starts
+    # exactly where cleanup_maintenance starts warning.
+    return bytes_over_usage_percent(usage.used, usage.total, target_percent)
+
+
+def collect_eviction_candidates(context: UserContext) -> tuple[list[EvictionCandidate], list[str]]:
+    """Inventory every idle cache stored on the home filesystem.
+
+    Caches whose tool is running are skipped, as are caches on another
+    filesystem because evicting them cannot relieve pressure on the home one.
+    Each cache is measured without directory summaries so its last use comes
+    from current file mtimes.
+    """
+    home_device = os.stat(context.home).st_dev
+    sources: list[tuple[str, str, tuple[str, ...], tuple[str, ...], bool]] = []
+    failures: list[str] = []
+    for tool in _EVICTABLE_TOOL_CACHES:
+        if tool_is_active(tool.process_names):
+            log_event(logger, "User cache eviction skipped while tool is active", cache=tool.label)
+            continue
+        path, executable, failure = query_cache_path(
+            context,
+            tuple(list(query) for query in tool.path_queries),
+            f"{tool.label} path query",
+            load_nvm=tool.load_nvm,
+        )
+        if failure:
+            failures.append(failure)
+        if path is not None and executable is not None:
+            clean_command = (executable,) + tool.clean_args
+            sources.append((tool.label, path, clean_command, tool.process_names, tool.load_nvm))
+    for label, relative_path, process_names in _EVICTABLE_AGENT_CACHES:
+        if tool_is_active(process_names):
+            log_event(logger, "User cache eviction skipped while tool is active", cache=label)
+            continue
+        sources.append((label, os.path.join(context.home, *relative_path), (), process_names, False))
+
+    candidates: list[EvictionCandidate] = []
+    for label, path, clean_command, process_names, load_nvm in sources:
+        if not is_safe_managed_path(context, path, label):
+            continue
+        try:
+            if os.lstat(path).st_dev != home_device:
+                continue
+            usage = cache_usage(path)
+        except FileNotFoundError:
+            continue
+        except OSError as exc:
+            failures.append(f"{label} inventory: {exc}")
+            continue
+        if usage.size_bytes and usage.newest_mtime is not None:
+            candidates.append(
+                EvictionCandidate(
+                    label,
+                    path,
+                    usage.size_bytes,
+                    usage.newest_mtime,
+                    process_names,
+                    clean_command,
+                    load_nvm,
+                )
+            )
+    return candidates, failures
+
+
+def plan_cache_eviction(
+    candidates: list[EvictionCandidate],
+    bytes_needed: int,
+) -> list[EvictionCandidate]:
+    """Choose the fewest, least recently used caches that free ``bytes_needed``.
+
+    Caches are taken oldest day first and largest first within a day. Picks
+    made redundant by a later, larger pick are then dropped, most recently
+    used first, so warm caches survive whenever the target allows it. When
+    every candidate together is not enough, nothing is planned: wiping every
+    warm cache would not relieve the pressure and would only cost rebuilds.
+    """
+    if bytes_needed <= 0 or sum(item.size_bytes for item in candidates) < bytes_needed:
+        return []
+    chosen: list[EvictionCandidate] = []
+    freed = 0
+    for candidate in sorted(
+        candidates,
+        key=lambda item: (int(item.last_used // _SECONDS_PER_DAY), -item.size_bytes),
+    ):
+        if freed >= bytes_needed:
+            break
+        chosen.append(candidate)
+        freed += candidate.size_bytes
+    for candidate in sorted(chosen, key=lambda item: (-item.last_used, item.size_bytes)):
+        if freed - candidate.size_bytes >= bytes_needed:
+            chosen.remove(candidate)
+            freed -= candidate.size_bytes
+    return chosen
+
+
+def lower_io_priority() -> None:
+    """Drop this process to the lowest best-effort I/O priority.
+
+    Child processes inherit the priority, so tool clean commands started
+    afterwards are bounded too.
+    """
+    ionice = shutil.which("ionice")
+    if ionice is None:
+        log_event(logger, "ionice not available; evicting at normal I/O priority")
+        return
+    try:
+        result = subprocess.run(
+            [ionice, *_EVICTION_IONICE_ARGS, "-p", str(os.getpid())],
+            capture_output=True,
+            text=True,
+            timeout=CLEANUP_COMMAND_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.SubprocessError) as exc:
+        details = str(exc)
+    else:
+        if result.returncode == 0:
+            return
+        details = result.stderr.strip() or f"exit {result.returncode}"
+    log_event(logger, "Could not lower eviction I/O priority", level=WARNING, error=details)
+
+
+def evict_cache(context: UserContext, candidate: EvictionCandidate) -> str | None:
+    """Evict one planned cache and return a concise failure summary."""
+    if candidate.clean_command:
+        return run_cleanup_command(
+            context,
+            list(candidate.clean_command),
+            f"{candidate.label} pressure eviction",
+            dry_run=False,
+            load_nvm=candidate.load_nvm,
+        )
+    try:
+        if not os.path.isdir(candidate.path):
+            raise OSError("managed cache path is not a directory")
+        shutil.rmtree(candidate.path)
+    except OSError as exc:
+        details = str(exc)
+        log_event(
+            logger,
+            "Failed to evict user cache",
+            level=WARNING,
+            cache=candidate.label,
+            path=candidate.path,
+            error=details,
+        )
+        return f"{candidate.label} pressure eviction: {details}"
+    log_event(logger, "Evicted user cache", cache=candidate.label, path=candidate.path)
+    return None
+
+
+def relieve_storage_pressure(context: UserContext, *, dry_run: bool) -> list[str]:
+    """Evict least recently used caches until the home filesystem meets its target."""
+    try:
+        bytes_needed = eviction_bytes_needed(context.home)
+    except OSError as exc:
+        log_event(logger, "Could not read home filesystem usage", level=WARNING, error=str(exc))
+        return [f"Home filesystem usage: {exc}"]
+    if bytes_needed <= 0:
+        return []
+
+    candidates, failures = collect_eviction_candidates(context)
+    plan = plan_cache_eviction(candidates, bytes_needed)
+    if not plan:
+        log_event(
+            logger,
+            "User cache eviction skipped; caches cannot reach the usage target",
+            level=WARNING,
+            needed_mb=round(bytes_needed / BYTES_PER_MB, 1),
+            available_mb=round(sum(item.size_bytes for item in candidates) / BYTES_PER_MB, 1),
+        )
+        return failures
+    planned_bytes = sum(candidate.size_bytes for candidate in plan)
+    log_event(
+        logger,
+        "User cache eviction plan",
+        needed_mb=round(bytes_needed / BYTES_PER_MB, 1),
+        planned_mb=round(planned_bytes / BYTES_PER_MB, 1),
+        caches=", ".join(candidate.label for candidate in plan) or None,
+        kept=", ".join(candidate.label for candidate in candidates if candidate not in plan) or None,
+    )
+    if dry_run:
+        return failures
+
+    lower_io_priority()
+    for candidate in plan:
+        # A tool may have started since the inventory; never evict under it.
+        if tool_is_active(candidate.process_names):
+            log_event(
+                logger,
+                "User cache eviction deferred while tool is active",
+                cache=candidate.label,
+                path=candidate.path,
+            )
+            continue
+        failure = evict_cache(context, candidate)
+        if failure:
+            failures.append(failure)
+    return failures
+
+
 def run_user_cache_maintenance(context: UserContext, *, dry_run: bool) -> list[str]:
-    """Run each independent user cache policy and collect failures."""
-    failures = cleanup_npm_cache(context, dry_run=dry_run)
-    failures.extend(cleanup_pip_cache(context, dry_run=dry_run))
-    failures.extend(cleanup_uv_cache(context, dry_run=dry_run))
-    failures.extend(
-        cleanup_go_cache(
+    """Run each independent user cache policy and collect failures.
+
+    Policies own disjoint cache roots, so they run concurrently; failures are
+    reported in policy order. The storage-pressure eviction pass runs last.
+    """
+    summaries = DirectorySummaryCache(usage_summary_path(context))
+    policies: tuple[Callable[[], list[str]], ...] = (
+        partial(cleanup_npm_cache, context, dry_run=dry_run, summaries=summaries),
+        partial(cleanup_pip_cache, context, dry_run=dry_run, summaries=summaries),
+        partial(cleanup_uv_cache, context, dry_run=dry_run, summaries=summaries),
+        partial(
+            cleanup_go_cache,
             context,
             cache_name="Go build cache",
             go_env_name="GOCACHE",
             max_bytes=GO_BUILD_CACHE_MAX_BYTES,
             clean_args=["-cache", "-testcache", "-fuzzcache"],
             dry_run=dry_run,
-        )
-    )
-    failures.extend(
-        cleanup_go_cache(
+            summaries=summaries,
+        ),
+        partial(
+            cleanup_go_cache,
             context,
             cache_name="Go module cache",
             go_env_name="GOMODCACHE",
             max_bytes=GO_MODULE_CACHE_MAX_BYTES,
             clean_args=["-modcache"],
             dry_run=dry_run,
-        )
+            summaries=summaries,
+        ),
+        partial(cleanup_agent_caches, context, dry_run=dry_run),
     )
-    failures.extend(cleanup_agent_caches(context, dry_run=dry_run))
-    return failures
+    with ThreadPoolExecutor(max_workers=_INVENTORY_WORKERS) as pool:
+        results = list(pool.map(lambda policy: policy(), policies))
+    results.append(relieve_storage_pressure(context, dry_run=dry_run))
+    if not dry_run:
+        summaries.save()
+    return [failure for failures in results for failure in failures]
 
 
 def main(argv: list[str] | None = None) -> int:
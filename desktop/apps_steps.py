@@ -6,6 +6,7 @@ import os
 import shlex
 import tempfile
 
+from lib.apt_sources import refresh_apt_metadata
 from lib.atomic_io import write_text_atomic
 from lib.config import SetupConfig
 from lib.machine_state import is_container
@@ -167,7 +168,7 @@ def _install_vscode() -> None:
             raise RuntimeError("could not install the Microsoft repository key")
 
     write_text_atomic(VSCODE_SOURCES, VSCODE_SOURCE_CONTENT, mode=0o644)
-    update = run("apt-get update -qq", check=False)
+    update = refresh_apt_metadata(run)
     if update.returncode != 0:
         raise RuntimeError("could not refresh the Visual Studio Code repository")
 
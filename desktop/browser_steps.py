@@ -9,6 +9,7 @@ import subprocess
 import tempfile
 from typing import Optional
 
+from lib.apt_sources import refresh_apt_metadata
 from lib.config import SetupConfig
 from lib.machine_state import is_container
 from lib.remote_utils import (
@@ -175,7 +176,7 @@ def _refresh_existing_extrepo_sources() -> bool:
 
 def _update_apt_metadata() -> subprocess.CompletedProcess[str]:
     """Refresh APT metadata with bounded network and lock waits."""
-    return run(_APT_UPDATE_COMMAND, check=False)
+    return refresh_apt_metadata(run, _APT_UPDATE_COMMAND)
 
 
 def _ensure_extrepo_and_update() -> None:
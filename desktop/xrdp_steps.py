@@ -6,6 +6,7 @@ import glob
 import os
 import shlex
 
+from lib.apt_sources import refresh_apt_metadata
 from lib.config import SetupConfig
 from lib.remote_utils import (
     get_os_id,
@@ -65,7 +66,7 @@ def _configure_xrdp_package_source() -> str:
     with open(_XRDP_SID_PREFERENCES, "w", encoding="utf-8") as preference_file:
         preference_file.write(_XRDP_SID_PREFERENCE)
 
-    update_result = run("apt-get update -qq", check=False)
+    update_result = refresh_apt_metadata(run)
     if update_result.returncode != 0:
         raise RuntimeError("could not refresh Debian Sid package metadata")
     return "-t sid"
@@ -323,6 +323,11 @@ def create_infra_tools_parser() -> Tuple[argparse.ArgumentParser, argparse.Argum
         metavar=("USERNAME", "PASSWORD"),
         help="Save or update a share user's workspace credential",
     )
+    shares_parser.add_argument(
+        "--fix-permissions",
+        action="store_true",
+        help="Walk every share tree again to repair group and mode changed outside Samba",
+    )
     shares_parser.add_argument("--dry-run", action="store_true")
     shares_parser.add_argument(
         "--workspace",
@@ -1040,6 +1045,7 @@ _PROVISIONING_CHANGE_ARGS = (
     "container_base",
     "vm_image",
     "vm_image_storage",
+    "vm_template",
 )
 
 _CACHED_PROVISIONING_FIELDS = (
@@ -1058,6 +1064,7 @@ _CACHED_PROVISIONING_FIELDS = (
     "container_base",
     "vm_image",
     "vm_image_storage",
+    "vm_template",
 )
 
 
@@ -1600,6 +1607,7 @@ def run_shares_command(args: argparse.Namespace) -> int:
             samba_shares=cached_config.samba_shares,
             share_credentials=cached_config.share_credentials,
             scrub_specs=cached_config.scrub_specs,
+            force_steps=["reconcile_samba_shares"] if args.fix_permissions else None,
         )
         runtime_config = prepare_runtime_config(share_config)
         validate_samba_share_specs(
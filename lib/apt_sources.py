@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
+import json
 import os
 import re
 import shlex
 import shutil
+import subprocess
 import tempfile
+import threading
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
 from urllib.parse import urlparse
 
-from lib.remote_utils import read_os_release
+from lib.atomic_io import write_json_atomic
+from lib.remote_utils import apt_usage, is_dry_run, read_os_release
 from lib.validation import validate_debian_codename, validate_filesystem_path
 
 
@@ -23,6 +28,11 @@ MANAGED_SOURCE_FILENAME = "infra_tools-debian.sources"
 MANAGED_SOURCE_MARKER = "# Managed by infra_tools"
 _DEFAULT_DEBIAN_ARCHIVE_KEYRING = DEBIAN_ARCHIVE_KEYRING
 _DEBIAN_COMPONENT_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9+.-]*$")
+APT_LISTS_DIR = "/var/lib/apt/lists"
+APT_UPDATE_SUCCESS_STAMP = "/var/lib/apt/periodic/update-success-stamp"
+DEFAULT_APT_METADATA_MAX_AGE_MINUTES = 360
+APT_METADATA_STATE_SCHEMA_VERSION = 1
+_parsed_source_cache: dict[str, tuple[tuple[int, int, int], tuple[AptSourceEntry, ...]]] = {}
 
 
 @dataclass(frozen=True)
@@ -184,27 +194,184 @@ def _parse_deb822_stanza(stanza: list[str], path: str) -> list[AptSourceEntry]:
     return entries
 
 
+def _file_identity(path: str) -> Optional[tuple[int, int, int]]:
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino
+
+
+def _parse_source_file(path: str) -> tuple[AptSourceEntry, ...]:
+    """Parse one source file, reusing the result while the file is unchanged."""
+
+    identity = _file_identity(path)
+    if identity is None:
+        return ()
+    cached = _parsed_source_cache.get(path)
+    if cached is not None and cached[0] == identity:
+        return cached[1]
+    try:
+        with open(path, encoding="utf-8") as file_obj:
+            content = file_obj.read()
+    except OSError:
+        return ()
+
+    entries: list[AptSourceEntry] = []
+    if path.endswith(".sources"):
+        for stanza in _deb822_stanzas(content):
+            entries.extend(_parse_deb822_stanza(stanza, path))
+    else:
+        for line in content.splitlines():
+            entry = _parse_one_line_source(line, path)
+            if entry is not None:
+                entries.append(entry)
+    parsed = tuple(entries)
+    _parsed_source_cache[path] = (identity, parsed)
+    return parsed
+
+
 def parse_apt_sources(apt_dir: str = "/etc/apt") -> tuple[AptSourceEntry, ...]:
     """Parse active binary sources from classic and deb822 APT files."""
 
     validate_filesystem_path(apt_dir, must_exist=True)
     entries: list[AptSourceEntry] = []
     for path in _source_files(apt_dir):
+        entries.extend(_parse_source_file(path))
+    return tuple(entries)
+
+
+def apt_sources_signature(apt_dir: str = "/etc/apt") -> list[list[object]]:
+    """Describe the source files APT reads by path, mtime and size."""
+
+    signature: list[list[object]] = []
+    for path in _source_files(apt_dir):
+        identity = _file_identity(path)
+        if identity is not None:
+            signature.append([path, identity[0], identity[1]])
+    return signature
+
+
+def _newest_mtime(paths: tuple[str, ...]) -> float:
+    newest = 0.0
+    for path in paths:
         try:
-            with open(path, encoding="utf-8") as file_obj:
-                content = file_obj.read()
+            newest = max(newest, os.stat(path).st_mtime)
         except OSError:
             continue
+    return newest
 
-        if path.endswith(".sources"):
-            for stanza in _deb822_stanzas(content):
-                entries.extend(_parse_deb822_stanza(stanza, path))
-        else:
-            for line in content.splitlines():
-                entry = _parse_one_line_source(line, path)
-                if entry is not None:
-                    entries.append(entry)
-    return tuple(entries)
+
+class AptMetadataTracker:
+    """Decide whether ``apt-get update`` is needed; safe to share between threads.
+
+    Package lists count as fresh when the source files are unchanged since
+    the last recorded refresh and that refresh, or the newest APT list
+    timestamp, is younger than ``max_age_seconds``. Changed sources always
+    force a refresh. The state file is a cache: losing it only costs one
+    refresh.
+    """
+
+    def __init__(
+        self,
+        state_file: str,
+        max_age_seconds: float,
+        *,
+        apt_dir: str = "/etc/apt",
+        lists_dir: str = APT_LISTS_DIR,
+        update_stamp: str = APT_UPDATE_SUCCESS_STAMP,
+        force: bool = False,
+    ):
+        validate_filesystem_path(state_file, must_exist=False)
+        self.state_file = os.path.abspath(state_file)
+        self.max_age_seconds = max_age_seconds
+        self.apt_dir = apt_dir
+        self.lists_dir = lists_dir
+        self.update_stamp = update_stamp
+        self.force = force
+        self.lock = threading.Lock()
+        self._state = self._load()
+
+    def _load(self) -> dict[str, object]:
+        if os.path.islink(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, encoding="utf-8") as file_obj:
+                payload = json.load(file_obj)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(payload, dict) or payload.get("schema_version") != APT_METADATA_STATE_SCHEMA_VERSION:
+            return {}
+        return payload
+
+    def refresh_reason(self, now: Optional[float] = None) -> Optional[str]:
+        """Return why package lists need a refresh, or None when they are fresh."""
+
+        if self.force:
+            return "requested"
+        signature = apt_sources_signature(self.apt_dir)
+        recorded = self._state.get("sources")
+        if recorded is not None and recorded != signature:
+            return "sources changed"
+        refreshed_at = _newest_mtime((self.lists_dir, self.update_stamp))
+        recorded_at = self._state.get("refreshed_at")
+        if recorded is not None and isinstance(recorded_at, (int, float)):
+            refreshed_at = max(refreshed_at, float(recorded_at))
+        if not refreshed_at:
+            return "stale"
+        if _newest_mtime(tuple(str(entry[0]) for entry in signature)) > refreshed_at:
+            return "sources changed"
+        current = time.time() if now is None else now
+        if current - refreshed_at >= self.max_age_seconds:
+            return "stale"
+        return None
+
+    def record_refresh(self, now: Optional[float] = None) -> None:
+        self._state = {
+            "schema_version": APT_METADATA_STATE_SCHEMA_VERSION,
+            "sources": apt_sources_signature(self.apt_dir),
+            "refreshed_at": time.time() if now is None else now,
+        }
+        write_json_atomic(self.state_file, self._state, mode=0o600, sort_keys=True)
+
+
+_metadata_tracker: Optional[AptMetadataTracker] = None
+
+
+def configure_apt_metadata_tracking(tracker: Optional[AptMetadataTracker]) -> None:
+    """Enable skipping fresh APT metadata refreshes for this process."""
+
+    global _metadata_tracker
+    _metadata_tracker = tracker
+
+
+def refresh_apt_metadata(
+    run_command: Callable[..., subprocess.CompletedProcess[str]],
+    command: str = "apt-get update -qq",
+) -> subprocess.CompletedProcess[str]:
+    """Run ``command`` unless the configured tracker finds the package lists fresh.
+
+    Callers pass their module's ``run`` so the command goes through the same
+    wrapper as the rest of the step. Without a tracker every call refreshes.
+    """
+
+    tracker = _metadata_tracker
+    if tracker is None or is_dry_run():
+        return run_command(command, check=False)
+    with tracker.lock:
+        reason = tracker.refresh_reason()
+        if reason is None:
+            apt_usage().record_metadata_refresh("skipped (fresh)")
+            print("  ✓ APT package lists are fresh and sources are unchanged; skipping update")
+            return subprocess.CompletedProcess(command, 0, "", "")
+        result = run_command(command, check=False)
+        if result.returncode == 0:
+            apt_usage().record_metadata_refresh(f"refreshed ({reason})")
+            try:
+                tracker.record_refresh()
+            except OSError as exc:
+                print(f"  ⚠ Could not record APT metadata refresh: {exc}")
+        return result
 
 
 def _is_cdrom_uri(uri: str) -> bool:
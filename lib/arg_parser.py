@@ -5,6 +5,7 @@ from __future__ import annotations
 import argparse
 
 
+from lib.apt_sources import DEFAULT_APT_METADATA_MAX_AGE_MINUTES
 from lib.config import (
     AGENT_TOOLS,
     BROWSER_AUTOMATION_PROVIDERS,
@@ -16,6 +17,7 @@ from lib.config import (
     MACHINE_TYPES,
     WEB_INTERFACES,
 )
+from lib.step_scheduler import DEFAULT_STEP_WORKERS
 
 
 class CommaSeparatedChoicesAction(argparse.Action):
@@ -366,6 +368,16 @@ def add_setup_arguments(
                 "type and falls back to 'iso' (default: auto-detect)"
             ),
         )
+        parser.add_argument(
+            "--no-vm-template",
+            dest="vm_template",
+            action="store_false",
+            default=argparse.SUPPRESS,
+            help=(
+                "Import the catalog image into every new VM instead of cloning "
+                "it from the node's template for that image and root storage"
+            ),
+        )
     else:
         parser.add_argument("--name", dest="friendly_name", default=None,
                            help="Friendly name for this configuration")
@@ -500,6 +512,40 @@ def add_setup_arguments(
             "unchanged setup work is reused on reruns"
         ),
     )
+    parser.add_argument(
+        "--step-workers",
+        dest="step_workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "Run up to N setup steps at once when their declared resources do "
+            f"not conflict; 1 runs steps strictly in order (default: {DEFAULT_STEP_WORKERS})"
+        ),
+    )
+    parser.add_argument(
+        "--force-step",
+        dest="force_steps",
+        action="append",
+        default=None,
+        metavar="STEP",
+        help=(
+            "Run STEP even when its inputs match its last successful run; "
+            "repeatable, 'all' forces every step"
+        ),
+    )
+    parser.add_argument(
+        "--apt-metadata-max-age",
+        dest="apt_metadata_max_age",
+        type=int,
+        default=None,
+        metavar="MINUTES",
+        help=(
+            "Skip apt-get update when package lists were refreshed within MINUTES "
+            "and APT sources are unchanged; changed sources always refresh "
+            f"(default: {DEFAULT_APT_METADATA_MAX_AGE_MINUTES})"
+        ),
+    )
     
     # Development tools
     parser.add_argument("--go", dest="install_go", 
@@ -956,6 +1002,10 @@ def add_setup_arguments(
                         type=int,
                         default=None,
                         help="Minutes of warning before an automatic restart starts.")
+    parser.add_argument("--security-monitor-daemon", dest="security_monitor_daemon",
+                        action="store_true",
+                        help="Run the security monitor as a continuous service instead of "
+                             "its 15-minute timer.")
     
     parser.add_argument("--dry-run", action="store_true",
                        help="Show what would be done without executing commands")
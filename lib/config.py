@@ -7,7 +7,9 @@ import ipaddress
 import shlex
 from dataclasses import dataclass, asdict
 from typing import Optional, cast
+from lib.apt_sources import DEFAULT_APT_METADATA_MAX_AGE_MINUTES
 from lib.plugin_registry import get_system_type_definition, get_system_type_names
+from lib.step_scheduler import DEFAULT_STEP_WORKERS
 from lib.types import StrList, NestedStrList, JSONDict, MaybeStr
 
 
@@ -250,6 +252,9 @@ class SetupConfig:
     dark_theme: bool = False
     dry_run: bool = False
     refresh_packages: bool = False
+    step_workers: int = DEFAULT_STEP_WORKERS
+    force_steps: Optional[StrList] = None
+    apt_metadata_max_age: int = DEFAULT_APT_METADATA_MAX_AGE_MINUTES
     install_go: bool = False
     install_node: bool = False
     install_python: bool = False
@@ -326,6 +331,7 @@ class SetupConfig:
     auto_restart: bool = True
     auto_restart_force_days: int = 7
     auto_restart_grace: int = 5
+    security_monitor_daemon: bool = False
     proxmox_balloon_target: Optional[int] = None
     # Proxmox guest provisioning
     hosted_node: MaybeStr = None
@@ -343,6 +349,7 @@ class SetupConfig:
     vm_image: MaybeStr = None  # HTTPS URL or 'storage:import/file.qcow2'
     vm_image_sha512: MaybeStr = None  # Required for custom HTTPS VM images
     vm_image_storage: MaybeStr = None  # Storage for downloaded VM image sources
+    vm_template: bool = True  # Clone catalog images from a per-node template
     include_desktop: bool = False
     include_cli_tools: bool = False
     include_control_plane_tools: bool = False
@@ -699,6 +706,15 @@ class SetupConfig:
 
         if self.refresh_packages:
             args.append("--refresh-packages")
+
+        if self.step_workers != DEFAULT_STEP_WORKERS:
+            args.append(f"--step-workers {self.step_workers}")
+
+        for step in self.force_steps or []:
+            args.append(f"--force-step {shlex.quote(step)}")
+
+        if self.apt_metadata_max_age != DEFAULT_APT_METADATA_MAX_AGE_MINUTES:
+            args.append(f"--apt-metadata-max-age {self.apt_metadata_max_age}")
         
         if self.dry_run:
             args.append("--dry-run")
@@ -867,6 +883,8 @@ class SetupConfig:
             args.append("--no-auto-restart")
         args.append(f"--auto-restart-force-days {self.auto_restart_force_days}")
         args.append(f"--auto-restart-grace {self.auto_restart_grace}")
+        if self.security_monitor_daemon:
+            args.append("--security-monitor-daemon")
         if self.proxmox_balloon_target is not None:
             args.append(f"--proxmox-balloon-target {self.proxmox_balloon_target}")
                 
@@ -942,6 +960,8 @@ class SetupConfig:
                 cmd_parts.append(
                     f"--image-storage {shlex.quote(self.vm_image_storage)}"
                 )
+            if not self.vm_template:
+                cmd_parts.append("--no-vm-template")
 
         if self.proxmox_balloon_target is not None:
             cmd_parts.append(
@@ -1337,6 +1357,8 @@ class SetupConfig:
             cmd_parts.append(f"--auto-restart-force-days {self.auto_restart_force_days}")
         if self.auto_restart_grace != 5:
             cmd_parts.append(f"--auto-restart-grace {self.auto_restart_grace}")
+        if self.security_monitor_daemon:
+            cmd_parts.append("--security-monitor-daemon")
         
         return cmd_parts
 
@@ -1349,6 +1371,9 @@ class SetupConfig:
         data.pop('deploy_latest', None)
         for transient_field in (
             'refresh_packages',
+            'step_workers',
+            'force_steps',
+            'apt_metadata_max_age',
             'copy_agent_keys',
             'copy_agent_config',
             'git_auth_source',
@@ -1755,6 +1780,11 @@ class SetupConfig:
             dark_theme=getattr(args, 'dark_theme', False),
             dry_run=getattr(args, 'dry_run', False),
             refresh_packages=getattr(args, 'refresh_packages', False),
+            step_workers=getattr(args, 'step_workers', None) or DEFAULT_STEP_WORKERS,
+            force_steps=getattr(args, 'force_steps', None),
+            apt_metadata_max_age=(
+                getattr(args, 'apt_metadata_max_age', None) or DEFAULT_APT_METADATA_MAX_AGE_MINUTES
+            ),
             install_go=getattr(args, 'install_go', False),
             install_node=getattr(args, 'install_node', False),
             install_python=getattr(args, 'install_python', False),
@@ -1847,6 +1877,7 @@ class SetupConfig:
             auto_restart=auto_restart,
             auto_restart_force_days=auto_restart_force_days,
             auto_restart_grace=auto_restart_grace,
+            security_monitor_daemon=bool(getattr(args, 'security_monitor_daemon', False)),
             proxmox_balloon_target=getattr(args, 'proxmox_balloon_target', None),
             hosted_node=getattr(args, 'hosted_node', None),
             hosted_user=getattr(args, 'hosted_user', 'root'),
@@ -1863,6 +1894,7 @@ class SetupConfig:
             vm_image=getattr(args, 'vm_image', None),
             vm_image_sha512=getattr(args, 'vm_image_sha512', None),
             vm_image_storage=getattr(args, 'vm_image_storage', None),
+            vm_template=getattr(args, 'vm_template', True),
             include_desktop=include_desktop,
             include_cli_tools=include_cli_tools,
             include_control_plane_tools=include_control_plane_tools,
@@ -8,14 +8,16 @@ import os
 import shlex
 import shutil
 import re
-import socket
 import sqlite3
 import sys
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
 from datetime import datetime
 from typing import Any, Iterable, Optional
 
+from lib.atomic_io import write_json_atomic
 from lib.remote_utils import run
 from lib.operation_state import OperationRecord, OperationStateStore
 from lib.update_policy import npm_freshness_args
@@ -26,10 +28,30 @@ from lib.deploy_utils import (
     save_deployment_metadata,
     should_redeploy
 )
-from lib.systemd_service import cleanup_service, create_managed_service
+from lib.systemd_service import cleanup_service, cleanup_systemd_unit, create_managed_service
+from lib.port_registry import PortConflictError, PortRegistry
 from lib.project_manifest import Component, Manifest, has_placeholder, load_manifest, render_template
+from lib.release_staging import (
+    link_tree,
+    ownership_fix_command,
+    stage_release_tree,
+    unshare_files,
+)
 from lib.validation import validate_filesystem_path
 
+# Directories that never contribute to a component's build fingerprint.
+_FINGERPRINT_IGNORED_DIRS = frozenset({".git", ".infra_tools", ".venv", "node_modules"})
+_FINGERPRINT_FILENAME = ".infra_tools_fingerprints.json"
+_MAX_PARALLEL_BUILDS = 4
+_READINESS_HISTORY_LIMIT = 50
+
+
+def _remove_path(path: str) -> None:
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
 
 class DeploymentOrchestrator:
     
@@ -51,58 +73,6 @@ class DeploymentOrchestrator:
         output = stderr.strip() or stdout.strip() or fallback
         return output[:500]
 
-    def _get_used_ports(self, exclude_services: Optional[set[str]] = None) -> set[int]:
-        """Get set of ports currently used by infra_tools services."""
-        used_ports: set[int] = set()
-        excluded = exclude_services or set()
-        try:
-            if not os.path.exists("/etc/systemd/system"):
-                return used_ports
-                
-            files = os.listdir("/etc/systemd/system")
-            for f in files:
-                service_name = f.removesuffix(".service")
-                if (
-                    service_name not in excluded
-                    and (f.startswith("node-") or f.startswith("app-"))
-                    and f.endswith(".service")
-                ):
-                    path = os.path.join("/etc/systemd/system", f)
-                    try:
-                        with open(path, 'r') as service_file:
-                            content = service_file.read()
-                            match = re.search(r'-p (\d+)', content)
-                            if match:
-                                used_ports.add(int(match.group(1)))
-                            match = re.search(r'--port (\d+)', content)
-                            if match:
-                                used_ports.add(int(match.group(1)))
-                            for match in re.finditer(r'(?:PORT=|LISTEN_ADDR=[^\n]*:|GOCLICK_ADDR=[^\n]*:)(\d+)', content):
-                                used_ports.add(int(match.group(1)))
-                    except OSError:
-                        pass
-        except OSError:
-            pass
-        return used_ports
-
-    def _find_free_port(self, start_port: int, reserved: Optional[set[int]] = None) -> int:
-        """Find the first free port starting from start_port."""
-        used_ports = self._get_used_ports()
-        used_ports.update(reserved or set())
-        port = start_port
-        while port < 65535:
-            if port in used_ports:
-                port += 1
-                continue
-            
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                try:
-                    s.bind(('127.0.0.1', port))
-                    return port
-                except OSError:
-                    port += 1
-        raise RuntimeError("No free ports available")
-
     def _capped_identity(self, prefix: str, raw_name: str) -> str:
         base = f"{prefix}-{self._sanitize_user_part(raw_name)}"
         if len(base) <= 31:
@@ -160,9 +130,16 @@ class DeploymentOrchestrator:
         )
         backup_path: Optional[str] = None
         try:
-            shutil.copytree(source_path, staging_path, dirs_exist_ok=True)
-            project_type = detect_project_type(staging_path)
+            # Only static trees share inodes with the active release: Node
+            # builds run as root and could write through a shared file.
+            project_type = detect_project_type(source_path)
+            stats = stage_release_tree(
+                source_path,
+                staging_path,
+                dest_path if project_type == "static" else None,
+            )
             print(f"Deploying {project_type} project to {dest_path}...")
+            print(f"  ✓ Staged release: {stats.summary()}")
 
             site_root = path or "/"
             if not site_root.startswith("/"):
@@ -172,20 +149,14 @@ class DeploymentOrchestrator:
             self.build_project(staging_path, project_type, site_root=site_root)
 
             result = run(
-                f"chown -R {shlex.quote(self.deploy_user)}:{shlex.quote(self.deploy_group)} "
-                f"{shlex.quote(staging_path)}",
+                ownership_fix_command(staging_path, self.deploy_user, self.deploy_group),
                 check=False,
             )
             if result.returncode != 0:
                 raise RuntimeError(
-                    f"Could not set release ownership to {self.deploy_user}:{self.deploy_group}"
+                    f"Could not set release ownership and permissions to "
+                    f"{self.deploy_user}:{self.deploy_group} for {dest_path}"
                 )
-            result = run(
-                f"chmod -R u=rwX,go=rX {shlex.quote(staging_path)}",
-                check=False,
-            )
-            if result.returncode != 0:
-                raise RuntimeError(f"Could not set release permissions for {dest_path}")
 
             if os.path.exists(dest_path):
                 backup_path = tempfile.mkdtemp(
@@ -294,13 +265,17 @@ class DeploymentOrchestrator:
     def _build_home(username: str) -> str:
         return os.path.join("/var/lib/infra_tools/build-users", username)
 
-    def _port_state_path(self, dest_path: str) -> str:
+    def _port_registry(self) -> PortRegistry:
+        return PortRegistry(os.path.join(self.base_dir, ".infra_tools_shared", "port-registry.json"))
+
+    def _legacy_port_state_path(self, dest_path: str) -> str:
         app_name = os.path.basename(dest_path.rstrip("/"))
         return os.path.join(self._get_persistent_root(app_name), "manifest-ports.json")
 
-    def _load_manifest_ports(self, dest_path: str) -> dict[str, int]:
+    def _load_legacy_manifest_ports(self, dest_path: str) -> dict[str, int]:
+        """Read per-app assignments written before the host port registry existed."""
         try:
-            with open(self._port_state_path(dest_path), "r", encoding="utf-8") as handle:
+            with open(self._legacy_port_state_path(dest_path), "r", encoding="utf-8") as handle:
                 payload = json.load(handle)
         except (OSError, json.JSONDecodeError):
             return {}
@@ -312,51 +287,40 @@ class DeploymentOrchestrator:
             if isinstance(key, str) and isinstance(value, int) and 1024 <= value <= 65535
         }
 
-    def _save_manifest_ports(self, dest_path: str, manifest: Manifest) -> None:
-        assignments = {
-            component.name: component.port
-            for component in manifest.components
-            if component.is_service and component.port is not None
-        }
-        state_path = self._port_state_path(dest_path)
-        self._ensure_dir(os.path.dirname(state_path))
-        temporary_path = f"{state_path}.tmp"
-        with open(temporary_path, "w", encoding="utf-8") as handle:
-            json.dump(assignments, handle, sort_keys=True)
-            handle.write("\n")
-        os.chmod(temporary_path, 0o600)
-        os.replace(temporary_path, state_path)
-
     def _resolve_manifest_ports(self, manifest: Manifest, dest_path: str) -> Manifest:
-        stored = self._load_manifest_ports(dest_path)
-        own_services = {
-            self._service_identity(dest_path, component)[0]
-            for component in manifest.components
-            if component.is_service
-        }
-        unavailable = self._get_used_ports(exclude_services=own_services)
-        reserved: set[int] = set()
-        resolved: list[Component] = []
+        """Reserve each service's port in the host registry.
+
+        Automatic ports are sticky per systemd unit, so redeploys keep their
+        upstreams and the generated Nginx config does not change.
+        """
+        legacy = self._load_legacy_manifest_ports(dest_path)
+        owners: dict[str, Component] = {}
+        requests: dict[str, Optional[int]] = {}
+        preferred: dict[str, int] = {}
         for component in manifest.components:
             if not component.is_service:
-                resolved.append(component)
                 continue
-            port = component.port
-            if port is None:
-                candidate = stored.get(component.name)
-                if candidate is not None and candidate not in unavailable and candidate not in reserved:
-                    port = candidate
-                else:
-                    port = self._find_free_port(8000, unavailable | reserved)
-            elif port in unavailable or port in reserved:
-                raise RuntimeError(
-                    f"Component '{component.name}' cannot use port {port}; it is already assigned"
-                )
-            reserved.add(port)
-            resolved.append(replace(component, port=port))
-        return Manifest(version=manifest.version, components=resolved)
+            unit_name = self._service_identity(dest_path, component)[0]
+            owners[unit_name] = component
+            requests[unit_name] = component.port
+            if component.name in legacy:
+                preferred[unit_name] = legacy[component.name]
+        try:
+            assigned = self._port_registry().reserve(requests, preferred=preferred)
+        except PortConflictError as exc:
+            raise RuntimeError(
+                f"Component '{owners[exc.owner].name}' cannot use port {exc.port}; "
+                "it is already assigned"
+            ) from exc
+        resolved: list[Component] = []
+        for component in manifest.components:
+            if component.is_service:
+                unit_name = self._service_identity(dest_path, component)[0]
+                component = replace(component, port=assigned[unit_name])
+            resolved.append(component)
+        return replace(manifest, components=resolved)
 
-    def _app_unit_snapshots(self, dest_path: str) -> dict[str, str]:
+    def _app_unit_snapshots(self, dest_path: str, suffix: str = ".service") -> dict[str, str]:
         app_fragment = self._sanitize_user_part(os.path.basename(dest_path.rstrip("/")))
         prefix = f"app-{app_fragment}-"
         snapshots: dict[str, str] = {}
@@ -364,23 +328,36 @@ class DeploymentOrchestrator:
         if not os.path.isdir(systemd_dir):
             return snapshots
         for filename in os.listdir(systemd_dir):
-            if not filename.startswith(prefix) or not filename.endswith(".service"):
+            if not filename.startswith(prefix) or not filename.endswith(suffix):
                 continue
             try:
                 with open(os.path.join(systemd_dir, filename), "r", encoding="utf-8") as handle:
-                    snapshots[filename.removesuffix(".service")] = handle.read()
+                    snapshots[filename.removesuffix(suffix)] = handle.read()
             except OSError:
                 continue
         return snapshots
 
-    def _restore_app_units(self, dest_path: str, snapshots: dict[str, str]) -> None:
+    def _restore_app_units(
+        self,
+        dest_path: str,
+        snapshots: dict[str, str],
+        socket_snapshots: Optional[dict[str, str]] = None,
+    ) -> None:
+        socket_snapshots = socket_snapshots or {}
         current = self._app_unit_snapshots(dest_path)
         for service_name in set(current) - set(snapshots):
             cleanup_service(service_name)
+        for socket_name in set(self._app_unit_snapshots(dest_path, ".socket")) - set(socket_snapshots):
+            cleanup_systemd_unit(socket_name, "socket")
         for service_name, content in snapshots.items():
             with open(f"/etc/systemd/system/{service_name}.service", "w", encoding="utf-8") as handle:
                 handle.write(content)
+        for socket_name, content in socket_snapshots.items():
+            with open(f"/etc/systemd/system/{socket_name}.socket", "w", encoding="utf-8") as handle:
+                handle.write(content)
         run("systemctl daemon-reload")
+        for socket_name in sorted(socket_snapshots):
+            run(f"systemctl enable --now {shlex.quote(socket_name)}.socket")
         for service_name in snapshots:
             run(f"systemctl enable {shlex.quote(service_name)}.service")
         self._restart_app_units(snapshots)
@@ -512,9 +489,9 @@ class DeploymentOrchestrator:
 
         Returns one nginx "dep" descriptor per component. Components declare
         their own domains, so a single repo can serve a static apex site and a
-        reverse-proxied API subdomain from one deploy. This always performs a
-        full build; incremental skip (mirroring should_redeploy) is a future
-        optimization, kept out for a small, auditable surface.
+        reverse-proxied API subdomain from one deploy. Components whose input
+        fingerprint matches the active release reuse its artifacts through
+        hardlinks instead of rebuilding.
         """
         dest_path = self.get_deployment_path(domain, path, git_url)
         parent_dir = os.path.dirname(dest_path)
@@ -534,6 +511,7 @@ class DeploymentOrchestrator:
         activated = False
         stopped_units: list[str] = []
         unit_snapshots: dict[str, str] = {}
+        socket_snapshots: dict[str, str] = {}
         desired_units: set[str] = set()
         operation_store = OperationStateStore(
             os.path.join(
@@ -542,6 +520,7 @@ class DeploymentOrchestrator:
             )
         )
         operation: Optional[OperationRecord] = None
+        reserved_ports: dict[str, Optional[int]] = {}
         try:
             operation = operation_store.begin(
                 "manifest_deploy",
@@ -549,12 +528,22 @@ class DeploymentOrchestrator:
                 "preparing",
                 context={"commit": commit_hash or "unknown"},
             )
+            ports_before = self._port_registry().assignments()
             manifest = self._resolve_manifest_ports(manifest, dest_path)
+            reserved_ports = {
+                unit_name: ports_before.get(unit_name)
+                for unit_name in (
+                    self._service_identity(dest_path, component)[0]
+                    for component in manifest.components
+                    if component.is_service
+                )
+            }
             self._validate_manifest_routes(manifest, domain)
             print(f"Deploying manifest ({len(manifest.components)} component(s)) to {dest_path}...")
             build_user = self._build_identity(dest_path)
             self._ensure_build_user(build_user)
             unit_snapshots = self._app_unit_snapshots(dest_path)
+            socket_snapshots = self._app_unit_snapshots(dest_path, ".socket")
             desired_units = {
                 self._service_identity(dest_path, component)[0]
                 for component in manifest.components
@@ -575,16 +564,15 @@ class DeploymentOrchestrator:
                     "staging_path": staging_path,
                 },
             )
-            if keep_source:
-                shutil.copytree(source_path, staging_path, dirs_exist_ok=True)
-                print(f"  ✓ Copied source to staging path {staging_path}")
-            else:
-                shutil.copytree(source_path, staging_path, dirs_exist_ok=True)
-                print(f"  ✓ Copied source to staging path {staging_path}")
+            stats = stage_release_tree(source_path, staging_path, dest_path)
+            print(f"  ✓ Staged source at {staging_path}: {stats.summary()}")
 
-            # Build as an application-specific non-root identity.
+            # Build as an application-specific non-root identity. Files shared
+            # with the active release stay deploy-owned and read-only to it.
             result = run(
-                f"chown -R {shlex.quote(build_user)}:{shlex.quote(build_user)} {shlex.quote(staging_path)}",
+                ownership_fix_command(
+                    staging_path, build_user, build_user, modes=False, unshared_only=True
+                ),
                 check=False,
             )
             if result.returncode != 0:
@@ -592,13 +580,38 @@ class DeploymentOrchestrator:
 
             self._prepare_build_toolchain(staging_path, build_user)
 
-            # Build every component before touching the active release.
+            fingerprints = self._component_fingerprints(manifest, staging_path, build_user)
+            rebuild = self._components_to_rebuild(manifest, fingerprints, dest_path)
             for component in manifest.components:
                 component_domain = self._component_domain(component, domain)
-                print(f"  Component '{component.name}' ({component.type}) → {component_domain}{component.path}")
-                self._run_component_build(component, staging_path, build_user)
+                state = "build" if component.name in rebuild else "unchanged"
+                print(
+                    f"  Component '{component.name}' ({component.type}) → "
+                    f"{component_domain}{component.path} [{state}]"
+                )
+
+            # Builds may rewrite tracked files in place, so files they can
+            # reach get private copies the build user may own.
+            self._unshare_build_inputs(
+                [component for component in manifest.components if component.name in rebuild],
+                staging_path,
+                build_user,
+            )
+
+            # Build every changed component before touching the active release.
+            self._build_components(
+                [component for component in manifest.components if component.name in rebuild],
+                staging_path,
+                build_user,
+            )
+            for component in manifest.components:
+                if component.name not in rebuild:
+                    self._reuse_component_artifacts(component, dest_path, staging_path)
 
             self._validate_manifest_artifacts(manifest, staging_path)
+            # Fingerprints travel with the release, so a rollback restores the
+            # ones describing the release that is live again.
+            self._save_component_fingerprints(staging_path, fingerprints)
 
             for component in manifest.components:
                 if component.is_service:
@@ -665,30 +678,29 @@ class DeploymentOrchestrator:
             # The release tree is deploy-owned and world-readable so nginx can
             # serve static files and each service user can read and exec its
             # binary. Service writable state lives outside the release.
+            # Only inodes whose owner or mode differs are touched, so files
+            # linked from the previous release are left as they are.
             result = run(
-                f"chown -R {shlex.quote(self.deploy_user)}:{shlex.quote(self.deploy_group)} {shlex.quote(dest_path)}",
+                ownership_fix_command(dest_path, self.deploy_user, self.deploy_group),
                 check=False,
             )
             if result.returncode != 0:
                 raise RuntimeError(
-                    f"Could not set release ownership to {self.deploy_user}:{self.deploy_group}"
+                    f"Could not set release ownership and permissions to "
+                    f"{self.deploy_user}:{self.deploy_group} for {dest_path}"
                 )
-            result = run(
-                f"chmod -R u=rwX,go=rX {shlex.quote(dest_path)}",
-                check=False,
-            )
-            if result.returncode != 0:
-                raise RuntimeError(f"Could not set release permissions for {dest_path}")
 
             # Start services after the release tree is readable so they can exec.
             for component in manifest.components:
                 if component.is_service:
                     self._install_service_component(component, dest_path, domain)
 
-            for stale_unit in sorted(set(unit_snapshots) - desired_units):
+            stale_units = sorted(set(unit_snapshots) - desired_units)
+            for stale_unit in stale_units:
                 cleanup_service(stale_unit)
+            if stale_units:
+                self._port_registry().release(stale_units)
 
-            self._save_manifest_ports(dest_path, manifest)
             save_deployment_metadata(dest_path, git_url, commit_hash)
             if not keep_source and os.path.exists(source_path):
                 shutil.rmtree(source_path)
@@ -701,6 +713,13 @@ class DeploymentOrchestrator:
             return deps
         except Exception as deployment_error:
             rollback_errors: list[str] = []
+            # The live (or restored) release keeps its ports; ports claimed
+            # only for this deploy go back to the registry.
+            if reserved_ports:
+                try:
+                    self._port_registry().restore(reserved_ports)
+                except OSError as exc:
+                    print(f"  ⚠ Could not release reserved ports: {exc}")
             if activated:
                 for unit_name in sorted(desired_units):
                     try:
@@ -719,7 +738,7 @@ class DeploymentOrchestrator:
                     backup_path = None
                 shutil.rmtree(failed_path, ignore_errors=True)
                 try:
-                    self._restore_app_units(dest_path, unit_snapshots)
+                    self._restore_app_units(dest_path, unit_snapshots, socket_snapshots)
                 except RuntimeError as exc:
                     rollback_errors.append(str(exc))
                 if not rollback_errors:
@@ -755,6 +774,253 @@ class DeploymentOrchestrator:
             fcntl.flock(lock_handle.fileno(), fcntl.LOCK_UN)
             lock_handle.close()
 
+    @staticmethod
+    def _fingerprint_state_path(release_path: str) -> str:
+        return os.path.join(release_path, _FINGERPRINT_FILENAME)
+
+    def _load_component_fingerprints(self, dest_path: str) -> dict[str, str]:
+        try:
+            with open(self._fingerprint_state_path(dest_path), "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(payload, dict):
+            return {}
+        return {
+            key: value
+            for key, value in payload.items()
+            if isinstance(key, str) and isinstance(value, str)
+        }
+
+    def _save_component_fingerprints(self, release_path: str, fingerprints: dict[str, str]) -> None:
+        state_path = self._fingerprint_state_path(release_path)
+        temporary_path = f"{state_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as handle:
+            json.dump(fingerprints, handle, sort_keys=True)
+            handle.write("\n")
+        os.replace(temporary_path, state_path)
+
+    def _toolchain_fingerprint(self, build_user: str) -> str:
+        """Identify the build toolchain from version files, without subprocesses."""
+        build_home = self._build_home(build_user)
+        digest = hashlib.sha256()
+        for version_file in (
+            os.path.join(build_home, ".nvm", "alias", "default"),
+            "/usr/local/go/VERSION",
+        ):
+            try:
+                with open(version_file, "rb") as handle:
+                    digest.update(version_file.encode() + b"\0" + handle.read() + b"\0")
+            except OSError:
+                continue
+        try:
+            node_versions = sorted(os.listdir(os.path.join(build_home, ".nvm", "versions", "node")))
+        except OSError:
+            node_versions = []
+        digest.update(("node:" + ",".join(node_versions) + "\0").encode())
+        try:
+            uv_stat = os.stat(os.path.join(build_home, ".local", "bin", "uv"))
+            digest.update(f"uv:{uv_stat.st_size}:{uv_stat.st_mtime_ns}".encode())
+        except OSError:
+            pass
+        return digest.hexdigest()
+
+    @staticmethod
+    def _hash_component_inputs(source_path: str, inputs: list[str]) -> str:
+        """Hash the content of a component's declared inputs (or the whole tree)."""
+        digest = hashlib.sha256()
+        roots = inputs or ["."]
+        for root in sorted(roots):
+            root_path = os.path.join(source_path, root)
+            if os.path.isfile(root_path) or os.path.islink(root_path):
+                candidates = [root_path]
+            else:
+                candidates = []
+                for current_dir, directories, filenames in os.walk(root_path):
+                    directories[:] = sorted(
+                        name for name in directories if name not in _FINGERPRINT_IGNORED_DIRS
+                    )
+                    candidates.extend(
+                        os.path.join(current_dir, name) for name in sorted(filenames)
+                    )
+            for file_path in candidates:
+                relative = os.path.relpath(file_path, source_path)
+                digest.update(relative.encode() + b"\0")
+                if os.path.islink(file_path):
+                    digest.update(b"link:" + os.readlink(file_path).encode() + b"\0")
+                    continue
+                mode = os.stat(file_path).st_mode
+                digest.update(f"{mode & 0o111:o}\0".encode())
+                with open(file_path, "rb") as handle:
+                    for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                        digest.update(chunk)
+                digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _component_fingerprints(
+        self,
+        manifest: Manifest,
+        source_path: str,
+        build_user: str,
+    ) -> dict[str, str]:
+        """Fingerprint each component's sources, build settings and toolchain.
+
+        A component's fingerprint includes those of its dependencies, so a
+        change to a dependency invalidates every dependent component too.
+        """
+        toolchain = self._toolchain_fingerprint(build_user)
+        by_name = {component.name: component for component in manifest.components}
+        input_hashes: dict[str, str] = {}
+        fingerprints: dict[str, str] = {}
+
+        def fingerprint(component: Component) -> str:
+            if component.name in fingerprints:
+                return fingerprints[component.name]
+            input_key = "\0".join(component.inputs)
+            if input_key not in input_hashes:
+                input_hashes[input_key] = self._hash_component_inputs(source_path, component.inputs)
+            payload = {
+                "build": component.build,
+                "env": component.env,
+                "output": component.output,
+                "binary": component.binary,
+                "inputs": input_hashes[input_key],
+                "toolchain": toolchain,
+                "dependencies": {
+                    name: fingerprint(by_name[name]) for name in component.depends_on
+                },
+            }
+            value = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+            fingerprints[component.name] = value
+            return value
+
+        for component in manifest.components:
+            fingerprint(component)
+        return fingerprints
+
+    @staticmethod
+    def _component_artifacts(component: Component) -> list[str]:
+        """Repository-relative build outputs that can be carried between releases."""
+        if component.is_static and component.output:
+            return [component.output]
+        if component.is_service and component.binary:
+            return [component.binary]
+        return []
+
+    def _components_to_rebuild(
+        self,
+        manifest: Manifest,
+        fingerprints: dict[str, str],
+        dest_path: str,
+    ) -> set[str]:
+        """Return the names of components whose active artifacts cannot be reused."""
+        previous = self._load_component_fingerprints(dest_path)
+        rebuild: set[str] = set()
+        for component in manifest.components:
+            artifacts = self._component_artifacts(component)
+            reusable = (
+                bool(component.build)
+                and bool(artifacts)
+                and previous.get(component.name) == fingerprints[component.name]
+                and all(os.path.lexists(os.path.join(dest_path, artifact)) for artifact in artifacts)
+            )
+            if not reusable:
+                rebuild.add(component.name)
+
+        # A rebuilt component needs its dependencies' outputs in the staging
+        # tree while it builds, so those dependencies are rebuilt as well.
+        by_name = {component.name: component for component in manifest.components}
+        pending = list(rebuild)
+        while pending:
+            for dependency in by_name[pending.pop()].depends_on:
+                if dependency not in rebuild:
+                    rebuild.add(dependency)
+                    pending.append(dependency)
+        return rebuild
+
+    def _reuse_component_artifacts(
+        self,
+        component: Component,
+        dest_path: str,
+        staging_path: str,
+    ) -> None:
+        """Hardlink an unchanged component's outputs from the active release."""
+        for artifact in self._component_artifacts(component):
+            target = os.path.join(staging_path, artifact)
+            _remove_path(target)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            link_tree(os.path.join(dest_path, artifact), target)
+
+    def _unshare_build_inputs(
+        self,
+        components: list[Component],
+        staging_path: str,
+        build_user: str,
+    ) -> None:
+        """Unshare the declared inputs of ``components`` (or the whole tree)."""
+        if not components:
+            return
+        if all(component.inputs for component in components):
+            paths: Optional[list[str]] = sorted(
+                {path for component in components for path in component.inputs}
+            )
+        else:
+            paths = None
+        if not unshare_files(staging_path, paths):
+            return
+        result = run(
+            ownership_fix_command(
+                staging_path, build_user, build_user, modes=False, unshared_only=True
+            ),
+            check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Could not assign staging tree to build user {build_user}")
+
+    def _build_components(
+        self,
+        components: list[Component],
+        staging_path: str,
+        build_user: str,
+    ) -> None:
+        """Build components in dependency order.
+
+        Components that declare ``inputs`` and do not depend on each other
+        build concurrently; components without declared inputs may touch the
+        whole tree and always build alone.
+        """
+        remaining = list(components)
+        scheduled = {component.name for component in components}
+        finished: set[str] = set()
+        while remaining:
+            ready = [
+                component
+                for component in remaining
+                if all(
+                    dependency in finished or dependency not in scheduled
+                    for dependency in component.depends_on
+                )
+            ]
+            if not ready:
+                raise RuntimeError("Component build order has a depends_on cycle")
+            isolated = [component for component in ready if component.inputs]
+            batch = isolated if len(isolated) > 1 else ready[:1]
+            if len(batch) == 1:
+                self._run_component_build(batch[0], staging_path, build_user)
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=min(_MAX_PARALLEL_BUILDS, len(batch))
+                ) as executor:
+                    futures = [
+                        executor.submit(self._run_component_build, component, staging_path, build_user)
+                        for component in batch
+                    ]
+                    for future in futures:
+                        future.result()
+            for component in batch:
+                finished.add(component.name)
+                remaining.remove(component)
+
     def _run_component_build(
         self,
         component: Component,
@@ -1009,6 +1275,7 @@ class DeploymentOrchestrator:
                 )
 
         exec_start = render_template(component.exec, context) if component.exec else context['binary']
+        started_at = time.monotonic()
         create_managed_service(
             service_name,
             exec_start,
@@ -1019,37 +1286,112 @@ class DeploymentOrchestrator:
             description=f"infra.json service: {component.name}",
             runtime_env=runtime_env,
             writable_paths=[shared_dir],
+            readiness=component.readiness,
+            port=component.port,
         )
 
         if component.health:
             self._poll_health(component)
+        self._record_readiness(dest_path, component, time.monotonic() - started_at)
 
-    def _poll_health(self, component: Component, attempts: int = 10, delay: float = 1.0) -> None:
+    def _poll_health(
+        self,
+        component: Component,
+        timeout: Optional[float] = None,
+        initial_delay: float = 0.05,
+        max_delay: float = 2.0,
+    ) -> float:
         """Poll a service's health endpoint until it answers, then return.
 
-        Only a 2xx response accepts the release. A persistent failure aborts
-        activation so the caller can restore the previous release.
+        Polling starts at ``initial_delay`` and backs off exponentially up to
+        ``max_delay`` until the component's ``health_timeout`` expires. Only a
+        2xx response accepts the release. A persistent failure aborts
+        activation so the caller can restore the previous release. Returns
+        the seconds spent waiting.
         """
-        import time
         import urllib.error
         import urllib.request
 
         url = f"http://127.0.0.1:{component.port}{component.health}"
-        for _attempt in range(attempts):
+        limit = timeout if timeout is not None else component.health_timeout
+        started_at = time.monotonic()
+        deadline = started_at + limit
+        delay = initial_delay
+        attempts = 0
+        while True:
+            attempts += 1
+            remaining = deadline - time.monotonic()
             try:
-                with urllib.request.urlopen(url, timeout=3) as resp:
+                with urllib.request.urlopen(url, timeout=max(0.1, min(3.0, remaining))) as resp:
                     if 200 <= resp.status < 300:
-                        print(f"  ✓ Health check passed for '{component.name}' ({url} → {resp.status})")
-                        return
-            except urllib.error.HTTPError as exc:
+                        elapsed = time.monotonic() - started_at
+                        print(
+                            f"  ✓ Health check passed for '{component.name}' "
+                            f"({url} → {resp.status}, {elapsed:.2f}s, {attempts} attempt(s))"
+                        )
+                        return elapsed
+            except urllib.error.HTTPError:
                 pass
             except (urllib.error.URLError, OSError):
                 pass
-            time.sleep(delay)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
         raise RuntimeError(
-            f"Health check for '{component.name}' did not pass after {attempts} attempts ({url})"
+            f"Health check for '{component.name}' did not pass within {limit:g}s "
+            f"after {attempts} attempts ({url})"
         )
 
+    def _readiness_history_path(self, dest_path: str) -> str:
+        app_name = os.path.basename(dest_path.rstrip("/"))
+        return os.path.join(self._get_persistent_root(app_name), "readiness-history.json")
+
+    def _record_readiness(self, dest_path: str, component: Component, seconds: float) -> None:
+        """Append a component's time-to-ready and flag slow starts.
+
+        The history keeps the most recent samples per component so startup
+        regressions stay visible across deploys.
+        """
+        history_path = self._readiness_history_path(dest_path)
+        try:
+            with open(history_path, "r", encoding="utf-8") as handle:
+                history = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            history = {}
+        if not isinstance(history, dict):
+            history = {}
+        samples = [
+            sample for sample in history.get(component.name, [])
+            if isinstance(sample, dict) and isinstance(sample.get("seconds"), (int, float))
+        ]
+        previous = sorted(sample["seconds"] for sample in samples)
+        samples.append({
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "seconds": round(seconds, 3),
+            "readiness": component.readiness or ("http" if component.health else "start"),
+        })
+        history[component.name] = samples[-_READINESS_HISTORY_LIMIT:]
+        # The history is advisory; failing to persist it must not fail a
+        # release whose service is already up.
+        try:
+            self._ensure_dir(os.path.dirname(history_path))
+            write_json_atomic(history_path, history, sort_keys=True)
+        except OSError as exc:
+            print(f"  ⚠ Could not record readiness history for '{component.name}': {exc}")
+
+        message = f"  ✓ '{component.name}' ready in {seconds:.2f}s"
+        if previous:
+            median = previous[len(previous) // 2]
+            message += f" (median of last {len(previous)}: {median:.2f}s)"
+            if seconds > max(2 * median, median + 1.0):
+                message = (
+                    f"  ⚠ '{component.name}' took {seconds:.2f}s to become ready; "
+                    f"median of last {len(previous)} deploy(s) is {median:.2f}s"
+                )
+        print(message)
+
     def build_project(self, project_path: str, project_type: str,
                       site_root: Optional[str] = None) -> None:
         if project_type == "node":
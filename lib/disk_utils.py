@@ -7,6 +7,39 @@ from lib.types import BYTES_PER_MB
 # Note: os/subprocess/Path not used directly in this module - removed to keep strict checks clean
 
 
+def usage_percent(used_bytes: int, total_bytes: int) -> int:
+    """Return whole-percent filesystem usage as storage warnings report it.
+    
+    Usage is measured against the total size, including blocks reserved for
+    root, so it reads lower than df's used/(used+available) figure.
+    
+    Args:
+        used_bytes: Bytes in use (total minus all free blocks)
+        total_bytes: Filesystem size in bytes
+        
+    Returns:
+        int: Usage percentage rounded down, 0 for an empty filesystem
+    """
+    return int((used_bytes / total_bytes) * 100) if total_bytes > 0 else 0
+
+
+def bytes_over_usage_percent(used_bytes: int, total_bytes: int, percent: int) -> int:
+    """Return how many bytes must be freed for usage to fall below ``percent``.
+    
+    Args:
+        used_bytes: Bytes in use (total minus all free blocks)
+        total_bytes: Filesystem size in bytes
+        percent: Usage percentage that must no longer be reached
+        
+    Returns:
+        int: Bytes to free so :func:`usage_percent` drops below ``percent``
+    """
+    if total_bytes <= 0:
+        return 0
+    allowed_used = (total_bytes * percent - 1) // 100
+    return max(0, used_bytes - allowed_used)
+
+
 def get_free_disk_mb(path: str = "/") -> int:
     """Get free disk space in MB for any path.
     
@@ -56,7 +89,7 @@ def get_disk_usage_details(path: str) -> dict[str, int]:
             'total_mb': stat.total // BYTES_PER_MB,
             'used_mb': stat.used // BYTES_PER_MB,
             'free_mb': stat.free // BYTES_PER_MB,
-            'usage_percent': int((stat.used / stat.total) * 100) if stat.total > 0 else 0
+            'usage_percent': usage_percent(stat.used, stat.total)
         }
     except (OSError, AttributeError) as e:
         print(f"Error getting disk usage for {path}: {e}")
@@ -7,9 +7,18 @@ import json
 import os
 import re
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Iterable
+from typing import Any, Iterable, Optional
+
+from lib.atomic_io import write_json_atomic
+
+SUMMARY_CACHE_PATH = os.path.expanduser("~/.cache/infra_tools/github-maintenance.json")
+SUMMARY_CACHE_VERSION = 2
+DEFAULT_SUMMARY_JOBS = 8
+_PAGE_SIZE = 100
 
 
 _SKIP_DIRS = {
@@ -31,6 +40,8 @@ _GITHUB_REPO_PATTERNS = (
     re.compile(r"^ssh://git@github\.com/(?P<repo>[^/]+/[^/]+?)(?:\.git)?/?$"),
     re.compile(r"^git@github\.com:(?P<repo>[^/]+/[^/]+?)(?:\.git)?$"),
 )
+_GIT_SECTION_PATTERN = re.compile(r'^\[\s*([A-Za-z0-9.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+_LINK_NEXT_PATTERN = re.compile(r'<[^>]+>;\s*rel="next"')
 
 
 @dataclass(frozen=True)
@@ -88,6 +99,70 @@ class RepoSummary:
         }
 
 
+class SummaryCache:
+    """On-disk cache of GitHub list endpoints validated by ETag.
+
+    Entries are keyed by repository and endpoint and hold one ETag per page.
+    A cached page is reused when GitHub answers its conditional request with
+    ``304 Not Modified``; such responses do not count against the API rate
+    limit. Workers may share one instance across threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._repos: dict[str, dict[str, Any]] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return
+        if isinstance(payload, dict) and payload.get("version") == SUMMARY_CACHE_VERSION:
+            repos = payload.get("repos")
+            if isinstance(repos, dict):
+                self._repos = {name: entry for name, entry in repos.items() if isinstance(entry, dict)}
+
+    def get(self, repo: str, endpoint: str) -> list[dict[str, Any]]:
+        """Return the cached pages of ``endpoint``, or an empty list."""
+        with self._lock:
+            pages = self._repos.get(repo, {}).get(endpoint)
+        if not isinstance(pages, list):
+            return []
+        valid: list[dict[str, Any]] = []
+        for page in pages:
+            if not (
+                isinstance(page, dict)
+                and isinstance(page.get("etag"), str)
+                and isinstance(page.get("items"), list)
+                and isinstance(page.get("next"), bool)
+            ):
+                return []
+            valid.append(page)
+        return valid
+
+    def put(self, repo: str, endpoint: str, pages: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self._repos.setdefault(repo, {})[endpoint] = pages
+            self._dirty = True
+
+    def invalidate(self, repo: str) -> None:
+        with self._lock:
+            if self._repos.pop(repo, None) is not None:
+                self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            write_json_atomic(
+                self.path,
+                {"version": SUMMARY_CACHE_VERSION, "repos": self._repos},
+                sort_keys=True,
+            )
+            self._dirty = False
+
+
 def add_maintenance_subparser(subparsers: argparse._SubParsersAction) -> argparse.ArgumentParser:
     """Register the top-level maintenance command tree."""
 
@@ -118,6 +193,17 @@ def add_maintenance_subparser(subparsers: argparse._SubParsersAction) -> argpars
         default=[],
         help="Root directory to scan for git repositories; repeatable",
     )
+    github.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_SUMMARY_JOBS,
+        help=f"Repositories to query concurrently (default: {DEFAULT_SUMMARY_JOBS})",
+    )
+    github.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the on-disk summary cache",
+    )
     github_sub = github.add_subparsers(dest="github_command", help="GitHub maintenance command")
 
     audit = github_sub.add_parser("audit", help="Show GitHub storage usage for discovered repos")
@@ -193,7 +279,7 @@ def _cmd_github(args: argparse.Namespace) -> int:
 
 def _cmd_github_audit(args: argparse.Namespace) -> int:
     repos = discover_github_repos(_selected_roots(args))
-    summaries = [summarize_github_repo(repo) for repo in repos]
+    summaries = _summarize_with_cache(repos, args)
     if args.json:
         print(json.dumps([summary.to_dict() for summary in summaries], indent=2, sort_keys=True))
         return 0
@@ -221,8 +307,8 @@ def _cmd_github_prune(args: argparse.Namespace) -> int:
         return 0
 
     plans: list[tuple[GitHubRepo, list[str], list[int], list[int]]] = []
-    for repo in repos:
-        summary = summarize_github_repo(repo)
+    for summary in _summarize_with_cache(repos, args):
+        repo = summary.repo
         release_tags = _release_tags_to_delete(summary.releases, args.keep_releases)
         artifact_ids = _expired_artifact_ids(summary.artifacts) if args.delete_expired_artifacts else []
         cache_ids = (
@@ -256,18 +342,43 @@ def _cmd_github_prune(args: argparse.Namespace) -> int:
             print("Aborted.")
             return 0
 
-    for repo, release_tags, artifact_ids, cache_ids in plans:
-        for tag in release_tags:
-            _delete_release(repo.full_name, tag)
-        for artifact_id in artifact_ids:
-            _delete_artifact(repo.full_name, artifact_id)
-        for cache_id in cache_ids:
-            _delete_cache(repo.full_name, cache_id)
+    cache = _summary_cache(args)
+    try:
+        for repo, release_tags, artifact_ids, cache_ids in plans:
+            if cache is not None:
+                cache.invalidate(repo.full_name)
+            for tag in release_tags:
+                _delete_release(repo.full_name, tag)
+            for artifact_id in artifact_ids:
+                _delete_artifact(repo.full_name, artifact_id)
+            for cache_id in cache_ids:
+                _delete_cache(repo.full_name, cache_id)
+    finally:
+        if cache is not None:
+            cache.save()
 
     print("Cleanup complete.")
     return 0
 
 
+def _summary_cache(args: argparse.Namespace) -> Optional[SummaryCache]:
+    if getattr(args, "no_cache", False):
+        return None
+    return SummaryCache(SUMMARY_CACHE_PATH)
+
+
+def _summarize_with_cache(repos: list[GitHubRepo], args: argparse.Namespace) -> list[RepoSummary]:
+    jobs = getattr(args, "jobs", DEFAULT_SUMMARY_JOBS)
+    if jobs < 1:
+        raise ValueError("jobs must be at least 1")
+    cache = _summary_cache(args)
+    try:
+        return summarize_github_repos(repos, max_workers=jobs, cache=cache)
+    finally:
+        if cache is not None:
+            cache.save()
+
+
 def _selected_roots(args: argparse.Namespace) -> list[str]:
     roots = list(getattr(args, "maintenance_roots", []))
     roots.extend(getattr(args, "github_roots", []))
@@ -290,15 +401,29 @@ def discover_github_repos(roots: Iterable[str]) -> list[GitHubRepo]:
     return sorted(repos.values(), key=lambda repo: repo.full_name)
 
 
-def summarize_github_repo(repo: GitHubRepo) -> RepoSummary:
+def summarize_github_repo(repo: GitHubRepo, cache: Optional[SummaryCache] = None) -> RepoSummary:
     """Fetch releases, artifacts, and caches for a GitHub repo."""
 
-    releases = _fetch_github_releases(repo.full_name)
-    artifacts = _fetch_github_artifacts(repo.full_name)
-    caches = _fetch_github_caches(repo.full_name)
+    releases = _fetch_github_releases(repo.full_name, cache)
+    artifacts = _fetch_github_artifacts(repo.full_name, cache)
+    caches = _fetch_github_caches(repo.full_name, cache)
     return RepoSummary(repo=repo, releases=releases, artifacts=artifacts, caches=caches)
 
 
+def summarize_github_repos(
+    repos: list[GitHubRepo],
+    *,
+    max_workers: int = DEFAULT_SUMMARY_JOBS,
+    cache: Optional[SummaryCache] = None,
+) -> list[RepoSummary]:
+    """Summarize repositories concurrently, preserving the input order."""
+
+    if len(repos) <= 1 or max_workers <= 1:
+        return [summarize_github_repo(repo, cache) for repo in repos]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(repos))) as pool:
+        return list(pool.map(lambda repo: summarize_github_repo(repo, cache), repos))
+
+
 def _find_git_repo_roots(root: str) -> Iterable[str]:
     for dirpath, dirnames, _filenames in os.walk(root):
         dirnames[:] = [name for name in dirnames if name not in _SKIP_DIRS]
@@ -308,16 +433,83 @@ def _find_git_repo_roots(root: str) -> Iterable[str]:
             dirnames[:] = []
 
 
-def _git_remote_url(repo_root: str) -> str:
-    result = subprocess.run(
-        ["git", "-C", repo_root, "remote", "get-url", "origin"],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if result.returncode != 0:
+def _git_config_path(repo_root: str) -> Optional[str]:
+    """Locate the config file for a checkout, following worktree indirection."""
+
+    git_dir = os.path.join(repo_root, ".git")
+    if os.path.isfile(git_dir):
+        try:
+            with open(git_dir, "r", encoding="utf-8") as handle:
+                pointer = handle.read().strip()
+        except OSError:
+            return None
+        if not pointer.startswith("gitdir:"):
+            return None
+        git_dir = os.path.join(repo_root, pointer[len("gitdir:"):].strip())
+        try:
+            with open(os.path.join(git_dir, "commondir"), "r", encoding="utf-8") as handle:
+                git_dir = os.path.join(git_dir, handle.read().strip())
+        except OSError:
+            pass
+    config_path = os.path.join(git_dir, "config")
+    return config_path if os.path.isfile(config_path) else None
+
+
+def _git_config_value(raw: str) -> str:
+    """Decode a git config value: quotes, escapes, and trailing comments."""
+
+    value: list[str] = []
+    quoted = False
+    index = 0
+    while index < len(raw):
+        char = raw[index]
+        if char == "\\" and index + 1 < len(raw):
+            index += 1
+            value.append({"n": "\n", "t": "\t", "b": "\b"}.get(raw[index], raw[index]))
+        elif char == '"':
+            quoted = not quoted
+        elif char in "#;" and not quoted:
+            break
+        else:
+            value.append(char)
+        index += 1
+    return "".join(value).strip()
+
+
+def _git_remote_url(repo_root: str, remote: str = "origin") -> str:
+    """Read a remote URL straight from the checkout's git config.
+
+    Reading the file avoids spawning ``git`` once per repository. Includes and
+    ``insteadOf`` rewrites are not applied.
+    """
+
+    config_path = _git_config_path(repo_root)
+    if config_path is None:
         return ""
-    return result.stdout.strip()
+    try:
+        with open(config_path, "r", encoding="utf-8", errors="replace") as handle:
+            lines = handle.readlines()
+    except OSError:
+        return ""
+    in_remote = False
+    url = ""
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("["):
+            match = _GIT_SECTION_PATTERN.match(stripped)
+            in_remote = bool(
+                match
+                and match.group(1).lower() == "remote"
+                and match.group(2) is not None
+                and match.group(2).replace('\\"', '"') == remote
+            )
+            continue
+        if not in_remote or "=" not in stripped:
+            continue
+        key, _, raw_value = stripped.partition("=")
+        if key.strip().lower() == "url" and not url:
+            url = _git_config_value(raw_value)
+    return url
 
 
 def _parse_github_remote(remote_url: str) -> str | None:
@@ -341,6 +533,74 @@ def _gh_api_paginated(endpoint: str) -> list[Any]:
     return _decode_json_stream(result.stdout)
 
 
+def _gh_api_conditional(endpoint: str, etag: Optional[str]) -> tuple[int, str, bool, list[Any]]:
+    """Fetch one page of ``endpoint`` with an optional If-None-Match.
+
+    Returns the HTTP status, the response ETag, whether more pages follow,
+    and the decoded body.
+    """
+
+    command = ["gh", "api", "--include"]
+    if etag:
+        command.extend(["-H", f"If-None-Match: {etag}"])
+    command.append(endpoint)
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+    head, _, body = result.stdout.replace("\r\n", "\n").partition("\n\n")
+    status_line, *header_lines = head.split("\n")
+    status_parts = status_line.split()
+    status = int(status_parts[1]) if len(status_parts) > 1 and status_parts[1].isdigit() else 0
+    if status == 304:
+        return status, etag or "", False, []
+    if result.returncode != 0 or not 200 <= status < 300:
+        message = result.stderr.strip() or body.strip() or f"gh api failed for {endpoint}"
+        raise RuntimeError(message)
+    headers: dict[str, str] = {}
+    for line in header_lines:
+        name, separator, value = line.partition(":")
+        if separator:
+            headers[name.strip().lower()] = value.strip()
+    has_next = bool(_LINK_NEXT_PATTERN.search(headers.get("link", "")))
+    return status, headers.get("etag", ""), has_next, _decode_json_stream(body)
+
+
+def _gh_api_list(
+    repo: str,
+    endpoint: str,
+    extract: Any,
+    cache: Optional[SummaryCache],
+) -> list[dict[str, Any]]:
+    """List every item of a paginated endpoint, reusing cached pages when unchanged.
+
+    Every page is revalidated, so a change past the first page (or a page
+    shifting after deletions) is never hidden behind an unchanged first page.
+    """
+
+    if cache is None:
+        return [item for page in _gh_api_paginated(endpoint) for item in extract(page)]
+    cached = cache.get(repo, endpoint)
+    pages: list[dict[str, Any]] = []
+    while True:
+        previous = cached[len(pages)] if len(pages) < len(cached) else None
+        status, etag, has_next, body = _gh_api_conditional(
+            f"{endpoint}?per_page={_PAGE_SIZE}&page={len(pages) + 1}",
+            previous["etag"] if previous else None,
+        )
+        if status == 304 and previous is not None:
+            page = previous
+        else:
+            page = {
+                "etag": etag,
+                "next": has_next,
+                "items": [item for value in body for item in extract(value)],
+            }
+        pages.append(page)
+        if not page["next"]:
+            break
+    if all(page["etag"] for page in pages):
+        cache.put(repo, endpoint, pages)
+    return [item for page in pages for item in page["items"]]
+
+
 def _decode_json_stream(text: str) -> list[Any]:
     decoder = json.JSONDecoder()
     values: list[Any] = []
@@ -355,34 +615,34 @@ def _decode_json_stream(text: str) -> list[Any]:
         values.append(value)
 
 
-def _fetch_github_releases(repo: str) -> list[dict[str, Any]]:
-    releases: list[dict[str, Any]] = []
-    for page in _gh_api_paginated(f"/repos/{repo}/releases"):
-        if isinstance(page, list):
-            releases.extend(item for item in page if isinstance(item, dict))
-    return releases
+def _release_entries(page: Any) -> list[dict[str, Any]]:
+    if not isinstance(page, list):
+        return []
+    return [item for item in page if isinstance(item, dict)]
 
 
-def _fetch_github_artifacts(repo: str) -> list[dict[str, Any]]:
-    artifacts: list[dict[str, Any]] = []
-    for page in _gh_api_paginated(f"/repos/{repo}/actions/artifacts"):
+def _keyed_entries(key: str) -> Any:
+    def extract(page: Any) -> list[dict[str, Any]]:
         if not isinstance(page, dict):
-            continue
-        entries = page.get("artifacts", [])
-        if isinstance(entries, list):
-            artifacts.extend(item for item in entries if isinstance(item, dict))
-    return artifacts
+            return []
+        entries = page.get(key, [])
+        if not isinstance(entries, list):
+            return []
+        return [item for item in entries if isinstance(item, dict)]
 
+    return extract
 
-def _fetch_github_caches(repo: str) -> list[dict[str, Any]]:
-    caches: list[dict[str, Any]] = []
-    for page in _gh_api_paginated(f"/repos/{repo}/actions/caches"):
-        if not isinstance(page, dict):
-            continue
-        entries = page.get("actions_caches", [])
-        if isinstance(entries, list):
-            caches.extend(item for item in entries if isinstance(item, dict))
-    return caches
+
+def _fetch_github_releases(repo: str, cache: Optional[SummaryCache] = None) -> list[dict[str, Any]]:
+    return _gh_api_list(repo, f"/repos/{repo}/releases", _release_entries, cache)
+
+
+def _fetch_github_artifacts(repo: str, cache: Optional[SummaryCache] = None) -> list[dict[str, Any]]:
+    return _gh_api_list(repo, f"/repos/{repo}/actions/artifacts", _keyed_entries("artifacts"), cache)
+
+
+def _fetch_github_caches(repo: str, cache: Optional[SummaryCache] = None) -> list[dict[str, Any]]:
+    return _gh_api_list(repo, f"/repos/{repo}/actions/caches", _keyed_entries("actions_caches"), cache)
 
 
 def _release_tags_to_delete(releases: list[dict[str, Any]], keep_releases: int) -> list[str]:
@@ -4,13 +4,19 @@ from __future__ import annotations
 
 import argparse
 import getpass
+import json
 import os
+import re
+import sqlite3
+import time
+from datetime import datetime
 
 from common.common_steps import install_apt_packages, update_and_upgrade_packages
 from common.network_steps import configure_static_network, configure_system_hostname
 from desktop.browser_steps import configure_default_browser, install_browser
 from desktop.desktop_environment_steps import configure_dark_theme, install_desktop
 from lib.config import SetupConfig
+from lib.operation_index import INDEX_FILENAME, OperationIndex, rebuild_operation_index
 from lib.remote_utils import is_dry_run, run, set_dry_run
 from lib.types import StepFunc
 from lib.validation import validate_apt_packages
@@ -19,6 +25,9 @@ from lib.validators import validate_username
 
 LOCAL_DESKTOPS = ("xfce", "i3", "cinnamon", "lxqt")
 LOCAL_BROWSERS = ("brave", "firefox", "browsh", "helium", "lynx", "librewolf")
+OPERATION_LOG_DIR = "/var/log/infra_tools/operations"
+_RELATIVE_AGE_PATTERN = re.compile(r"^(\d+)([hdw])$")
+_AGE_UNIT_SECONDS = {"h": 3600, "d": 86400, "w": 604800}
 
 
 def _target_username() -> str:
@@ -190,6 +199,44 @@ def add_local_subparser(subparsers: argparse._SubParsersAction) -> None:
     )
     _add_network_arguments(network_parser, include_ipv4=False)
 
+    operations_parser = commands.add_parser(
+        "operations",
+        help="Query the index of sync, scrub, and other operation logs",
+        description=(
+            "List recorded operations from the operation log index, newest first. "
+            "Use --rebuild to recreate the index from the raw logs."
+        ),
+    )
+    operations_parser.add_argument("--type", dest="operation_type", help="Operation type, such as sync or scrub")
+    operations_parser.add_argument(
+        "--status",
+        help="Final status, such as completed or failed; running covers unfinished operations",
+    )
+    operations_parser.add_argument(
+        "--since",
+        help="Only operations started after this age (e.g. 36h, 30d, 8w) or ISO date",
+    )
+    operations_parser.add_argument(
+        "--context",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Match a creation context field, e.g. destination=/mnt/backup; repeatable",
+    )
+    operations_parser.add_argument("--metric", help="Also show this metric's last value and total")
+    operations_parser.add_argument("--limit", type=int, default=50, help="Maximum rows (default: 50)")
+    operations_parser.add_argument("--json", action="store_true", help="Output JSON instead of a table")
+    operations_parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recreate the index from raw logs before querying",
+    )
+    operations_parser.add_argument(
+        "--log-dir",
+        default=OPERATION_LOG_DIR,
+        help=f"Operation log directory (default: {OPERATION_LOG_DIR})",
+    )
+
 
 def _show_local_addresses() -> int:
     result = run("ip -brief address", check=False, capture_output=True)
@@ -282,6 +329,80 @@ def _run_network_command(args: argparse.Namespace) -> int:
     return _run_step(config, "staging static network configuration", configure_static_network)
 
 
+def _parse_since(value: str) -> float:
+    match = _RELATIVE_AGE_PATTERN.match(value)
+    if match:
+        return time.time() - int(match.group(1)) * _AGE_UNIT_SECONDS[match.group(2)]
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid --since value: {value} (use 30d, 36h, 8w, or an ISO date)") from None
+
+
+def _format_operation_time(timestamp: object) -> str:
+    if not isinstance(timestamp, (int, float)):
+        return "-"
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+def _run_operations_command(args: argparse.Namespace) -> int:
+    if args.limit < 1:
+        raise ValueError("--limit must be at least 1")
+    context: dict[str, str] = {}
+    for item in args.context:
+        key, separator, value = item.partition("=")
+        if not separator or not key:
+            raise ValueError(f"Invalid --context value: {item} (expected KEY=VALUE)")
+        context[key] = value
+    since = _parse_since(args.since) if args.since else None
+
+    try:
+        if args.rebuild:
+            count = rebuild_operation_index(args.log_dir)
+            if not args.json:
+                print(f"Rebuilt operation index from {count} operation(s)")
+        elif not os.path.exists(os.path.join(args.log_dir, INDEX_FILENAME)):
+            print(f"Error: no operation index in {args.log_dir}; run with --rebuild")
+            return 1
+        rows = OperationIndex(os.path.join(args.log_dir, INDEX_FILENAME)).query(
+            operation_type=args.operation_type,
+            status=args.status,
+            since=since,
+            context=context,
+            metric=args.metric,
+            limit=args.limit,
+        )
+    except (sqlite3.Error, OSError) as exc:
+        print(f"Error: cannot read operation index: {exc}")
+        return 1
+
+    if args.json:
+        print(json.dumps(rows, indent=2, sort_keys=True))
+        return 0
+    if not rows:
+        print("No matching operations.")
+        return 0
+
+    header = f"{'ID':<10} {'TYPE':<18} {'STARTED':<16} {'STATUS':<11} {'DURATION':>9} {'ERRORS':>6}"
+    if args.metric:
+        header += f" {args.metric.upper()[:20]:>20}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        duration = row["duration_seconds"]
+        line = (
+            f"{row['operation_id']:<10} {str(row['operation_type'] or '-'):<18} "
+            f"{_format_operation_time(row['started_at']):<16} {row['status']:<11} "
+            f"{(f'{duration:.1f}s' if duration is not None else '-'):>9} {row['error_count']:>6}"
+        )
+        if args.metric:
+            last = row.get("metric_last")
+            value = "-" if last is None else f"{last:g} {row.get('metric_unit') or ''}".strip()
+            line += f" {value:>20}"
+        print(line)
+    return 0
+
+
 def run_local_command(args: argparse.Namespace) -> int:
     """Dispatch a focused local maintenance command."""
 
@@ -293,12 +414,13 @@ def run_local_command(args: argparse.Namespace) -> int:
         "hostname": _run_hostname_command,
         "ip": _run_ip_command,
         "network": _run_network_command,
+        "operations": _run_operations_command,
     }
     handler = handlers.get(getattr(args, "local_command", None))
     if handler is None:
         print(
             "Error: local command required "
-            "(install, update, desktop, browser, hostname, ip, network)"
+            "(install, update, desktop, browser, hostname, ip, network, operations)"
         )
         return 1
     try:
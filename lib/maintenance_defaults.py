@@ -14,6 +14,14 @@ CRASH_REPORT_PATTERNS = (
 )
 STORAGE_WARNING_PERCENT = 80
 STORAGE_CRITICAL_PERCENT = 90
+# The storage forecast samples free space on each local filesystem hourly and
+# keeps a week of samples. A filesystem forecast to fill within the horizon
+# gets an early alert and early cleanup before writes start failing.
+STORAGE_FORECAST_MAX_SAMPLES = 7 * 24
+STORAGE_FORECAST_MIN_SAMPLES = 6
+STORAGE_FORECAST_MIN_SPAN_HOURS = 6
+STORAGE_FORECAST_HORIZON_HOURS = 72
+STORAGE_FORECAST_INFRA_TMP_MAX_AGE_DAYS = 1
 
 # Wait up to 5 minutes for apt/dpkg locks to be released before failing.
 APT_LOCK_OPTIONS = [
@@ -34,6 +42,9 @@ OPENCODE_CACHE_MAX_BYTES = 2 * BYTES_PER_GB
 CODEX_CACHE_MAX_BYTES = BYTES_PER_GB
 STALE_USER_TOOL_CACHE_MAX_AGE_DAYS = 90
 STALE_USER_TOOL_TMP_MAX_AGE_DAYS = 7
+# When the home filesystem is above this usage, whole user caches are evicted,
+# least recently used first, until usage drops back below it.
+USER_CACHE_EVICTION_TARGET_PERCENT = STORAGE_WARNING_PERCENT
 
 # Remove infra_tools-owned temp artifacts after a week. These are normally
 # cleaned up by finally blocks, but interrupted setup/deploy/provision runs can
@@ -71,6 +71,7 @@ def configure_maintenance_timer(
     persistent: bool = True,
     network_online: bool = True,
     purpose: str = "maintenance",
+    script_args: tuple[str, ...] = (),
 ) -> bool:
     """Install, enable, and verify a systemd timer for a maintenance script.
 
@@ -92,6 +93,8 @@ def configure_maintenance_timer(
         (purpose, "maintenance purpose"),
     ):
         _validate_unit_value(value, name)
+    for argument in script_args:
+        _validate_unit_value(argument, "script argument")
     if schedule:
         _validate_unit_value(schedule, "timer schedule")
     if on_boot_sec:
@@ -130,7 +133,7 @@ Documentation=man:systemd.service(5)
 
 [Service]
 Type=oneshot
-{user_line}{environment_lines}ExecStart=/usr/bin/python3 {shlex.quote(script_path)}
+{user_line}{environment_lines}ExecStart=/usr/bin/python3 {shlex.join((script_path,) + tuple(script_args))}
 TimeoutStartSec={timeout}
 StandardOutput=journal
 StandardError=journal
@@ -190,3 +193,83 @@ WantedBy=timers.target
     trigger_summary = schedule or f"after boot: {on_boot_sec}"
     print(f"  ✓ {check_name} {purpose} configured ({trigger_summary})")
     return True
+
+
+def configure_maintenance_daemon(
+    *,
+    service_name: str,
+    service_desc: str,
+    script_path: str,
+    check_name: str,
+    purpose: str = "maintenance",
+    script_args: tuple[str, ...] = (),
+    network_online: bool = True,
+) -> bool:
+    """Install, enable, and verify a long-running service for a maintenance script.
+
+    The continuous counterpart of :func:`configure_maintenance_timer`; the
+    service restarts on failure and starts at boot.
+    """
+    validate_service_name_uniqueness(service_name, [])
+    validate_filesystem_path(script_path, must_exist=False)
+    if not os.path.isabs(script_path):
+        raise ValueError(f"Maintenance script path must be absolute: {script_path}")
+    for value, name in (
+        (service_desc, "service description"),
+        (check_name, "maintenance name"),
+        (purpose, "maintenance purpose"),
+    ):
+        _validate_unit_value(value, name)
+    for argument in script_args:
+        _validate_unit_value(argument, "script argument")
+
+    service_file = os.path.join(SYSTEMD_DIR, f"{service_name}.service")
+    network_lines = "Wants=network-online.target\nAfter=network-online.target\n" if network_online else ""
+    service_content = f"""[Unit]
+Description={service_desc}
+Documentation=man:systemd.service(5)
+{network_lines}
+
+[Service]
+Type=simple
+ExecStart=/usr/bin/python3 {shlex.join((script_path,) + tuple(script_args))}
+Restart=on-failure
+RestartSec=10
+StandardOutput=journal
+StandardError=journal
+
+[Install]
+WantedBy=multi-user.target
+"""
+
+    if is_dry_run():
+        print(f"  [DRY-RUN] Would configure {check_name} {purpose} service")
+        return True
+
+    _write_unit_atomically(service_file, service_content)
+
+    service_unit = f"{service_name}.service"
+    reload_result = run("systemctl daemon-reload", check=False)
+    if reload_result.returncode != 0:
+        print(f"  ⚠ {check_name} {purpose} unit written but systemd could not reload")
+        return False
+
+    enable_result = run(f"systemctl enable {shlex.quote(service_unit)}", check=False)
+    if enable_result.returncode != 0:
+        print(f"  ⚠ {check_name} {purpose} service could not be enabled")
+        return False
+
+    # Restart so a rerun picks up a changed unit or monitor script.
+    restart_result = run(f"systemctl restart {shlex.quote(service_unit)}", check=False)
+    if restart_result.returncode != 0:
+        print(f"  ⚠ {check_name} {purpose} service could not be restarted")
+        return False
+
+    enabled_result = run(f"systemctl is-enabled {shlex.quote(service_unit)}", check=False)
+    active_result = run(f"systemctl is-active {shlex.quote(service_unit)}", check=False)
+    if enabled_result.returncode != 0 or active_result.returncode != 0:
+        print(f"  ⚠ {check_name} {purpose} service failed post-install verification")
+        return False
+
+    print(f"  ✓ {check_name} {purpose} configured (continuous service)")
+    return True
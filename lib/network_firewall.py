@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass, field
-from typing import Optional, cast
+from typing import Iterable, Optional, cast
 
 from lib.network_inventory import NetworkProfile, find_network_profile
 from lib.types import JSONDict
@@ -40,6 +40,22 @@ class FirewallRulePlan:
         return cast(JSONDict, asdict(self))
 
 
+@dataclass
+class FirewallChangePlan:
+    """Entry keys to add and remove so owned firewall state matches a plan."""
+
+    additions: list[str]
+    removals: list[str]
+    unchanged: list[str]
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.additions or self.removals)
+
+    def to_dict(self) -> JSONDict:
+        return cast(JSONDict, asdict(self))
+
+
 @dataclass
 class ProxmoxFirewallPlan:
     """Read-only Proxmox firewall plan derived from a network profile."""
@@ -102,6 +118,32 @@ class ProxmoxRenderedPlan:
         return cast(JSONDict, payload)
 
 
+def plan_firewall_changes(
+    current: Iterable[str],
+    desired: Iterable[str],
+    *,
+    owned: Optional[Iterable[str]] = None,
+) -> FirewallChangePlan:
+    """Diff firewall entries by key without touching entries the caller does not own.
+
+    ``owned`` limits removals to those current keys; ``None`` owns every
+    entry. Additions keep the order of ``desired``.
+    """
+
+    current_keys = list(dict.fromkeys(current))
+    desired_keys = list(dict.fromkeys(desired))
+    current_set = set(current_keys)
+    desired_set = set(desired_keys)
+    owned_set = current_set if owned is None else set(owned)
+    return FirewallChangePlan(
+        additions=[key for key in desired_keys if key not in current_set],
+        removals=[
+            key for key in current_keys if key in owned_set and key not in desired_set
+        ],
+        unchanged=[key for key in desired_keys if key in current_set],
+    )
+
+
 def plan_proxmox_control_plane_lockdown(
     profile_name: str,
     workspace: Optional[str] = None,
@@ -358,6 +400,7 @@ def _render_guest_fw() -> str:
 
 __all__ = [
     "FirewallAddressSet",
+    "FirewallChangePlan",
     "FirewallRulePlan",
     "PROXMOX_CLUSTER_TCP_PORTS",
     "PROXMOX_CLUSTER_UDP_PORTS",
@@ -368,6 +411,7 @@ __all__ = [
     "build_proxmox_control_plane_lockdown_plan",
     "format_proxmox_firewall_plan",
     "format_rendered_proxmox_plan",
+    "plan_firewall_changes",
     "plan_proxmox_control_plane_lockdown",
     "render_proxmox_firewall_plan",
 ]
@@ -0,0 +1,289 @@
+"""Durable on-disk outbox for notifications.
+
+Callers append a notification in one small file write and return
+immediately. A flusher delivers queued notifications to every target
+concurrently, preserves per-target ordering, retries failures with
+exponential backoff, and collapses notifications that share a
+``dedup_key`` within a short window so only the newest state is sent.
+
+Entries that still fail when the process exits stay on disk and are
+retried by the next process that flushes the same outbox.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from logging import ERROR, INFO, WARNING, Logger
+from typing import Callable, Optional
+
+from lib.atomic_io import write_json_atomic
+from lib.logging_utils import log_event
+from lib.notifications import Notification, NotificationConfig, _redact_notification_target
+from lib.types import JSONDict
+
+DEFAULT_OUTBOX_DIR = "/var/lib/infra_tools/notification-outbox"
+OUTBOX_SCHEMA_VERSION = 1
+DEDUP_WINDOW_SECONDS = 300
+RETRY_BASE_SECONDS = 5.0
+RETRY_MAX_SECONDS = 3600.0
+MAX_DELIVERY_ATTEMPTS = 10
+
+Deliver = Callable[[NotificationConfig, Notification], None]
+
+
+def retry_delay(attempts: int, base: float = RETRY_BASE_SECONDS, ceiling: float = RETRY_MAX_SECONDS) -> float:
+    """Return the wait before retry number ``attempts`` (1-based)."""
+    return min(ceiling, base * (2 ** max(0, attempts - 1)))
+
+
+class NotificationOutbox:
+    """Queue notifications on disk and deliver them in the background."""
+
+    def __init__(
+        self,
+        directory: str,
+        deliver: Deliver,
+        logger: Optional[Logger] = None,
+        *,
+        dedup_window: float = DEDUP_WINDOW_SECONDS,
+        retry_base: float = RETRY_BASE_SECONDS,
+        retry_max: float = RETRY_MAX_SECONDS,
+        max_attempts: int = MAX_DELIVERY_ATTEMPTS,
+    ):
+        self.directory = directory
+        self.deliver = deliver
+        self.logger = logger
+        self.dedup_window = dedup_window
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.max_attempts = max_attempts
+        self._sequence = itertools.count()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def append(self, notification: Notification, configs: list[NotificationConfig]) -> str:
+        """Persist ``notification`` for every target and wake the flusher."""
+        entry_id = f"{time.time_ns():020d}-{os.getpid()}-{next(self._sequence):06d}"
+        entry: JSONDict = {
+            "version": OUTBOX_SCHEMA_VERSION,
+            "id": entry_id,
+            "created_at": time.time(),
+            "notification": asdict(notification),
+            "pending": [str(config) for config in configs],
+            "attempts": {},
+            "next_attempt_at": {},
+        }
+        path = os.path.join(self.directory, f"{entry_id}.json")
+        temporary_path = os.path.join(self.directory, f".{entry_id}.tmp")
+        with open(temporary_path, "w", encoding="utf-8") as handle:
+            json.dump(entry, handle)
+        os.replace(temporary_path, path)
+        self._wake.set()
+        return entry_id
+
+    def pending_count(self) -> int:
+        return len(self._entry_names())
+
+    def _entry_names(self) -> list[str]:
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(name for name in names if name.endswith(".json") and not name.startswith("."))
+
+    def _load_entries(self) -> list[JSONDict]:
+        entries = []
+        for name in self._entry_names():
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    entry = json.load(handle)
+            except (OSError, json.JSONDecodeError):
+                continue
+            if (
+                isinstance(entry, dict)
+                and entry.get("version") == OUTBOX_SCHEMA_VERSION
+                and isinstance(entry.get("pending"), list)
+                and isinstance(entry.get("notification"), dict)
+            ):
+                entry["_path"] = path
+                entries.append(entry)
+        return entries
+
+    def _collapse(self, entries: list[JSONDict]) -> None:
+        """Drop older targets superseded by a newer entry with the same dedup key."""
+        newest: dict[str, JSONDict] = {}
+        for entry in reversed(entries):
+            key = entry["notification"].get("dedup_key")
+            if not key:
+                continue
+            latest = newest.get(key)
+            if latest is None:
+                newest[key] = entry
+                continue
+            if latest["created_at"] - entry["created_at"] > self.dedup_window:
+                continue
+            superseded = [target for target in entry["pending"] if target in latest["pending"]]
+            if superseded:
+                entry["pending"] = [target for target in entry["pending"] if target not in superseded]
+                entry["_dirty"] = True
+                if self.logger:
+                    log_event(
+                        self.logger,
+                        "Queued notification superseded",
+                        level=INFO,
+                        dedup_key=key,
+                        targets=len(superseded),
+                    )
+
+    def _deliver_target(self, target: str, entries: list[JSONDict], now: float) -> dict[str, Optional[str]]:
+        """Deliver ``entries`` to one target in order, stopping at the first failure.
+
+        Returns a mapping of entry id to None on success or the error text.
+        """
+        config = NotificationConfig.from_string(target)
+        outcomes: dict[str, Optional[str]] = {}
+        for entry in entries:
+            if float(entry["next_attempt_at"].get(target, 0)) > now:
+                break
+            try:
+                self.deliver(config, Notification(**entry["notification"]))
+            except Exception as exc:
+                outcomes[entry["id"]] = str(exc)
+                break
+            outcomes[entry["id"]] = None
+        return outcomes
+
+    def flush(self, now: Optional[float] = None) -> Optional[float]:
+        """Deliver every due entry once.
+
+        Returns the earliest time a remaining entry becomes due, or None when
+        the outbox is empty. Another process already flushing the same outbox
+        makes this call a no-op.
+        """
+        with open(os.path.join(self.directory, ".flush.lock"), "a+", encoding="utf-8") as lock_handle:
+            try:
+                fcntl.flock(lock_handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return None
+            try:
+                return self._flush_locked(time.time() if now is None else now)
+            finally:
+                fcntl.flock(lock_handle.fileno(), fcntl.LOCK_UN)
+
+    def _flush_locked(self, now: float) -> Optional[float]:
+        entries = self._load_entries()
+        self._collapse(entries)
+        by_target: dict[str, list[JSONDict]] = {}
+        for entry in entries:
+            for target in entry["pending"]:
+                by_target.setdefault(target, []).append(entry)
+
+        results: dict[str, dict[str, Optional[str]]] = {}
+        if by_target:
+            with ThreadPoolExecutor(max_workers=len(by_target)) as pool:
+                futures = {
+                    target: pool.submit(self._deliver_target, target, target_entries, now)
+                    for target, target_entries in by_target.items()
+                }
+                results = {target: future.result() for target, future in futures.items()}
+
+        entries_by_id = {entry["id"]: entry for entry in entries}
+        for target, outcomes in results.items():
+            for entry_id, error in outcomes.items():
+                entry = entries_by_id[entry_id]
+                entry["_dirty"] = True
+                if error is None:
+                    entry["pending"].remove(target)
+                    entry["attempts"].pop(target, None)
+                    entry["next_attempt_at"].pop(target, None)
+                    continue
+                attempts = int(entry["attempts"].get(target, 0)) + 1
+                redacted = _redact_notification_target(NotificationConfig.from_string(target))
+                if attempts >= self.max_attempts:
+                    entry["pending"].remove(target)
+                    if self.logger:
+                        log_event(
+                            self.logger,
+                            "Notification dropped after repeated delivery failures",
+                            level=ERROR,
+                            job=entry["notification"].get("job"),
+                            target=redacted,
+                            attempts=attempts,
+                            error=error,
+                        )
+                    continue
+                entry["attempts"][target] = attempts
+                delay = retry_delay(attempts, self.retry_base, self.retry_max)
+                entry["next_attempt_at"][target] = now + delay
+                if self.logger:
+                    log_event(
+                        self.logger,
+                        "Notification delivery failed; will retry",
+                        level=WARNING,
+                        job=entry["notification"].get("job"),
+                        target=redacted,
+                        attempts=attempts,
+                        retry_in_seconds=round(delay, 1),
+                        error=error,
+                    )
+
+        next_due: Optional[float] = None
+        queued_targets: set[str] = set()
+        for entry in entries:
+            path = entry.pop("_path")
+            dirty = entry.pop("_dirty", False)
+            if not entry["pending"]:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                continue
+            if dirty:
+                write_json_atomic(path, entry, indent=None)
+            for target in entry["pending"]:
+                # Later entries wait behind the head of each target's queue.
+                if target in queued_targets:
+                    continue
+                queued_targets.add(target)
+                due = float(entry["next_attempt_at"].get(target, now))
+                next_due = due if next_due is None else min(next_due, due)
+        return next_due
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                next_due = self.flush()
+            except Exception as exc:
+                next_due = time.time() + self.retry_base
+                if self.logger:
+                    log_event(self.logger, "Notification outbox flush failed", level=ERROR, error=str(exc))
+            timeout = None if next_due is None else max(0.0, next_due - time.time())
+            self._wake.wait(timeout)
+
+    def start(self) -> None:
+        """Start the background flusher; it first drains entries left by earlier runs."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="notification-outbox", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background flusher and make one final delivery pass."""
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
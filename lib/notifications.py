@@ -5,11 +5,12 @@ Supports webhook and email notifications for important events.
 
 from __future__ import annotations
 
+import atexit
 import json
 import re
 import socket
 import subprocess
-from typing import Optional, Literal, cast
+from typing import TYPE_CHECKING, Optional, Literal, cast
 from dataclasses import dataclass, field
 from logging import ERROR, INFO, Logger, WARNING
 import urllib.request
@@ -19,6 +20,9 @@ import urllib.parse
 from lib.logging_utils import log_event
 from lib.types import JSONDict
 
+if TYPE_CHECKING:
+    from lib.notification_outbox import NotificationOutbox
+
 NotificationStatus = Literal["good", "info", "warning", "error"]
 NotificationState = Literal["firing", "resolved", "success"]
 NotificationDeliveryPolicy = Literal["always", "signal"]
@@ -26,6 +30,7 @@ NotificationDeliveryPolicy = Literal["always", "signal"]
 NETWORK_TIMEOUT_SECONDS = 30
 NOTIFICATION_SCHEMA_VERSION = 2
 _MAILBOX_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+_default_outbox: Optional[NotificationOutbox] = None
 
 
 @dataclass
@@ -103,21 +108,29 @@ class Notification:
 class NotificationSender:
     """Handles sending notifications to configured targets."""
     
-    def __init__(self, configs: list[NotificationConfig], logger: Optional[Logger] = None):
+    def __init__(
+        self,
+        configs: list[NotificationConfig],
+        logger: Optional[Logger] = None,
+        outbox: Optional[NotificationOutbox] = None,
+    ):
         """Initialize notification sender.
         
         Args:
             configs: List of notification configurations
             logger: Optional logger for debugging
+            outbox: Optional outbox; when set, send() queues instead of delivering
         """
         self.configs = configs
         self.logger = logger
+        self.outbox = outbox
     
     def send(self, notification: Notification) -> bool:
         """Send notification to all configured targets.
         
         Returns:
-            True only if ALL configured targets were sent successfully.
+            True only if ALL configured targets were sent successfully, or
+            the notification was queued durably in the outbox.
             Returns True if no targets are configured (nothing to fail).
         """
         if not self.configs:
@@ -134,14 +147,25 @@ class NotificationSender:
                     status=notification.status,
                 )
             return True
+
+        if self.outbox is not None:
+            try:
+                self.outbox.append(notification, self.configs)
+                return True
+            except OSError as e:
+                if self.logger:
+                    log_event(
+                        self.logger,
+                        "Notification outbox unavailable; delivering directly",
+                        level=WARNING,
+                        job=notification.job,
+                        error=str(e),
+                    )
         
         all_succeeded = True
         for config in self.configs:
             try:
-                if config.type == "webhook":
-                    self._send_webhook(config.target, notification)
-                elif config.type == "mailbox":
-                    self._send_mailbox(config.target, notification)
+                self.deliver(config, notification)
             except Exception as e:
                 all_succeeded = False
                 if self.logger:
@@ -156,6 +180,13 @@ class NotificationSender:
                     )
         
         return all_succeeded
+
+    def deliver(self, config: NotificationConfig, notification: Notification) -> None:
+        """Deliver to a single target, raising on failure."""
+        if config.type == "webhook":
+            self._send_webhook(config.target, notification)
+        elif config.type == "mailbox":
+            self._send_mailbox(config.target, notification)
     
     def _send_webhook(self, url: str, notification: Notification) -> None:
         """Send webhook notification via HTTP POST."""
@@ -278,10 +309,34 @@ def send_notification(
         delivery_policy=delivery_policy,
     )
     
-    sender = NotificationSender(configs, logger=logger)
+    sender = NotificationSender(configs, logger=logger, outbox=_default_outbox)
     return sender.send(notification)
 
 
+def enable_notification_outbox(
+    directory: Optional[str] = None,
+    logger: Optional[Logger] = None,
+) -> NotificationOutbox:
+    """Queue this process's notifications in a durable outbox.
+
+    After this call, send_notification() and send_notification_safe() append
+    to the outbox and return immediately; a background thread delivers the
+    queue, and one final pass runs at interpreter exit. Failed deliveries
+    stay queued for the next process that enables the same outbox.
+    """
+    global _default_outbox
+    from lib.notification_outbox import DEFAULT_OUTBOX_DIR, NotificationOutbox
+
+    if _default_outbox is not None:
+        return _default_outbox
+    sender = NotificationSender([], logger=logger)
+    outbox = NotificationOutbox(directory or DEFAULT_OUTBOX_DIR, sender.deliver, logger=logger)
+    outbox.start()
+    atexit.register(outbox.close)
+    _default_outbox = outbox
+    return outbox
+
+
 def send_notification_safe(
     configs: list[NotificationConfig],
     subject: str,
@@ -0,0 +1,363 @@
+"""SQLite index of operation logs for fast history queries.
+
+The index keeps one row per operation (type, timing, status, error count,
+creation context) plus aggregated numeric metrics, so questions such as
+"which scrubs failed last month" do not require scanning rotated JSON logs.
+Rows are written when an operation starts and completes. The raw logs stay
+authoritative: :func:`rebuild_operation_index` recreates the index from them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from lib.types import JSONDict
+
+INDEX_FILENAME = "index.sqlite3"
+INDEX_SCHEMA_VERSION = 1
+
+_LOG_NAME_PATTERN = re.compile(r"^(?P<type>.+)_\d{8}_\d{6}_(?P<id>[^_.]+)\.log(?:\.(?P<rotation>\d+))?$")
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS operations (
+        operation_id TEXT PRIMARY KEY,
+        operation_type TEXT,
+        log_file TEXT,
+        started_at REAL,
+        ended_at REAL,
+        status TEXT NOT NULL DEFAULT 'running',
+        duration_seconds REAL,
+        error_count INTEGER NOT NULL DEFAULT 0,
+        context TEXT NOT NULL DEFAULT '{}'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS metrics (
+        operation_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        unit TEXT,
+        count INTEGER NOT NULL,
+        total REAL NOT NULL,
+        minimum REAL NOT NULL,
+        maximum REAL NOT NULL,
+        last REAL NOT NULL,
+        PRIMARY KEY (operation_id, name)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS operations_type_started ON operations (operation_type, started_at)",
+    "CREATE INDEX IF NOT EXISTS operations_status_started ON operations (status, started_at)",
+)
+
+
+class MetricSummary:
+    """Running count/sum/min/max/last for one numeric metric."""
+
+    __slots__ = ("unit", "count", "total", "minimum", "maximum", "last")
+
+    def __init__(self, value: float, unit: Optional[str] = None):
+        self.unit = unit
+        self.count = 1
+        self.total = value
+        self.minimum = value
+        self.maximum = value
+        self.last = value
+
+    def add(self, value: float, unit: Optional[str] = None) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.last = value
+        if unit:
+            self.unit = unit
+
+
+def add_metric_sample(
+    metrics: dict[str, MetricSummary],
+    name: str,
+    value: Any,
+    unit: Optional[str] = None,
+) -> None:
+    """Fold a numeric metric value into ``metrics``; other values are ignored."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return
+    summary = metrics.get(name)
+    if summary is None:
+        metrics[name] = MetricSummary(float(value), unit)
+    else:
+        summary.add(float(value), unit)
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+class OperationIndex:
+    """Read and write the operation index database."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_SCHEMA_VERSION:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            connection.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+            connection.commit()
+        return connection
+
+    def record_start(
+        self,
+        operation_id: str,
+        operation_type: str,
+        log_file: str,
+        started_at: float,
+        context: Optional[JSONDict] = None,
+    ) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                """
+                INSERT OR REPLACE INTO operations
+                    (operation_id, operation_type, log_file, started_at, context)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (operation_id, operation_type, log_file, started_at, json.dumps(context or {}, default=str)),
+            )
+
+    def record_completion(
+        self,
+        operation_id: str,
+        *,
+        status: str,
+        ended_at: float,
+        duration_seconds: float,
+        error_count: int,
+        metrics: dict[str, MetricSummary],
+    ) -> None:
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                """
+                INSERT INTO operations (operation_id, status, ended_at, duration_seconds, error_count)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(operation_id) DO UPDATE SET
+                    status = excluded.status,
+                    ended_at = excluded.ended_at,
+                    duration_seconds = excluded.duration_seconds,
+                    error_count = excluded.error_count
+                """,
+                (operation_id, status, ended_at, duration_seconds, error_count),
+            )
+            self._write_metrics(connection, operation_id, metrics)
+
+    @staticmethod
+    def _write_metrics(
+        connection: sqlite3.Connection,
+        operation_id: str,
+        metrics: dict[str, MetricSummary],
+    ) -> None:
+        connection.executemany(
+            """
+            INSERT OR REPLACE INTO metrics
+                (operation_id, name, unit, count, total, minimum, maximum, last)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    operation_id,
+                    name,
+                    summary.unit,
+                    summary.count,
+                    summary.total,
+                    summary.minimum,
+                    summary.maximum,
+                    summary.last,
+                )
+                for name, summary in metrics.items()
+            ],
+        )
+
+    def prune(self, started_before: float) -> int:
+        """Drop index rows for operations whose logs have been cleaned up."""
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "DELETE FROM metrics WHERE operation_id IN "
+                "(SELECT operation_id FROM operations WHERE started_at < ?)",
+                (started_before,),
+            )
+            return connection.execute(
+                "DELETE FROM operations WHERE started_at < ?", (started_before,)
+            ).rowcount
+
+    def query(
+        self,
+        *,
+        operation_type: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        context: Optional[dict[str, str]] = None,
+        metric: Optional[str] = None,
+        limit: int = 50,
+    ) -> list[JSONDict]:
+        """Return matching operations, newest first."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if operation_type:
+            clauses.append("o.operation_type = ?")
+            params.append(operation_type)
+        if status:
+            clauses.append("o.status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("o.started_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("o.started_at < ?")
+            params.append(until)
+        for key, value in (context or {}).items():
+            clauses.append("CAST(json_extract(o.context, ?) AS TEXT) = ?")
+            params.extend((f'$."{key}"', value))
+        metric_columns = ""
+        metric_join = ""
+        if metric:
+            metric_columns = ", m.unit AS metric_unit, m.count AS metric_count, m.total AS metric_total, m.last AS metric_last"
+            metric_join = "LEFT JOIN metrics m ON m.operation_id = o.operation_id AND m.name = ?"
+            params.insert(0, metric)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f"""
+                SELECT o.operation_id, o.operation_type, o.log_file, o.started_at, o.ended_at,
+                       o.status, o.duration_seconds, o.error_count, o.context{metric_columns}
+                FROM operations o {metric_join}
+                {where}
+                ORDER BY o.started_at DESC
+                LIMIT ?
+                """,
+                params,
+            ).fetchall()
+        results = []
+        for row in rows:
+            result = dict(row)
+            result["context"] = json.loads(result["context"] or "{}")
+            results.append(result)
+        return results
+
+    def rebuild(self, log_dir: str) -> int:
+        """Replace the index contents with data parsed from ``log_dir``.
+
+        Returns the number of operations indexed.
+        """
+        operations = _scan_operation_logs(log_dir)
+        with closing(self._connect()) as connection, connection:
+            connection.execute("DELETE FROM metrics")
+            connection.execute("DELETE FROM operations")
+            for operation_id, operation in operations.items():
+                connection.execute(
+                    """
+                    INSERT INTO operations
+                        (operation_id, operation_type, log_file, started_at, ended_at,
+                         status, duration_seconds, error_count, context)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        operation_id,
+                        operation["operation_type"],
+                        operation["log_file"],
+                        operation["started_at"],
+                        operation["ended_at"],
+                        operation["status"],
+                        operation["duration_seconds"],
+                        operation["error_count"],
+                        json.dumps(operation["context"], default=str),
+                    ),
+                )
+                self._write_metrics(connection, operation_id, operation["metrics"])
+        return len(operations)
+
+
+def _log_files_oldest_first(log_dir: str) -> list[Path]:
+    """List operation logs so rotated segments precede the live file."""
+    candidates = []
+    for path in Path(log_dir).glob("*.log*"):
+        match = _LOG_NAME_PATTERN.match(path.name)
+        if match:
+            rotation = int(match.group("rotation") or 0)
+            candidates.append((path.name.split(".log", 1)[0], -rotation, path))
+    return [path for _base, _rotation, path in sorted(candidates)]
+
+
+def _scan_operation_logs(log_dir: str) -> dict[str, JSONDict]:
+    operations: dict[str, JSONDict] = {}
+    for path in _log_files_oldest_first(log_dir):
+        name_match = _LOG_NAME_PATTERN.match(path.name)
+        try:
+            handle = open(path, "r", encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        with handle:
+            for line in handle:
+                parts = line.split(" - ", 3)
+                if len(parts) != 4:
+                    continue
+                try:
+                    event = json.loads(parts[3])
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(event, dict) or not isinstance(event.get("operation_id"), str):
+                    continue
+                operation = operations.setdefault(event["operation_id"], {
+                    "operation_type": name_match.group("type") if name_match else None,
+                    "log_file": str(path).split(".log", 1)[0] + ".log",
+                    "started_at": None,
+                    "ended_at": None,
+                    "status": "running",
+                    "duration_seconds": None,
+                    "error_count": 0,
+                    "context": {},
+                    "metrics": {},
+                })
+                event_type = event.get("event_type")
+                if event_type == "operation_start":
+                    operation["started_at"] = _timestamp(event.get("start_time"))
+                elif event_type == "logger_created":
+                    if isinstance(event.get("operation_type"), str):
+                        operation["operation_type"] = event["operation_type"]
+                    if isinstance(event.get("context"), dict):
+                        operation["context"] = event["context"]
+                elif event_type == "metric" and isinstance(event.get("metric_name"), str):
+                    add_metric_sample(
+                        operation["metrics"], event["metric_name"], event.get("value"), event.get("unit")
+                    )
+                elif event_type == "error":
+                    operation["error_count"] += 1
+                elif event_type == "operation_complete":
+                    operation["status"] = str(event.get("status", "completed"))
+                    operation["ended_at"] = _timestamp(event.get("end_time"))
+                    duration = event.get("duration_seconds")
+                    if isinstance(duration, (int, float)):
+                        operation["duration_seconds"] = float(duration)
+    return operations
+
+
+def rebuild_operation_index(log_dir: str) -> int:
+    """Recreate ``log_dir``'s index from its raw operation logs."""
+    return OperationIndex(os.path.join(log_dir, INDEX_FILENAME)).rebuild(log_dir)
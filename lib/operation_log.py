@@ -1,14 +1,192 @@
-"""Operation logging framework extending logging_utils.py for audit trails."""
+"""Operation logging framework extending logging_utils.py for audit trails.
+
+Operation events are buffered in memory and appended to the rotating log in
+batches. A batch is written when it reaches ``FLUSH_MAX_EVENTS`` events or
+``FLUSH_MAX_BYTES`` bytes, when a background thread finds it older than
+``FLUSH_INTERVAL_SECONDS``, and immediately for severe or state-changing
+events (errors, warnings, checkpoints, rollbacks, start and completion).
+Pending events are also written at interpreter exit, and on SIGTERM/SIGHUP in
+entry points that call :func:`install_signal_flush`, so only a hard kill can
+lose up to one flush interval of routine events.
+"""
 
 from __future__ import annotations
+import atexit
 import json
+import os
+import signal
+import sqlite3
+import sys
+import threading
 import time
 import uuid
 from datetime import datetime
+from logging import INFO, getLevelName
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
+from types import FrameType
 from typing import Any, Optional
 
-from lib.logging_utils import get_rotating_logger, log_message
+from lib.logging_utils import STANDARD_DATE_FORMAT, get_rotating_logger, log_message
+from lib.operation_index import INDEX_FILENAME, MetricSummary, OperationIndex, add_metric_sample
+
+FLUSH_MAX_EVENTS = 256
+FLUSH_MAX_BYTES = 64 * 1024
+FLUSH_INTERVAL_SECONDS = 1.0
+# Documented per-event budget for buffered log_metric/log_step calls; see
+# scripts/benchmark_operation_log.py.
+EVENT_OVERHEAD_BUDGET_MICROSECONDS = 20.0
+_IMMEDIATE_EVENT_TYPES = frozenset({
+    "operation_start",
+    "checkpoint",
+    "rollback",
+    "error",
+    "warning",
+    "operation_complete",
+})
+_LEVEL_NAME = f"{getLevelName(INFO):<8}"
+
+
+class _BufferedEventWriter:
+    """Batch formatted operation events into single writes on a rotating handler."""
+
+    def __init__(self, name: str, handler: RotatingFileHandler):
+        self.name = name
+        self.handler = handler
+        self._lock = threading.Lock()
+        self._events: list[tuple[float, str]] = []
+        self._pending_bytes = 0
+        self._oldest = 0.0
+
+    def append(self, message: str, immediate: bool = False) -> None:
+        created = time.time()
+        with self._lock:
+            if not self._events:
+                self._oldest = created
+            self._events.append((created, message))
+            self._pending_bytes += len(message)
+            if (
+                not immediate
+                and len(self._events) < FLUSH_MAX_EVENTS
+                and self._pending_bytes < FLUSH_MAX_BYTES
+            ):
+                return
+            self._flush_locked()
+
+    def flush(self, older_than: Optional[float] = None, blocking: bool = True) -> None:
+        """Write pending events; without ``blocking``, skip a writer that is busy."""
+        if not self._lock.acquire(blocking=blocking):
+            return
+        try:
+            if not self._events:
+                return
+            if older_than is not None and self._oldest > older_than:
+                return
+            self._flush_locked()
+        finally:
+            self._lock.release()
+
+    def _flush_locked(self) -> None:
+        events, self._events, self._pending_bytes = self._events, [], 0
+        # Mirrors STANDARD_LOG_FORMAT; consecutive events usually share a second.
+        lines: list[str] = []
+        last_second = -1
+        stamp = ""
+        for created, message in events:
+            second = int(created)
+            if second != last_second:
+                stamp = time.strftime(STANDARD_DATE_FORMAT, time.localtime(second))
+                last_second = second
+            lines.append(f"{stamp} - {_LEVEL_NAME} - {self.name} - {message}\n")
+        self._write("".join(lines))
+
+    def _write(self, text: str) -> None:
+        handler = self.handler
+        handler.acquire()
+        try:
+            if handler.stream is None:
+                handler.setStream(open(handler.baseFilename, handler.mode, encoding=handler.encoding))
+            if handler.maxBytes > 0:
+                position = handler.stream.seek(0, os.SEEK_END)
+                if position > 0 and position + len(text) >= handler.maxBytes:
+                    handler.doRollover()
+            handler.stream.write(text)
+            handler.stream.flush()
+        except (OSError, IOError, ValueError) as e:
+            print(f"Error writing to log {handler.baseFilename}: {e}", file=sys.stderr)
+        finally:
+            handler.release()
+
+
+_writers_lock = threading.Lock()
+_writers: set[_BufferedEventWriter] = set()
+_flush_thread: Optional[threading.Thread] = None
+_signal_handlers_installed = False
+
+
+def flush_operation_logs(blocking: bool = True) -> None:
+    """Write every buffered operation event now.
+
+    Without ``blocking``, writers whose lock is held are skipped; signal
+    handlers use this because the interrupted code may hold those locks.
+    """
+    if not _writers_lock.acquire(blocking=blocking):
+        return
+    try:
+        writers = list(_writers)
+    finally:
+        _writers_lock.release()
+    for writer in writers:
+        writer.flush(blocking=blocking)
+
+
+def _flush_periodically() -> None:
+    while True:
+        time.sleep(FLUSH_INTERVAL_SECONDS)
+        cutoff = time.time() - FLUSH_INTERVAL_SECONDS
+        with _writers_lock:
+            writers = list(_writers)
+        for writer in writers:
+            writer.flush(older_than=cutoff)
+
+
+def _flush_then_reraise(signum: int, _frame: Optional[FrameType]) -> None:
+    flush_operation_logs(blocking=False)
+    signal.signal(signum, signal.SIG_DFL)
+    os.kill(os.getpid(), signum)
+
+
+def install_signal_flush() -> None:
+    """Flush buffered events before SIGTERM/SIGHUP terminate the process.
+
+    Entry points opt in from their main thread; signals that already have a
+    custom handler are left alone.
+    """
+    global _signal_handlers_installed
+    if _signal_handlers_installed or threading.current_thread() is not threading.main_thread():
+        return
+    _signal_handlers_installed = True
+    for signum in (signal.SIGTERM, signal.SIGHUP):
+        if signal.getsignal(signum) == signal.SIG_DFL:
+            signal.signal(signum, _flush_then_reraise)
+
+
+def _register_writer(writer: _BufferedEventWriter) -> None:
+    global _flush_thread
+    with _writers_lock:
+        _writers.add(writer)
+        if _flush_thread is None:
+            _flush_thread = threading.Thread(
+                target=_flush_periodically, name="operation-log-flush", daemon=True
+            )
+            _flush_thread.start()
+            atexit.register(flush_operation_logs)
+
+
+def _unregister_writer(writer: _BufferedEventWriter) -> None:
+    writer.flush()
+    with _writers_lock:
+        _writers.discard(writer)
 
 
 class OperationLogger:
@@ -24,10 +202,14 @@ class OperationLogger:
         self.operation_id = operation_id
         self.log_file = log_file
         self.logger = get_rotating_logger(f"operation_{operation_id}", log_file)
+        self._writer = self._buffered_writer()
         self.start_time = time.time()
         self.checkpoints: dict[str, dict[str, Any]] = {}
         self.current_step: Optional[str] = None
         self.status = "running"
+        self.index: Optional[OperationIndex] = None
+        self._metrics: dict[str, MetricSummary] = {}
+        self._error_count = 0
         
         # Log operation start
         self._log_event("operation_start", {
@@ -116,6 +298,7 @@ class OperationLogger:
         if context:
             error_data["context"] = context
         
+        self._error_count += 1
         self._log_event("error", error_data)
     
     def log_warning(self, warning_message: str, context: Optional[dict[str, Any]] = None) -> None:
@@ -153,6 +336,7 @@ class OperationLogger:
         if unit:
             metric_data["unit"] = unit
         
+        add_metric_sample(self._metrics, metric_name, value, unit)
         self._log_event("metric", metric_data)
     
     def complete(self, status: str = "completed", summary: Optional[str] = None) -> None:
@@ -177,6 +361,26 @@ class OperationLogger:
             completion_data["summary"] = summary
         
         self._log_event("operation_complete", completion_data)
+        if self.index is not None:
+            try:
+                self.index.record_completion(
+                    self.operation_id,
+                    status=status,
+                    ended_at=end_time,
+                    duration_seconds=round(duration, 2),
+                    error_count=self._error_count,
+                    metrics=self._metrics,
+                )
+            except (sqlite3.Error, OSError) as e:
+                print(f"Error updating operation index {self.index.path}: {e}", file=sys.stderr)
+        if self._writer is not None:
+            _unregister_writer(self._writer)
+            self._writer = None
+
+    def flush(self) -> None:
+        """Write buffered events for this operation now."""
+        if self._writer is not None:
+            self._writer.flush()
     
     def get_checkpoint(self, checkpoint_name: str) -> Optional[dict[str, Any]]:
         """Retrieve checkpoint state.
@@ -226,8 +430,26 @@ class OperationLogger:
             **data
         }
         
-        # Use the existing log_message function for consistent logging
-        log_message(self.logger, json.dumps(log_entry, default=str))
+        message = json.dumps(log_entry, default=str)
+        if self._writer is not None:
+            self._writer.append(message, immediate=event_type in _IMMEDIATE_EVENT_TYPES)
+        else:
+            log_message(self.logger, message)
+
+    def _buffered_writer(self) -> Optional[_BufferedEventWriter]:
+        """Return a batching writer when events go to a rotating file.
+
+        Loggers that fell back to stderr keep unbuffered writes.
+        """
+        if not self.logger.isEnabledFor(INFO):
+            return None
+        log_file_path = str(Path(self.log_file).resolve())
+        for handler in self.logger.handlers:
+            if isinstance(handler, RotatingFileHandler) and handler.baseFilename == log_file_path:
+                writer = _BufferedEventWriter(self.logger.name, handler)
+                _register_writer(writer)
+                return writer
+        return None
 
     def log_context(self, event_type: str, data: dict[str, Any]) -> None:
         """Public wrapper for logging contextual events (safe for external callers)."""
@@ -246,6 +468,7 @@ class OperationLoggerManager:
         self.base_log_dir = Path(base_log_dir)
         self.base_log_dir.mkdir(parents=True, exist_ok=True)
         self.active_loggers: dict[str, OperationLogger] = {}
+        self.index = OperationIndex(str(self.base_log_dir / INDEX_FILENAME))
     
     def create_logger(self, operation_type: str, **kwargs: Any) -> OperationLogger:
         """Create a new operation logger.
@@ -268,6 +491,11 @@ class OperationLoggerManager:
             "operation_type": operation_type,
             "context": kwargs
         })
+        try:
+            self.index.record_start(operation_id, operation_type, str(log_file), logger.start_time, kwargs)
+            logger.index = self.index
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error updating operation index {self.index.path}: {e}", file=sys.stderr)
         
         self.active_loggers: dict[str, OperationLogger] = self.active_loggers if hasattr(self, 'active_loggers') else {}
         self.active_loggers[operation_id] = logger
@@ -325,6 +553,10 @@ class OperationLoggerManager:
                     # Best-effort cleanup: ignore errors removing old log file.
                     pass
         
+        try:
+            self.index.prune(cutoff_time)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error pruning operation index {self.index.path}: {e}", file=sys.stderr)
         return cleaned_count
 
 
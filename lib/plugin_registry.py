@@ -52,6 +52,32 @@ class SystemTypeDefinition:
     step_builder: str | None = None
 
 
+RESOURCE_APT = "apt"
+RESOURCE_USERS = "users"
+RESOURCE_HOME = "home"
+RESOURCE_NGINX = "nginx"
+RESOURCE_SYSTEMD = "systemd"
+
+
+def path_resource(path: str) -> str:
+    """Return the resource name for a filesystem path and everything below it."""
+
+    return f"path:{path.rstrip('/') or '/'}"
+
+
+@dataclass(frozen=True)
+class StepResources:
+    """Shared target resources a custom step reads and writes.
+
+    ``home`` is the setup user's home directory; ``path:`` resources cover
+    the named path and its descendants.
+    """
+
+    step: str
+    reads: tuple[str, ...] = ()
+    writes: tuple[str, ...] = ()
+
+
 @dataclass(frozen=True)
 class PluginDefinition:
     """Declarative plugin contract for built-in plugin discovery."""
@@ -63,6 +89,7 @@ class PluginDefinition:
     system_types: tuple[SystemTypeDefinition, ...] = ()
     custom_steps: tuple[str, ...] = ()
     custom_step_provider: str | None = None
+    step_resources: tuple[StepResources, ...] = ()
     validators: tuple[str, ...] = ()
     validator_provider: str | None = None
 
@@ -75,6 +102,7 @@ class PluginRegistry:
     system_types: tuple[SystemTypeDefinition, ...]
     system_types_by_name: Mapping[str, SystemTypeDefinition] = field(default_factory=dict)
     custom_step_providers_by_name: Mapping[str, str] = field(default_factory=dict)
+    step_resources_by_name: Mapping[str, StepResources] = field(default_factory=dict)
     validator_providers_by_name: Mapping[str, str] = field(default_factory=dict)
 
 
@@ -137,6 +165,17 @@ def build_plugin_registry(plugin_definitions: Sequence[PluginDefinition]) -> Plu
                 f"Plugin {plugin_definition.name!r} must declare both custom_steps "
                 "and custom_step_provider together"
             )
+        for resources in plugin_definition.step_resources:
+            if resources.step not in plugin_definition.custom_steps:
+                raise ValueError(
+                    f"Plugin {plugin_definition.name!r} declares resources for "
+                    f"{resources.step!r}, which is not one of its custom steps"
+                )
+        declared_steps = [resources.step for resources in plugin_definition.step_resources]
+        if len(declared_steps) != len(set(declared_steps)):
+            raise ValueError(
+                f"Plugin {plugin_definition.name!r} declares resources for a step more than once"
+            )
         if bool(plugin_definition.validators) != bool(plugin_definition.validator_provider):
             raise ValueError(
                 f"Plugin {plugin_definition.name!r} must declare both validators "
@@ -174,6 +213,7 @@ def build_plugin_registry(plugin_definitions: Sequence[PluginDefinition]) -> Plu
     ordered_system_types: list[SystemTypeDefinition] = []
     custom_step_providers_by_name: dict[str, str] = {}
     custom_step_plugins_by_name: dict[str, str] = {}
+    step_resources_by_name: dict[str, StepResources] = {}
     validator_providers_by_name: dict[str, str] = {}
     validator_plugins_by_name: dict[str, str] = {}
     for plugin_definition in resolved_plugins:
@@ -198,6 +238,8 @@ def build_plugin_registry(plugin_definitions: Sequence[PluginDefinition]) -> Plu
                     )
                 custom_step_providers_by_name[custom_step] = plugin_definition.custom_step_provider
                 custom_step_plugins_by_name[custom_step] = plugin_definition.name
+            for resources in plugin_definition.step_resources:
+                step_resources_by_name[resources.step] = resources
         if plugin_definition.validator_provider:
             for validator_name in plugin_definition.validators:
                 if validator_name in validator_providers_by_name:
@@ -216,6 +258,7 @@ def build_plugin_registry(plugin_definitions: Sequence[PluginDefinition]) -> Plu
         system_types=tuple(ordered_system_types),
         system_types_by_name=system_types_by_name,
         custom_step_providers_by_name=custom_step_providers_by_name,
+        step_resources_by_name=step_resources_by_name,
         validator_providers_by_name=validator_providers_by_name,
     )
 
@@ -311,6 +354,22 @@ def resolve_custom_step(step_name: str) -> "StepFunc":
     return step_function
 
 
+def get_step_resources(step_function: "StepFunc") -> StepResources | None:
+    """Return the declared resources for a registered custom step function.
+
+    Steps that are not registered custom steps, or whose plugin declares no
+    resources for them, return None and must run exclusively.
+    """
+
+    step_name = getattr(step_function, "__name__", None)
+    if not isinstance(step_name, str):
+        return None
+    resources = get_plugin_registry().step_resources_by_name.get(step_name)
+    if resources is None or resolve_custom_step(step_name) is not step_function:
+        return None
+    return resources
+
+
 def resolve_validator(validator_name: str) -> Callable[..., object]:
     """Resolve a validator or parser name to its plugin-owned callable."""
 
@@ -0,0 +1,224 @@
+"""Persistent loopback port registry for deployed services.
+
+Each deployed component owns a sticky port keyed by its systemd unit name, so
+redeploys keep the same upstream and Nginx configs do not churn. Ports
+claimed by unmanaged ``app-*``/``node-*`` unit files are learned by scanning
+the unit directory, but only when its mtime changes; allocations otherwise
+use the registry's in-file state and an advancing cursor.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import re
+import socket
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Optional
+
+from lib.atomic_io import write_json_atomic
+from lib.types import JSONDict
+
+SYSTEMD_UNIT_DIR = "/etc/systemd/system"
+REGISTRY_SCHEMA_VERSION = 1
+FIRST_PORT = 8000
+LAST_PORT = 65534
+
+_UNIT_PREFIXES = ("app-", "node-")
+_UNIT_PORT_PATTERNS = (
+    re.compile(r"-p (\d+)"),
+    re.compile(r"--port (\d+)"),
+)
+_UNIT_ENV_PORT_PATTERN = re.compile(r"(?:PORT=|LISTEN_ADDR=[^\n]*:|GOCLICK_ADDR=[^\n]*:)(\d+)")
+
+
+class PortConflictError(RuntimeError):
+    """Raised when a fixed port is already held by another owner."""
+
+    def __init__(self, owner: str, port: int):
+        super().__init__(f"Port {port} requested by {owner} is already assigned")
+        self.owner = owner
+        self.port = port
+
+
+def scan_unit_ports(unit_dir: str = SYSTEMD_UNIT_DIR) -> dict[str, list[int]]:
+    """Return the ports referenced by each infra_tools-style service unit."""
+    units: dict[str, list[int]] = {}
+    try:
+        filenames = os.listdir(unit_dir)
+    except OSError:
+        return units
+    for filename in filenames:
+        if not filename.endswith(".service") or not filename.startswith(_UNIT_PREFIXES):
+            continue
+        try:
+            with open(os.path.join(unit_dir, filename), "r", encoding="utf-8") as handle:
+                content = handle.read()
+        except OSError:
+            continue
+        ports: set[int] = set()
+        for pattern in _UNIT_PORT_PATTERNS:
+            match = pattern.search(content)
+            if match:
+                ports.add(int(match.group(1)))
+        ports.update(int(match.group(1)) for match in _UNIT_ENV_PORT_PATTERN.finditer(content))
+        if ports:
+            units[filename.removesuffix(".service")] = sorted(ports)
+    return units
+
+
+def _port_is_bindable(port: int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        try:
+            probe.bind(("127.0.0.1", port))
+        except OSError:
+            return False
+    return True
+
+
+class PortRegistry:
+    """Read and update the host's loopback port assignments under one lock."""
+
+    def __init__(
+        self,
+        path: str,
+        unit_dir: str = SYSTEMD_UNIT_DIR,
+        first_port: int = FIRST_PORT,
+    ):
+        self.path = os.path.abspath(path)
+        self.unit_dir = unit_dir
+        self.first_port = first_port
+
+    @contextmanager
+    def _locked(self) -> Iterator[JSONDict]:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.lock", "a+", encoding="utf-8") as lock_handle:
+            fcntl.flock(lock_handle.fileno(), fcntl.LOCK_EX)
+            try:
+                state = self._load()
+                self._reconcile(state)
+                yield state
+                write_json_atomic(self.path, state, sort_keys=True)
+            finally:
+                fcntl.flock(lock_handle.fileno(), fcntl.LOCK_UN)
+
+    def _load(self) -> JSONDict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            payload = {}
+        if not isinstance(payload, dict) or payload.get("version") != REGISTRY_SCHEMA_VERSION:
+            payload = {}
+        assignments = payload.get("assignments")
+        units = payload.get("units")
+        return {
+            "version": REGISTRY_SCHEMA_VERSION,
+            "assignments": {
+                owner: port
+                for owner, port in (assignments.items() if isinstance(assignments, dict) else ())
+                if isinstance(owner, str) and isinstance(port, int)
+            },
+            "units": {
+                unit: [port for port in ports if isinstance(port, int)]
+                for unit, ports in (units.items() if isinstance(units, dict) else ())
+                if isinstance(unit, str) and isinstance(ports, list)
+            },
+            "unit_dir_mtime_ns": payload.get("unit_dir_mtime_ns"),
+            "cursor": payload.get("cursor") if isinstance(payload.get("cursor"), int) else None,
+        }
+
+    def _reconcile(self, state: JSONDict) -> None:
+        """Rescan unit files only when the unit directory has changed."""
+        try:
+            mtime_ns: Optional[int] = os.stat(self.unit_dir).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns is not None and mtime_ns == state["unit_dir_mtime_ns"]:
+            return
+        state["units"] = scan_unit_ports(self.unit_dir) if mtime_ns is not None else {}
+        state["unit_dir_mtime_ns"] = mtime_ns
+
+    @staticmethod
+    def _taken_by_others(state: JSONDict, owners: set[str]) -> set[int]:
+        taken = {
+            port for owner, port in state["assignments"].items() if owner not in owners
+        }
+        for unit, ports in state["units"].items():
+            if unit not in owners:
+                taken.update(ports)
+        return taken
+
+    def _next_free(self, state: JSONDict, taken: set[int]) -> int:
+        """Advance the cursor to the next unclaimed, bindable port."""
+        span = LAST_PORT - self.first_port + 1
+        cursor = state["cursor"]
+        if cursor is None or not self.first_port <= cursor <= LAST_PORT:
+            cursor = self.first_port
+        for offset in range(span):
+            port = self.first_port + (cursor - self.first_port + offset) % span
+            if port in taken or not _port_is_bindable(port):
+                continue
+            state["cursor"] = port + 1 if port < LAST_PORT else self.first_port
+            return port
+        raise RuntimeError("No free ports available")
+
+    def reserve(
+        self,
+        requests: Mapping[str, Optional[int]],
+        *,
+        preferred: Optional[Mapping[str, int]] = None,
+    ) -> dict[str, int]:
+        """Assign ports to owners atomically and return the assignments.
+
+        ``requests`` maps each owner to a fixed port or None for automatic
+        assignment. Automatic owners keep their previous port when it is still
+        free, then try ``preferred``, then take the next free port. Owners in
+        the same request may hand ports to one another.
+        """
+        owners = set(requests)
+        with self._locked() as state:
+            taken = self._taken_by_others(state, owners)
+            assigned: dict[str, int] = {}
+            for owner, port in requests.items():
+                if port is None:
+                    continue
+                if port in taken or port in assigned.values():
+                    raise PortConflictError(owner, port)
+                assigned[owner] = port
+            for owner, port in requests.items():
+                if port is not None:
+                    continue
+                claimed = taken | set(assigned.values())
+                for candidate in (
+                    state["assignments"].get(owner),
+                    (preferred or {}).get(owner),
+                ):
+                    if isinstance(candidate, int) and candidate not in claimed:
+                        assigned[owner] = candidate
+                        break
+                else:
+                    assigned[owner] = self._next_free(state, claimed)
+            state["assignments"].update(assigned)
+            return assigned
+
+    def release(self, owners: Iterable[str]) -> None:
+        """Forget assignments for owners that are no longer deployed."""
+        with self._locked() as state:
+            for owner in owners:
+                state["assignments"].pop(owner, None)
+
+    def restore(self, previous: Mapping[str, Optional[int]]) -> None:
+        """Put owners back to earlier assignments; None forgets the owner."""
+        with self._locked() as state:
+            for owner, port in previous.items():
+                if port is None:
+                    state["assignments"].pop(owner, None)
+                else:
+                    state["assignments"][owner] = port
+
+    def assignments(self) -> dict[str, int]:
+        with self._locked() as state:
+            return dict(state["assignments"])
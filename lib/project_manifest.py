@@ -30,6 +30,9 @@ MANIFEST_FILENAME = "infra.json"
 SUPPORTED_VERSION = 1
 MIN_PORT = 1024
 MAX_PORT = 65535
+READINESS_MODES = frozenset({"notify", "socket"})
+DEFAULT_HEALTH_TIMEOUT = 30
+MAX_HEALTH_TIMEOUT = 600
 
 _NAME_PATTERN = re.compile(r"^[a-z0-9-]+$")
 _PLACEHOLDER_RE = re.compile(r"\{\{\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*\}\}")
@@ -87,7 +90,7 @@ def _validate_placeholders(text: str, field: str, where: str) -> None:
     if "{{" in unmatched or "}}" in unmatched:
         raise ValueError(f"{where}: {field} contains a malformed template placeholder")
 
-_COMMON_FIELDS = {"name", "type", "domain", "path", "build", "env"}
+_COMMON_FIELDS = {"name", "type", "domain", "path", "build", "env", "inputs", "depends_on"}
 _STATIC_FIELDS = {"output"}
 _SERVICE_FIELDS = {
     "binary",
@@ -97,6 +100,8 @@ _SERVICE_FIELDS = {
     "runtime_env",
     "reverse_proxy",
     "health",
+    "health_timeout",
+    "readiness",
     "working_dir",
     "sqlite_backup",
     "backup_retention",
@@ -113,6 +118,9 @@ class Component:
     path: str = "/"
     build: StrList = field(default_factory=list)
     env: StrDict = field(default_factory=dict)
+    # Repository-relative build inputs; empty means the whole repository.
+    inputs: StrList = field(default_factory=list)
+    depends_on: StrList = field(default_factory=list)
     # static
     output: Optional[str] = None
     # service
@@ -122,6 +130,9 @@ class Component:
     env_file: Optional[str] = None
     reverse_proxy: bool = True
     health: Optional[str] = None
+    health_timeout: int = DEFAULT_HEALTH_TIMEOUT
+    # "notify" (sd_notify READY=1) or "socket" (systemd socket activation).
+    readiness: Optional[str] = None
     working_dir: Optional[str] = None
     runtime_env: StrDict = field(default_factory=dict)
     sqlite_backup: Optional[str] = None
@@ -241,9 +252,41 @@ def parse_manifest(data: object) -> Manifest:
         seen.add(component.name)
         components.append(component)
 
+    _validate_dependencies(components)
     return Manifest(version=version, components=components)
 
 
+def _validate_dependencies(components: list[Component]) -> None:
+    """Reject unknown, self-referencing, or cyclic ``depends_on`` entries."""
+    names = {component.name for component in components}
+    graph: dict[str, StrList] = {}
+    for component in components:
+        where = f"component {component.name!r}"
+        for dependency in component.depends_on:
+            if dependency == component.name:
+                raise ValueError(f"{where}: depends_on must not reference itself")
+            if dependency not in names:
+                raise ValueError(f"{where}: depends_on references unknown component {dependency!r}")
+        graph[component.name] = component.depends_on
+
+    visiting: set[str] = set()
+    visited: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"depends_on cycle includes component {name!r}")
+        visiting.add(name)
+        for dependency in graph[name]:
+            visit(dependency)
+        visiting.discard(name)
+        visited.add(name)
+
+    for component in components:
+        visit(component.name)
+
+
 def _parse_component(entry: object, index: int) -> Component:
     where = f"components[{index}]"
     if not isinstance(entry, dict):
@@ -277,6 +320,8 @@ def _parse_component(entry: object, index: int) -> Component:
 
     build = _parse_build(entry.get("build"), where)
     env = _parse_env(entry.get("env"), where)
+    inputs = _parse_inputs(entry.get("inputs"), where)
+    depends_on = _parse_depends_on(entry.get("depends_on"), where)
 
     common = dict(
         name=name,
@@ -285,6 +330,8 @@ def _parse_component(entry: object, index: int) -> Component:
         path=path,
         build=build,
         env=env,
+        inputs=inputs,
+        depends_on=depends_on,
     )
 
     if comp_type == "static":
@@ -348,6 +395,22 @@ def _parse_service(entry: dict, where: str, common: dict) -> Component:
     if health is not None:
         validate_no_control_characters(health, f"{where} health")
 
+    health_timeout = entry.get("health_timeout", DEFAULT_HEALTH_TIMEOUT)
+    if (
+        not isinstance(health_timeout, int)
+        or isinstance(health_timeout, bool)
+        or not 1 <= health_timeout <= MAX_HEALTH_TIMEOUT
+    ):
+        raise ValueError(
+            f"{where}: health_timeout must be an integer from 1 through {MAX_HEALTH_TIMEOUT}"
+        )
+
+    readiness = entry.get("readiness")
+    if readiness is not None and readiness not in READINESS_MODES:
+        raise ValueError(
+            f"{where}: readiness must be one of {', '.join(sorted(READINESS_MODES))}"
+        )
+
     working_dir = entry.get("working_dir")
     if working_dir is not None:
         if not isinstance(working_dir, str) or not working_dir:
@@ -383,6 +446,8 @@ def _parse_service(entry: dict, where: str, common: dict) -> Component:
         runtime_env=runtime_env,
         reverse_proxy=reverse_proxy,
         health=health,
+        health_timeout=health_timeout,
+        readiness=readiness,
         working_dir=working_dir,
         sqlite_backup=sqlite_backup,
         backup_retention=backup_retention,
@@ -409,6 +474,35 @@ def _parse_build(value: object, where: str) -> StrList:
     raise ValueError(f"{where}: build must be a string or array of strings")
 
 
+def _parse_inputs(value: object, where: str) -> StrList:
+    if value is None:
+        return []
+    if not isinstance(value, list) or not value:
+        raise ValueError(f"{where}: inputs must be a non-empty array of repository paths")
+    inputs: StrList = []
+    for entry in value:
+        if not isinstance(entry, str) or not entry:
+            raise ValueError(f"{where}: each input must be a non-empty string")
+        validate_no_control_characters(entry, f"{where} inputs")
+        _require_repo_relative(entry, "inputs", where)
+        inputs.append(os.path.normpath(entry))
+    return inputs
+
+
+def _parse_depends_on(value: object, where: str) -> StrList:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError(f"{where}: depends_on must be an array of component names")
+    dependencies: StrList = []
+    for entry in value:
+        if not isinstance(entry, str) or not _NAME_PATTERN.match(entry):
+            raise ValueError(f"{where}: depends_on entries must be component names")
+        if entry not in dependencies:
+            dependencies.append(entry)
+    return dependencies
+
+
 def _parse_env(
     value: object,
     where: str,
@@ -15,6 +15,7 @@ from typing import Optional
 from lib.cluster_update import run_cluster_update
 from lib.proxmox_backup import BackupInfo, ProxmoxBackupError, create_backup, list_backups
 from lib.proxmox_guest import probe_proxmox_cluster, probe_proxmox_host
+from lib.proxmox_vm_batch import DEFAULT_MAX_NODE_OPERATIONS, run_vm_batch_provision
 from lib.proxmox_migrate import ProxmoxMigrateError, migrate_guest
 from lib.proxmox_maintenance import (
     collect_maintenance_report,
@@ -167,6 +168,36 @@ def add_proxmox_subparser(subparsers: argparse._SubParsersAction) -> argparse.Ar
     )
     rolling_update.set_defaults(_handler=_cmd_rolling_update)
 
+    provision = sub.add_parser(
+        "provision",
+        help="Provision saved VM setups concurrently",
+        description=(
+            "Create the VMs of several saved setups at once. VMIDs are reserved "
+            "up front; image transfers and disk imports are capped per node "
+            "while boot and SSH waits overlap."
+        ),
+    )
+    provision.add_argument(
+        "targets",
+        nargs="+",
+        help="Saved setup names/hosts of the VMs to provision",
+    )
+    provision.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate and print provisioning plans without creating VMs",
+    )
+    provision.add_argument(
+        "--max-node-operations",
+        type=int,
+        default=DEFAULT_MAX_NODE_OPERATIONS,
+        help=(
+            "Concurrent image transfers/disk imports per Proxmox node "
+            f"(default: {DEFAULT_MAX_NODE_OPERATIONS})"
+        ),
+    )
+    provision.set_defaults(_handler=_cmd_provision)
+
     ls = sub.add_parser("ls", aliases=["list"], help="List guests on a host")
     ls.add_argument("host", help="Registered host name or address")
     ls.set_defaults(_handler=_cmd_containers_ls)
@@ -817,6 +848,15 @@ def _cmd_rolling_update(args: argparse.Namespace, workspace: Optional[str]) -> i
     )
 
 
+def _cmd_provision(args: argparse.Namespace, workspace: Optional[str]) -> int:
+    return run_vm_batch_provision(
+        list(args.targets),
+        workspace=workspace,
+        dry_run=args.dry_run,
+        max_node_operations=args.max_node_operations,
+    )
+
+
 def _cmd_containers_ls(args: argparse.Namespace, workspace: Optional[str]) -> int:
     host = _resolve_host(args.host, workspace)
     rows = list_containers(host)
@@ -514,6 +514,50 @@ def _get_next_vmid(
     return vmid
 
 
+def _reserve_vmids(
+    node_ip: str,
+    user: str,
+    ssh_opts: StrList,
+    count: int,
+    *,
+    floor: int = 0,
+    dry_run: bool = False,
+) -> list[int]:
+    """Return ``count`` distinct free VMIDs, all at or above ``floor``.
+
+    The candidates are checked against the cluster in one remote call, so
+    guests provisioned together never race each other for ``/cluster/nextid``.
+    Pass the highest ID already handed out as ``floor`` when reserving for
+    several nodes of one cluster.
+    """
+    if count < 1:
+        return []
+    if dry_run:
+        start = max(100, floor)
+        return list(range(start, start + count))
+    script = (
+        f"id=$(pvesh get /cluster/nextid) || exit 1; "
+        f"[ \"$id\" -ge {int(floor)} ] || id={int(floor)}; "
+        f"found=0; tries=0; "
+        f"while [ $found -lt {int(count)} ] && [ $tries -lt 1000 ]; do "
+        f"if pvesh get /cluster/nextid --vmid $id >/dev/null 2>&1; then "
+        f"echo $id; found=$((found + 1)); fi; "
+        f"id=$((id + 1)); tries=$((tries + 1)); done"
+    )
+    result = _ssh_run(node_ip, user, ssh_opts, script, log_cmd=f"reserve {count} VMID(s)")
+    try:
+        vmids = [int(line) for line in (result.stdout or "").split()]
+    except ValueError:
+        vmids = []
+    if result.returncode != 0 or len(vmids) != count:
+        raise ProvisionError(
+            f"Could not reserve {count} VMID(s) on {node_ip}: "
+            f"{(result.stderr or result.stdout or '').strip() or 'not enough free IDs'}"
+        )
+    print(f"  ✓ Reserved VMIDs: {', '.join(str(vmid) for vmid in vmids)}")
+    return vmids
+
+
 def _resolve_storage_pool(
     pool_arg: str,
     node_ip: str,
@@ -1113,6 +1157,7 @@ __all__ = [
     "_get_node_name",
     "_is_usable_nameserver",
     "_parse_corosync_config",
+    "_reserve_vmids",
     "_list_proxmox_bridges",
     "_list_storage_names_for_content",
     "_list_storage_pools",
@@ -0,0 +1,143 @@
+"""Content-addressed cloud image cache on Proxmox nodes.
+
+Each node records a verified image in ``IMAGE_CACHE_DIR/<sha512>`` as the
+``SIZE MTIME PATH`` of the file that passed verification. A later fetch whose
+file still has that size and mtime reuses it without rehashing. A node without
+the image first copies it from a cluster peer that has it recorded and only
+downloads it from the internet when no peer can supply it. The transfer and
+its SHA-512 check run in a single SSH invocation.
+"""
+
+from __future__ import annotations
+
+import re
+import shlex
+import time
+from dataclasses import dataclass
+
+from lib.proxmox_guest import ProvisionError, _ssh_run
+from lib.types import StrList
+
+IMAGE_CACHE_DIR = "/var/lib/infra_tools/image-cache"
+_RESULT_RE = re.compile(
+    r"^infra_tools-image (?P<origin>\S+) (?P<bytes>\d+) (?P<size>\d+)$", re.MULTILINE
+)
+_SHA512_RE = re.compile(r"[0-9a-f]{128}")
+_MIB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ImageFetch:
+    """Where a node's cloud image came from and what fetching it cost.
+
+    ``size`` is the staged file's size in bytes, or 0 when it was not measured.
+    """
+
+    path: str
+    origin: str
+    bytes_transferred: int = 0
+    seconds: float = 0.0
+    size: int = 0
+
+    def describe(self) -> str:
+        if self.origin == "cached":
+            return "already verified on the node (recorded digest reused)"
+        if self.origin == "local":
+            return "found in image storage and verified"
+        if self.origin == "dry-run":
+            return "not fetched (dry run)"
+        size = f"{self.bytes_transferred / _MIB:.1f} MiB"
+        if self.origin.startswith("peer:"):
+            return f"copied {size} from cluster peer {self.origin[5:]} in {self.seconds:.1f}s"
+        return f"downloaded {size} in {self.seconds:.1f}s"
+
+
+def render_image_fetch_script(url: str, sha512: str, remote_path: str) -> str:
+    """Return the node-side shell script that provides a verified image at ``remote_path``."""
+    if not _SHA512_RE.fullmatch(sha512):
+        raise ProvisionError("Cached cloud images require a lowercase SHA-512 digest")
+    index = f"{IMAGE_CACHE_DIR}/{sha512}"
+    remote_dir = remote_path.rsplit("/", 1)[0] or "/"
+    # The peer command is single-quoted so the peer reads its own index.
+    peer_command = f'f=$(cut -d" " -f3- {index}) && [ -f "$f" ] && exec cat -- "$f"'
+    return f"""index={shlex.quote(index)}
+dest={shlex.quote(remote_path)}
+part="$dest.part.$$"
+expected={shlex.quote(sha512)}
+verify() {{ echo "$expected  $1" | sha512sum -c --status -; }}
+mkdir -p {shlex.quote(IMAGE_CACHE_DIR)} {shlex.quote(remote_dir)} || exit 1
+exec 9>"$index.lock" && flock 9 || exit 1
+if [ -f "$index" ] && [ "$(cat "$index")" = "$(stat -c '%s %Y %n' -- "$dest" 2>/dev/null)" ]; then
+  echo "infra_tools-image cached 0 $(cut -d" " -f1 "$index")"
+  exit 0
+fi
+origin=local
+bytes=0
+if [ -f "$dest" ]; then
+  verify "$dest" || {{ echo "existing $dest does not match the pinned SHA-512" >&2; exit 2; }}
+else
+  origin=
+  own=" $(hostname -I 2>/dev/null) "
+  for peer in $(awk '/ring0_addr:/ {{print $2}}' /etc/pve/corosync.conf 2>/dev/null); do
+    case "$own" in *" $peer "*) continue ;; esac
+    if ssh -n -o BatchMode=yes -o ConnectTimeout=10 root@"$peer" {shlex.quote(peer_command)} >"$part" 2>/dev/null \\
+        && verify "$part"; then
+      origin="peer:$peer"
+      break
+    fi
+  done
+  if [ -z "$origin" ]; then
+    wget -q --https-only -O "$part" {shlex.quote(url)} || {{ rm -f "$part"; echo "download failed" >&2; exit 1; }}
+    verify "$part" || {{ rm -f "$part"; echo "downloaded image does not match the pinned SHA-512" >&2; exit 2; }}
+    origin=download
+  fi
+  bytes=$(stat -c %s -- "$part")
+  mv -- "$part" "$dest" || {{ rm -f "$part"; exit 1; }}
+fi
+stat -c '%s %Y %n' -- "$dest" >"$index.tmp" && mv -- "$index.tmp" "$index"
+echo "infra_tools-image $origin $bytes $(stat -c %s -- "$dest")"
+"""
+
+
+def fetch_cached_image(
+    url: str,
+    sha512: str,
+    remote_path: str,
+    node_ip: str,
+    user: str,
+    ssh_opts: StrList,
+) -> ImageFetch:
+    """Provide a SHA-512-verified image at ``remote_path`` on ``node_ip``."""
+    started = time.monotonic()
+    result = _ssh_run(
+        node_ip,
+        user,
+        ssh_opts,
+        render_image_fetch_script(url, sha512, remote_path),
+        log_cmd=f"fetch cloud image {sha512[:12]} → {remote_path}",
+    )
+    detail = (result.stderr or result.stdout or "").strip()
+    if result.returncode == 2:
+        raise ProvisionError(
+            f"SHA-512 verification failed for {remote_path} on {node_ip}: {detail}"
+        )
+    match = _RESULT_RE.search(result.stdout or "")
+    if result.returncode != 0 or match is None:
+        raise ProvisionError(
+            f"Failed to fetch cloud image on {node_ip}: {detail or 'unknown error'}"
+        )
+    return ImageFetch(
+        path=remote_path,
+        origin=match.group("origin"),
+        bytes_transferred=int(match.group("bytes")),
+        seconds=time.monotonic() - started,
+        size=int(match.group("size")),
+    )
+
+
+__all__ = [
+    "IMAGE_CACHE_DIR",
+    "ImageFetch",
+    "fetch_cached_image",
+    "render_image_fetch_script",
+]
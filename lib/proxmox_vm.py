@@ -28,9 +28,11 @@ import json
 import os
 import re
 import shlex
+import threading
 import time
-from dataclasses import dataclass
-from typing import Optional, cast
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import ContextManager, Optional, cast
 
 from lib.cloud_images import (
     CloudImage,
@@ -46,6 +48,7 @@ from lib.proxmox_guest import (
     _get_guest_gateway,
     _get_host_nameservers,
     _get_next_vmid,
+    _reserve_vmids,
     _resolve_public_key_path,
     _resolve_storage_pool,
     _ssh_opts,
@@ -54,6 +57,8 @@ from lib.proxmox_guest import (
     auto_detect_bridge,
     enroll_provisioned_guest_host_keys,
 )
+from lib.proxmox_image_cache import ImageFetch, fetch_cached_image
+from lib.proxmox_vm_template import VMTemplate, build_vm_template, find_vm_template
 from lib.proxmox_memory import (
     DEFAULT_BALLOON_TARGET_PERCENT,
     GuestMemoryAllocation,
@@ -89,6 +94,28 @@ class _ExistingVM:
     cores: Optional[int]
 
 
+@dataclass
+class NodeBatch:
+    """State shared by VMs provisioned concurrently on one Proxmox node.
+
+    ``operations`` caps concurrent image transfers and disk imports;
+    ``admission`` serializes memory checks so each VM sees the floors of
+    batch VMs admitted before it, even those not yet running.
+    ``batch_vmids`` holds every VMID the whole batch has been assigned,
+    shared by the node batches of one run under ``vmid_lock``, so a VMID
+    retry never takes an ID reserved for another batch member.
+    """
+
+    operations: threading.BoundedSemaphore
+    admission: threading.Lock = field(default_factory=threading.Lock)
+    admitted_minimum_mib: int = 0
+    admitted_maximum_mib: int = 0
+    batch_vmids: set[int] = field(default_factory=set)
+    vmid_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+_MIB = 1024 * 1024
+_VMID_RETRY_ATTEMPTS = 3
 _UNIT_TO_KIB = {"K": 1, "M": 1024, "G": 1024 * 1024, "T": 1024 * 1024 * 1024}
 
 
@@ -703,8 +730,13 @@ def _download_image_to_host(
     ssh_opts: StrList,
     *,
     dry_run: bool,
-) -> str:
-    """Fetch ``image`` onto the Proxmox node; return the absolute remote path."""
+) -> ImageFetch:
+    """Provide ``image`` on the Proxmox node and report how it got there.
+
+    Pinned images go through the node's content-addressed cache (see
+    :mod:`lib.proxmox_image_cache`); unpinned images are downloaded when the
+    staged file is missing.
+    """
     if not image.url or not image.filename:
         raise ProvisionError("Internal error: download requested without URL")
     if storage_content not in {"import", "iso"}:
@@ -742,8 +774,17 @@ def _download_image_to_host(
 
     if dry_run:
         print(f"  [DRY-RUN] Would download {image.url} → {remote_path}")
-        return remote_path
+        return ImageFetch(path=remote_path, origin="dry-run")
+
+    if image.sha512:
+        print(f"  Fetching cloud image: {image.url}")
+        fetched = fetch_cached_image(
+            image.url, image.sha512, remote_path, node_ip, user, ssh_opts
+        )
+        print(f"  ✓ SHA-512 verified; cloud image {fetched.describe()}")
+        return fetched
 
+    started = time.monotonic()
     mkdir_result = _ssh_run(
         node_ip, user, ssh_opts, f"mkdir -p {shlex.quote(remote_dir)}"
     )
@@ -756,7 +797,8 @@ def _download_image_to_host(
         f"if [ ! -f {shlex.quote(remote_path)} ]; then "
         f"wget -q --https-only --show-progress -O {shlex.quote(remote_path)}.part "
         f"{shlex.quote(image.url)} && "
-        f"mv {shlex.quote(remote_path)}.part {shlex.quote(remote_path)}; "
+        f"mv {shlex.quote(remote_path)}.part {shlex.quote(remote_path)} && "
+        f"stat -c %s {shlex.quote(remote_path)}; "
         f"fi"
     )
     print(f"  Downloading cloud image: {image.url}")
@@ -766,22 +808,17 @@ def _download_image_to_host(
             f"Failed to download cloud image on {node_ip}: "
             f"{(result.stderr or result.stdout or '').strip() or 'unknown error'}"
         )
-    if image.sha512:
-        check = (
-            f"echo {shlex.quote(image.sha512 + '  ' + remote_path)} "
-            f"| sha512sum -c -"
-        )
-        verify = _ssh_run(node_ip, user, ssh_opts, check)
-        if verify.returncode != 0:
-            raise ProvisionError(
-                f"SHA-512 verification failed for {image.filename} on {node_ip}: "
-                f"{(verify.stderr or verify.stdout or '').strip()}"
-            )
-        print(f"  ✓ SHA-512 verified")
-    else:
-        print(f"  ⚠ No SHA-512 pinned for {image.filename}; skipping verification")
-
-    return remote_path
+    print(f"  ⚠ No SHA-512 pinned for {image.filename}; skipping verification")
+    downloaded = (result.stdout or "").strip()
+    if not downloaded.isdigit():
+        return ImageFetch(path=remote_path, origin="local")
+    return ImageFetch(
+        path=remote_path,
+        origin="download",
+        bytes_transferred=int(downloaded),
+        seconds=time.monotonic() - started,
+        size=int(downloaded),
+    )
 
 
 def _render_user_data(
@@ -939,6 +976,110 @@ def _destroy_vm_best_effort(
         print(f"  ✓ Removed partially provisioned VM {vmid}")
 
 
+def _clone_vm_template(
+    template_vmid: int,
+    vmid: int,
+    hostname: str,
+    root_pool: str,
+    node_ip: str,
+    user: str,
+    ssh_opts: StrList,
+    *,
+    dry_run: bool = False,
+) -> str:
+    """Clone ``template_vmid`` into ``vmid``; linked unless the storage refuses."""
+    clone_cmd = f"qm clone {template_vmid} {vmid} --name {shlex.quote(hostname)}"
+    result = _ssh_run(node_ip, user, ssh_opts, clone_cmd, dry_run=dry_run)
+    if result.returncode == 0:
+        return "linked clone"
+    detail = (result.stderr or result.stdout or "").strip()
+    if "linked clone" not in detail.lower():
+        raise ProvisionError(f"qm clone {template_vmid} → {vmid} failed: {detail or 'unknown error'}")
+    print(f"  ⚠ {root_pool} does not support linked clones; copying the template disk")
+    result = _ssh_run(
+        node_ip,
+        user,
+        ssh_opts,
+        f"{clone_cmd} --full 1 --storage {shlex.quote(root_pool)}",
+        dry_run=dry_run,
+    )
+    if result.returncode != 0:
+        raise ProvisionError(
+            f"qm clone {template_vmid} → {vmid} failed: "
+            f"{(result.stderr or result.stdout or '').strip() or 'unknown error'}"
+        )
+    return "full clone"
+
+
+def _create_vm_with_image(
+    vmid: int,
+    options: str,
+    image_remote_path: Optional[str],
+    storage_ref: Optional[str],
+    root_pool: str,
+    node_ip: str,
+    user: str,
+    ssh_opts: StrList,
+    *,
+    dry_run: bool = False,
+) -> str:
+    """Create ``vmid`` and attach a root disk copied from the image source."""
+    create_cmd = f"qm create {vmid} {options}"
+    result = _ssh_run(node_ip, user, ssh_opts, create_cmd, dry_run=dry_run)
+    if result.returncode != 0:
+        raise ProvisionError(
+            f"qm create {vmid} failed: "
+            f"{(result.stderr or result.stdout or '').strip() or 'unknown error'}"
+        )
+
+    # Attach the disk: prefer importing the qcow2; otherwise reference the
+    # pre-uploaded storage volume directly.
+    if image_remote_path:
+        # Let Proxmox choose the target's native image format. Block-backed
+        # pools such as LVM-thin only support raw volumes, while directory
+        # pools commonly use qcow2.
+        import_cmd = (
+            f"qm disk import {vmid} {shlex.quote(image_remote_path)} "
+            f"{shlex.quote(root_pool)}"
+        )
+        imported = _ssh_run(node_ip, user, ssh_opts, import_cmd, dry_run=dry_run)
+        if imported.returncode != 0:
+            if not dry_run:
+                _destroy_vm_best_effort(vmid, node_ip, user, ssh_opts)
+            raise ProvisionError(
+                f"qm disk import for VM {vmid} failed: "
+                f"{(imported.stderr or imported.stdout or '').strip() or 'unknown error'}"
+            )
+        # Proxmox names the imported volume {pool}:vm-{vmid}-disk-0.
+        disk_volume = f"{root_pool}:vm-{vmid}-disk-0"
+        root_disk = "import"
+    elif storage_ref:
+        # Caller has uploaded a qcow2 to e.g. local:import/foo.qcow2; let qm
+        # import-from copy it into the root pool during set.
+        disk_volume = f"{root_pool}:0,import-from={storage_ref}"
+        root_disk = "storage"
+    else:
+        if not dry_run:
+            _destroy_vm_best_effort(vmid, node_ip, user, ssh_opts)
+        raise ProvisionError("No image source available to attach to VM disk")
+
+    set_cmd = (
+        f"qm set {vmid} "
+        f"--scsi0 {shlex.quote(disk_volume)},iothread=1 "
+        f"--ide2 {shlex.quote(root_pool)}:cloudinit "
+        f"--boot order=scsi0"
+    )
+    set_result = _ssh_run(node_ip, user, ssh_opts, set_cmd, dry_run=dry_run)
+    if set_result.returncode != 0:
+        if not dry_run:
+            _destroy_vm_best_effort(vmid, node_ip, user, ssh_opts)
+        raise ProvisionError(
+            f"qm set for VM {vmid} failed: "
+            f"{(set_result.stderr or set_result.stdout or '').strip() or 'unknown error'}"
+        )
+    return root_disk
+
+
 def _create_vm(
     *,
     vmid: int,
@@ -966,8 +1107,14 @@ def _create_vm(
     dry_run: bool = False,
     ipv6_cidr: Optional[str] = None,
     gateway6: Optional[str] = None,
-) -> bool:
-    """Build, populate, and start the VM on ``node_ip``."""
+    template_vmid: Optional[int] = None,
+) -> str:
+    """Build, populate, and start the VM on ``node_ip``.
+
+    With ``template_vmid`` the root disk is cloned from that template instead
+    of imported. Returns how the root disk was created: ``import``,
+    ``storage``, ``linked clone`` or ``full clone``.
+    """
     ipconfig_parts = [
         f"ip={target_ip}/{cidr_prefix}",
         f"gw={gateway}",
@@ -977,8 +1124,7 @@ def _create_vm(
         if gateway6:
             ipconfig_parts.append(f"gw6={gateway6}")
 
-    create_parts = [
-        f"qm create {vmid}",
+    option_parts = [
         f"--name {shlex.quote(hostname)}",
         f"--memory {memory_mb}",
         f"--balloon {balloon_min_mb}",
@@ -999,60 +1145,36 @@ def _create_vm(
         "--onboot 1",
     ]
     if user_data_ref:
-        create_parts.append(f"--cicustom user={shlex.quote(user_data_ref)}")
+        option_parts.append(f"--cicustom user={shlex.quote(user_data_ref)}")
+    options = " ".join(option_parts)
 
-    create_cmd = " ".join(create_parts)
-    result = _ssh_run(node_ip, user, ssh_opts, create_cmd, dry_run=dry_run)
-    if result.returncode != 0:
-        raise ProvisionError(
-            f"qm create {vmid} failed: "
-            f"{(result.stderr or result.stdout or '').strip() or 'unknown error'}"
+    if template_vmid is not None:
+        root_disk = _clone_vm_template(
+            template_vmid, vmid, hostname, root_pool, node_ip, user, ssh_opts, dry_run=dry_run
         )
-    created = True
-
-    # Attach the disk: prefer importing the qcow2; otherwise reference the
-    # pre-uploaded storage volume directly.
-    if image_remote_path:
-        # Let Proxmox choose the target's native image format. Block-backed
-        # pools such as LVM-thin only support raw volumes, while directory
-        # pools commonly use qcow2.
-        import_cmd = (
-            f"qm disk import {vmid} {shlex.quote(image_remote_path)} "
-            f"{shlex.quote(root_pool)}"
+        set_result = _ssh_run(
+            node_ip, user, ssh_opts, f"qm set {vmid} {options}", dry_run=dry_run
         )
-        imported = _ssh_run(node_ip, user, ssh_opts, import_cmd, dry_run=dry_run)
-        if imported.returncode != 0:
-            if not dry_run and created:
+        if set_result.returncode != 0:
+            if not dry_run:
                 _destroy_vm_best_effort(vmid, node_ip, user, ssh_opts)
             raise ProvisionError(
-                f"qm disk import for VM {vmid} failed: "
-                f"{(imported.stderr or imported.stdout or '').strip() or 'unknown error'}"
+                f"qm set for cloned VM {vmid} failed: "
+                f"{(set_result.stderr or set_result.stdout or '').strip() or 'unknown error'}"
             )
-        # Proxmox names the imported volume {pool}:vm-{vmid}-disk-0.
-        disk_volume = f"{root_pool}:vm-{vmid}-disk-0"
-    elif storage_ref:
-        # Caller has uploaded a qcow2 to e.g. local:import/foo.qcow2; let qm
-        # import-from copy it into the root pool during set.
-        disk_volume = f"{root_pool}:0,import-from={storage_ref}"
     else:
-        if not dry_run and created:
-            _destroy_vm_best_effort(vmid, node_ip, user, ssh_opts)
-        raise ProvisionError("No image source available to attach to VM disk")
-
-    set_cmd = (
-        f"qm set {vmid} "
-        f"--scsi0 {shlex.quote(disk_volume)},iothread=1 "
-        f"--ide2 {shlex.quote(root_pool)}:cloudinit "
-        f"--boot order=scsi0"
-    )
-    set_result = _ssh_run(node_ip, user, ssh_opts, set_cmd, dry_run=dry_run)
-    if set_result.returncode != 0:
-        if not dry_run and created:
-            _destroy_vm_best_effort(vmid, node_ip, user, ssh_opts)
-        raise ProvisionError(
-            f"qm set for VM {vmid} failed: "
-            f"{(set_result.stderr or set_result.stdout or '').strip() or 'unknown error'}"
+        root_disk = _create_vm_with_image(
+            vmid,
+            options,
+            image_remote_path,
+            storage_ref,
+            root_pool,
+            node_ip,
+            user,
+            ssh_opts,
+            dry_run=dry_run,
         )
+    created = True
 
     resize_cmd = f"qm resize {vmid} scsi0 {disk_size_gib}G"
     resize_result = _ssh_run(node_ip, user, ssh_opts, resize_cmd, dry_run=dry_run)
@@ -1122,7 +1244,7 @@ def _create_vm(
         )
 
     print(f"  ✓ VM {vmid} created and started ({hostname}, {target_ip})")
-    return True
+    return root_disk
 
 
 def _wait_for_guest_agent(
@@ -1174,18 +1296,68 @@ def _wait_for_guest_agent(
     )
 
 
-def provision_vm(config: SetupConfig, *, image: Optional[str] = None) -> None:
+def _describe_root_disk(
+    root_disk: str,
+    image_fetch: Optional[ImageFetch],
+    template: Optional[VMTemplate],
+) -> str:
+    """Summarize how the root disk was created and the image bytes it wrote."""
+    size = f"{image_fetch.size / _MIB:.1f} MiB" if image_fetch and image_fetch.size else None
+    if root_disk == "linked clone" and template:
+        if template.built:
+            return (
+                f"linked clone of template {template.vmid}, built from the image "
+                f"({size or 'size not measured'} written once for the template)"
+            )
+        return f"linked clone of template {template.vmid} (no image data written)"
+    if root_disk == "full clone" and template:
+        written = f"{size} written" if size else "whole template disk copied"
+        return f"full copy of template {template.vmid} ({written})"
+    if root_disk == "import":
+        return f"imported from the cloud image ({size or 'size not measured'} written)"
+    return "imported from image storage (size not measured)"
+
+
+def _retry_vmid(
+    node_ip: str,
+    user: str,
+    ssh_opts: StrList,
+    node_batch: Optional[NodeBatch],
+    *,
+    dry_run: bool = False,
+) -> int:
+    """Return a new VMID after a create collision, outside the batch's VMIDs."""
+    if node_batch is None:
+        return _get_next_vmid(node_ip, user, ssh_opts)
+    with node_batch.vmid_lock:
+        floor = max(node_batch.batch_vmids, default=0) + 1
+        vmid = _reserve_vmids(node_ip, user, ssh_opts, 1, floor=floor, dry_run=dry_run)[0]
+        node_batch.batch_vmids.add(vmid)
+    return vmid
+
+
+def provision_vm(
+    config: SetupConfig,
+    *,
+    image: Optional[str] = None,
+    vmid: Optional[int] = None,
+    node_batch: Optional[NodeBatch] = None,
+) -> None:
     """Orchestrate Proxmox VM provisioning.
 
     Args:
         config: SetupConfig with hosted_node, container_memory, container_storage, etc.
         image: Optional override; either an http(s) URL or a Proxmox storage
             reference like ``local:import/foo.qcow2``.
+        vmid: VMID reserved up front by a batch; allocated here when omitted.
+        node_batch: Shared limits when several VMs are provisioned on the node
+            at once (see :mod:`lib.proxmox_vm_batch`).
 
     Raises:
         VMAlreadyExists: if a VM with the target IP already exists on the node.
         ProvisionError: on any provisioning failure.
     """
+    provision_started = time.monotonic()
     node_ip = cast(str, config.hosted_node)
     memory_str = cast(str, config.container_memory)
     storage_specs = cast(NestedStrList, config.container_storage)
@@ -1223,6 +1395,9 @@ def provision_vm(config: SetupConfig, *, image: Optional[str] = None) -> None:
     )
 
     resolved, catalog_entry = _resolve_image(config, image)
+    use_template = bool(
+        getattr(config, "vm_template", True) and catalog_entry and resolved.sha512
+    )
 
     pub_path = _resolve_public_key_path(config.ssh_key) if not dry_run else None
     pubkey_contents: Optional[str] = None
@@ -1283,6 +1458,10 @@ def provision_vm(config: SetupConfig, *, image: Optional[str] = None) -> None:
                 "  Image source storage: "
                 f"{config.vm_image_storage or 'auto (import, then iso fallback)'}"
             )
+        if use_template:
+            print("  Root disk: clone of the node's template for this image (built on first use)")
+        else:
+            print("  Root disk: imported from the image")
         return
 
     print(f"  Hostname: {hostname}")
@@ -1330,17 +1509,23 @@ def provision_vm(config: SetupConfig, *, image: Optional[str] = None) -> None:
             f"VM with IP {target_ip} already exists on {node_ip}"
         )
 
-    memory_floor_safe = _report_memory_capacity(
-        node_ip=node_ip,
-        user=user,
-        ssh_opts=ssh_opts,
-        proposed_minimum_mib=balloon_min_mb,
-        proposed_maximum_mib=memory_mb,
-    )
-    _enforce_memory_floor(
-        memory_floor_safe,
-        getattr(config, "allow_memory_overcommit", False),
-    )
+    with node_batch.admission if node_batch else nullcontext():
+        memory_floor_safe = _report_memory_capacity(
+            node_ip=node_ip,
+            user=user,
+            ssh_opts=ssh_opts,
+            proposed_minimum_mib=balloon_min_mb
+            + (node_batch.admitted_minimum_mib if node_batch else 0),
+            proposed_maximum_mib=memory_mb
+            + (node_batch.admitted_maximum_mib if node_batch else 0),
+        )
+        _enforce_memory_floor(
+            memory_floor_safe,
+            getattr(config, "allow_memory_overcommit", False),
+        )
+        if node_batch:
+            node_batch.admitted_minimum_mib += balloon_min_mb
+            node_batch.admitted_maximum_mib += memory_mb
 
     root_pool = _resolve_storage_pool(
         root_pool_arg, node_ip, user, ssh_opts, "images"
@@ -1372,7 +1557,21 @@ def provision_vm(config: SetupConfig, *, image: Optional[str] = None) -> None:
         "auto", node_ip, user, ssh_opts, "snippets"
     )
 
-    if resolved.url:
+    node_slot: ContextManager[object] = (
+        node_batch.operations if node_batch else nullcontext()
+    )
+    template: Optional[VMTemplate] = None
+    if use_template:
+        template_vmid = find_vm_template(
+            cast(str, resolved.sha512), root_pool, node_ip, user, ssh_opts
+        )
+        if template_vmid is not None:
+            template = VMTemplate(vmid=template_vmid)
+            print(f"  ✓ Cloning from VM template {template_vmid} on {root_pool}")
+    image_fetch: Optional[ImageFetch] = None
+    image_remote_path: Optional[str] = None
+    storage_ref: Optional[str] = None
+    if resolved.url and template is None:
         image_pool, image_content = _resolve_image_storage(
             config.vm_image_storage,
             node_ip,
@@ -1380,18 +1579,27 @@ def provision_vm(config: SetupConfig, *, image: Optional[str] = None) -> None:
             ssh_opts,
             dry_run=dry_run,
         )
-        image_remote_path = _download_image_to_host(
-            resolved,
-            image_pool,
-            image_content,
-            node_ip,
-            user,
-            ssh_opts,
-            dry_run=dry_run,
-        )
-        storage_ref: Optional[str] = None
-    else:
-        image_remote_path = None
+        with node_slot:
+            image_fetch = _download_image_to_host(
+                resolved,
+                image_pool,
+                image_content,
+                node_ip,
+                user,
+                ssh_opts,
+                dry_run=dry_run,
+            )
+            image_remote_path = image_fetch.path
+            if use_template:
+                template = build_vm_template(
+                    image_remote_path,
+                    cast(str, resolved.sha512),
+                    root_pool,
+                    node_ip,
+                    user,
+                    ssh_opts,
+                )
+    elif not resolved.url:
         storage_ref = resolved.storage_ref
         if storage_ref:
             if not is_local_image_ref(storage_ref):
@@ -1412,7 +1620,8 @@ def provision_vm(config: SetupConfig, *, image: Optional[str] = None) -> None:
     provision_complete = False
 
     try:
-        vmid = _get_next_vmid(node_ip, user, ssh_opts)
+        if vmid is None:
+            vmid = _get_next_vmid(node_ip, user, ssh_opts)
         create_kwargs = {
             "vmid": vmid,
             "target_ip": target_ip,
@@ -1439,16 +1648,19 @@ def provision_vm(config: SetupConfig, *, image: Optional[str] = None) -> None:
             "dry_run": dry_run,
             "ipv6_cidr": config.static_ipv6,
             "gateway6": config.network_gateway6,
+            "template_vmid": template.vmid if template else None,
         }
-        try:
-            _create_vm(**create_kwargs)
-        except ProvisionError as exc:
-            if "already exists" not in str(exc).lower():
-                raise
-            print(f"  ⚠ VMID {vmid} was allocated concurrently; retrying with a new VMID")
-            vmid = _get_next_vmid(node_ip, user, ssh_opts)
-            create_kwargs["vmid"] = vmid
-            _create_vm(**create_kwargs)
+        with node_slot:
+            for attempt in range(_VMID_RETRY_ATTEMPTS + 1):
+                try:
+                    root_disk = _create_vm(**create_kwargs)
+                    break
+                except ProvisionError as exc:
+                    if "already exists" not in str(exc).lower() or attempt == _VMID_RETRY_ATTEMPTS:
+                        raise
+                print(f"  ⚠ VMID {vmid} was allocated concurrently; retrying with a new VMID")
+                vmid = _retry_vmid(node_ip, user, ssh_opts, node_batch, dry_run=dry_run)
+                create_kwargs["vmid"] = vmid
         vm_started = True
         _wait_for_guest_agent(
             vmid,
@@ -1467,6 +1679,7 @@ def provision_vm(config: SetupConfig, *, image: Optional[str] = None) -> None:
             dry_run=dry_run,
             label="VM",
         )
+        first_ssh_seconds = time.monotonic() - provision_started
         enroll_provisioned_guest_host_keys(
             target_ip,
             node_ip,
@@ -1514,3 +1727,16 @@ def provision_vm(config: SetupConfig, *, image: Optional[str] = None) -> None:
             # Tiny grace period so qemu-guest-agent / cloud-init finish flushing
             # before subsequent setup steps log in.
             time.sleep(2)
+
+    elapsed = time.monotonic() - provision_started
+    if image_fetch:
+        image_summary = image_fetch.describe()
+    elif template:
+        image_summary = f"not needed (template {template.vmid} reused)"
+    else:
+        image_summary = f"imported from {storage_ref}"
+    print(
+        f"  ✓ VM {hostname} provisioned in {elapsed:.1f}s "
+        f"(first SSH after {first_ssh_seconds:.1f}s); cloud image {image_summary}"
+    )
+    print(f"  Root disk: {_describe_root_disk(root_disk, image_fetch, template)}")
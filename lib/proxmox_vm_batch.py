@@ -0,0 +1,214 @@
+"""Provision several saved VM setups at once.
+
+VMIDs are reserved for the whole batch before any VM is created, so the
+guests never race each other for ``/cluster/nextid``. Each VM then runs the
+regular :func:`lib.proxmox_vm.provision_vm` pipeline in its own thread.
+Image transfers and disk imports hold one of ``max_node_operations`` slots
+on their node; boot, guest-agent and SSH waits hold none, so a node keeps
+importing the next disk while earlier VMs boot. Each VM's output lines are
+prefixed with its target name.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, cast
+
+from lib.cache import load_setup_command
+from lib.config import SetupConfig
+from lib.proxmox_guest import ProvisionError, _reserve_vmids, _ssh_opts
+from lib.proxmox_vm import NodeBatch, VMAlreadyExists, provision_vm
+from lib.setup_common import prepare_validated_runtime_config
+from lib.step_output import prefixed_step_output, step_output_prefix
+from lib.workspace import set_workspace_dir
+
+DEFAULT_MAX_NODE_OPERATIONS = 2
+
+
+@dataclass
+class VMBatchResult:
+    target: str
+    host: Optional[str]
+    status: str
+    vmid: Optional[int] = None
+    seconds: float = 0.0
+    details: str = ""
+
+
+def _reserve_batch_vmids(configs: list[SetupConfig]) -> list[int]:
+    """Reserve one VMID per config, node by node, without reusing an ID."""
+    by_node: dict[str, list[int]] = {}
+    for index, config in enumerate(configs):
+        by_node.setdefault(cast(str, config.hosted_node), []).append(index)
+    vmids: list[int] = [0] * len(configs)
+    floor = 0
+    for node_ip, indexes in by_node.items():
+        first = configs[indexes[0]]
+        reserved = _reserve_vmids(
+            node_ip,
+            first.hosted_user,
+            _ssh_opts(first.hosted_key),
+            len(indexes),
+            floor=floor,
+            dry_run=first.dry_run,
+        )
+        for index, vmid in zip(indexes, reserved):
+            vmids[index] = vmid
+        floor = max(reserved) + 1
+    return vmids
+
+
+def provision_vms(
+    targets: list[tuple[str, SetupConfig]],
+    *,
+    max_node_operations: int = DEFAULT_MAX_NODE_OPERATIONS,
+) -> list[VMBatchResult]:
+    """Provision every ``(target, config)`` VM concurrently; return one result each."""
+    if max_node_operations < 1:
+        raise ValueError("--max-node-operations must be positive")
+    if not targets:
+        return []
+    configs = [config for _target, config in targets]
+    vmids = _reserve_batch_vmids(configs)
+    # VMID retries on any node must avoid IDs reserved anywhere in the batch.
+    batch_vmids = set(vmids)
+    vmid_lock = threading.Lock()
+    node_batches = {
+        node: NodeBatch(
+            operations=threading.BoundedSemaphore(max_node_operations),
+            batch_vmids=batch_vmids,
+            vmid_lock=vmid_lock,
+        )
+        for node in {cast(str, config.hosted_node) for config in configs}
+    }
+
+    def provision(index: int) -> VMBatchResult:
+        target, config = targets[index]
+        result = VMBatchResult(
+            target=target,
+            host=config.host,
+            status="failed",
+            vmid=vmids[index],
+        )
+        started = time.monotonic()
+        try:
+            with step_output_prefix(target):
+                provision_vm(
+                    config,
+                    image=config.vm_image,
+                    vmid=vmids[index],
+                    node_batch=node_batches[cast(str, config.hosted_node)],
+                )
+            result.status = "created"
+        except VMAlreadyExists:
+            result.status = "exists"
+            result.vmid = None
+            result.details = "VM already provisioned, skipped creation"
+        except Exception as exc:
+            result.details = str(exc)
+        result.seconds = time.monotonic() - started
+        return result
+
+    with prefixed_step_output(), ThreadPoolExecutor(
+        max_workers=len(targets),
+        thread_name_prefix="vm-provision",
+    ) as pool:
+        return list(pool.map(provision, range(len(targets))))
+
+
+def _print_summary(results: list[VMBatchResult], elapsed: float) -> None:
+    print()
+    print("=" * 60)
+    print("VM batch provisioning summary")
+    print("=" * 60)
+    for result in results:
+        vmid = f" VMID {result.vmid}" if result.vmid is not None else ""
+        timing = f" in {result.seconds:.1f}s" if result.seconds else ""
+        detail = f" - {result.details}" if result.details else ""
+        print(
+            f"{result.status.upper():<9} {result.target} [{result.host or '-'}]"
+            f"{vmid}{timing}{detail}"
+        )
+    sequential = sum(result.seconds for result in results)
+    print("=" * 60)
+    print(
+        f"Wall time {elapsed:.1f}s for {len(results)} VM(s) "
+        f"(sum of per-VM times {sequential:.1f}s)"
+    )
+
+
+def run_vm_batch_provision(
+    targets: list[str],
+    *,
+    workspace: Optional[str] = None,
+    dry_run: bool = False,
+    max_node_operations: int = DEFAULT_MAX_NODE_OPERATIONS,
+) -> int:
+    if workspace:
+        set_workspace_dir(workspace)
+    if max_node_operations < 1:
+        raise ValueError("--max-node-operations must be positive")
+
+    prepared: list[tuple[str, SetupConfig]] = []
+    results: list[VMBatchResult] = []
+    for target in targets:
+        config = load_setup_command(target)
+        if config is None:
+            results.append(
+                VMBatchResult(
+                    target=target,
+                    host=None,
+                    status="failed",
+                    details="No saved setup command found",
+                )
+            )
+            continue
+        if config.machine_type != "vm" or not config.hosted_node:
+            results.append(
+                VMBatchResult(
+                    target=target,
+                    host=config.host,
+                    status="failed",
+                    details="Saved setup is not a Proxmox VM (--machine vm --hosted-node)",
+                )
+            )
+            continue
+        config.dry_run = dry_run
+        try:
+            prepare_validated_runtime_config(config, workspace)
+        except ValueError as exc:
+            results.append(
+                VMBatchResult(
+                    target=target,
+                    host=config.host,
+                    status="failed",
+                    details=str(exc),
+                )
+            )
+            continue
+        prepared.append((target, config))
+
+    if len(prepared) != len(targets):
+        print("Preflight failed; no VMs were provisioned.")
+        _print_summary(results, 0.0)
+        return 1
+
+    started = time.monotonic()
+    try:
+        results = provision_vms(prepared, max_node_operations=max_node_operations)
+    except ProvisionError as exc:
+        print(f"\n✗ Failed to reserve VMIDs: {exc}")
+        return 1
+    _print_summary(results, time.monotonic() - started)
+    return 0 if all(result.status != "failed" for result in results) else 1
+
+
+__all__ = [
+    "DEFAULT_MAX_NODE_OPERATIONS",
+    "VMBatchResult",
+    "provision_vms",
+    "run_vm_batch_provision",
+]
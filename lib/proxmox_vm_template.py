@@ -0,0 +1,187 @@
+"""Golden Proxmox templates for catalog cloud images.
+
+The first VM provisioned from a catalog image on a root storage pool turns a
+prepared VM (imported disk plus cloud-init drive, never booted) into a Proxmox
+template. Later VMs are cloned from it, as linked clones where the storage
+supports them, and receive their own hardware and cloud-init settings.
+
+Templates are identified by a description marker carrying the image digest
+and pool, so a catalog refresh in :mod:`lib.cloud_images` yields a new marker
+and a new template. Building it removes templates for digests no longer in
+the catalog unless linked clones still depend on them.
+"""
+
+from __future__ import annotations
+
+import re
+import shlex
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from lib.cloud_images import list_cloud_images
+from lib.proxmox_guest import ProvisionError, _ssh_run
+from lib.proxmox_image_cache import IMAGE_CACHE_DIR
+from lib.types import StrList
+
+TEMPLATE_VMID_FLOOR = 9000
+_MARKER_PREFIX = "infra_tools-template"
+_DIGEST_LENGTH = 16
+# Templates are found by scanning the node's own guest configs; the marker
+# only uses characters Proxmox stores verbatim in a description comment.
+_LIST_TEMPLATES = (
+    "for f in /etc/pve/qemu-server/*.conf; do "
+    "[ -f \"$f\" ] && grep -qx 'template: 1' \"$f\" || continue; "
+    f"m=$(grep -o -m1 '^#{_MARKER_PREFIX}\\.[A-Za-z0-9_.-]*' \"$f\") || continue; "
+    "echo \"$(basename \"$f\" .conf) ${m#\\#}\"; done"
+)
+_RESULT_RE = re.compile(
+    r"^infra_tools-template (?P<state>built|existing) (?P<vmid>\d+)$", re.MULTILINE
+)
+_KEPT_RE = re.compile(r"^infra_tools-template kept (?P<vmid>\d+)$", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class VMTemplate:
+    """A catalog image template on one node and whether this run built it."""
+
+    vmid: int
+    built: bool = False
+    seconds: float = 0.0
+
+
+def template_marker(sha512: str, pool: str) -> str:
+    """Return the description marker for ``sha512`` on root storage ``pool``."""
+    return f"{_MARKER_PREFIX}.{sha512[:_DIGEST_LENGTH]}.{pool}"
+
+
+def _catalog_digests() -> set[str]:
+    return {
+        image["sha512"][:_DIGEST_LENGTH]
+        for _key, image in list_cloud_images()
+        if image["sha512"]
+    }
+
+
+def find_vm_template(
+    sha512: str,
+    pool: str,
+    node_ip: str,
+    user: str,
+    ssh_opts: StrList,
+) -> Optional[int]:
+    """Return the VMID of the template for ``sha512`` on ``pool``, if built."""
+    result = _ssh_run(node_ip, user, ssh_opts, _LIST_TEMPLATES, quiet=True)
+    if result.returncode != 0:
+        return None
+    marker = template_marker(sha512, pool)
+    for line in (result.stdout or "").splitlines():
+        vmid, _separator, found = line.strip().partition(" ")
+        if found == marker and vmid.isdigit():
+            return int(vmid)
+    return None
+
+
+def render_template_build_script(
+    image_path: str,
+    sha512: str,
+    pool: str,
+    *,
+    catalog_digests: Iterable[str],
+) -> str:
+    """Return the node-side script that builds the template once per node.
+
+    Builds are serialized by a node lock and re-check for the template first,
+    so concurrent provisions of the same image build it only once.
+    """
+    marker = template_marker(sha512, pool)
+    current = " ".join(sorted(set(catalog_digests)))
+    name = f"infra-tools-template-{sha512[:12]}"
+    quoted_pool = shlex.quote(pool)
+    return f"""mkdir -p {shlex.quote(IMAGE_CACHE_DIR)} || exit 1
+exec 9>{shlex.quote(IMAGE_CACHE_DIR)}/templates.lock && flock 9 || exit 1
+templates=$({_LIST_TEMPLATES})
+existing=$(echo "$templates" | awk -v m={shlex.quote(marker)} '$2 == m {{print $1; exit}}')
+if [ -n "$existing" ]; then
+  echo "infra_tools-template existing $existing"
+  exit 0
+fi
+id={TEMPLATE_VMID_FLOOR}
+while ! pvesh get /cluster/nextid --vmid $id >/dev/null 2>&1; do
+  id=$((id + 1))
+  [ $id -lt {TEMPLATE_VMID_FLOOR + 1000} ] || {{ echo "no free template VMID" >&2; exit 1; }}
+done
+if ! {{ qm create $id --name {name} --description {shlex.quote(marker)} \\
+      --ostype l26 --scsihw virtio-scsi-single --serial0 socket --vga serial0 \\
+      --agent enabled=1,freeze-fs=1 \\
+    && qm disk import $id {shlex.quote(image_path)} {quoted_pool} \\
+    && qm set $id --scsi0 {quoted_pool}:vm-$id-disk-0,iothread=1 \\
+      --ide2 {quoted_pool}:cloudinit --boot order=scsi0 \\
+    && qm template $id; }}; then
+  qm destroy $id --purge 1 >/dev/null 2>&1
+  exit 1
+fi
+current=" {current} "
+echo "$templates" | while read -r vmid found; do
+  [ -n "$vmid" ] || continue
+  rest=${{found#{_MARKER_PREFIX}.}}
+  digest=${{rest%%.*}}
+  [ "${{rest#*.}}" = {quoted_pool} ] || continue
+  case "$current" in *" $digest "*) continue ;; esac
+  qm destroy "$vmid" >/dev/null 2>&1 || echo "infra_tools-template kept $vmid"
+done
+echo "infra_tools-template built $id"
+"""
+
+
+def build_vm_template(
+    image_path: str,
+    sha512: str,
+    pool: str,
+    node_ip: str,
+    user: str,
+    ssh_opts: StrList,
+) -> VMTemplate:
+    """Return the template for ``sha512`` on ``pool``, building it if missing."""
+    started = time.monotonic()
+    result = _ssh_run(
+        node_ip,
+        user,
+        ssh_opts,
+        render_template_build_script(
+            image_path,
+            sha512,
+            pool,
+            catalog_digests=_catalog_digests(),
+        ),
+        log_cmd=f"build VM template {template_marker(sha512, pool)}",
+    )
+    match = _RESULT_RE.search(result.stdout or "")
+    if result.returncode != 0 or match is None:
+        raise ProvisionError(
+            f"Failed to build VM template on {node_ip}: "
+            f"{(result.stderr or result.stdout or '').strip() or 'unknown error'}"
+        )
+    for kept in _KEPT_RE.finditer(result.stdout or ""):
+        print(
+            f"  ⚠ Kept outdated template {kept.group('vmid')}; "
+            "linked clones still depend on it"
+        )
+    template = VMTemplate(
+        vmid=int(match.group("vmid")),
+        built=match.group("state") == "built",
+        seconds=time.monotonic() - started,
+    )
+    if template.built:
+        print(f"  ✓ Built VM template {template.vmid} in {template.seconds:.1f}s")
+    return template
+
+
+__all__ = [
+    "TEMPLATE_VMID_FLOOR",
+    "VMTemplate",
+    "build_vm_template",
+    "find_vm_template",
+    "render_template_build_script",
+    "template_marker",
+]
@@ -0,0 +1,226 @@
+"""Release staging that shares unchanged files with the active release.
+
+Deployments build a sibling release tree and swap it in atomically. Copying
+the full source tree for every release doubles disk usage and I/O for large
+sites, so files whose content matches the active release are hardlinked from
+it instead. Changed files are reflinked from the source when the filesystem
+supports it and copied otherwise.
+
+Hardlinked inodes are shared with the live release. Callers must therefore
+leave their ownership and mode alone, and ``unshare_files`` gives paths a
+build may write private copies first; ``ownership_fix_command`` only touches
+inodes whose owner or mode actually differs.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+import shlex
+import shutil
+import stat
+from dataclasses import dataclass
+from typing import Optional
+
+# linux/fs.h FICLONE: share extents with the source file (copy-on-write).
+_FICLONE = 0x40049409
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class StagingStats:
+    """Counts of files shared with the previous release versus written anew."""
+
+    linked_files: int = 0
+    linked_bytes: int = 0
+    copied_files: int = 0
+    copied_bytes: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.linked_files} unchanged file(s) linked "
+            f"({self.linked_bytes / 1048576:.1f} MiB), "
+            f"{self.copied_files} new or changed file(s) written "
+            f"({self.copied_bytes / 1048576:.1f} MiB)"
+        )
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _same_content(source: os.stat_result, source_path: str,
+                  previous: os.stat_result, previous_path: str) -> bool:
+    """Compare by size, then mtime, then content hash."""
+    if not stat.S_ISREG(previous.st_mode) or source.st_size != previous.st_size:
+        return False
+    if bool(source.st_mode & 0o111) != bool(previous.st_mode & 0o111):
+        return False
+    if source.st_mtime_ns == previous.st_mtime_ns:
+        return True
+    try:
+        return _file_digest(source_path) == _file_digest(previous_path)
+    except OSError:
+        return False
+
+
+def clone_or_copy(source: str, destination: str) -> None:
+    """Reflink ``source`` to ``destination`` when supported, else copy it."""
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except OSError:
+        shutil.copyfile(source, destination)
+    shutil.copystat(source, destination)
+
+
+def link_tree(source: str, destination: str) -> None:
+    """Recreate ``source`` at ``destination`` using hardlinks for files.
+
+    Falls back to a copy when the two paths are on different filesystems.
+    """
+    if os.path.islink(source) or not os.path.isdir(source):
+        try:
+            os.link(source, destination, follow_symlinks=False)
+        except OSError:
+            shutil.copy2(source, destination, follow_symlinks=False)
+        return
+    os.makedirs(destination, exist_ok=True)
+    shutil.copystat(source, destination)
+    for entry in os.scandir(source):
+        link_tree(entry.path, os.path.join(destination, entry.name))
+
+
+def stage_release_tree(
+    source_path: str,
+    staging_path: str,
+    previous_path: Optional[str] = None,
+) -> StagingStats:
+    """Populate ``staging_path`` from ``source_path``.
+
+    Regular files that match the same relative path in ``previous_path`` are
+    hardlinked from there; everything else is reflinked or copied from the
+    source. Directories are always created fresh.
+    """
+    stats = StagingStats()
+    previous_dev: Optional[int] = None
+    if previous_path and os.path.isdir(previous_path):
+        previous_dev = os.stat(previous_path).st_dev
+    else:
+        previous_path = None
+
+    def stage_dir(source_dir: str, target_dir: str, previous_dir: Optional[str]) -> None:
+        os.makedirs(target_dir, exist_ok=True)
+        for entry in os.scandir(source_dir):
+            target = os.path.join(target_dir, entry.name)
+            previous = os.path.join(previous_dir, entry.name) if previous_dir else None
+            if entry.is_symlink():
+                os.symlink(os.readlink(entry.path), target)
+                continue
+            if entry.is_dir():
+                previous_subdir = previous if previous and os.path.isdir(previous) else None
+                stage_dir(entry.path, target, previous_subdir)
+                continue
+            source_stat = entry.stat(follow_symlinks=False)
+            if not stat.S_ISREG(source_stat.st_mode):
+                continue
+            if previous is not None:
+                try:
+                    previous_stat = os.lstat(previous)
+                except OSError:
+                    previous_stat = None
+                if (
+                    previous_stat is not None
+                    and previous_stat.st_dev == previous_dev
+                    and _same_content(source_stat, entry.path, previous_stat, previous)
+                ):
+                    try:
+                        os.link(previous, target, follow_symlinks=False)
+                        stats.linked_files += 1
+                        stats.linked_bytes += source_stat.st_size
+                        continue
+                    except OSError:
+                        pass
+            clone_or_copy(entry.path, target)
+            stats.copied_files += 1
+            stats.copied_bytes += source_stat.st_size
+        shutil.copystat(source_dir, target_dir)
+
+    stage_dir(source_path, staging_path, previous_path)
+    return stats
+
+
+def unshare_files(root: str, relative_paths: Optional[list[str]] = None) -> int:
+    """Replace hardlinked files below ``relative_paths`` of ``root`` with copies.
+
+    Without ``relative_paths`` the whole tree is unshared. Copies are
+    reflinked where supported, so they stay cheap until written. Returns the
+    number of files unshared.
+    """
+    unshared = 0
+
+    def unshare(path: str) -> None:
+        nonlocal unshared
+        try:
+            file_stat = os.lstat(path)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_nlink < 2:
+            return
+        private = os.path.join(
+            os.path.dirname(path), f".{os.path.basename(path)}.unshare-{os.getpid()}"
+        )
+        try:
+            clone_or_copy(path, private)
+            os.chown(private, file_stat.st_uid, file_stat.st_gid)
+            os.replace(private, path)
+        except BaseException:
+            if os.path.lexists(private):
+                os.unlink(private)
+            raise
+        unshared += 1
+
+    for relative in relative_paths or ["."]:
+        top = os.path.join(root, relative)
+        if os.path.islink(top) or not os.path.isdir(top):
+            unshare(top)
+            continue
+        for current_dir, _directories, filenames in os.walk(top):
+            for name in filenames:
+                unshare(os.path.join(current_dir, name))
+    return unshared
+
+
+def ownership_fix_command(
+    path: str,
+    user: str,
+    group: str,
+    *,
+    modes: bool = True,
+    unshared_only: bool = False,
+) -> str:
+    """Shell command that sets owner (and ``u=rwX,go=rX``) only where they differ.
+
+    With ``unshared_only``, files with more than one link are skipped so
+    inodes shared with an active release are never handed to another owner.
+    """
+    quoted = shlex.quote(path)
+    owner = f"{shlex.quote(user)}:{shlex.quote(group)}"
+    scope = r"-links 1 " if unshared_only else ""
+    dir_scope = r"\( -type d -o -links 1 \) " if unshared_only else ""
+    commands = [
+        f"find {quoted} {dir_scope}\\( ! -user {shlex.quote(user)} -o ! -group {shlex.quote(group)} \\) "
+        f"-exec chown -h {owner} {{}} +",
+    ]
+    if modes:
+        commands.extend((
+            f"find {quoted} -type d ! -perm 0755 -exec chmod 0755 {{}} +",
+            f"find {quoted} -type f {scope}-perm /111 ! -perm 0755 -exec chmod 0755 {{}} +",
+            f"find {quoted} -type f {scope}! -perm /111 ! -perm 0644 -exec chmod 0644 {{}} +",
+        ))
+    return " && ".join(commands)
@@ -12,13 +12,28 @@ import signal
 import string
 import subprocess
 import sys
-from typing import Callable, Optional
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
 
+from lib.step_output import current_step_prefix, relay_step_output
+from lib.ufw_rules import invalidate_ufw_snapshot
 from lib.validation import validate_package_name
 
 
 _dry_run = False
 
+_APT_COMMAND_RE = re.compile(r"^(?:[A-Za-z_][A-Za-z0-9_]*=\S*\s+)*apt-get\s")
+_UFW_WRITE_COMMAND_RE = re.compile(r"(?:^|[;&|(]\s*)ufw\s+(?!status\b)")
+_INSTALLED_STATUS = "install ok installed"
+# Resolver errors that blame specific packages. Other failures (network loss,
+# lock timeouts, an interrupted dpkg) fail every half of a batch the same way.
+_APT_PACKAGE_ERROR_RE = re.compile(
+    r"Unable to locate package|has no installation candidate|Unmet dependencies|"
+    r"Couldn't find any package"
+)
+
 
 DEFAULT_COMMAND_TIMEOUT_SECONDS = 60 * 60
 _TIMEOUT_TERMINATION_GRACE_SECONDS = 5.0
@@ -224,21 +239,37 @@ def run(
 
     requires_shell = _requires_shell(cmd)
     command = ["/bin/bash", "-lc", cmd] if requires_shell else shlex.split(cmd)
+    # Output of a step running beside others is relayed so it keeps the step prefix.
+    relay_prefix = None if capture_output else current_step_prefix()
+    relay_output = relay_prefix is not None
+    started = time.monotonic()
     process = subprocess.Popen(
         command,
         stdin=subprocess.PIPE if input_data is not None else None,
-        stdout=subprocess.PIPE if capture_output else None,
-        stderr=subprocess.PIPE if capture_output else None,
+        stdout=subprocess.PIPE if capture_output or relay_output else None,
+        stderr=subprocess.PIPE if capture_output else (subprocess.STDOUT if relay_output else None),
         text=text,
         cwd=cwd,
         start_new_session=requires_shell,
     )
+    relay: Optional[threading.Thread] = None
     try:
-        stdout, stderr = process.communicate(input=input_data, timeout=validated_timeout)
+        if relay_output:
+            relay = relay_step_output(process.stdout or (), relay_prefix)
+            _write_command_input(process, input_data)
+            process.wait(timeout=validated_timeout)
+            relay.join()
+            stdout = stderr = None
+        else:
+            stdout, stderr = process.communicate(input=input_data, timeout=validated_timeout)
     except subprocess.TimeoutExpired as exc:
         assert validated_timeout is not None
         _terminate_timed_out_process(process, process_group=requires_shell)
-        stdout, stderr = process.communicate()
+        if relay is not None:
+            relay.join()
+            stderr = None
+        else:
+            stdout, stderr = process.communicate()
         diagnostic = stderr or exc.stderr
         raise CommandTimeoutError(
             log_cmd,
@@ -252,6 +283,11 @@ def run(
         stdout=stdout,
         stderr=stderr,
     )
+    if _APT_COMMAND_RE.match(cmd.strip()):
+        _apt_usage.record("apt-get", time.monotonic() - started)
+    if _UFW_WRITE_COMMAND_RE.search(cmd.strip()):
+        # Steps that change UFW without lib.ufw_rules must not leave a stale snapshot.
+        invalidate_ufw_snapshot()
     if check and result.returncode != 0:
         if getattr(result, 'stderr', None):
             warning = _redact_command(result.stderr) if isinstance(result.stderr, str) else result.stderr
@@ -266,6 +302,18 @@ def run(
     return result
 
 
+def _write_command_input(process: subprocess.Popen[str], input_data: Optional[str]) -> None:
+    """Send ``input_data`` to a process whose output is read elsewhere."""
+    if process.stdin is None:
+        return
+    try:
+        if input_data:
+            process.stdin.write(input_data)
+        process.stdin.close()
+    except BrokenPipeError:
+        pass
+
+
 def _requires_shell(cmd: str) -> bool:
     """Return True when a command string depends on shell parsing."""
 
@@ -365,14 +413,162 @@ def detect_os() -> str:
     }[distro_id]
 
 
+class AptUsage:
+    """Thread-safe count and duration of APT tool invocations in one process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.invocations: dict[str, int] = {}
+        self.seconds: dict[str, float] = {}
+        self.avoided: dict[str, int] = {}
+        self.metadata_refreshes: dict[str, int] = {}
+
+    def record(self, tool: str, seconds: float, *, avoided: int = 0) -> None:
+        with self._lock:
+            self.invocations[tool] = self.invocations.get(tool, 0) + 1
+            self.seconds[tool] = self.seconds.get(tool, 0.0) + seconds
+            self._add_avoided(tool, avoided)
+
+    def record_avoided(self, tool: str, count: int) -> None:
+        with self._lock:
+            self._add_avoided(tool, count)
+
+    def _add_avoided(self, tool: str, count: int) -> None:
+        if count > 0:
+            self.avoided[tool] = self.avoided.get(tool, 0) + count
+
+    def record_metadata_refresh(self, outcome: str) -> None:
+        """Count a tracked package-list refresh by outcome, e.g. ``skipped (fresh)``."""
+        with self._lock:
+            self.metadata_refreshes[outcome] = self.metadata_refreshes.get(outcome, 0) + 1
+
+    def summary(self) -> Optional[str]:
+        """Describe invocations, the estimated time batching saved and metadata refreshes."""
+        with self._lock:
+            refreshes = ", ".join(
+                f"{count} {outcome}" for outcome, count in sorted(self.metadata_refreshes.items())
+            )
+            if not self.invocations:
+                return f"APT metadata refreshes: {refreshes}" if refreshes else None
+            runs = ", ".join(
+                f"{self.invocations[tool]} {tool} run(s) in {self.seconds[tool]:.1f}s"
+                for tool in sorted(self.invocations)
+            )
+            avoided = sum(self.avoided.values())
+            saved = sum(
+                count * self.seconds.get(tool, 0.0) / max(1, self.invocations.get(tool, 0))
+                for tool, count in self.avoided.items()
+            )
+        summary = f"APT: {runs}"
+        if avoided:
+            summary += f"; batching avoided {avoided} invocation(s), about {saved:.1f}s"
+        if refreshes:
+            summary += f"; metadata refreshes: {refreshes}"
+        return summary
+
+
+_apt_usage = AptUsage()
+
+
+def apt_usage() -> AptUsage:
+    """Return the APT invocation counters for this process."""
+    return _apt_usage
+
+
+@dataclass(frozen=True)
+class AptInstallResult:
+    """Outcome of :func:`ensure_apt_packages`."""
+
+    already_installed: tuple[str, ...]
+    installed: tuple[str, ...]
+    failed: tuple[str, ...]
+
+
 def is_package_installed(package: str) -> bool:
     safe_package = validate_package_name(package)
+    started = time.monotonic()
     result = subprocess.run(
         ["dpkg-query", "-W", "-f=${Status}", safe_package],
         capture_output=True,
         text=True,
     )
-    return result.returncode == 0 and "install ok installed" in result.stdout
+    _apt_usage.record("dpkg-query", time.monotonic() - started)
+    return result.returncode == 0 and _INSTALLED_STATUS in result.stdout
+
+
+def installed_packages(packages: Iterable[str]) -> set[str]:
+    """Return which of ``packages`` are installed, using one ``dpkg-query`` call."""
+    names = list(dict.fromkeys(validate_package_name(package) for package in packages))
+    if not names:
+        return set()
+    started = time.monotonic()
+    # dpkg-query exits non-zero when any name is unknown but still reports the rest.
+    result = subprocess.run(
+        ["dpkg-query", "-W", "-f=${binary:Package}\t${Package}\t${Status}\n", *names],
+        capture_output=True,
+        text=True,
+    )
+    _apt_usage.record("dpkg-query", time.monotonic() - started, avoided=len(names) - 1)
+    found: set[str] = set()
+    for line in result.stdout.splitlines():
+        # Multi-arch packages report "libc6:amd64" as the binary name.
+        fields = line.split("\t")
+        if len(fields) == 3 and fields[2] == _INSTALLED_STATUS:
+            found.update(fields[:2])
+    return {name for name in names if name in found}
+
+
+def _apt_failure_is_package_specific(package_args: str) -> bool:
+    """Return whether a simulated install blames some of the packages."""
+    result = run(f"apt-get install --simulate -qq {package_args}", check=False, capture_output=True)
+    return result.returncode != 0 and bool(
+        _APT_PACKAGE_ERROR_RE.search(f"{result.stdout or ''}\n{result.stderr or ''}")
+    )
+
+
+def _apt_install_batch(packages: list[str]) -> int:
+    """Install ``packages`` in one transaction, bisecting only after a failure.
+
+    A failure is split only when a simulated install blames specific
+    packages; any other failure would repeat in every half.
+
+    Returns the number of ``apt-get install`` transactions used.
+    """
+    package_args = " ".join(shlex.quote(package) for package in packages)
+    result = run(f"apt-get install -y -qq {package_args}", check=False)
+    if result.returncode == 0 or len(packages) == 1:
+        return 1
+    if not _apt_failure_is_package_specific(package_args):
+        return 1
+    middle = len(packages) // 2
+    return 1 + _apt_install_batch(packages[:middle]) + _apt_install_batch(packages[middle:])
+
+
+def ensure_apt_packages(packages: Iterable[str]) -> AptInstallResult:
+    """Install every missing package from ``packages`` in one APT transaction.
+
+    When APT blames specific packages for a failed transaction, it is retried
+    on halves of the missing set so one bad package does not block the others.
+    Installation is verified with dpkg.
+    """
+    names = list(dict.fromkeys(validate_package_name(package) for package in packages))
+    present = installed_packages(names)
+    missing = [name for name in names if name not in present]
+    already_installed = tuple(name for name in names if name in present)
+    if not missing:
+        return AptInstallResult(already_installed, (), ())
+
+    os.environ["DEBIAN_FRONTEND"] = "noninteractive"
+    transactions = _apt_install_batch(missing)
+    _apt_usage.record_avoided("apt-get", len(missing) - transactions)
+    if is_dry_run():
+        return AptInstallResult(already_installed, tuple(missing), ())
+    now_present = installed_packages(missing)
+    return AptInstallResult(
+        already_installed,
+        tuple(name for name in missing if name in now_present),
+        tuple(name for name in missing if name not in now_present),
+    )
 
 
 def install_with_verify(
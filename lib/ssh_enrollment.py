@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import fcntl
 import os
 import subprocess
+import threading
 from typing import Callable, Optional
 
 from lib.atomic_io import write_text_atomic
@@ -18,6 +20,9 @@ _SUPPORTED_HOST_KEY_TYPES = {
     "ssh-ed25519",
     "ssh-rsa",
 }
+# Concurrent VM provisions rewrite the same workspace known_hosts file; the
+# thread lock covers this process and the flock covers other infra-tools runs.
+_KNOWN_HOSTS_LOCK = threading.Lock()
 
 
 def _fingerprint(scan: str) -> str:
@@ -85,7 +90,16 @@ def _matching_known_host_lines(path: str, host_name: str) -> set[str]:
 def _persist_scan(host: str, scan: str, port: int) -> str:
     known_hosts = get_workspace_known_hosts_path()
     os.makedirs(os.path.dirname(known_hosts), mode=0o700, exist_ok=True)
+    with _KNOWN_HOSTS_LOCK, open(f"{known_hosts}.lock", "a+", encoding="utf-8") as lock_handle:
+        fcntl.flock(lock_handle.fileno(), fcntl.LOCK_EX)
+        try:
+            _replace_known_host_lines(known_hosts, host, scan, port)
+        finally:
+            fcntl.flock(lock_handle.fileno(), fcntl.LOCK_UN)
+    return known_hosts
+
 
+def _replace_known_host_lines(known_hosts: str, host: str, scan: str, port: int) -> None:
     existing_lines: list[str] = []
     if os.path.exists(known_hosts):
         with open(known_hosts, encoding="utf-8") as file_obj:
@@ -99,7 +113,6 @@ def _persist_scan(host: str, scan: str, port: int) -> str:
 
     updated_lines = [*existing_lines, *scan.splitlines()]
     write_text_atomic(known_hosts, "\n".join(updated_lines) + "\n", mode=0o600)
-    return known_hosts
 
 
 def replace_scanned_host_keys(host: str, scan: str, *, port: int = 22) -> str:
@@ -0,0 +1,111 @@
+"""Name prefixes for output printed by concurrently running setup steps.
+
+While :func:`prefixed_step_output` is active, every complete line a thread
+writes to ``sys.stdout`` inside :func:`step_output_prefix` is prefixed with
+that step's name, so lines from steps running at the same time stay
+attributable. :func:`lib.remote_utils.run` streams command output through
+:func:`relay_step_output` while a prefix is set. :mod:`lib.proxmox_vm_batch` prefixes each
+VM it provisions the same way.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional, TextIO, Union
+
+_local = threading.local()
+
+
+def current_step_prefix() -> Optional[str]:
+    """Return the output prefix of the step running on this thread, if any."""
+    if not isinstance(sys.stdout, _PrefixedStdout):
+        return None
+    return getattr(_local, "prefix", None)
+
+
+class _PrefixedStdout:
+    """Line-buffer each thread's writes and prefix them with its step name."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self._lock = threading.Lock()
+        self._partial: dict[int, str] = {}
+
+    def write(self, text: str) -> int:
+        prefix: Optional[str] = getattr(_local, "prefix", None)
+        if prefix is None:
+            with self._lock:
+                self._stream.write(text)
+            return len(text)
+        ident = threading.get_ident()
+        with self._lock:
+            *lines, rest = (self._partial.pop(ident, "") + text).split("\n")
+            if rest:
+                self._partial[ident] = rest
+            if lines:
+                self._stream.write("".join(f"{prefix}{line}\n" if line else "\n" for line in lines))
+        return len(text)
+
+    def finish_line(self, prefix: str) -> None:
+        with self._lock:
+            rest = self._partial.pop(threading.get_ident(), "")
+            if rest:
+                self._stream.write(f"{prefix}{rest}\n")
+
+    def flush(self) -> None:
+        with self._lock:
+            self._stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+@contextmanager
+def prefixed_step_output() -> Iterator[None]:
+    """Route ``sys.stdout`` through a per-step line prefixer until exit."""
+    original = sys.stdout
+    sys.stdout = _PrefixedStdout(original)  # type: ignore[assignment]
+    try:
+        yield
+    finally:
+        sys.stdout = original
+
+
+@contextmanager
+def _prefix_scope(prefix: str) -> Iterator[None]:
+    _local.prefix = prefix
+    try:
+        yield
+    finally:
+        stream = sys.stdout
+        if isinstance(stream, _PrefixedStdout):
+            stream.finish_line(prefix)
+        _local.prefix = None
+
+
+def step_output_prefix(name: str) -> Iterator[None]:
+    """Prefix this thread's output with ``name`` while the block runs."""
+    return _prefix_scope(f"[{name}] ")
+
+
+def relay_step_output(lines: Iterable[Union[str, bytes]], prefix: str) -> threading.Thread:
+    """Copy ``lines`` to ``sys.stdout`` under ``prefix`` as each one arrives.
+
+    The copy runs on a started daemon thread that ends when ``lines`` is
+    exhausted, so a command's output is never held until it exits.
+    """
+
+    def relay() -> None:
+        with _prefix_scope(prefix):
+            for line in lines:
+                sys.stdout.write(line.decode(errors="replace") if isinstance(line, bytes) else line)
+                sys.stdout.flush()
+
+    thread = threading.Thread(target=relay, name=f"{prefix.strip()} output", daemon=True)
+    thread.start()
+    return thread
+
+
+__all__ = ["current_step_prefix", "prefixed_step_output", "relay_step_output", "step_output_prefix"]
@@ -0,0 +1,158 @@
+"""Dependency-aware concurrent execution of setup steps.
+
+Each step's declared :class:`~lib.plugin_registry.StepResources` decide which
+earlier steps it must wait for: a step depends on every earlier step that
+writes something it reads or writes, or reads something it writes. Steps
+without a declaration conflict with everything, so they run alone and keep
+their original position relative to every other step. Ready steps start in
+list order on a bounded worker pool.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+from lib.plugin_registry import StepResources
+
+DEFAULT_STEP_WORKERS = 4
+
+
+@dataclass
+class StepTiming:
+    """Wall-clock interval of one executed step."""
+
+    index: int
+    name: str
+    started: float
+    finished: float
+
+    @property
+    def elapsed(self) -> float:
+        return self.finished - self.started
+
+
+def _resources_overlap(first: str, second: str) -> bool:
+    if first == second:
+        return True
+    if not (first.startswith("path:") and second.startswith("path:")):
+        return False
+    shorter, longer = sorted((first[5:], second[5:]), key=len)
+    return shorter == "/" or longer.startswith(shorter + "/")
+
+
+def _any_overlap(first: Sequence[str], second: Sequence[str]) -> bool:
+    return any(_resources_overlap(a, b) for a in first for b in second)
+
+
+def resources_conflict(first: Optional[StepResources], second: Optional[StepResources]) -> bool:
+    """Return whether two steps must not run at the same time."""
+    if first is None or second is None:
+        return True
+    return (
+        _any_overlap(first.writes, second.writes)
+        or _any_overlap(first.writes, second.reads)
+        or _any_overlap(first.reads, second.writes)
+    )
+
+
+def build_step_dependencies(resources: Sequence[Optional[StepResources]]) -> list[tuple[int, ...]]:
+    """Return, for each step, the indices of earlier steps it must wait for."""
+    return [
+        tuple(
+            earlier
+            for earlier in range(index)
+            if resources_conflict(resources[earlier], resources[index])
+        )
+        for index in range(len(resources))
+    ]
+
+
+def critical_path(
+    dependencies: Sequence[Sequence[int]],
+    timings: Sequence[StepTiming],
+) -> list[StepTiming]:
+    """Return the longest chain of dependent steps by measured wall time."""
+    if not timings:
+        return []
+    by_index = {timing.index: timing for timing in timings}
+    chain_seconds: dict[int, float] = {}
+    previous: dict[int, Optional[int]] = {}
+    for index in sorted(by_index):
+        best: Optional[int] = None
+        for dependency in dependencies[index]:
+            if dependency in chain_seconds and (
+                best is None or chain_seconds[dependency] > chain_seconds[best]
+            ):
+                best = dependency
+        chain_seconds[index] = by_index[index].elapsed + (chain_seconds[best] if best is not None else 0.0)
+        previous[index] = best
+    cursor: Optional[int] = max(chain_seconds, key=lambda index: chain_seconds[index])
+    path: list[StepTiming] = []
+    while cursor is not None:
+        path.append(by_index[cursor])
+        cursor = previous[cursor]
+    path.reverse()
+    return path
+
+
+def _timed_step(run_step: Callable[[int], None], index: int) -> tuple[float, float]:
+    started = time.monotonic()
+    run_step(index)
+    return started, time.monotonic()
+
+
+def run_step_graph(
+    names: Sequence[str],
+    dependencies: Sequence[Sequence[int]],
+    run_step: Callable[[int], None],
+    *,
+    max_workers: int = DEFAULT_STEP_WORKERS,
+    on_start: Optional[Callable[[int], None]] = None,
+) -> list[StepTiming]:
+    """Run steps as their dependencies finish, at most ``max_workers`` at once.
+
+    ``on_start`` is called from the scheduling thread before a step is
+    submitted. After the first failure no further steps start; steps already
+    running are allowed to finish and the first failure is re-raised.
+    Returns the timings of completed steps in completion order.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    pending = list(range(len(names)))
+    completed: set[int] = set()
+    running: dict[Future[tuple[float, float]], int] = {}
+    timings: list[StepTiming] = []
+    failure: Optional[BaseException] = None
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="setup-step") as pool:
+        while pending or running:
+            if failure is None:
+                for index in list(pending):
+                    if len(running) >= max_workers:
+                        break
+                    if not all(dependency in completed for dependency in dependencies[index]):
+                        continue
+                    pending.remove(index)
+                    if on_start is not None:
+                        on_start(index)
+                    running[pool.submit(_timed_step, run_step, index)] = index
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    failure = failure or error
+                    continue
+                started, finished = future.result()
+                completed.add(index)
+                timings.append(StepTiming(index, names[index], started, finished))
+
+    if failure is not None:
+        raise failure
+    return timings
@@ -0,0 +1,136 @@
+"""Fingerprints of setup steps that last completed successfully on a host.
+
+A step fingerprint covers the step name, the saved setup configuration, the
+installed project code and the state of the filesystem paths the step
+declares. Setup skips a step whose current fingerprint matches the one
+recorded after its last successful run. The store is a cache: a missing or
+unreadable file only means every step runs again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from lib.atomic_io import write_json_atomic
+from lib.types import JSONDict
+from lib.validation import validate_filesystem_path
+
+if TYPE_CHECKING:
+    from lib.config import SetupConfig
+    from lib.plugin_registry import StepResources
+
+
+STEP_STATE_SCHEMA_VERSION = 1
+_CODE_SKIP_DIRECTORIES = {"__pycache__", "tests", "state"}
+
+
+def project_code_version(root: str) -> str:
+    """Return a digest of every Python source file below ``root``."""
+    digest = hashlib.sha256()
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = sorted(
+            name for name in subdirectories
+            if name not in _CODE_SKIP_DIRECTORIES and not name.startswith(".")
+        )
+        for name in sorted(files):
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(directory, name)
+            digest.update(os.path.relpath(path, root).encode("utf-8") + b"\0")
+            try:
+                with open(path, "rb") as file_obj:
+                    digest.update(hashlib.sha256(file_obj.read()).digest())
+            except OSError:
+                digest.update(b"unreadable")
+    return digest.hexdigest()
+
+
+def _path_state(path: str) -> list[object]:
+    """Describe ``path`` without the directory mtimes other steps churn."""
+    try:
+        stat_result = os.lstat(path)
+    except OSError:
+        return [path, "missing"]
+    if os.path.isdir(path) and not os.path.islink(path):
+        return [path, "directory"]
+    return [path, "file", stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_mode]
+
+
+def step_fingerprint(resources: StepResources, config: SetupConfig, code_version: str) -> str:
+    """Return the fingerprint of ``resources.step`` for this run's inputs."""
+    paths = sorted(
+        {
+            resource[len("path:"):]
+            for resource in (*resources.reads, *resources.writes)
+            if resource.startswith("path:")
+        }
+    )
+    payload = {
+        "step": resources.step,
+        "system_type": config.system_type,
+        "config": config.to_dict(),
+        "code_version": code_version,
+        "paths": [_path_state(path) for path in paths],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class StepStateStore:
+    """Read and update recorded step fingerprints; safe to share between threads."""
+
+    def __init__(self, path: str):
+        validate_filesystem_path(path, must_exist=False)
+        self.path = os.path.abspath(path)
+        self._lock = threading.Lock()
+        self._steps = self._load()
+
+    def _load(self) -> dict[str, JSONDict]:
+        if os.path.islink(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as file_obj:
+                payload = json.load(file_obj)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(payload, dict) or payload.get("schema_version") != STEP_STATE_SCHEMA_VERSION:
+            return {}
+        steps = payload.get("steps")
+        if not isinstance(steps, dict):
+            return {}
+        return {
+            name: entry
+            for name, entry in steps.items()
+            if isinstance(entry, dict) and isinstance(entry.get("fingerprint"), str)
+        }
+
+    def is_current(self, step: str, fingerprint: str) -> bool:
+        with self._lock:
+            entry = self._steps.get(step)
+        return entry is not None and entry["fingerprint"] == fingerprint
+
+    def record_success(self, step: str, fingerprint: str) -> None:
+        with self._lock:
+            self._steps[step] = {
+                "fingerprint": fingerprint,
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._write()
+
+    def forget(self, step: str) -> None:
+        with self._lock:
+            if self._steps.pop(step, None) is not None:
+                self._write()
+
+    def _write(self) -> None:
+        write_json_atomic(
+            self.path,
+            {"schema_version": STEP_STATE_SCHEMA_VERSION, "steps": self._steps},
+            mode=0o600,
+            sort_keys=True,
+        )
@@ -48,17 +48,18 @@ def cleanup_systemd_unit(unit_name: str, unit_type: str = "service") -> None:
 
 
 def cleanup_service(service_name: str) -> None:
-    """Stop, disable, and remove a service plus any associated timer or path unit.
+    """Stop, disable, and remove a service plus any associated activator unit.
     
     This is the primary cleanup function for systemd services. It automatically
-    checks for and cleans up any associated timer or path unit before cleaning
-    up the service. Use this for all service cleanup operations.
+    checks for and cleans up any associated timer, path, or socket unit before
+    cleaning up the service. Use this for all service cleanup operations.
     
     Args:
         service_name: Base name of the service (without .service/.timer/.path
-                      extension). If the service has a timer (service_name.timer)
-                      or a path activator (service_name.path), they are detected
-                      and cleaned up as well.
+                      extension). If the service has a timer (service_name.timer),
+                      a path activator (service_name.path), or a socket
+                      (service_name.socket), they are detected and cleaned up
+                      as well.
     
     Examples:
         # Cleans up myapp.service plus myapp.timer/myapp.path if present
@@ -70,13 +71,15 @@ def cleanup_service(service_name: str) -> None:
     service_file = os.path.join(SYSTEMD_DIR, f"{service_name}.service")
     timer_file = os.path.join(SYSTEMD_DIR, f"{service_name}.timer")
     path_file = os.path.join(SYSTEMD_DIR, f"{service_name}.path")
+    socket_file = os.path.join(SYSTEMD_DIR, f"{service_name}.socket")
     
     needs_reload = False
     
-    # Stop and disable timers/paths first (they activate the service)
+    # Stop and disable timers/paths/sockets first (they activate the service)
     for activator_file, activator_kind in (
         (timer_file, "timer"),
         (path_file, "path"),
+        (socket_file, "socket"),
     ):
         if os.path.exists(activator_file):
             run(f"systemctl stop {shlex.quote(service_name)}.{activator_kind}", check=False)
@@ -135,6 +138,7 @@ def cleanup_all_infra_services(dry_run: bool = False) -> None:
         r"^node-.*\.service$",
         # Manifest-defined (infra.json) service components
         r"^app-.*\.service$",
+        r"^app-.*\.socket$",
         # Auto-update units created by infra_tools. Ruby remains here only to
         # retire the obsolete unit when upgrading; no Ruby unit is recreated.
         r"^auto-update-(?:apt|godot|gogs|node|ruby|uv)\.service$",
@@ -145,8 +149,11 @@ def cleanup_all_infra_services(dry_run: bool = False) -> None:
         # Recurring security and cleanup maintenance
         r"^security-monitor\.service$",
         r"^security-monitor\.timer$",
+        r"^security-monitor-daemon\.service$",
         r"^cleanup-maintenance\.service$",
         r"^cleanup-maintenance\.timer$",
+        r"^storage-forecast\.service$",
+        r"^storage-forecast\.timer$",
         r"^user-cache-maintenance\.service$",
         r"^user-cache-maintenance\.timer$",
         # SMB mount units
@@ -183,12 +190,16 @@ def cleanup_all_infra_services(dry_run: bool = False) -> None:
     print(f"  Cleaning up {len(units_to_remove)} existing infra_tools unit(s)...")
     
     # Group by unit type for proper stopping order
-    timers = [u for u in units_to_remove if u.endswith(".timer")]
+    timers = [u for u in units_to_remove if u.endswith((".timer", ".socket"))]
     services = [u for u in units_to_remove if u.endswith(".service")]
     mounts = [u for u in units_to_remove if u.endswith(".mount")]
-    others = [u for u in units_to_remove if not any(u.endswith(ext) for ext in [".timer", ".service", ".mount"])]
+    others = [
+        u for u in units_to_remove
+        if not any(u.endswith(ext) for ext in [".timer", ".socket", ".service", ".mount"])
+    ]
     
-    # Stop in order: timers first (they trigger services), then services, then mounts, then others
+    # Stop in order: timers and sockets first (they trigger services), then
+    # services, then mounts, then others
     for unit in timers + services + mounts + others:
         unit_type = unit.rsplit(".", 1)[1]
         unit_path = os.path.join(systemd_dir, unit)
@@ -197,7 +208,7 @@ def cleanup_all_infra_services(dry_run: bool = False) -> None:
         run(f"systemctl stop {shlex.quote(unit)}", check=False)
         
         # Disable timers/mounts and services with an [Install] section.
-        if unit_type in ("timer", "mount") or (
+        if unit_type in ("timer", "socket", "mount") or (
             unit_type == "service" and _unit_has_install_section(unit_path)
         ):
             run(f"systemctl disable {shlex.quote(unit)}", check=False)
@@ -292,15 +303,20 @@ def generate_managed_service(name: str, exec_start: str, working_dir: str,
                              env_file: Optional[str] = None,
                              description: Optional[str] = None,
                              runtime_env: Optional[dict[str, str]] = None,
-                             writable_paths: Optional[list[str]] = None) -> str:
+                             writable_paths: Optional[list[str]] = None,
+                             readiness: Optional[str] = None) -> str:
     """Generate a hardened systemd unit for a manifest service component.
 
     Unlike the Node generator this makes no assumptions about the
     runtime: the component supplies its own ExecStart (a binary path or full
     command) and reads its configuration (including which port to bind) from
     ``env_file`` or ``runtime_env``. infra_tools only needs the port for the
-    nginx upstream.
+    nginx upstream. ``readiness="notify"`` makes systemd wait for the
+    service's sd_notify ``READY=1``; ``readiness="socket"`` ties the service
+    to its ``.socket`` unit (see :func:`generate_managed_socket`).
     """
+    if readiness not in (None, "notify", "socket"):
+        raise ValueError(f"Unsupported service readiness mode: {readiness}")
     validate_no_control_characters(name, "systemd service name")
     validate_systemd_exec_command(exec_start)
     validate_filesystem_path(working_dir, must_exist=False)
@@ -317,9 +333,20 @@ def generate_managed_service(name: str, exec_start: str, working_dir: str,
         "[Unit]",
         f"Description={description or f'infra_tools managed service: {name}'}",
         "After=network.target",
+    ]
+    if readiness == "socket":
+        lines += [
+            f"Requires={name}.socket",
+            f"After={name}.socket",
+        ]
+    lines += [
         "",
         "[Service]",
-        "Type=simple",
+        "Type=notify" if readiness == "notify" else "Type=simple",
+    ]
+    if readiness == "notify":
+        lines.append("NotifyAccess=main")
+    lines += [
         f"User={web_user}",
         f"Group={web_group}",
         f"WorkingDirectory={working_dir}",
@@ -355,27 +382,62 @@ def generate_managed_service(name: str, exec_start: str, working_dir: str,
     return "\n".join(lines)
 
 
-def _install_and_start_unit(service_name: str, unit_content: str) -> None:
-    """Write a unit file, (re)load, enable, restart, and verify it is active."""
+def generate_managed_socket(name: str, port: int,
+                            description: Optional[str] = None) -> str:
+    """Generate a loopback listening socket that activates a managed service."""
+    validate_no_control_characters(name, "systemd socket name")
+    if description:
+        validate_no_control_characters(description, "systemd socket description")
+    if not 1 <= port <= 65535:
+        raise ValueError(f"Invalid socket port: {port}")
+    return "\n".join([
+        "[Unit]",
+        f"Description={description or f'infra_tools managed socket: {name}'}",
+        "",
+        "[Socket]",
+        f"ListenStream=127.0.0.1:{port}",
+        "",
+        "[Install]",
+        "WantedBy=sockets.target",
+        "",
+    ])
+
+
+def _install_and_start_unit(service_name: str, unit_content: str,
+                            socket_content: Optional[str] = None,
+                            settle: bool = True) -> None:
+    """Write a unit file, (re)load, enable, restart, and verify it is active.
+
+    With ``socket_content`` the socket unit is installed and started first so
+    the listener exists before the service. ``settle=False`` skips the
+    post-start pause for units whose start job already waits for readiness.
+    """
     service_file = os.path.join(SYSTEMD_DIR, f"{service_name}.service")
 
     # Clean up any previous unit before installing the new one.
     cleanup_service(service_name)
 
-    try:
-        with open(service_file, 'w') as f:
-            f.write(unit_content)
-    except PermissionError as e:
-        raise PermissionError(f"Failed to write service file {service_file}. Need root permissions.") from e
+    unit_files = [(service_file, unit_content)]
+    if socket_content is not None:
+        unit_files.append((os.path.join(SYSTEMD_DIR, f"{service_name}.socket"), socket_content))
+    for unit_file, content in unit_files:
+        try:
+            with open(unit_file, 'w') as f:
+                f.write(content)
+        except PermissionError as e:
+            raise PermissionError(f"Failed to write service file {unit_file}. Need root permissions.") from e
 
     run("systemctl daemon-reload")
+    if socket_content is not None:
+        run(f"systemctl enable --now {shlex.quote(service_name)}.socket")
     run(f"systemctl enable {shlex.quote(service_name)}")
     run(f"systemctl restart {shlex.quote(service_name)}")
 
     print(f"  ✓ Created and started systemd service: {service_name}")
 
-    import time
-    time.sleep(1)
+    if settle:
+        import time
+        time.sleep(1)
 
     result = run(f"systemctl is-active {shlex.quote(service_name)}", check=False)
     if result.returncode != 0:
@@ -390,10 +452,27 @@ def create_managed_service(service_name: str, exec_start: str, working_dir: str,
                            env_file: Optional[str] = None,
                            description: Optional[str] = None,
                            runtime_env: Optional[dict[str, str]] = None,
-                           writable_paths: Optional[list[str]] = None) -> None:
-    """Create, enable, and start a manifest-defined systemd service."""
+                           writable_paths: Optional[list[str]] = None,
+                           readiness: Optional[str] = None,
+                           port: Optional[int] = None) -> None:
+    """Create, enable, and start a manifest-defined systemd service.
+
+    A ``notify`` service's restart returns only after ``READY=1``, and a
+    ``socket`` service's listener accepts connections as soon as its socket
+    unit starts, so neither waits for the fixed post-start pause.
+    """
     unit_content = generate_managed_service(
         service_name, exec_start, working_dir, web_user, web_group, env_file,
-        description, runtime_env, writable_paths
+        description, runtime_env, writable_paths, readiness
+    )
+    socket_content = None
+    if readiness == "socket":
+        if port is None:
+            raise ValueError(f"{service_name}: socket readiness requires a port")
+        socket_content = generate_managed_socket(service_name, port, description)
+    _install_and_start_unit(
+        service_name,
+        unit_content,
+        socket_content=socket_content,
+        settle=readiness is None,
     )
-    _install_and_start_unit(service_name, unit_content)
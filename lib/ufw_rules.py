@@ -0,0 +1,391 @@
+"""Shared UFW state model and diff-based rule reconciliation.
+
+UFW applies every ``ufw allow``/``ufw delete`` to the live ruleset as soon as
+the firewall is active, so each command costs a ruleset reload. This module
+parses ``ufw status numbered`` into typed rules, keeps one snapshot until a
+write invalidates it, and reconciles desired rules through
+:func:`lib.network_firewall.plan_firewall_changes`: rules already present are
+skipped, and only owned rules that actually exist are deleted (highest
+number first). An inactive UFW lists no numbered rules, so its saved rules
+are read from ``ufw show added`` and deleted by their rule spec instead.
+
+During setup, :func:`configure_ufw_snapshot_sharing` lets every step reuse one
+snapshot; :func:`lib.remote_utils.run` invalidates it whenever a ``ufw``
+command other than ``ufw status`` runs.
+"""
+
+from __future__ import annotations
+
+import re
+import shlex
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional, Sequence
+
+from lib.network_firewall import FirewallChangePlan, plan_firewall_changes
+
+_NUMBERED_RULE_RE = re.compile(
+    r"^\[\s*(?P<number>\d+)\]\s+(?P<to>.+?)\s+"
+    r"(?P<action>(?:ALLOW|DENY|REJECT|LIMIT)(?:\s+(?:IN|OUT|FWD))?)\s+"
+    r"(?P<source>.+?)\s*$"
+)
+_V6_SUFFIX = " (v6)"
+_RULE_ACTIONS = ("allow", "deny", "reject", "limit")
+_RULE_KEYWORDS = ("from", "to", "port", "proto", "on")
+
+
+@dataclass(frozen=True)
+class UfwRule:
+    """One numbered rule from ``ufw status numbered``.
+
+    Rules saved by an inactive UFW have no number; ``spec`` is then the rule
+    as ``ufw show added`` prints it, without its comment.
+    """
+
+    number: int
+    to: str
+    action: str
+    source: str
+    comment: str = ""
+    spec: str = ""
+
+    @property
+    def target(self) -> str:
+        """Return the destination without UFW's ``(v6)`` marker."""
+        return self.to[: -len(_V6_SUFFIX)] if self.to.endswith(_V6_SUFFIX) else self.to
+
+    @property
+    def is_global(self) -> bool:
+        return self.source.startswith("Anywhere")
+
+    @property
+    def key(self) -> str:
+        """Identify the rule across IPv4/IPv6 copies and renumbering."""
+        if self.comment:
+            return self.comment
+        source = "" if self.is_global else f" from {self.source}"
+        return f"{self.target} {self.action}{source}"
+
+    def is_untagged_global(self, target: str, actions: Iterable[str]) -> bool:
+        """Return whether this is a comment-less rule for ``target`` from anywhere."""
+        return not self.comment and self.is_global and self.target == target and self.action in actions
+
+    def has_comment_prefix(self, prefix: str) -> bool:
+        return self.comment == prefix or self.comment.startswith(f"{prefix} ")
+
+
+@dataclass(frozen=True)
+class UfwStatus:
+    active: bool
+    rules: tuple[UfwRule, ...]
+
+
+def parse_ufw_status(output: str) -> UfwStatus:
+    """Parse ``ufw status numbered`` output into typed rules."""
+    active = False
+    rules: list[UfwRule] = []
+    for raw_line in output.splitlines():
+        line = raw_line.strip()
+        if line.startswith("Status:"):
+            active = line.split(":", 1)[1].strip() == "active"
+            continue
+        body, _separator, comment = line.partition("#")
+        match = _NUMBERED_RULE_RE.match(body.strip())
+        if match:
+            rules.append(
+                UfwRule(
+                    number=int(match.group("number")),
+                    to=match.group("to"),
+                    action=re.sub(r"\s+", " ", match.group("action")),
+                    source=match.group("source"),
+                    comment=comment.strip(),
+                )
+            )
+    return UfwStatus(active=active, rules=tuple(rules))
+
+
+def _parse_added_rule(line: str) -> Optional[UfwRule]:
+    try:
+        tokens = shlex.split(line)
+    except ValueError:
+        return None
+    comment = ""
+    if len(tokens) >= 2 and tokens[-2] == "comment":
+        comment = tokens[-1]
+        tokens = tokens[:-2]
+    if not tokens or tokens[0] not in _RULE_ACTIONS:
+        # Route rules and app profiles are never managed here.
+        return None
+    action = tokens[0].upper()
+    direction = "IN"
+    rest = tokens[1:]
+    if rest and rest[0] in ("in", "out"):
+        direction = rest[0].upper()
+        rest = rest[1:]
+    if rest and rest[0] in ("log", "log-all"):
+        rest = rest[1:]
+    if len(rest) == 1 and rest[0] not in _RULE_KEYWORDS:
+        target, source = rest[0], "Anywhere"
+    else:
+        fields = dict(zip(rest[::2], rest[1::2]))
+        if len(rest) % 2 or not set(fields) <= set(_RULE_KEYWORDS):
+            return None
+        port = fields.get("port", "")
+        if port and "proto" in fields:
+            port = f"{port}/{fields['proto']}"
+        destination = fields.get("to", "any")
+        target = port if destination == "any" else f"{destination} {port}".strip()
+        target = target or "Anywhere"
+        if "on" in fields:
+            target = f"{target} on {fields['on']}"
+        source = fields.get("from", "any")
+        source = "Anywhere" if source == "any" else source
+    return UfwRule(
+        number=0,
+        to=target,
+        action=f"{action} {direction}",
+        source=source,
+        comment=comment,
+        spec=" ".join(shlex.quote(token) for token in tokens),
+    )
+
+
+def parse_ufw_added(output: str) -> tuple[UfwRule, ...]:
+    """Parse ``ufw show added`` output into the rules an inactive UFW has saved."""
+    rules: list[UfwRule] = []
+    for raw_line in output.splitlines():
+        line = raw_line.strip()
+        if line.startswith("ufw "):
+            rule = _parse_added_rule(line[len("ufw "):])
+            if rule is not None:
+                rules.append(rule)
+    return tuple(rules)
+
+
+@dataclass(frozen=True)
+class DesiredUfwRule:
+    """A rule to keep, identified by its comment or, untagged, by target and action."""
+
+    rule: str
+    comment: Optional[str] = None
+    target: Optional[str] = None
+    action: Optional[str] = None
+    failure: str = field(default="Could not add a UFW rule", compare=False)
+
+    @property
+    def key(self) -> str:
+        return self.comment if self.comment is not None else f"{self.target} {self.action}"
+
+    @property
+    def command(self) -> str:
+        if self.comment is None:
+            return f"ufw {self.rule}"
+        return f"ufw {self.rule} comment {shlex.quote(self.comment)}"
+
+    def present_in(self, rules: Iterable[UfwRule]) -> bool:
+        return any(rule.key == self.key for rule in rules)
+
+
+class UfwRuleError(RuntimeError):
+    """A desired rule could not be added; the message is the rule's ``failure``."""
+
+    def __init__(self, rule: DesiredUfwRule):
+        super().__init__(rule.failure)
+        self.rule = rule
+
+
+class UfwSnapshotCache:
+    """One ``ufw status numbered`` snapshot shared by every caller in a run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._status: Optional[UfwStatus] = None
+        self.reads = 0
+        self.reuses = 0
+
+    def get(self, read: Callable[[], UfwStatus]) -> UfwStatus:
+        with self._lock:
+            if self._status is None:
+                self._status = read()
+                self.reads += 1
+            else:
+                self.reuses += 1
+            return self._status
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._status = None
+
+    def summary(self) -> Optional[str]:
+        if not self.reads:
+            return None
+        return f"UFW: {self.reads} status read(s), {self.reuses} served from the shared snapshot"
+
+
+_shared_snapshot: Optional[UfwSnapshotCache] = None
+
+
+def configure_ufw_snapshot_sharing(cache: Optional[UfwSnapshotCache]) -> None:
+    """Share one UFW status snapshot between every :class:`UfwFirewall` in this process."""
+    global _shared_snapshot
+    _shared_snapshot = cache
+
+
+def invalidate_ufw_snapshot() -> None:
+    """Forget the shared snapshot after a UFW change made outside this module."""
+    cache = _shared_snapshot
+    if cache is not None:
+        cache.invalidate()
+
+
+class UfwFirewall:
+    """Apply UFW changes against a cached status snapshot.
+
+    ``run_command`` is the caller's ``run`` wrapper. The snapshot is re-read
+    only after a change; without a shared cache each instance keeps its own.
+    A failed ``ufw status`` reads as an inactive firewall unless
+    ``require_status`` is set, which raises ``RuntimeError`` instead.
+    """
+
+    def __init__(
+        self,
+        run_command: Callable[..., subprocess.CompletedProcess[str]],
+        *,
+        require_status: bool = False,
+    ):
+        self._run = run_command
+        self._require_status = require_status
+        self._own_snapshot = UfwSnapshotCache()
+        self._active: Optional[bool] = None
+        self.added = 0
+        self.removed = 0
+        self.reloads = 0
+
+    def _snapshot(self) -> UfwSnapshotCache:
+        return _shared_snapshot if _shared_snapshot is not None else self._own_snapshot
+
+    def _read_status(self) -> UfwStatus:
+        result = self._run("ufw status numbered", check=False, capture_output=True)
+        stdout = getattr(result, "stdout", None)
+        if result.returncode != 0 or not isinstance(stdout, str):
+            if self._require_status:
+                stderr = getattr(result, "stderr", None)
+                detail = (stderr if isinstance(stderr, str) else "") or f"exit {result.returncode}"
+                raise RuntimeError(f"Could not inspect UFW: {detail.strip()}")
+            return UfwStatus(active=False, rules=())
+        status = parse_ufw_status(stdout)
+        if status.active:
+            return status
+        added = self._run("ufw show added", check=False, capture_output=True)
+        stdout = getattr(added, "stdout", None)
+        if added.returncode != 0 or not isinstance(stdout, str):
+            return status
+        return UfwStatus(active=False, rules=parse_ufw_added(stdout))
+
+    def status(self) -> UfwStatus:
+        status = self._snapshot().get(self._read_status)
+        self._active = status.active
+        return status
+
+    @property
+    def active(self) -> bool:
+        if self._active is None:
+            self.status()
+        return bool(self._active)
+
+    def _invalidate(self) -> None:
+        self._own_snapshot.invalidate()
+        invalidate_ufw_snapshot()
+
+    def change(self, arguments: str, *, check: bool = False) -> subprocess.CompletedProcess[str]:
+        """Run ``ufw arguments`` and invalidate the snapshot."""
+        return self._change(f"ufw {arguments}", check=check)
+
+    def _change(self, command: str, *, check: bool = False) -> subprocess.CompletedProcess[str]:
+        # Only the live ruleset is reloaded; an inactive UFW just saves the rule.
+        reloads = self.active
+        result = self._run(command, check=check)
+        self._invalidate()
+        if reloads:
+            self.reloads += 1
+        return result
+
+    def ensure(self, rule: DesiredUfwRule) -> bool:
+        """Add ``rule`` unless it is already present; return whether it is in place."""
+        if rule.present_in(self.status().rules):
+            return True
+        if self._change(rule.command).returncode != 0:
+            return False
+        self.added += 1
+        return True
+
+    def delete(self, predicate: Callable[[UfwRule], bool]) -> int:
+        """Delete every current rule matching ``predicate``; return how many."""
+        matches = [rule for rule in self.status().rules if predicate(rule)]
+        # Saved rules of an inactive UFW are deleted by spec; numbered ones
+        # highest first so earlier deletions do not renumber later ones.
+        for rule in sorted(matches, key=lambda item: item.number, reverse=True):
+            target = rule.spec if rule.number == 0 else str(rule.number)
+            if self._change(f"ufw --force delete {target}").returncode != 0:
+                raise RuntimeError(f"Could not remove UFW rule {target}")
+            self.removed += 1
+        return len(matches)
+
+    def reconcile(
+        self,
+        desired: Sequence[DesiredUfwRule],
+        *,
+        owned: Callable[[UfwRule], bool],
+        superseded: Callable[[UfwRule], bool] = lambda _rule: False,
+        verify: bool = False,
+    ) -> FirewallChangePlan:
+        """Add missing ``desired`` rules, then delete stale owned and superseded rules.
+
+        Additions come first so access is never narrower than requested while
+        the rules change. Raises :class:`UfwRuleError` for a rule UFW rejects
+        and, with ``verify``, ``RuntimeError`` when an active UFW does not
+        retain an added rule.
+        """
+        rules = self.status().rules
+        plan = plan_firewall_changes(
+            (rule.key for rule in rules),
+            (rule.key for rule in desired),
+            owned={rule.key for rule in rules if owned(rule)},
+        )
+        additions = set(plan.additions)
+        # The plan already compared against current rules, so each addition is
+        # applied directly instead of re-reading status through ensure().
+        pending = set(additions)
+        for rule in desired:
+            if rule.key not in pending:
+                continue
+            pending.discard(rule.key)
+            if self._change(rule.command).returncode != 0:
+                raise UfwRuleError(rule)
+            self.added += 1
+        if verify and additions and self.active:
+            retained = {rule.key for rule in self.status().rules}
+            missing = sorted(additions - retained)
+            if missing:
+                raise RuntimeError("UFW did not retain requested rules: " + ", ".join(missing))
+        removals = set(plan.removals)
+        self.delete(lambda rule: rule.key in removals or superseded(rule))
+        return plan
+
+    def enable(self) -> bool:
+        result = self._run("ufw --force enable", check=False)
+        self._invalidate()
+        if result.returncode != 0:
+            return False
+        self._active = True
+        self.reloads += 1
+        return True
+
+    def summary(self) -> str:
+        if not (self.added or self.removed):
+            return f"UFW rules unchanged ({self.reloads} ruleset reload(s))"
+        return (
+            f"UFW rules: {self.added} added, {self.removed} removed "
+            f"({self.reloads} ruleset reload(s))"
+        )
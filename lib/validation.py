@@ -1614,6 +1614,7 @@ def validate_hosted_flags(config: Any) -> None:
     allow_memory_overcommit = getattr(config, "allow_memory_overcommit", False)
     image_storage = getattr(config, "vm_image_storage", None)
     image_sha512 = getattr(config, "vm_image_sha512", None)
+    vm_template = getattr(config, "vm_template", True)
     validate_vm_storage_settings(config, require_provisioning=True)
     if not config.hosted_node:
         if balloon_min:
@@ -1626,6 +1627,8 @@ def validate_hosted_flags(config: Any) -> None:
             raise ValueError("--image-storage requires --provision-on")
         if image_sha512:
             raise ValueError("--image-sha512 requires --provision-on")
+        if not vm_template:
+            raise ValueError("--no-vm-template requires --provision-on")
         return
 
     from lib.validators import validate_host
@@ -1797,6 +1800,8 @@ def validate_hosted_flags(config: Any) -> None:
             raise ValueError("--image requires --machine vm")
         if image_storage:
             raise ValueError("--image-storage requires --machine vm")
+        if not vm_template:
+            raise ValueError("--no-vm-template requires --machine vm")
 
 
 def validate_rdp_settings(config: Any) -> None:
@@ -4,7 +4,15 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Mapping
 
-from lib.plugin_registry import PluginDefinition
+from lib.plugin_registry import (
+    RESOURCE_APT,
+    RESOURCE_HOME,
+    RESOURCE_SYSTEMD,
+    RESOURCE_USERS,
+    PluginDefinition,
+    StepResources,
+    path_resource,
+)
 
 if TYPE_CHECKING:
     from lib.config import SetupConfig
@@ -58,6 +66,60 @@ PLUGIN = PluginDefinition(
         "install_flatpak_packages",
     ),
     custom_step_provider="plugins.common:get_custom_step_functions",
+    step_resources=(
+        StepResources("update_and_upgrade_packages", writes=(RESOURCE_APT,)),
+        StepResources("check_debian_package_sources", writes=(RESOURCE_APT,)),
+        StepResources(
+            "ensure_sudo_installed",
+            writes=(RESOURCE_APT, path_resource("/etc/sudoers.d")),
+        ),
+        # configure_locale stays undeclared: it changes this process's
+        # environment, which every concurrently running step would inherit.
+        StepResources("configure_ipv4_preference", writes=(path_resource("/etc/gai.conf"),)),
+        StepResources(
+            "setup_user",
+            writes=(RESOURCE_USERS, RESOURCE_HOME, path_resource("/etc/sudoers.d")),
+        ),
+        StepResources(
+            "copy_ssh_keys_to_user",
+            reads=(RESOURCE_USERS, path_resource("/root/.ssh/authorized_keys")),
+            writes=(RESOURCE_HOME,),
+        ),
+        StepResources("generate_ssh_key", reads=(RESOURCE_USERS,), writes=(RESOURCE_HOME,)),
+        StepResources("configure_time_sync", writes=(RESOURCE_APT, RESOURCE_SYSTEMD)),
+        StepResources(
+            "configure_swap",
+            writes=(
+                path_resource("/swapfile"),
+                path_resource("/etc/fstab"),
+                path_resource("/etc/sysctl.conf"),
+            ),
+        ),
+        StepResources(
+            "install_go",
+            writes=(RESOURCE_APT, path_resource("/usr/local/go"), path_resource("/etc/profile.d")),
+        ),
+        StepResources("install_node", reads=(RESOURCE_USERS,), writes=(RESOURCE_APT, RESOURCE_HOME)),
+        StepResources(
+            "install_python",
+            reads=(RESOURCE_USERS,),
+            writes=(RESOURCE_APT, RESOURCE_HOME, path_resource("/usr/local/bin")),
+        ),
+        StepResources(
+            "configure_auto_update_uv",
+            reads=(RESOURCE_USERS, RESOURCE_HOME),
+            writes=(RESOURCE_SYSTEMD,),
+        ),
+        StepResources("configure_auto_update_gogs", writes=(RESOURCE_SYSTEMD,)),
+        StepResources("install_cli_tools", writes=(RESOURCE_APT,)),
+        StepResources("install_control_plane_tools", writes=(RESOURCE_APT,)),
+        StepResources("install_mail_utils", writes=(RESOURCE_APT,)),
+        StepResources("install_apt_packages", writes=(RESOURCE_APT,)),
+        StepResources(
+            "install_flatpak_packages",
+            writes=(RESOURCE_APT, path_resource("/var/lib/flatpak")),
+        ),
+    ),
 )
 
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Mapping
 
-from lib.plugin_registry import PluginDefinition
+from lib.plugin_registry import RESOURCE_USERS, PluginDefinition, StepResources
 
 if TYPE_CHECKING:
     from lib.types import StepFunc
@@ -33,6 +33,9 @@ PLUGIN = PluginDefinition(
         "configure_proxmox_management_firewall",
     ),
     custom_step_provider="plugins.security:get_custom_step_functions",
+    step_resources=(
+        StepResources("create_remoteusers_group", writes=(RESOURCE_USERS,)),
+    ),
 )
 
 
@@ -4,7 +4,15 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Mapping
 
-from lib.plugin_registry import PluginDefinition
+from lib.plugin_registry import (
+    RESOURCE_HOME,
+    RESOURCE_NGINX,
+    RESOURCE_SYSTEMD,
+    RESOURCE_USERS,
+    PluginDefinition,
+    StepResources,
+    path_resource,
+)
 
 if TYPE_CHECKING:
     from lib.config import SetupConfig
@@ -53,6 +61,16 @@ PLUGIN = PluginDefinition(
         "install_build_dependencies",
     ),
     custom_step_provider="plugins.web:get_custom_step_functions",
+    step_resources=(
+        StepResources(
+            "configure_auto_update_node",
+            reads=(RESOURCE_USERS, RESOURCE_HOME),
+            writes=(RESOURCE_SYSTEMD,),
+        ),
+        StepResources("configure_nginx_security", writes=(RESOURCE_NGINX,)),
+        StepResources("create_hello_world_site", writes=(path_resource("/var/www/html"),)),
+        StepResources("configure_default_site", writes=(RESOURCE_NGINX,)),
+    ),
 )
 
 
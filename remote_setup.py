@@ -9,16 +9,19 @@ import re
 import shutil
 import sys
 import time
+from contextlib import nullcontext
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from lib.apt_sources import AptMetadataTracker, configure_apt_metadata_tracking
 from lib.arg_parser import create_setup_argument_parser
 from lib.config import SetupConfig
 from lib.display import print_setup_summary
 from lib.machine_state import STATE_DIR, resolve_machine_type, save_machine_state, save_setup_config
 from lib.notifications import send_setup_notification
 from lib.operation_state import OperationRecord, OperationStateStore
-from lib.remote_utils import detect_os, is_dry_run, set_dry_run
+from lib.remote_utils import apt_usage, detect_os, is_dry_run, set_dry_run
+from lib.ufw_rules import UfwSnapshotCache, configure_ufw_snapshot_sharing
 from lib.validation import (
     validate_agent_repositories,
     validate_agent_git_settings,
@@ -27,6 +30,7 @@ from lib.validation import (
     validate_web_interface_settings,
     validate_gogs_settings,
     validate_network_setup_settings,
+    validate_positive_integer,
     validate_rdp_settings,
     validate_samba_share_credentials,
     validate_samba_share_specs,
@@ -34,7 +38,11 @@ from lib.validation import (
     validate_vm_storage_settings,
 )
 from lib.validators import validate_username
+from lib.plugin_registry import get_step_resources, resolve_custom_step
 from lib.progress import progress_bar
+from lib.step_output import prefixed_step_output, step_output_prefix
+from lib.step_scheduler import StepTiming, build_step_dependencies, critical_path, run_step_graph
+from lib.step_state import StepStateStore, project_code_version, step_fingerprint
 from lib.system_types import get_steps_for_system_type
 from typing import Optional
 from lib.types import Deployments, StepFunc
@@ -43,6 +51,8 @@ from lib.types import Deployments, StepFunc
 REMOTE_AGENT_PAYLOAD_DIR = "/opt/infra_tools/agent_payload"
 REMOTE_DEVICE_PAIRING_PAYLOAD_DIR = "/opt/infra_tools/device_pairing_payload"
 SETUP_OPERATION_FILE = os.path.join(STATE_DIR, "setup-operation.json")
+STEP_STATE_FILE = os.path.join(STATE_DIR, "setup-steps.json")
+APT_METADATA_STATE_FILE = os.path.join(STATE_DIR, "apt-metadata.json")
 _active_setup_operation: Optional[tuple[OperationStateStore, OperationRecord]] = None
 
 
@@ -307,6 +317,22 @@ def _print_dry_run_plan(steps: list[tuple[str, StepFunc]]) -> None:
     print("\n[DRY-RUN] No setup steps were executed and no target files were changed.")
 
 
+def _print_step_timing_report(
+    dependencies: list[tuple[int, ...]],
+    timings: list[StepTiming],
+    wall_seconds: float,
+) -> None:
+    """Print total step time against wall time and the critical path."""
+    if not timings:
+        return
+    step_seconds = sum(timing.elapsed for timing in timings)
+    path = critical_path(dependencies, timings)
+    print(f"\nSteps took {step_seconds:.1f}s of work in {wall_seconds:.1f}s wall time")
+    print(f"Critical path ({sum(timing.elapsed for timing in path):.1f}s):")
+    for timing in path:
+        print(f"  {timing.elapsed:6.1f}s  {timing.name}")
+
+
 def config_from_remote_args(args: argparse.Namespace) -> SetupConfig:
     if args.custom_steps:
         system_type = "custom_steps"
@@ -331,6 +357,11 @@ def config_from_remote_args(args: argparse.Namespace) -> SetupConfig:
     validate_vm_storage_settings(config, require_provisioning=False)
     validate_network_setup_settings(config)
     validate_rdp_settings(config)
+    validate_positive_integer(str(config.step_workers), "step workers")
+    validate_positive_integer(str(config.apt_metadata_max_age), "APT metadata max age")
+    for step_name in config.force_steps or []:
+        if step_name != "all":
+            resolve_custom_step(step_name)
     
     if system_type == "server_proxmox":
         config.username = "root"
@@ -415,7 +446,37 @@ def _run_main() -> int:
     setup_errors: list[str] = []
     
     total_steps = len(steps)
-    for i, (name, func) in enumerate(steps, 1):
+    step_names = [name for name, _func in steps]
+    step_resources = [get_step_resources(func) for _name, func in steps]
+    dependencies = build_step_dependencies(step_resources)
+    started_count = 0
+    # A password or --refresh-packages asks for work a fingerprint cannot see.
+    step_state = (
+        None
+        if config.refresh_packages or config.password
+        else StepStateStore(STEP_STATE_FILE)
+    )
+    code_version = (
+        project_code_version(os.path.dirname(os.path.abspath(__file__)))
+        if step_state is not None and any(step_resources)
+        else ""
+    )
+    forced_steps = set(config.force_steps or [])
+    configure_apt_metadata_tracking(
+        AptMetadataTracker(
+            APT_METADATA_STATE_FILE,
+            config.apt_metadata_max_age * 60,
+            force=config.refresh_packages,
+        )
+    )
+    ufw_snapshot = UfwSnapshotCache()
+    configure_ufw_snapshot_sharing(ufw_snapshot)
+    skipped_steps: list[str] = []
+
+    def start_step(index: int) -> None:
+        nonlocal started_count
+        started_count += 1
+        name = step_names[index]
         _transition_setup_operation(
             "applying",
             {
@@ -423,13 +484,31 @@ def _run_main() -> int:
                 "system_type": config.system_type,
                 "username": config.username,
                 "step": name,
-                "step_index": i,
+                "step_index": index + 1,
                 "step_count": total_steps,
             },
         )
-        bar = progress_bar(i, total_steps)
-        print(f"\n{bar} [{i}/{total_steps}] {name}")
+        bar = progress_bar(started_count, total_steps)
+        print(f"\n{bar} [{started_count}/{total_steps}] {name}")
         sys.stdout.flush()
+
+    def run_step(index: int) -> None:
+        with step_output_prefix(step_names[index]):
+            run_step_body(index)
+
+    def run_step_body(index: int) -> None:
+        name, func = steps[index]
+        resources = step_resources[index]
+        tracked = step_state is not None and resources is not None
+        if (
+            tracked
+            and not forced_steps & {resources.step, "all"}
+            and step_state.is_current(resources.step, step_fingerprint(resources, config, code_version))
+        ):
+            skipped_steps.append(name)
+            print(f"  ✓ {name} unchanged since its last successful run; skipped")
+            sys.stdout.flush()
+            return
         step_started = time.monotonic()
         try:
             func(config)
@@ -438,18 +517,49 @@ def _run_main() -> int:
             elapsed = time.monotonic() - step_started
             print(f"  ✗ {error_msg} ({elapsed:.1f}s)")
             setup_errors.append(error_msg)
-            if config.notify_specs:
-                send_setup_notification(
-                    notify_specs=config.notify_specs,
-                    system_type=config.system_type,
-                    host=config.host,
-                    success=False,
-                    errors=setup_errors,
-                    friendly_name=config.friendly_name,
-                )
+            if tracked:
+                step_state.forget(resources.step)
             raise
+        if tracked:
+            step_state.record_success(resources.step, step_fingerprint(resources, config, code_version))
         elapsed = time.monotonic() - step_started
-        print(f"  ✓ Step completed in {elapsed:.1f}s")
+        print(f"  ✓ {name} completed in {elapsed:.1f}s")
+        sys.stdout.flush()
+
+    setup_started = time.monotonic()
+    try:
+        with prefixed_step_output() if config.step_workers > 1 else nullcontext():
+            timings = run_step_graph(
+                step_names,
+                dependencies,
+                run_step,
+                max_workers=config.step_workers,
+                on_start=start_step,
+            )
+    except Exception:
+        if config.notify_specs:
+            send_setup_notification(
+                notify_specs=config.notify_specs,
+                system_type=config.system_type,
+                host=config.host,
+                success=False,
+                errors=setup_errors,
+                friendly_name=config.friendly_name,
+            )
+        raise
+    finally:
+        configure_apt_metadata_tracking(None)
+        configure_ufw_snapshot_sharing(None)
+
+    _print_step_timing_report(dependencies, timings, time.monotonic() - setup_started)
+    if skipped_steps:
+        print(f"Skipped {len(skipped_steps)} unchanged step(s); use --force-step STEP to rerun one")
+    apt_summary = apt_usage().summary()
+    if apt_summary:
+        print(apt_summary)
+    ufw_summary = ufw_snapshot.summary()
+    if ufw_summary:
+        print(ufw_summary)
     
     bar = progress_bar(total_steps, total_steps)
     print(f"\n{bar} Complete!")
@@ -556,7 +666,6 @@ def _run_main() -> int:
         from smb.samba_steps import (
             install_samba,
             configure_samba_firewall,
-            configure_samba_global_settings,
             configure_samba_fail2ban,
             reconcile_samba_shares
         )
@@ -565,20 +674,20 @@ def _run_main() -> int:
         print("Configuring Samba...")
         print("=" * 60)
         
-        print("\n[1/4] Installing Samba")
+        print("\n[1/3] Installing Samba")
         install_samba(config)
         
-        print("\n[2/4] Configuring global Samba settings with security hardening")
-        configure_samba_global_settings(config)
-        
-        print("\n[3/4] Configuring firewall for Samba")
+        print("\n[2/3] Configuring firewall for Samba")
         configure_samba_firewall(config)
         
-        print("\n[4/4] Configuring fail2ban for Samba brute-force protection")
+        print("\n[3/3] Configuring fail2ban for Samba brute-force protection")
         configure_samba_fail2ban(config)
         
         print("\n" + "=" * 60)
-        print(f"Reconciling {len(config.samba_shares or [])} Samba share(s)...")
+        print(
+            f"Reconciling hardened Samba settings and "
+            f"{len(config.samba_shares or [])} share(s)..."
+        )
         print("=" * 60)
         reconcile_samba_shares(config)
         
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Measure per-event OperationLogger overhead against its documented budget."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from lib.logging_utils import get_rotating_logger, log_message  # noqa: E402
+from lib.operation_log import EVENT_OVERHEAD_BUDGET_MICROSECONDS, OperationLogger  # noqa: E402
+
+
+def _per_event_microseconds(start: float, events: int) -> float:
+    return (time.perf_counter() - start) * 1_000_000 / events
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000, help="Events to log (default: 100000)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        unbuffered = get_rotating_logger("benchmark_unbuffered", str(Path(tmpdir) / "unbuffered.log"))
+        start = time.perf_counter()
+        for index in range(args.events):
+            log_message(unbuffered, f'{{"event_type": "metric", "value": {index}}}')
+        baseline = _per_event_microseconds(start, args.events)
+
+        logger = OperationLogger("benchmark", str(Path(tmpdir) / "buffered.log"))
+        start = time.perf_counter()
+        for index in range(args.events):
+            logger.log_metric("files_checked", index, "count")
+        logger.complete()
+        buffered = _per_event_microseconds(start, args.events)
+
+    print(f"Per-call handler write (baseline): {baseline:.2f} us/event")
+    print(f"Buffered log_metric:               {buffered:.2f} us/event")
+    print(f"Budget:                            {EVENT_OVERHEAD_BUDGET_MICROSECONDS:.2f} us/event")
+    if buffered > EVENT_OVERHEAD_BUDGET_MICROSECONDS:
+        print("Buffered operation logging exceeds its per-event budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
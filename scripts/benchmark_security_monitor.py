@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Measure security-monitor SSH journal parsing throughput on a synthetic log.
+
+Compares JSON-decoding and regex-parsing every journal line with the
+substring prefilter used by the monitor.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Iterable
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from security.service_tools.security_monitor import _SshFailureAggregator  # noqa: E402
+
+_NOISE = (
+    "Connection closed by {ip} port {port} [preauth]",
+    "Received disconnect from {ip} port {port}:11: Bye Bye [preauth]",
+    "Disconnected from {ip} port {port} [preauth]",
+    "pam_unix(sshd:session): session opened for user deploy(uid=1000) by (uid=0)",
+    "Accepted key ED25519 SHA256:abc for deploy from {ip} port {port} ssh2",
+)
+_ATTACK = (
+    "Failed password for root from {ip} port {port} ssh2",
+    "Invalid user admin from {ip} port {port}",
+    "pam_unix(sshd:auth): authentication failure; logname= uid=0 euid=0 tty=ssh ruser= rhost={ip}",
+)
+
+
+def _synthetic_pool(size: int, attack_ratio: float) -> list[str]:
+    rng = random.Random(0)
+    pool = []
+    for index in range(size):
+        templates = _ATTACK if rng.random() < attack_ratio else _NOISE
+        message = rng.choice(templates).format(
+            ip=f"203.0.113.{rng.randrange(1, 255)}",
+            port=rng.randrange(1024, 65535),
+        )
+        pool.append(json.dumps({
+            "__CURSOR": f"s=0123456789abcdef;i={index:x};b=fedcba9876543210;m={index:x};t={index:x};x=0",
+            "__REALTIME_TIMESTAMP": "1766400000000000",
+            "MESSAGE": message,
+            "_SOURCE_REALTIME_TIMESTAMP": "1766400000000000",
+        }))
+    return pool
+
+
+def _decode_every_line(lines: Iterable[str]) -> int:
+    aggregator = _SshFailureAggregator()
+    for line in lines:
+        record = json.loads(line)
+        aggregator.add_message(record["MESSAGE"], None)
+    return int(aggregator.summary()["failure_count"])
+
+
+def _prefiltered(lines: Iterable[str]) -> int:
+    aggregator = _SshFailureAggregator()
+    for line in lines:
+        aggregator.add_line(line)
+    return int(aggregator.summary()["failure_count"])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=1_000_000, help="Journal lines to parse (default: 1000000)")
+    parser.add_argument(
+        "--attack-ratio",
+        type=float,
+        default=0.2,
+        help="Fraction of lines that are authentication failures (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    pool = _synthetic_pool(10_000, args.attack_ratio)
+    results = []
+    for label, parse in (("Decode every line", _decode_every_line), ("Prefiltered", _prefiltered)):
+        start = time.perf_counter()
+        failures = parse(itertools.islice(itertools.cycle(pool), args.lines))
+        elapsed = time.perf_counter() - start
+        results.append(failures)
+        print(f"{label + ':':19} {args.lines / elapsed:>12,.0f} lines/s ({failures} failures)")
+    if results[0] != results[1]:
+        print("Prefiltered parsing counted a different number of failures")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,12 +4,12 @@ from __future__ import annotations
 
 import json
 import os
-import re
 import shlex
 import shutil
+from dataclasses import replace
 from urllib.parse import quote
 
-from lib.maintenance_systemd import configure_maintenance_timer
+from lib.maintenance_systemd import configure_maintenance_daemon, configure_maintenance_timer
 from lib.config import SetupConfig
 from lib.maintenance_defaults import JOURNAL_MAX_USE
 from lib.machine_state import (
@@ -20,6 +20,9 @@ from lib.machine_state import (
     is_vm,
 )
 from lib.remote_utils import is_dry_run, run
+from lib.systemd_service import cleanup_service
+from lib.network_firewall import plan_firewall_changes
+from lib.ufw_rules import DesiredUfwRule, UfwFirewall, UfwRuleError
 from lib.validation import validate_network_ip_or_cidr
 
 _LEGACY_UNATTENDED_ORIGINS_FILE = "/etc/apt/apt.conf.d/52infra-tools-unattended-upgrades"
@@ -37,12 +40,12 @@ _FAILLOCK_CONF = "/etc/security/faillock.conf"
 _PAM_FAILLOCK_PROFILE = "/usr/share/pam-configs/faillock-infra-tools"
 _ISSUE_BANNER = "Authorized access only. All activity is monitored and logged.\n"
 _SECURITY_MONITOR_SCRIPT = "/opt/infra_tools/security/service_tools/security_monitor.py"
+_SECURITY_MONITOR_DAEMON_SERVICE = "security-monitor-daemon"
 _SSH_RULE_COMMENT_PREFIX = "infra_tools SSH"
 _RDP_RULE_COMMENT_PREFIX = "infra_tools RDP"
 _WEB_RULE_COMMENT_PREFIX = "infra_tools web TCP"
 _MDNS_RULE_COMMENT_PREFIX = "infra_tools mDNS UDP"
 _PROXMOX_MANAGEMENT_COMMENT_PREFIX = "infra_tools access source"
-_UFW_NUMBERED_RULE_RE = re.compile(r"^\[\s*(\d+)\]")
 _APPARMOR_USERNS_PROFILE = "/etc/apparmor.d/unprivileged_userns"
 _APPARMOR_USERNS_RESTRICTION = (
     "/proc/sys/kernel/apparmor_restrict_unprivileged_userns"
@@ -104,203 +107,179 @@ def create_remoteusers_group(config: SetupConfig) -> None:
         print("  ✓ remoteusers group already exists with root user")
 
 
-def _rdp_firewall_rules(config: SetupConfig) -> list[tuple[str, str]]:
-    """Return validated UFW comment/command pairs for the requested RDP policy."""
+def _rdp_firewall_rules(config: SetupConfig) -> list[DesiredUfwRule]:
+    """Return validated UFW rules for the requested RDP policy."""
     sources = [
         validate_network_ip_or_cidr(source, "RDP source")
         for source in config.effective_rdp_sources()
     ]
     if not sources:
-        comment = f"{_RDP_RULE_COMMENT_PREFIX} global"
-        return [(comment, f"ufw limit 3389/tcp comment {shlex.quote(comment)}")]
-
-    rules: list[tuple[str, str]] = []
-    for source in sources:
-        comment = f"{_RDP_RULE_COMMENT_PREFIX} source {source}"
-        rules.append(
-            (
-                comment,
-                "ufw limit from "
-                f"{shlex.quote(source)} to any port 3389 proto tcp "
-                f"comment {shlex.quote(comment)}",
-            )
+        return [DesiredUfwRule("limit 3389/tcp", f"{_RDP_RULE_COMMENT_PREFIX} global")]
+    return [
+        DesiredUfwRule(
+            f"limit from {shlex.quote(source)} to any port 3389 proto tcp",
+            f"{_RDP_RULE_COMMENT_PREFIX} source {source}",
         )
-    return rules
-
-
-def _remove_stale_managed_rules(
-    comment_prefix: str,
-    desired_comments: set[str],
-) -> None:
-    """Remove obsolete comment-tagged rules in descending UFW order."""
-    result = run("ufw status numbered", check=False, capture_output=True)
-    stdout = getattr(result, "stdout", None)
-    if result.returncode != 0 or not isinstance(stdout, str):
-        return
-
-    stale_rule_numbers: list[int] = []
-    for line in stdout.splitlines():
-        if "#" not in line:
-            continue
-        comment = line.split("#", 1)[1].strip()
-        if comment != comment_prefix and not comment.startswith(f"{comment_prefix} "):
-            continue
-        if comment in desired_comments:
-            continue
-        match = _UFW_NUMBERED_RULE_RE.match(line.strip())
-        if match:
-            stale_rule_numbers.append(int(match.group(1)))
-
-    for rule_number in sorted(stale_rule_numbers, reverse=True):
-        run(f"ufw --force delete {rule_number}", check=False)
-
-
-def _configure_rdp_firewall(config: SetupConfig) -> None:
-    """Apply RDP rules without removing broad access before replacements exist."""
-    rules = _rdp_firewall_rules(config)
-    has_restricted_sources = bool(config.effective_rdp_sources())
-
-    if not has_restricted_sources:
-        # A legacy untagged limit rule is indistinguishable from the desired
-        # global rule to UFW. Replace it so future reruns can reconcile by tag.
-        run("ufw delete allow 3389/tcp", check=False)
-        run("ufw delete limit 3389/tcp", check=False)
-
-    for _comment, command in rules:
-        result = run(command, check=False)
-        if result.returncode != 0:
-            if not has_restricted_sources:
-                # Preserve the pre-existing reachability contract if tagging
-                # the replacement global rule unexpectedly fails.
-                run("ufw limit 3389/tcp", check=False)
-            raise RuntimeError("Failed to install the requested RDP firewall rule")
-
-    if has_restricted_sources:
-        # Replacements are active before broad legacy access is removed.
-        run("ufw delete allow 3389/tcp", check=False)
-        run("ufw delete limit 3389/tcp", check=False)
-
-    _remove_stale_managed_rules(
-        _RDP_RULE_COMMENT_PREFIX,
-        {comment for comment, _command in rules},
-    )
+        for source in sources
+    ]
 
 
-def _configure_ssh_firewall(config: SetupConfig) -> None:
+def _ssh_firewall_rules(config: SetupConfig) -> list[DesiredUfwRule]:
     """Allow trusted SSH sources or rate-limit unrestricted SSH access."""
-
     sources = [
         validate_network_ip_or_cidr(source, "SSH source")
         for source in config.effective_access_sources()
     ]
     if not sources:
-        result = run("ufw limit ssh", check=False)
-        if result.returncode != 0:
-            raise RuntimeError("Failed to install the requested SSH firewall rule")
-        _remove_stale_managed_rules(_SSH_RULE_COMMENT_PREFIX, set())
-        return
-
-    desired_comments: set[str] = set()
-    for source in sources:
-        comment = f"{_SSH_RULE_COMMENT_PREFIX} trusted source {source}"
-        result = run(
-            "ufw allow from "
-            f"{shlex.quote(source)} to any port 22 proto tcp "
-            f"comment {shlex.quote(comment)}",
-            check=False,
+        return [DesiredUfwRule("limit ssh", target="22/tcp", action="LIMIT IN")]
+    return [
+        DesiredUfwRule(
+            f"allow from {shlex.quote(source)} to any port 22 proto tcp",
+            f"{_SSH_RULE_COMMENT_PREFIX} trusted source {source}",
         )
-        if result.returncode != 0:
-            raise RuntimeError("Failed to install the requested SSH firewall rule")
-        desired_comments.add(comment)
-
-    for broad_rule in ("allow ssh", "limit ssh", "allow 22/tcp", "limit 22/tcp"):
-        run(f"ufw delete {broad_rule}", check=False)
-    _remove_stale_managed_rules(_SSH_RULE_COMMENT_PREFIX, desired_comments)
-
+        for source in sources
+    ]
 
-def _configure_managed_web_ports(config: SetupConfig) -> list[int]:
-    """Reconcile infra_tools-managed TCP web ports."""
 
-    ports = config.effective_web_ports()
+def _web_firewall_rules(config: SetupConfig, ports: list[int]) -> list[tuple[int, DesiredUfwRule]]:
+    """Return infra_tools-managed TCP web port rules keyed by port."""
     sources = [
         validate_network_ip_or_cidr(source, "web port source")
         for source in config.effective_access_sources()
     ]
-    desired_comments: set[str] = set()
+    rules: list[tuple[int, DesiredUfwRule]] = []
     for port in ports:
         if sources:
-            for source in sources:
-                comment = f"{_WEB_RULE_COMMENT_PREFIX} {port} source {source}"
-                result = run(
-                    "ufw allow from "
-                    f"{shlex.quote(source)} to any port {port} proto tcp "
-                    f"comment {shlex.quote(comment)}",
-                    check=False,
+            rules.extend(
+                (
+                    port,
+                    DesiredUfwRule(
+                        f"allow from {shlex.quote(source)} to any port {port} proto tcp",
+                        f"{_WEB_RULE_COMMENT_PREFIX} {port} source {source}",
+                    ),
                 )
-                if result.returncode != 0:
-                    raise RuntimeError(
-                        f"Failed to install web firewall rule for TCP {port}"
-                    )
-                desired_comments.add(comment)
-            # Replacements are active before the old broad rule is removed.
-            run(f"ufw delete allow {port}/tcp", check=False)
-        else:
-            comment = f"{_WEB_RULE_COMMENT_PREFIX} {port}"
-            result = run(
-                f"ufw allow {port}/tcp comment {shlex.quote(comment)}",
-                check=False,
+                for source in sources
             )
-            if result.returncode != 0:
-                raise RuntimeError(
-                    f"Failed to install web firewall rule for TCP {port}"
-                )
-            desired_comments.add(comment)
-
-    _remove_stale_managed_rules(_WEB_RULE_COMMENT_PREFIX, desired_comments)
-    return ports
-
+        else:
+            rules.append((port, DesiredUfwRule(f"allow {port}/tcp", f"{_WEB_RULE_COMMENT_PREFIX} {port}")))
+    return rules
 
-def _configure_mdns_firewall(config: SetupConfig) -> None:
-    """Allow Avahi's local-network multicast traffic through UFW."""
 
+def _mdns_firewall_managed(config: SetupConfig) -> bool:
+    """Return whether this run reconciles Avahi's multicast firewall rule."""
     if not (config.enable_mdns or config.clear_mdns):
-        return
-
+        return False
     if config.enable_mdns and not can_manage_mdns():
         print(
             "  ✓ Skipping mDNS firewall rule "
             "(OCI containers cannot run a target system service)"
         )
-        return
+        return False
+    return True
 
-    if not config.enable_mdns:
-        _remove_stale_managed_rules(_MDNS_RULE_COMMENT_PREFIX, set())
-        return
 
-    comment = _MDNS_RULE_COMMENT_PREFIX
-    result = run(
-        f"ufw allow 5353/udp comment {shlex.quote(comment)}",
-        check=False,
-    )
-    if result.returncode != 0:
-        raise RuntimeError("Failed to install the mDNS firewall rule")
-    _remove_stale_managed_rules(_MDNS_RULE_COMMENT_PREFIX, {comment})
+def _reconcile_firewall_rules(
+    firewall: UfwFirewall,
+    config: SetupConfig,
+    *,
+    include_rdp: bool = False,
+    include_web: bool = False,
+) -> list[int]:
+    """Bring managed SSH, RDP, web and mDNS rules to the desired state.
+
+    Missing rules are added before superseded broad rules and stale tagged
+    rules are deleted, so access is never narrower than requested mid-run.
+    Returns the reconciled web ports.
+    """
+    ssh_error = "Failed to install the requested SSH firewall rule"
+    rdp_error = "Failed to install the requested RDP firewall rule"
+    desired = [replace(rule, failure=ssh_error) for rule in _ssh_firewall_rules(config)]
+    prefixes = [_SSH_RULE_COMMENT_PREFIX]
+    superseded: list[tuple[str, tuple[str, ...]]] = []
+    if config.effective_access_sources():
+        superseded.append(("22/tcp", ("ALLOW IN", "LIMIT IN")))
+
+    rdp_global = None
+    if include_rdp:
+        rdp_rules = [replace(rule, failure=rdp_error) for rule in _rdp_firewall_rules(config)]
+        desired.extend(rdp_rules)
+        prefixes.append(_RDP_RULE_COMMENT_PREFIX)
+        if config.effective_rdp_sources():
+            superseded.append(("3389/tcp", ("ALLOW IN", "LIMIT IN")))
+        else:
+            rdp_global = rdp_rules[0]
+            # A legacy untagged limit rule is indistinguishable from the desired
+            # global rule to UFW. Replace it so future reruns can reconcile by tag.
+            if not rdp_global.present_in(firewall.status().rules):
+                firewall.delete(
+                    lambda rule: rule.is_untagged_global("3389/tcp", ("ALLOW IN", "LIMIT IN"))
+                )
+
+    web_ports = config.effective_web_ports() if include_web else []
+    if include_web:
+        for port, rule in _web_firewall_rules(config, web_ports):
+            desired.append(replace(rule, failure=f"Failed to install web firewall rule for TCP {port}"))
+        prefixes.append(_WEB_RULE_COMMENT_PREFIX)
+        if config.effective_access_sources():
+            superseded.extend((f"{port}/tcp", ("ALLOW IN",)) for port in web_ports)
+
+    if _mdns_firewall_managed(config):
+        prefixes.append(_MDNS_RULE_COMMENT_PREFIX)
+        if config.enable_mdns:
+            desired.append(
+                DesiredUfwRule(
+                    "allow 5353/udp",
+                    _MDNS_RULE_COMMENT_PREFIX,
+                    failure="Failed to install the mDNS firewall rule",
+                )
+            )
+
+    try:
+        firewall.reconcile(
+            desired,
+            owned=lambda rule: any(rule.has_comment_prefix(prefix) for prefix in prefixes),
+            superseded=lambda rule: any(
+                rule.is_untagged_global(target, actions) for target, actions in superseded
+            ),
+        )
+    except UfwRuleError as exc:
+        if exc.rule is rdp_global:
+            # Preserve the pre-existing reachability contract if tagging
+            # the replacement global rule unexpectedly fails.
+            firewall.change("limit 3389/tcp")
+        raise
+    return web_ports
+
+
+def _prepare_inactive_firewall(firewall: UfwFirewall) -> bool:
+    """Install UFW with default policies; return whether it was already active."""
+    if firewall.active:
+        return True
+    os.environ["DEBIAN_FRONTEND"] = "noninteractive"
+    run("apt-get install -y -qq ufw")
+    firewall.change("default deny incoming", check=True)
+    firewall.change("default allow outgoing", check=True)
+    return False
+
+
+def _enable_firewall(firewall: UfwFirewall) -> bool:
+    if firewall.enable():
+        return True
+    if is_container():
+        print("  ⚠ Firewall could not be enabled (container may lack capabilities)")
+        return False
+    raise RuntimeError("Firewall could not be enabled (check command output)")
 
 
 def configure_firewall(config: SetupConfig) -> None:
-    result = run("ufw status 2>/dev/null | grep -q 'Status: active'", check=False)
-    firewall_active = result.returncode == 0
-
-    if not firewall_active:
-        os.environ["DEBIAN_FRONTEND"] = "noninteractive"
-        run("apt-get install -y -qq ufw")
-        run("ufw default deny incoming", check=True)
-        run("ufw default allow outgoing", check=True)
-    _configure_ssh_firewall(config)
-    if config.enable_rdp:
-        _configure_rdp_firewall(config)
-    web_ports = _configure_managed_web_ports(config)
-    _configure_mdns_firewall(config)
+    firewall = UfwFirewall(run)
+    firewall_active = _prepare_inactive_firewall(firewall)
+    web_ports = _reconcile_firewall_rules(
+        firewall,
+        config,
+        include_rdp=config.enable_rdp,
+        include_web=True,
+    )
 
     if firewall_active:
         if web_ports:
@@ -310,14 +289,10 @@ def configure_firewall(config: SetupConfig) -> None:
             )
         else:
             print("  ✓ Firewall already configured")
+        print(f"  ✓ {firewall.summary()}")
         return
 
-    result = run("ufw --force enable", check=False)
-    if result.returncode != 0:
-        if is_container():
-            print("  ⚠ Firewall could not be enabled (container may lack capabilities)")
-        else:
-            raise RuntimeError("Firewall could not be enabled (check command output)")
+    if not _enable_firewall(firewall):
         return
 
     ssh_policy = (
@@ -342,6 +317,7 @@ def configure_firewall(config: SetupConfig) -> None:
             )
     else:
         print(f"  ✓ Firewall configured ({ssh_policy})")
+    print(f"  ✓ {firewall.summary()}")
 
 
 def configure_fail2ban(config: SetupConfig) -> None:
@@ -778,12 +754,29 @@ def configure_security_monitor(config: SetupConfig) -> None:
 
     Monitors fail2ban ban events, auditd key events (identity, sudoers, SSH
     config, kernel modules, privileged execs), and SSH auth failures, then
-    sends notifications via the configured infra_tools targets.
+    sends notifications via the configured infra_tools targets. With
+    ``--security-monitor-daemon`` a continuous service replaces the timer.
     """
     if not (is_vm() or is_hardware()):
         print("  ✓ Skipping security monitor (not applicable to containers)")
         return
 
+    if config.security_monitor_daemon:
+        configured = configure_maintenance_daemon(
+            service_name=_SECURITY_MONITOR_DAEMON_SERVICE,
+            service_desc="Security event monitor daemon",
+            script_path=_SECURITY_MONITOR_SCRIPT,
+            script_args=("--daemon",),
+            check_name="Security event monitor",
+            purpose="monitor",
+        )
+        if not configured:
+            raise RuntimeError("Security event monitor daemon failed verification")
+        # Retire the timer only once the daemon is running.
+        if not is_dry_run():
+            cleanup_service("security-monitor")
+        return
+
     configured = configure_maintenance_timer(
         service_name="security-monitor",
         service_desc="Security event monitor",
@@ -797,6 +790,8 @@ def configure_security_monitor(config: SetupConfig) -> None:
     )
     if not configured:
         raise RuntimeError("Security event monitor timer failed verification")
+    if not is_dry_run():
+        cleanup_service(_SECURITY_MONITOR_DAEMON_SERVICE)
 
 
 def _cleanup_legacy_unattended_upgrades() -> None:
@@ -848,30 +843,19 @@ def configure_auto_updates(config: SetupConfig) -> None:
 
 
 def configure_firewall_web(config: SetupConfig) -> None:
-    result = run("ufw status 2>/dev/null | grep -q 'Status: active'", check=False)
-    firewall_active = result.returncode == 0
-    if not firewall_active:
-        os.environ["DEBIAN_FRONTEND"] = "noninteractive"
-        run("apt-get install -y -qq ufw")
-        run("ufw default deny incoming", check=True)
-        run("ufw default allow outgoing", check=True)
-    _configure_ssh_firewall(config)
-    web_ports = _configure_managed_web_ports(config)
-    _configure_mdns_firewall(config)
+    firewall = UfwFirewall(run)
+    firewall_active = _prepare_inactive_firewall(firewall)
+    web_ports = _reconcile_firewall_rules(firewall, config, include_web=True)
 
     if firewall_active:
         print(
             "  ✓ Firewall already active; web ports reconciled: "
             + ", ".join(str(port) for port in web_ports)
         )
+        print(f"  ✓ {firewall.summary()}")
         return
 
-    result = run("ufw --force enable", check=False)
-    if result.returncode != 0:
-        if is_container():
-            print("  ⚠ Firewall could not be enabled (container may lack capabilities)")
-        else:
-            raise RuntimeError("Firewall could not be enabled (check command output)")
+    if not _enable_firewall(firewall):
         return
     
     print(
@@ -879,31 +863,21 @@ def configure_firewall_web(config: SetupConfig) -> None:
         + ", ".join(str(port) for port in web_ports)
         + ")"
     )
+    print(f"  ✓ {firewall.summary()}")
 
 
 def configure_firewall_ssh_only(config: SetupConfig) -> None:
     """Configure firewall to allow only SSH (for servers without web/RDP)."""
-    result = run("ufw status 2>/dev/null | grep -q 'Status: active'", check=False)
-    firewall_active = result.returncode == 0
-
-    if not firewall_active:
-        os.environ["DEBIAN_FRONTEND"] = "noninteractive"
-        run("apt-get install -y -qq ufw")
-        run("ufw default deny incoming", check=True)
-        run("ufw default allow outgoing", check=True)
-    _configure_ssh_firewall(config)
-    _configure_mdns_firewall(config)
+    firewall = UfwFirewall(run)
+    firewall_active = _prepare_inactive_firewall(firewall)
+    _reconcile_firewall_rules(firewall, config)
 
     if firewall_active:
         print("  ✓ Firewall already configured")
+        print(f"  ✓ {firewall.summary()}")
         return
     
-    result = run("ufw --force enable", check=False)
-    if result.returncode != 0:
-        if is_container():
-            print("  ⚠ Firewall could not be enabled (container may lack capabilities)")
-        else:
-            raise RuntimeError("Firewall could not be enabled (check command output)")
+    if not _enable_firewall(firewall):
         return
 
     ssh_policy = (
@@ -912,6 +886,7 @@ def configure_firewall_ssh_only(config: SetupConfig) -> None:
         else "SSH rate-limited"
     )
     print(f"  ✓ Firewall configured ({ssh_policy})")
+    print(f"  ✓ {firewall.summary()}")
 
 
 def _proxmox_management_entries() -> list[dict[str, object]] | None:
@@ -960,9 +935,17 @@ def configure_proxmox_management_firewall(config: SetupConfig) -> None:
         for entry in existing_entries
         if isinstance(entry.get("cidr"), str)
     }
-    for source in desired_sources:
-        if source in existing_by_cidr:
-            continue
+    plan = plan_firewall_changes(
+        existing_by_cidr,
+        desired_sources,
+        owned=(
+            cidr
+            for cidr, entry in existing_by_cidr.items()
+            if isinstance(entry.get("comment"), str)
+            and entry["comment"].startswith(_PROXMOX_MANAGEMENT_COMMENT_PREFIX)
+        ),
+    )
+    for source in plan.additions:
         comment = f"{_PROXMOX_MANAGEMENT_COMMENT_PREFIX} {source}"
         result = run(
             "pvesh create /cluster/firewall/ipset/management "
@@ -974,15 +957,7 @@ def configure_proxmox_management_firewall(config: SetupConfig) -> None:
                 f"Could not add Proxmox management source {source}"
             )
 
-    desired_set = set(desired_sources)
-    for cidr, entry in existing_by_cidr.items():
-        comment = entry.get("comment")
-        if (
-            not isinstance(comment, str)
-            or not comment.startswith(_PROXMOX_MANAGEMENT_COMMENT_PREFIX)
-            or cidr in desired_set
-        ):
-            continue
+    for cidr in plan.removals:
         encoded_cidr = quote(cidr, safe="")
         result = run(
             f"pvesh delete /cluster/firewall/ipset/management/{encoded_cidr}",
@@ -1066,6 +1041,22 @@ RuntimeMaxUse={JOURNAL_MAX_USE}
     if not configured:
         raise RuntimeError("Cleanup maintenance timer failed verification")
 
+    forecast_configured = configure_maintenance_timer(
+        service_name="storage-forecast",
+        service_desc="Sample local storage usage and clean up early when filling",
+        timer_desc="Sample local storage usage (hourly)",
+        script_path="/opt/infra_tools/common/service_tools/cleanup_maintenance.py",
+        script_args=("--forecast",),
+        schedule="hourly",
+        check_name="Storage forecast",
+        randomized_delay="5min",
+        timeout="30min",
+        network_online=False,
+        purpose="check",
+    )
+    if not forecast_configured:
+        raise RuntimeError("Storage forecast timer failed verification")
+
     if config.username == "root":
         print("  ℹ User cache maintenance skipped for the root account")
         return
@@ -3,7 +3,9 @@
 Security Event Monitor
 
 Checks security logs for notable events and sends notifications via the
-configured infra_tools notification targets. Runs every 15 minutes.
+configured infra_tools notification targets. Runs every 15 minutes, or
+continuously with ``--daemon`` to alert on SSH and fail2ban events within
+seconds.
 
 Event sources (where installed):
   - fail2ban: ban/unban events from /var/log/fail2ban.log
@@ -18,6 +20,9 @@ Severity rules:
   info    — SSH auth failures at or above the reporting threshold (default: 5),
              and certificate recovery/rotation
 
+fail2ban and SSH journal reads resume from persisted cursors (log inode and
+byte offset, and the journal cursor), so each run reads only new entries.
+
 Routine privileged-exec audit hits are retained for context when another event
 is reported, but do not create a notification by themselves. Collection
 failures notify once when they begin and again when the source recovers.
@@ -27,20 +32,33 @@ Logs to: /var/log/infra_tools/security/security_monitor.log
 
 from __future__ import annotations
 
+import argparse
+import fcntl
 import json
 import os
+import queue
 import re
 import shutil
+import signal
 import subprocess
 import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta
 from logging import ERROR, WARNING
+from typing import BinaryIO, Iterable, Iterator, TextIO
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
 
 from lib.logging_utils import get_service_logger, log_event
 from lib.atomic_io import write_json_atomic
-from lib.notifications import load_notification_configs_from_state, send_notification_safe
+from lib.notifications import (
+    NotificationConfig,
+    enable_notification_outbox,
+    load_notification_configs_from_state,
+    send_notification_safe,
+)
 from lib.types import JSONDict
 from lib.validation import validate_filesystem_path
 from lib.xrdp_certificate import XrdpCertificateHealth, inspect_xrdp_certificate
@@ -60,18 +78,69 @@ _BAN_RE = re.compile(
     r' fail2ban\.actions\s+\[.*?\]:\s+(?:WARNING|NOTICE)\s+\[([^\]]+)\] (Ban|Unban) (\S+)'
 )
 
+# Journal fields decoded per SSH entry; journalctl always adds __CURSOR.
+_JOURNAL_OUTPUT_FIELDS = 'MESSAGE,_SOURCE_REALTIME_TIMESTAMP'
+_JOURNAL_TIMEOUT_SECONDS = 15
+_SSH_FAILURE_MARKERS = (
+    'failed password',
+    'invalid user',
+    'keyboard-interactive',
+    'publickey',
+    'authentication failure',
+    'authentication attempt',
+)
+_SSH_LOCKOUT_MARKERS = ('account temporarily locked', 'account locked', 'faillock')
+_FAILED_PASSWORD_RE = re.compile(
+    r'Failed password for (?:invalid user )?(?P<user>\S+) from (?P<source>\S+)',
+    re.IGNORECASE,
+)
+_INVALID_USER_RE = re.compile(r'Invalid user (?P<user>\S+) from (?P<source>\S+)', re.IGNORECASE)
+_GENERIC_SOURCE_RE = re.compile(r'\bfrom (?P<source>\S+)', re.IGNORECASE)
+_GENERIC_USER_RE = re.compile(r'\buser[= ](?P<user>\S+)', re.IGNORECASE)
+_LOCKOUT_SOURCE_RE = re.compile(r'\b(?:rhost|from)[= ](?P<source>\S+)', re.IGNORECASE)
+
+# Daemon mode: SSH failures are counted over a sliding window as they arrive;
+# auditd and certificate checks keep the periodic cadence of the timer.
+_DAEMON_SSH_WINDOW_SECONDS = 900
+_DAEMON_CHECK_INTERVAL_SECONDS = 900
+_DAEMON_CHECKPOINT_SECONDS = 30
+_DAEMON_POLL_SECONDS = 1.0
+_DAEMON_RESTART_DELAY_SECONDS = 5.0
+_DAEMON_MAX_QUEUED_LINES = 10_000
+_DAEMON_MAX_WINDOW_EVENTS = 100_000
+_DAEMON_STDERR_TAIL_LINES = 20
+
 # auditd keys that trigger integrity-change notifications.
 _CRITICAL_KEYS = ('identity', 'sudoers', 'sshd_config', 'modules')
 # auditd keys included in notifications but not used to raise severity —
 # 'privileged' fires on every sudo call, which is routine admin activity.
 _INFO_KEYS = ('privileged',)
 _SECURITY_EVENT_SCHEMA_VERSION = 1
+_AUDIT_FIELD_PATTERNS: dict[str, re.Pattern[str]] = {}
 
 
 # ---------------------------------------------------------------------------
 # State
 # ---------------------------------------------------------------------------
 
+def _lock_state(blocking: bool = True) -> TextIO | None:
+    """Take the state lock that timer runs and the daemon share.
+
+    The lock is held until the returned handle is closed. Without
+    ``blocking``, returns None when another monitor holds it.
+    """
+    lock_path = f'{_STATE_FILE}.lock'
+    validate_filesystem_path(lock_path, must_exist=False)
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    handle = open(lock_path, 'a')
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+    except BlockingIOError:
+        handle.close()
+        return None
+    return handle
+
+
 def _load_state() -> dict[str, object]:
     try:
         with open(_STATE_FILE) as f:
@@ -91,8 +160,77 @@ def _save_state(state: dict[str, object]) -> None:
 # fail2ban
 # ---------------------------------------------------------------------------
 
-def _check_fail2ban(since: datetime) -> tuple[list[JSONDict], list[JSONDict], str | None]:
-    """Return structured ban/unban events and any collection error."""
+def _parse_fail2ban_line(line: str) -> JSONDict | None:
+    """Return a structured ban/unban event for one fail2ban log line."""
+    # Most fail2ban lines are "Found"/filter chatter; skip the regex for them.
+    if ' Ban ' not in line and ' Unban ' not in line:
+        return None
+    m = _BAN_RE.match(line)
+    if not m:
+        return None
+    action = m.group(3)
+    return {
+        "type": "fail2ban",
+        "action": action.lower(),
+        "severity": "warning" if action == "Ban" else "info",
+        "timestamp": m.group(1),
+        "jail": m.group(2),
+        "source_ip": m.group(4),
+    }
+
+
+def _fail2ban_cursor(state: dict[str, object]) -> JSONDict | None:
+    """Return the persisted fail2ban inode/offset cursor, if valid."""
+    cursor = state.get('fail2ban_cursor')
+    if not isinstance(cursor, dict):
+        return None
+    inode = cursor.get('inode')
+    offset = cursor.get('offset')
+    if not isinstance(inode, int) or not isinstance(offset, int) or offset < 0:
+        return None
+    return {'inode': inode, 'offset': offset}
+
+
+def _read_complete_lines(handle: BinaryIO, offset: int) -> Iterator[tuple[str, int]]:
+    """Yield complete lines after ``offset`` with the offset following each.
+
+    A trailing line without a newline is still being written; it is left for
+    the next run so the cursor never points into the middle of a line.
+    """
+    handle.seek(offset)
+    for raw in handle:
+        if not raw.endswith(b'\n'):
+            return
+        offset += len(raw)
+        yield raw.decode('utf-8', 'replace'), offset
+
+
+def _rotated_fail2ban_lines(cursor: JSONDict) -> list[str]:
+    """Return the unread tail of the log that logrotate moved aside."""
+    rotated = f'{_FAIL2BAN_LOG}.1'
+    try:
+        with open(rotated, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if st.st_ino != cursor['inode'] or st.st_size < cursor['offset']:
+                return []
+            return [line for line, _offset in _read_complete_lines(f, cursor['offset'])]
+    except OSError:
+        return []
+
+
+def _check_fail2ban(
+    since: datetime,
+    cursor: JSONDict | None = None,
+) -> tuple[list[JSONDict], list[JSONDict], str | None, JSONDict | None]:
+    """Return ban/unban events after ``cursor``, any error, and the next cursor.
+
+    The cursor stores the live log's inode and the byte offset after the last
+    complete line, so each run reads only what fail2ban appended. A changed
+    inode means the log was rotated: the rest of the rotated ``.1`` file is
+    read before the new log. A log shorter than the offset was truncated in
+    place and is read from the start. Without a cursor (first run), the whole
+    log is read and filtered by ``since``.
+    """
     bans: list[JSONDict] = []
     unbans: list[JSONDict] = []
     if not os.path.exists(_FAIL2BAN_LOG):
@@ -100,36 +238,40 @@ def _check_fail2ban(since: datetime) -> tuple[list[JSONDict], list[JSONDict], st
         # client is installed, however, a missing log means this source is no
         # longer observable (including when the service switched log targets).
         if shutil.which('fail2ban-client'):
-            return bans, unbans, f'fail2ban: log file unavailable: {_FAIL2BAN_LOG}'
-        return bans, unbans, None
+            return bans, unbans, f'fail2ban: log file unavailable: {_FAIL2BAN_LOG}', cursor
+        return bans, unbans, None, None
+    # Timestamps are zero-padded, so string order is time order.
+    not_before = since.strftime('%Y-%m-%d %H:%M:%S') if cursor is None else None
     try:
-        with open(_FAIL2BAN_LOG) as f:
-            for line in f:
-                m = _BAN_RE.match(line)
-                if not m:
-                    continue
-                try:
-                    ts = datetime.strptime(m.group(1), '%Y-%m-%d %H:%M:%S')
-                except ValueError:
-                    continue
-                if ts < since:
-                    continue
-                jail, action, ip = m.group(2), m.group(3), m.group(4)
-                entry: JSONDict = {
-                    "type": "fail2ban",
-                    "action": action.lower(),
-                    "severity": "warning" if action == "Ban" else "info",
-                    "timestamp": m.group(1),
-                    "jail": jail,
-                    "source_ip": ip,
-                }
-                if action == 'Ban':
-                    bans.append(entry)
-                else:
-                    unbans.append(entry)
+        with open(_FAIL2BAN_LOG, 'rb') as f:
+            st = os.fstat(f.fileno())
+            offset = 0
+            if cursor is not None:
+                if cursor['inode'] != st.st_ino:
+                    for line in _rotated_fail2ban_lines(cursor):
+                        _collect_fail2ban_event(line, bans, unbans, not_before)
+                elif cursor['offset'] <= st.st_size:
+                    offset = cursor['offset']
+            for line, offset in _read_complete_lines(f, offset):
+                _collect_fail2ban_event(line, bans, unbans, not_before)
     except OSError as exc:
-        return bans, unbans, f'fail2ban log: {exc}'
-    return bans, unbans, None
+        return bans, unbans, f'fail2ban log: {exc}', cursor
+    return bans, unbans, None, {'inode': st.st_ino, 'offset': offset}
+
+
+def _collect_fail2ban_event(
+    line: str,
+    bans: list[JSONDict],
+    unbans: list[JSONDict],
+    not_before: str | None,
+) -> None:
+    entry = _parse_fail2ban_line(line)
+    if entry is None or (not_before and str(entry['timestamp']) < not_before):
+        return
+    if entry['action'] == 'ban':
+        bans.append(entry)
+    else:
+        unbans.append(entry)
 
 
 # ---------------------------------------------------------------------------
@@ -138,7 +280,12 @@ def _check_fail2ban(since: datetime) -> tuple[list[JSONDict], list[JSONDict], st
 
 def _audit_field_values(record: str, field_name: str) -> list[str]:
     """Extract simple auditd field values from one ausearch record."""
-    pattern = re.compile(rf'\b{re.escape(field_name)}=(?:"([^"]*)"|(\S+))')
+    if f'{field_name}=' not in record:
+        return []
+    pattern = _AUDIT_FIELD_PATTERNS.get(field_name)
+    if pattern is None:
+        pattern = re.compile(rf'\b{re.escape(field_name)}=(?:"([^"]*)"|(\S+))')
+        _AUDIT_FIELD_PATTERNS[field_name] = pattern
     values: list[str] = []
     for match in pattern.finditer(record):
         value = match.group(1) or match.group(2)
@@ -241,45 +388,44 @@ def _check_auditd(since: datetime) -> tuple[list[JSONDict], bool, list[str]]:
 # SSH failures
 # ---------------------------------------------------------------------------
 
+def _may_be_ssh_event(line: str) -> bool:
+    """Cheap case-insensitive prefilter run before JSON decoding and regexes.
+
+    Every failure and lockout marker recognised by the parsers below contains
+    one of these substrings, so a line rejected here cannot produce an event.
+    """
+    lowered = line.lower()
+    return (
+        'fail' in lowered
+        or 'invalid user' in lowered
+        or 'publickey' in lowered
+        or 'keyboard-interactive' in lowered
+        or 'authentication' in lowered
+        or 'locked' in lowered
+    )
+
+
 def _parse_ssh_failure(message: str, timestamp: str | None) -> JSONDict | None:
     """Extract a useful, low-cardinality summary from one SSH log message."""
-    failure_markers = (
-        'Failed password',
-        'Invalid user',
-        'keyboard-interactive',
-        'publickey',
-        'authentication failure',
-        'authentication attempt',
-    )
-    if not any(marker.lower() in message.lower() for marker in failure_markers):
+    lower_message = message.lower()
+    if not any(marker in lower_message for marker in _SSH_FAILURE_MARKERS):
         return None
 
     user = 'unknown'
     source_ip = 'unknown'
     method = 'unknown'
-    failed_password = re.search(
-        r'Failed password for (?:invalid user )?(?P<user>\S+) from (?P<source>\S+)',
-        message,
-        re.IGNORECASE,
-    )
-    invalid_user = re.search(
-        r'Invalid user (?P<user>\S+) from (?P<source>\S+)',
-        message,
-        re.IGNORECASE,
-    )
-    generic_source = re.search(r'\bfrom (?P<source>\S+)', message, re.IGNORECASE)
-    generic_user = re.search(r'\buser[= ](?P<user>\S+)', message, re.IGNORECASE)
-    match = failed_password or invalid_user
+    match = _FAILED_PASSWORD_RE.search(message) or _INVALID_USER_RE.search(message)
     if match:
         user = match.group('user')
         source_ip = match.group('source')
     else:
+        generic_source = _GENERIC_SOURCE_RE.search(message)
         if generic_source:
             source_ip = generic_source.group('source').rstrip(';,')
+        generic_user = _GENERIC_USER_RE.search(message)
         if generic_user:
             user = generic_user.group('user').rstrip(';,')
 
-    lower_message = message.lower()
     if 'publickey' in lower_message:
         method = 'publickey'
     elif 'keyboard-interactive' in lower_message:
@@ -304,18 +450,15 @@ def _parse_ssh_failure(message: str, timestamp: str | None) -> JSONDict | None:
 def _parse_ssh_lockout(message: str, timestamp: str | None) -> JSONDict | None:
     """Extract PAM/faillock account-lockout events from SSH journal text."""
     lower_message = message.lower()
-    if not any(
-        marker in lower_message
-        for marker in ('account temporarily locked', 'account locked', 'faillock')
-    ):
+    if not any(marker in lower_message for marker in _SSH_LOCKOUT_MARKERS):
         return None
 
     user = 'unknown'
-    user_match = re.search(r'\buser[= ](?P<user>\S+)', message, re.IGNORECASE)
+    user_match = _GENERIC_USER_RE.search(message)
     if user_match:
         user = user_match.group('user').rstrip(';,')
     source_ip = 'unknown'
-    source_match = re.search(r'\b(?:rhost|from)[= ](?P<source>\S+)', message, re.IGNORECASE)
+    source_match = _LOCKOUT_SOURCE_RE.search(message)
     if source_match:
         source_ip = source_match.group('source').rstrip(';,')
 
@@ -346,85 +489,200 @@ def _normalise_ssh_summary(value: object) -> JSONDict:
     return {'failure_count': 0, 'sources': [], 'lockouts': []}
 
 
-def _check_ssh_failures(since: datetime) -> tuple[JSONDict, str | None]:
-    """Summarise SSH authentication failures and return collection errors."""
-    since_str = since.strftime('%Y-%m-%d %H:%M:%S')
+def _count_event(
+    aggregate: dict[tuple[str, ...], JSONDict],
+    key: tuple[str, ...],
+    event: JSONDict,
+    timestamp: str | None,
+) -> None:
+    current = aggregate.get(key)
+    if current is None:
+        aggregate[key] = event
+        return
+    current['count'] = int(current.get('count', 0)) + 1
+    if timestamp:
+        current['last_seen'] = timestamp
+
+
+def _journal_message(line: str) -> tuple[str, str | None] | None:
+    """Return the message and timestamp of a journal line worth parsing.
+
+    Lines rejected by :func:`_may_be_ssh_event` are never JSON-decoded.
+    Plain-text lines are accepted as the message itself.
+    """
+    if not _may_be_ssh_event(line):
+        return None
     try:
-        result = subprocess.run(
-            ['journalctl', '-u', 'sshd', '-u', 'ssh',
-             '--since', since_str, '--no-pager', '-o', 'json'],
-            capture_output=True, text=True, check=False, timeout=15,
-        )
-        if result.returncode != 0:
-            details = result.stderr.strip() or f'journalctl exited {result.returncode}'
-            return _normalise_ssh_summary(0), f'SSH journal: {details}'
-
-        aggregate: dict[tuple[str, str, str], JSONDict] = {}
-        lockout_aggregate: dict[tuple[str, str], JSONDict] = {}
-        for line in result.stdout.splitlines():
-            message = line
-            timestamp: str | None = None
-            try:
-                record = json.loads(line)
-            except json.JSONDecodeError:
-                record = None
-            if isinstance(record, dict):
-                message_value = record.get('MESSAGE')
-                if not isinstance(message_value, str):
-                    continue
-                message = message_value
-                raw_timestamp = record.get('_SOURCE_REALTIME_TIMESTAMP')
-                if isinstance(raw_timestamp, str) and raw_timestamp.isdigit():
-                    timestamp = datetime.fromtimestamp(
-                        int(raw_timestamp) / 1_000_000
-                    ).isoformat(timespec='seconds')
-
-            lockout = _parse_ssh_lockout(message, timestamp)
-            if lockout:
-                lockout_key = (str(lockout['source_ip']), str(lockout['username']))
-                current_lockout = lockout_aggregate.get(lockout_key)
-                if current_lockout is None:
-                    lockout_aggregate[lockout_key] = dict(lockout)
-                else:
-                    current_lockout['count'] = int(current_lockout.get('count', 0)) + 1
-                    if timestamp:
-                        current_lockout['last_seen'] = timestamp
-
-            event = _parse_ssh_failure(message, timestamp)
-            if event:
-                key = (
-                    str(event['source_ip']),
-                    str(event['username']),
-                    str(event['method']),
-                )
-                current = aggregate.get(key)
-                if current is None:
-                    aggregate[key] = dict(event)
-                else:
-                    current['count'] = int(current.get('count', 0)) + 1
-                    if timestamp:
-                        current['last_seen'] = timestamp
-
-        sources = sorted(
-            aggregate.values(),
-            key=lambda entry: (-int(entry.get('count', 0)), str(entry.get('source_ip', ''))),
+        record = json.loads(line)
+    except json.JSONDecodeError:
+        return line, None
+    if not isinstance(record, dict):
+        return line, None
+    message = record.get('MESSAGE')
+    if not isinstance(message, str):
+        return None
+    timestamp: str | None = None
+    raw_timestamp = record.get('_SOURCE_REALTIME_TIMESTAMP')
+    if isinstance(raw_timestamp, str) and raw_timestamp.isdigit():
+        timestamp = datetime.fromtimestamp(
+            int(raw_timestamp) / 1_000_000
+        ).isoformat(timespec='seconds')
+    return message, timestamp
+
+
+def _journal_record_cursor(line: str) -> str | None:
+    """Return the ``__CURSOR`` of one JSON journal line, if present."""
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    cursor = record.get('__CURSOR') if isinstance(record, dict) else None
+    return cursor if isinstance(cursor, str) and cursor else None
+
+
+def _ssh_summary(failures: Iterable[JSONDict], lockouts: Iterable[JSONDict]) -> JSONDict:
+    """Build the SSH summary with the highest-volume sources first."""
+    def by_count(entry: JSONDict) -> tuple[int, str]:
+        return -int(entry.get('count', 0)), str(entry.get('source_ip', ''))
+
+    sources = sorted(failures, key=by_count)
+    summary: JSONDict = {
+        'failure_count': sum(int(entry.get('count', 0)) for entry in sources),
+        'sources': sources[:_SSH_MAX_BREAKDOWN],
+        'lockouts': sorted(lockouts, key=by_count)[:_SSH_MAX_BREAKDOWN],
+    }
+    if len(sources) > _SSH_MAX_BREAKDOWN:
+        summary['suppressed_sources'] = len(sources) - _SSH_MAX_BREAKDOWN
+    return summary
+
+
+class _SshFailureAggregator:
+    """Fold SSH journal lines into per-source counts as they are read.
+
+    The raw text of the latest JSON record is kept so its journal cursor can
+    be decoded once at the end.
+    """
+
+    def __init__(self) -> None:
+        self.failures: dict[tuple[str, ...], JSONDict] = {}
+        self.lockouts: dict[tuple[str, ...], JSONDict] = {}
+        self._last_record = ''
+
+    def add_line(self, line: str) -> None:
+        if line.startswith('{'):
+            self._last_record = line
+        parsed = _journal_message(line)
+        if parsed is not None:
+            self.add_message(*parsed)
+
+    def add_message(self, message: str, timestamp: str | None) -> None:
+        lockout = _parse_ssh_lockout(message, timestamp)
+        if lockout:
+            _count_event(
+                self.lockouts,
+                (str(lockout['source_ip']), str(lockout['username'])),
+                lockout,
+                timestamp,
+            )
+        event = _parse_ssh_failure(message, timestamp)
+        if event:
+            _count_event(
+                self.failures,
+                (str(event['source_ip']), str(event['username']), str(event['method'])),
+                event,
+                timestamp,
+            )
+
+    def cursor(self) -> str | None:
+        """Return the journal cursor of the latest JSON record read."""
+        return _journal_record_cursor(self._last_record) if self._last_record else None
+
+    def summary(self) -> JSONDict:
+        return _ssh_summary(self.failures.values(), self.lockouts.values())
+
+
+def _journal_cursor(state: dict[str, object]) -> str | None:
+    """Return the persisted SSH journal cursor, if any."""
+    cursor = state.get('journal_cursor')
+    return cursor if isinstance(cursor, str) and cursor else None
+
+
+def _stream_ssh_journal(position: list[str], aggregator: _SshFailureAggregator) -> tuple[int, str]:
+    """Feed journalctl output to ``aggregator`` line by line.
+
+    Returns journalctl's exit status and stderr. Raises
+    :class:`subprocess.TimeoutExpired` when the read exceeds its deadline.
+    """
+    command = [
+        'journalctl', '-u', 'sshd', '-u', 'ssh', *position, '--no-pager',
+        '-o', 'json', f'--output-fields={_JOURNAL_OUTPUT_FIELDS}',
+    ]
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors='replace',
+    )
+    timed_out = threading.Event()
+
+    def _kill() -> None:
+        timed_out.set()
+        process.kill()
+
+    # Drain stderr alongside stdout so a chatty journalctl cannot fill the
+    # stderr pipe and block before it finishes writing entries.
+    stderr_chunks: list[str] = []
+    stderr_reader = threading.Thread(
+        target=lambda: stderr_chunks.append(process.stderr.read() if process.stderr else ''),
+        daemon=True,
+    )
+    timer = threading.Timer(_JOURNAL_TIMEOUT_SECONDS, _kill)
+    timer.start()
+    stderr_reader.start()
+    try:
+        for line in process.stdout or ():
+            aggregator.add_line(line)
+        returncode = process.wait()
+        stderr_reader.join()
+    finally:
+        timer.cancel()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(command, _JOURNAL_TIMEOUT_SECONDS)
+    return returncode, ''.join(stderr_chunks)
+
+
+def _check_ssh_failures(
+    since: datetime,
+    cursor: str | None = None,
+) -> tuple[JSONDict, str | None, str | None]:
+    """Summarise SSH authentication failures after ``cursor``.
+
+    Returns the summary, any collection error, and the journal cursor of the
+    last entry read. Without a cursor (first run), or when journalctl rejects
+    a stale one, the journal is read from ``since`` instead.
+    """
+    since_position = ['--since', since.strftime('%Y-%m-%d %H:%M:%S')]
+    try:
+        aggregator = _SshFailureAggregator()
+        returncode, stderr = _stream_ssh_journal(
+            ['--after-cursor', cursor] if cursor else since_position, aggregator
         )
-        summary: JSONDict = {
-            'failure_count': sum(int(entry.get('count', 0)) for entry in sources),
-            'sources': sources[:_SSH_MAX_BREAKDOWN],
-            'lockouts': sorted(
-                lockout_aggregate.values(),
-                key=lambda entry: (
-                    -int(entry.get('count', 0)),
-                    str(entry.get('source_ip', '')),
-                ),
-            )[:_SSH_MAX_BREAKDOWN],
-        }
-        if len(sources) > _SSH_MAX_BREAKDOWN:
-            summary['suppressed_sources'] = len(sources) - _SSH_MAX_BREAKDOWN
-        return summary, None
+        if returncode != 0 and cursor:
+            log_event(
+                logger,
+                'SSH journal cursor rejected; reading from the last run time',
+                level=WARNING,
+                errors=stderr.strip(),
+            )
+            aggregator = _SshFailureAggregator()
+            returncode, stderr = _stream_ssh_journal(since_position, aggregator)
+        if returncode != 0:
+            details = stderr.strip() or f'journalctl exited {returncode}'
+            return _normalise_ssh_summary(0), f'SSH journal: {details}', cursor
+        return aggregator.summary(), None, aggregator.cursor() or cursor
     except (subprocess.TimeoutExpired, OSError) as exc:
-        return _normalise_ssh_summary(0), f'SSH journal: {exc}'
+        return _normalise_ssh_summary(0), f'SSH journal: {exc}', cursor
 
 
 # ---------------------------------------------------------------------------
@@ -479,9 +737,19 @@ def _certificate_health_event(
     return None
 
 
-def _next_state(now: datetime, health: XrdpCertificateHealth) -> dict[str, object]:
-    """Build persisted collection and certificate state."""
+def _next_state(
+    now: datetime,
+    health: XrdpCertificateHealth,
+    *,
+    fail2ban_cursor: JSONDict | None = None,
+    journal_cursor: str | None = None,
+) -> dict[str, object]:
+    """Build persisted collection cursors and certificate state."""
     next_state: dict[str, object] = {"last_run": now.isoformat()}
+    if fail2ban_cursor is not None:
+        next_state["fail2ban_cursor"] = fail2ban_cursor
+    if journal_cursor:
+        next_state["journal_cursor"] = journal_cursor
     if health.status != "not_configured":
         next_state["rdp_certificate_status"] = health.status
         next_state["rdp_certificate_issue"] = health.issue or ""
@@ -819,120 +1087,91 @@ def _security_actions(
 
 
 # ---------------------------------------------------------------------------
-# Main
+# Reporting
 # ---------------------------------------------------------------------------
 
-def main() -> int:
-    log_event(logger, "Starting security monitor check")
-
-    notification_configs = load_notification_configs_from_state(logger)
-    if not notification_configs:
+def _notify_collection_errors(
+    notification_configs: list[NotificationConfig],
+    *,
+    since: datetime,
+    now: datetime,
+    collection_errors: list[str],
+    previous_collection_errors: list[str],
+) -> None:
+    """Report unreadable event sources once, when the set of failures changes."""
+    log_event(
+        logger,
+        'Security event collection failed; retaining previous cursor',
+        level=WARNING,
+        errors='; '.join(collection_errors),
+    )
+    if collection_errors == previous_collection_errors:
         log_event(
             logger,
-            "No notification targets configured; security events will be logged locally",
+            'Security event collection still failing; notification suppressed',
+            level=WARNING,
+            errors='; '.join(collection_errors),
         )
-
-    state = _load_state()
-    now = datetime.now()
-
-    if 'last_run' in state:
-        try:
-            last_run = state['last_run']
-            if not isinstance(last_run, str):
-                raise TypeError('last_run must be a string')
-            since = datetime.fromisoformat(last_run)
-            if since.tzinfo is not None:
-                since = since.astimezone().replace(tzinfo=None)
-        except (TypeError, ValueError):
-            since = now - timedelta(minutes=15)
-    else:
-        since = now - timedelta(minutes=15)
-    if since > now:
-        since = now - timedelta(minutes=15)
-
-    bans, unbans, fail2ban_error = _check_fail2ban(since)
-    bans = [_normalise_fail2ban_event(event) for event in bans]
-    unbans = [_normalise_fail2ban_event(event) for event in unbans]
-    audit_results, audit_critical, audit_errors = _check_auditd(since)
-    audit_events = [_normalise_audit_event(event) for event in audit_results]
-    audit_keys = _audit_event_keys(audit_events)
-    ssh_result, ssh_error = _check_ssh_failures(since)
-    ssh_summary = _normalise_ssh_summary(ssh_result)
-    ssh_failures = int(ssh_summary.get('failure_count', 0))
-    certificate_health = inspect_xrdp_certificate()
-    collection_errors = _normalise_collection_errors(
-        [fail2ban_error, *audit_errors, ssh_error]
+        return
+    details = _format_security_details(
+        since=since,
+        now=now,
+        status="error",
+        bans=[],
+        unbans=[],
+        audit_keys=[],
+        ssh_failures=0,
+        certificate_event=None,
+        collection_errors=collection_errors,
     )
-    previous_collection_errors = _state_collection_errors(state)
-    if collection_errors:
-        details = _format_security_details(
+    send_notification_safe(
+        notification_configs,
+        subject='Security monitor error: event source unavailable',
+        job='security_monitor',
+        status='error',
+        message=(
+            'The security monitor could not read one or more event '
+            'sources. This is a monitoring-health issue, not evidence '
+            'of an intrusion.'
+        ),
+        details=details,
+        logger=logger,
+        data=_build_security_data(
             since=since,
             now=now,
-            status="error",
+            status='error',
             bans=[],
             unbans=[],
             audit_keys=[],
             ssh_failures=0,
             certificate_event=None,
             collection_errors=collection_errors,
-        )
-        log_event(
-            logger,
-            'Security event collection failed; retaining previous cursor',
-            level=WARNING,
-            errors='; '.join(collection_errors),
-        )
-        if collection_errors != previous_collection_errors:
-            send_notification_safe(
-                notification_configs,
-                subject='Security monitor error: event source unavailable',
-                job='security_monitor',
-                status='error',
-                message=(
-                    'The security monitor could not read one or more event '
-                    'sources. This is a monitoring-health issue, not evidence '
-                    'of an intrusion.'
-                ),
-                details=details,
-                logger=logger,
-                data=_build_security_data(
-                    since=since,
-                    now=now,
-                    status='error',
-                    bans=[],
-                    unbans=[],
-                    audit_keys=[],
-                    ssh_failures=0,
-                    certificate_event=None,
-                    collection_errors=collection_errors,
-                ),
-                event_type='security.source_health',
-                state='firing',
-                dedup_key='security_monitor:source-health',
-                actions=['Restore the affected event source and inspect security-monitor.service logs.'],
-            )
-        else:
-            log_event(
-                logger,
-                'Security event collection still failing; notification suppressed',
-                level=WARNING,
-                errors='; '.join(collection_errors),
-            )
-        cursor = state.get('last_run')
-        if not isinstance(cursor, str) or not cursor:
-            cursor = since.isoformat()
-        next_state = _next_state(now, certificate_health)
-        next_state['last_run'] = cursor
-        next_state['collection_errors'] = collection_errors
-        _save_state(next_state)
-        return 1
+        ),
+        event_type='security.source_health',
+        state='firing',
+        dedup_key='security_monitor:source-health',
+        actions=['Restore the affected event source and inspect security-monitor.service logs.'],
+    )
 
-    certificate_event = _certificate_health_event(state, certificate_health)
-    certificate_failed = certificate_health.status == "error"
+
+def _report_findings(
+    notification_configs: list[NotificationConfig],
+    *,
+    since: datetime,
+    now: datetime,
+    bans: list[JSONDict],
+    unbans: list[JSONDict],
+    audit_events: list[JSONDict],
+    ssh_summary: JSONDict,
+    certificate_event: tuple[str, str, str] | None = None,
+    collection_recovered: bool = False,
+) -> bool:
+    """Notify about noteworthy findings; return False when there were none."""
+    audit_keys = _audit_event_keys(audit_events)
+    ssh_failures = int(ssh_summary.get('failure_count', 0))
     critical_audit_keys = [key for key in audit_keys if key in _CRITICAL_KEYS]
     lockouts = ssh_summary.get('lockouts', [])
     has_lockouts = isinstance(lockouts, list) and bool(lockouts)
-    collection_recovered = bool(previous_collection_errors)
     if unbans:
         log_event(
             logger,
@@ -948,18 +1187,7 @@ def main() -> int:
         or collection_recovered
     )
     if not has_noteworthy:
-        if certificate_failed:
-            log_event(
-                logger,
-                "XRDP TLS certificate remains unhealthy",
-                level=ERROR,
-                errors=certificate_health.issue or "unknown certificate error",
-            )
-            _save_state(_next_state(now, certificate_health))
-            return 1
-        log_event(logger, "No noteworthy security events")
-        _save_state(_next_state(now, certificate_health))
-        return 0
+        return False
 
     # Determine notification severity.
     # Info-only audit keys (e.g. 'privileged') provide context but do not
@@ -1071,12 +1299,484 @@ def main() -> int:
         actions=actions,
     )
 
-    log_event(logger, "Security monitor check complete",
+    log_event(logger, "Security events reported",
               status=status, events=', '.join(summary_parts),
               window=f"{since_str} → {now.strftime('%Y-%m-%d %H:%M:%S')}")
-    _save_state(_next_state(now, certificate_health))
+    return True
+
+
+def _state_since(state: dict[str, object], now: datetime) -> datetime:
+    """Return the auditd window start from ``last_run``, clamped to recent time."""
+    default = now - timedelta(minutes=15)
+    last_run = state.get('last_run')
+    if not isinstance(last_run, str):
+        return default
+    try:
+        since = datetime.fromisoformat(last_run)
+    except ValueError:
+        return default
+    if since.tzinfo is not None:
+        since = since.astimezone().replace(tzinfo=None)
+    return default if since > now else since
+
+
+# ---------------------------------------------------------------------------
+# Daemon
+# ---------------------------------------------------------------------------
+
+class _SshFailureWindow:
+    """Sliding window of SSH failures per source with a bounded event count."""
+
+    def __init__(self, seconds: float, max_events: int = _DAEMON_MAX_WINDOW_EVENTS):
+        self.seconds = seconds
+        self.max_events = max_events
+        self._events: deque[tuple[float, tuple[str, ...]]] = deque()
+        self._sources: dict[tuple[str, ...], JSONDict] = {}
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def add(self, now: float, event: JSONDict) -> None:
+        key = (str(event['source_ip']), str(event['username']), str(event['method']))
+        last_seen = event.get('last_seen')
+        _count_event(
+            self._sources,
+            key,
+            dict(event),
+            last_seen if isinstance(last_seen, str) else None,
+        )
+        self._events.append((now, key))
+        self.expire(now)
+
+    def expire(self, now: float) -> None:
+        cutoff = now - self.seconds
+        while self._events and (self._events[0][0] < cutoff or len(self._events) > self.max_events):
+            _added, key = self._events.popleft()
+            source = self._sources[key]
+            source['count'] = int(source['count']) - 1
+            if source['count'] <= 0:
+                del self._sources[key]
+
+    def summary(self) -> JSONDict:
+        return _ssh_summary(self._sources.values(), [])
+
+
+class _SecurityMonitorDaemon:
+    """Follow the SSH journal and fail2ban log and alert within seconds.
+
+    auditd and XRDP certificate checks still run every ``interval`` seconds.
+    Cursors and certificate state are checkpointed to the same state file as
+    the periodic check, so switching modes resumes where the other stopped.
+    """
+
+    def __init__(
+        self,
+        notification_configs: list[NotificationConfig],
+        state: dict[str, object],
+        *,
+        interval: float = _DAEMON_CHECK_INTERVAL_SECONDS,
+    ):
+        self.notification_configs = notification_configs
+        self.state = state
+        self.interval = interval
+        self.since = _state_since(state, datetime.now())
+        self.fail2ban_cursor = _fail2ban_cursor(state)
+        self.journal_cursor = _journal_cursor(state)
+        self.certificate_health: XrdpCertificateHealth | None = None
+        self.window = _SshFailureWindow(_DAEMON_SSH_WINDOW_SECONDS)
+        self.ssh_alerted = False
+        self.lockouts: dict[tuple[str, ...], JSONDict] = {}
+        self.errors: dict[str, str] = {}
+        self.reported_errors = _state_collection_errors(state)
+        self.lines: queue.Queue[str | None] = queue.Queue(maxsize=_DAEMON_MAX_QUEUED_LINES)
+        self.stop = threading.Event()
+        self._journal: subprocess.Popen[str] | None = None
+        self._journal_stderr: deque[str] = deque(maxlen=_DAEMON_STDERR_TAIL_LINES)
+        self._journal_stderr_reader: threading.Thread | None = None
+        self._journal_restart_at = 0.0
+        self._last_record = ''
+
+    # -- journal ----------------------------------------------------------
+
+    def _start_journal(self) -> None:
+        position = (
+            ['--after-cursor', self.journal_cursor]
+            if self.journal_cursor
+            else ['--since', self.since.strftime('%Y-%m-%d %H:%M:%S')]
+        )
+        self._journal = subprocess.Popen(
+            ['journalctl', '-u', 'sshd', '-u', 'ssh', *position, '--follow', '--no-pager',
+             '-o', 'json', f'--output-fields={_JOURNAL_OUTPUT_FIELDS}'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors='replace',
+        )
+        threading.Thread(
+            target=self._read_journal,
+            args=(self._journal,),
+            name='security-monitor-journal',
+            daemon=True,
+        ).start()
+        # A follower that keeps warning would otherwise fill the stderr pipe
+        # and block; only the last lines are kept for the error message.
+        self._journal_stderr = deque(maxlen=_DAEMON_STDERR_TAIL_LINES)
+        self._journal_stderr_reader = threading.Thread(
+            target=self._read_journal_stderr,
+            args=(self._journal, self._journal_stderr),
+            name='security-monitor-journal-stderr',
+            daemon=True,
+        )
+        self._journal_stderr_reader.start()
+
+    def _read_journal(self, process: subprocess.Popen[str]) -> None:
+        # put() blocks when the queue is full, which stops reading and lets
+        # journalctl wait on the pipe instead of growing memory here.
+        for line in process.stdout or ():
+            self.lines.put(line)
+        self.lines.put(None)
+
+    @staticmethod
+    def _read_journal_stderr(process: subprocess.Popen[str], tail: deque[str]) -> None:
+        for line in process.stderr or ():
+            if line.strip():
+                tail.append(line.rstrip())
+
+    def _journal_exited(self, now: float) -> None:
+        process = self._journal
+        self._journal = None
+        if process is None:
+            return
+        returncode = process.wait()
+        if self._journal_stderr_reader is not None:
+            self._journal_stderr_reader.join(timeout=_DAEMON_POLL_SECONDS)
+            self._journal_stderr_reader = None
+        stderr = '\n'.join(self._journal_stderr)
+        if self.stop.is_set():
+            return
+        if self.journal_cursor and returncode != 0:
+            # A rejected cursor would fail on every restart; resume by time.
+            self.journal_cursor = None
+        self.errors['ssh_journal'] = (
+            f"SSH journal: {stderr or f'journalctl exited {returncode}'}"
+        )
+        self._journal_restart_at = now + _DAEMON_RESTART_DELAY_SECONDS
+
+    def handle_journal_line(self, line: str, now: float) -> None:
+        """Count one journal line's SSH failure or account lockout."""
+        if line.startswith('{'):
+            self._last_record = line
+        self.errors.pop('ssh_journal', None)
+        parsed = _journal_message(line)
+        if parsed is None:
+            return
+        message, timestamp = parsed
+        lockout = _parse_ssh_lockout(message, timestamp)
+        if lockout:
+            _count_event(
+                self.lockouts,
+                (str(lockout['source_ip']), str(lockout['username'])),
+                lockout,
+                timestamp,
+            )
+        failure = _parse_ssh_failure(message, timestamp)
+        if failure:
+            self.window.add(now, failure)
+
+    def _drain_journal(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while not self.stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                line = self.lines.get(timeout=remaining)
+            except queue.Empty:
+                return
+            if line is None:
+                self._journal_exited(time.monotonic())
+                return
+            self.handle_journal_line(line, time.monotonic())
+
+    # -- checks -----------------------------------------------------------
+
+    def _report(
+        self,
+        *,
+        bans: list[JSONDict] | None = None,
+        unbans: list[JSONDict] | None = None,
+        audit_events: list[JSONDict] | None = None,
+        ssh_summary: JSONDict | None = None,
+        certificate_event: tuple[str, str, str] | None = None,
+        collection_recovered: bool = False,
+    ) -> None:
+        _report_findings(
+            self.notification_configs,
+            since=self.since,
+            now=datetime.now(),
+            bans=bans or [],
+            unbans=unbans or [],
+            audit_events=audit_events or [],
+            ssh_summary=ssh_summary or _normalise_ssh_summary(0),
+            certificate_event=certificate_event,
+            collection_recovered=collection_recovered,
+        )
+
+    def poll_fail2ban(self) -> None:
+        bans, unbans, error, self.fail2ban_cursor = _check_fail2ban(
+            self.since, self.fail2ban_cursor
+        )
+        if error:
+            self.errors['fail2ban'] = error
+            return
+        self.errors.pop('fail2ban', None)
+        if bans or unbans:
+            self._report(bans=bans, unbans=unbans)
+
+    def check_ssh(self, now: float) -> None:
+        """Report new lockouts, and SSH failures once per threshold crossing.
+
+        The failure alert re-arms after the window drains below the threshold.
+        """
+        self.window.expire(now)
+        crossed = False
+        if len(self.window) < _SSH_FAILURE_THRESHOLD:
+            self.ssh_alerted = False
+        elif not self.ssh_alerted:
+            self.ssh_alerted = crossed = True
+        if not crossed and not self.lockouts:
+            return
+        summary = self.window.summary() if crossed else _normalise_ssh_summary(0)
+        summary['lockouts'] = _ssh_summary([], self.lockouts.values())['lockouts']
+        self.lockouts.clear()
+        self._report(ssh_summary=summary)
+
+    def run_periodic_checks(self) -> None:
+        """Run auditd and XRDP certificate checks since the previous pass."""
+        now = datetime.now()
+        audit_results, _critical, audit_errors = _check_auditd(self.since)
+        if audit_errors:
+            self.errors['auditd'] = '; '.join(audit_errors)
+        else:
+            self.errors.pop('auditd', None)
+            self.since = now
+        audit_events = [_normalise_audit_event(event) for event in audit_results]
+        self.certificate_health = inspect_xrdp_certificate()
+        certificate_event = _certificate_health_event(self.state, self.certificate_health)
+        self.state = _next_state(now, self.certificate_health)
+        self._report(audit_events=audit_events, certificate_event=certificate_event)
+
+    def sync_collection_errors(self) -> None:
+        errors = _normalise_collection_errors(list(self.errors.values()))
+        if errors and errors != self.reported_errors:
+            _notify_collection_errors(
+                self.notification_configs,
+                since=self.since,
+                now=datetime.now(),
+                collection_errors=errors,
+                previous_collection_errors=self.reported_errors,
+            )
+        elif not errors and self.reported_errors:
+            self._report(collection_recovered=True)
+        self.reported_errors = errors
+
+    def _checkpoint_journal_cursor(self) -> str | None:
+        cursor = _journal_record_cursor(self._last_record) if self._last_record else None
+        if cursor:
+            self.journal_cursor = cursor
+        return self.journal_cursor
+
+    def checkpoint(self) -> None:
+        """Persist cursors, the auditd window start, and certificate state."""
+        next_state = dict(self.state)
+        next_state.update(_next_state(
+            self.since,
+            self.certificate_health or XrdpCertificateHealth("not_configured", "", ""),
+            fail2ban_cursor=self.fail2ban_cursor,
+            journal_cursor=self._checkpoint_journal_cursor(),
+        ))
+        if self.reported_errors:
+            next_state['collection_errors'] = self.reported_errors
+        else:
+            next_state.pop('collection_errors', None)
+        _save_state(next_state)
+
+    # -- loop -------------------------------------------------------------
+
+    def run(self) -> int:
+        next_periodic = 0.0
+        next_checkpoint = time.monotonic() + _DAEMON_CHECKPOINT_SECONDS
+        try:
+            while not self.stop.is_set():
+                now = time.monotonic()
+                if self._journal is None and now >= self._journal_restart_at:
+                    self._start_journal()
+                self._drain_journal(_DAEMON_POLL_SECONDS)
+                now = time.monotonic()
+                self.poll_fail2ban()
+                self.check_ssh(now)
+                if now >= next_periodic:
+                    self.run_periodic_checks()
+                    next_periodic = now + self.interval
+                self.sync_collection_errors()
+                if now >= next_checkpoint:
+                    self.checkpoint()
+                    next_checkpoint = now + _DAEMON_CHECKPOINT_SECONDS
+        finally:
+            self.stop.set()
+            if self._journal is not None:
+                self._journal.terminate()
+                self._journal.wait()
+            self.checkpoint()
+        return 0
+
+
+def run_daemon(interval: float = _DAEMON_CHECK_INTERVAL_SECONDS) -> int:
+    """Run the monitor continuously until SIGTERM or SIGINT."""
+    log_event(logger, "Starting security monitor daemon", interval_seconds=interval)
+    # Holding the state lock for the daemon's lifetime keeps a leftover timer
+    # run from interleaving its cursors with the daemon's checkpoints.
+    state_lock = _lock_state()
+    try:
+        notification_configs = load_notification_configs_from_state(logger)
+        if notification_configs:
+            enable_notification_outbox(logger=logger)
+        daemon = _SecurityMonitorDaemon(notification_configs, _load_state(), interval=interval)
+
+        def _stop(_signum: int, _frame: object) -> None:
+            daemon.stop.set()
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+        return daemon.run()
+    finally:
+        if state_lock is not None:
+            state_lock.close()
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse security monitor options."""
+    parser = argparse.ArgumentParser(
+        description="Check security logs and notify about noteworthy events.",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Follow the SSH journal and fail2ban log continuously instead of checking once",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=_DAEMON_CHECK_INTERVAL_SECONDS,
+        help="Seconds between auditd and XRDP certificate checks in daemon mode (default: 900)",
+    )
+    args = parser.parse_args(argv)
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+    return args
+
+
+def main() -> int:
+    state_lock = _lock_state(blocking=False)
+    if state_lock is None:
+        log_event(logger, "Another security monitor holds the state file; skipping this check")
+        return 0
+    try:
+        return _check_once()
+    finally:
+        state_lock.close()
+
+
+def _check_once() -> int:
+    log_event(logger, "Starting security monitor check")
+
+    notification_configs = load_notification_configs_from_state(logger)
+    if not notification_configs:
+        log_event(
+            logger,
+            "No notification targets configured; security events will be logged locally",
+        )
+
+    state = _load_state()
+    now = datetime.now()
+    since = _state_since(state, now)
+
+    previous_fail2ban_cursor = _fail2ban_cursor(state)
+    previous_journal_cursor = _journal_cursor(state)
+    bans, unbans, fail2ban_error, fail2ban_cursor = _check_fail2ban(
+        since, previous_fail2ban_cursor
+    )
+    bans = [_normalise_fail2ban_event(event) for event in bans]
+    unbans = [_normalise_fail2ban_event(event) for event in unbans]
+    audit_results, audit_critical, audit_errors = _check_auditd(since)
+    audit_events = [_normalise_audit_event(event) for event in audit_results]
+    ssh_result, ssh_error, journal_cursor = _check_ssh_failures(
+        since, previous_journal_cursor
+    )
+    ssh_summary = _normalise_ssh_summary(ssh_result)
+    certificate_health = inspect_xrdp_certificate()
+    collection_errors = _normalise_collection_errors(
+        [fail2ban_error, *audit_errors, ssh_error]
+    )
+    previous_collection_errors = _state_collection_errors(state)
+    if collection_errors:
+        _notify_collection_errors(
+            notification_configs,
+            since=since,
+            now=now,
+            collection_errors=collection_errors,
+            previous_collection_errors=previous_collection_errors,
+        )
+        cursor = state.get('last_run')
+        if not isinstance(cursor, str) or not cursor:
+            cursor = since.isoformat()
+        next_state = _next_state(
+            now,
+            certificate_health,
+            fail2ban_cursor=previous_fail2ban_cursor,
+            journal_cursor=previous_journal_cursor,
+        )
+        next_state['last_run'] = cursor
+        next_state['collection_errors'] = collection_errors
+        _save_state(next_state)
+        return 1
+
+    next_state = _next_state(
+        now,
+        certificate_health,
+        fail2ban_cursor=fail2ban_cursor,
+        journal_cursor=journal_cursor,
+    )
+    certificate_failed = certificate_health.status == "error"
+    reported = _report_findings(
+        notification_configs,
+        since=since,
+        now=now,
+        bans=bans,
+        unbans=unbans,
+        audit_events=audit_events,
+        ssh_summary=ssh_summary,
+        certificate_event=_certificate_health_event(state, certificate_health),
+        collection_recovered=bool(previous_collection_errors),
+    )
+    if not reported:
+        if certificate_failed:
+            log_event(
+                logger,
+                "XRDP TLS certificate remains unhealthy",
+                level=ERROR,
+                errors=certificate_health.issue or "unknown certificate error",
+            )
+        else:
+            log_event(logger, "No noteworthy security events")
+    _save_state(next_state)
     return 1 if certificate_failed else 0
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    _args = parse_args()
+    sys.exit(run_daemon(_args.interval) if _args.daemon else main())
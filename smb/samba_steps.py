@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import grp
 import os
 import shlex
 import re
@@ -236,11 +237,42 @@ def _get_veto_dirs_for_share(share_path: str, config: SetupConfig) -> list[str]:
     return veto_dirs
 
 
+def _share_root_matches(path: str, group_name: str, mode: int) -> bool:
+    """Return whether the share root already has the managed group and mode."""
+
+    try:
+        stat_result = os.stat(path)
+        gid = grp.getgrnam(group_name).gr_gid
+    except (OSError, KeyError):
+        return False
+    return stat_result.st_gid == gid and (stat_result.st_mode & 0o7777) == mode
+
+
+def _fix_share_permissions(path: str, group_name: str, mode: str) -> None:
+    """Change group and mode only on entries below ``path`` that differ."""
+
+    safe_path = shlex.quote(path)
+    safe_group = shlex.quote(group_name)
+    # Symlinks are skipped because chgrp would follow them out of the share.
+    run(f"find {safe_path} ! -type l ! -group {safe_group} -exec chgrp {safe_group} {{}} +")
+    run(f"find {safe_path} ! -type l ! -perm {mode} -exec chmod {mode} {{}} +")
+
+
 def _prepare_samba_share(
     config: SetupConfig,
     share_config: dict[str, Any],
+    previous_paths: Optional[dict[str, str]] = None,
+    *,
+    force_walk: bool = False,
 ) -> tuple[str, str]:
-    """Provision one share's users, group, path, and return its config section."""
+    """Provision one share's users, group, path, and return its config section.
+
+    ``previous_paths`` maps managed groups to their paths in the current
+    smb.conf. When this share's path is unchanged and the share root already carries the
+    managed group and mode, the tree was fixed by an earlier reconcile and
+    Samba's ``force group`` keeps new files consistent, so it is not walked
+    again unless ``force_walk`` is set.
+    """
 
     share_name = cast(str, share_config["share_name"])
     access_type = cast(str, share_config["access_type"])
@@ -275,15 +307,17 @@ def _prepare_samba_share(
     run(f"gpasswd -M {shlex.quote(member_list)} {safe_group}")
     print(f"  Reconciled {len(users)} member(s) in group {group_name}")
 
-    safe_primary_path = shlex.quote(primary_path)
-    run(f"chgrp -R --preserve-root {safe_group} {safe_primary_path}")
-
-    if access_type == "write":
-        run(f"chmod -R --preserve-root 2775 {safe_primary_path}")
+    mode = "2775" if access_type == "write" else "2755"
+    previous_path = (previous_paths or {}).get(group_name)
+    if (
+        not force_walk
+        and previous_path == primary_path
+        and _share_root_matches(primary_path, group_name, int(mode, 8))
+    ):
+        print(f"  ✓ Permissions on {primary_path} already reconciled")
     else:
-        run(f"chmod -R --preserve-root 2755 {safe_primary_path}")
-
-    print(f"  Set {'write' if access_type == 'write' else 'read-only'} permissions on {primary_path}")
+        _fix_share_permissions(primary_path, group_name, mode)
+        print(f"  Set {'write' if access_type == 'write' else 'read-only'} permissions on {primary_path}")
 
     section_marker = f"[{share_name}_{access_type}]"
 
@@ -323,6 +357,16 @@ def _prepare_samba_share(
     return group_name, "\n".join(share_lines) + "\n"
 
 
+def _section_settings(section: str) -> dict[str, str]:
+    return dict(
+        (key.strip().lower(), value.strip())
+        for key, value in re.findall(
+            r"(?m)^[ \t]*([^#;=\r\n]+?)[ \t]*=[ \t]*([^\r\n]*)$",
+            section,
+        )
+    )
+
+
 def _managed_share_group(section: str) -> Optional[str]:
     """Return the managed group for an infra_tools-generated share section."""
 
@@ -331,13 +375,7 @@ def _managed_share_group(section: str) -> Optional[str]:
         return None
     section_name = header_match.group(1)
     expected_group = f"smb_{section_name}"
-    settings = dict(
-        (key.lower(), value.strip())
-        for key, value in re.findall(
-            r"(?m)^[ \t]*([^#;=\r\n]+?)[ \t]*=[ \t]*([^\r\n]*)$",
-            section,
-        )
-    )
+    settings = _section_settings(section)
     if (
         settings.get("valid users") == f"@{expected_group}"
         and settings.get("force group") == expected_group
@@ -346,10 +384,14 @@ def _managed_share_group(section: str) -> Optional[str]:
     return None
 
 
-def _remove_managed_share_sections(content: str) -> tuple[str, set[str]]:
-    """Remove current and legacy infra_tools-managed share sections."""
+def _remove_managed_share_sections(content: str) -> tuple[str, dict[str, str]]:
+    """Remove current and legacy infra_tools-managed share sections.
+
+    Returns the remaining content and the removed sections' paths keyed by
+    their managed group.
+    """
 
-    managed_groups: set[str] = set()
+    managed_paths: dict[str, str] = {}
     block_pattern = re.compile(
         r"(?ms)^[ \t]*" + re.escape(MANAGED_SHARES_BEGIN) + r"[ \t]*\r?\n"
         r".*?^[ \t]*" + re.escape(MANAGED_SHARES_END) + r"[ \t]*(?:\r?\n|\Z)"
@@ -358,7 +400,7 @@ def _remove_managed_share_sections(content: str) -> tuple[str, set[str]]:
         for section in re.findall(r"(?ms)^[ \t]*\[[^\]\r\n]+\].*?(?=^[ \t]*\[|\Z)", block):
             group_name = _managed_share_group(section)
             if group_name:
-                managed_groups.add(group_name)
+                managed_paths[group_name] = _section_settings(section).get("path", "")
     content = block_pattern.sub("", content)
 
     section_pattern = re.compile(r"(?ms)^[ \t]*\[[^\]\r\n]+\].*?(?=^[ \t]*\[|\Z)")
@@ -367,14 +409,40 @@ def _remove_managed_share_sections(content: str) -> tuple[str, set[str]]:
         group_name = _managed_share_group(match.group(0))
         if not group_name:
             return match.group(0)
-        managed_groups.add(group_name)
+        managed_paths[group_name] = _section_settings(match.group(0)).get("path", "")
         return ""
 
-    return section_pattern.sub(remove_legacy, content).rstrip(), managed_groups
+    return section_pattern.sub(remove_legacy, content).rstrip(), managed_paths
+
+
+def _render_smb_config(unmanaged_content: str, sections: list[str]) -> str:
+    """Render the complete smb.conf: hardened globals, unmanaged sections, shares."""
+
+    desired_content = _render_hardened_global_settings(unmanaged_content).rstrip()
+    if sections:
+        desired_content += (
+            ("\n\n" if desired_content else "")
+            + f"{MANAGED_SHARES_BEGIN}\n"
+            + "\n".join(sections)
+            + f"{MANAGED_SHARES_END}\n"
+        )
+    elif desired_content:
+        desired_content += "\n"
+    return desired_content
+
+
+def _reload_samba() -> None:
+    run("smbcontrol smbd reload-config")
 
 
 def reconcile_samba_shares(config: SetupConfig, **_: Any) -> None:
-    """Make managed Samba shares exactly match ``config.samba_shares``."""
+    """Make managed Samba shares exactly match ``config.samba_shares``.
+
+    smb.conf is rendered once for all shares together with the hardened global
+    settings, written only when the content changes, and followed by a single
+    reload. ``--force-step reconcile_samba_shares`` (or ``all``) walks every
+    share tree again to repair ownership changed outside Samba.
+    """
 
     validate_samba_share_specs(config.samba_shares, config.share_credentials)
     credentials = parse_share_credentials(config.share_credentials)
@@ -386,30 +454,24 @@ def reconcile_samba_shares(config: SetupConfig, **_: Any) -> None:
     if not os.path.exists(SMB_CONF_PATH):
         raise RuntimeError("Samba is not installed; run setup with --samba first")
 
+    with open(SMB_CONF_PATH, "r", encoding="utf-8") as file_obj:
+        previous_content = file_obj.read()
+    unmanaged_content, previous_paths = _remove_managed_share_sections(previous_content)
+
+    force_walk = bool({"reconcile_samba_shares", "all"} & set(config.force_steps or []))
     desired_groups: set[str] = set()
     sections: list[str] = []
     for share_config in share_configs:
-        group_name, section = _prepare_samba_share(config, share_config)
+        group_name, section = _prepare_samba_share(
+            config,
+            share_config,
+            previous_paths,
+            force_walk=force_walk,
+        )
         desired_groups.add(group_name)
         sections.append(section)
 
-    with open(SMB_CONF_PATH, "r", encoding="utf-8") as file_obj:
-        previous_content = file_obj.read()
-    unmanaged_content, previous_groups = _remove_managed_share_sections(previous_content)
-
-    managed_block = ""
-    if sections:
-        managed_block = (
-            f"{MANAGED_SHARES_BEGIN}\n"
-            + "\n".join(sections)
-            + f"{MANAGED_SHARES_END}\n"
-        )
-    desired_content = unmanaged_content
-    if managed_block:
-        desired_content += ("\n\n" if desired_content else "") + managed_block
-    elif desired_content:
-        desired_content += "\n"
-
+    desired_content = _render_smb_config(unmanaged_content, sections)
     if desired_content != previous_content:
         if not _write_validated_smb_config(
             SMB_CONF_PATH,
@@ -417,12 +479,12 @@ def reconcile_samba_shares(config: SetupConfig, **_: Any) -> None:
             desired_content,
         ):
             raise RuntimeError("Samba share configuration validation failed")
-        run("systemctl reload smbd")
+        _reload_samba()
         print(f"  ✓ Reconciled {len(sections)} Samba share(s)")
     else:
         print(f"  ✓ {len(sections)} Samba share(s) already up to date")
 
-    for obsolete_group in sorted(previous_groups - desired_groups):
+    for obsolete_group in sorted(set(previous_paths) - desired_groups):
         run(f"groupdel {shlex.quote(obsolete_group)}", check=False)
 
 
@@ -564,7 +626,7 @@ def configure_samba_global_settings(config: SetupConfig) -> None:
     if not _write_validated_smb_config(smb_conf, content, desired_content):
         return
 
-    run("systemctl reload smbd")
+    _reload_samba()
     print("  ✓ Updated global Samba configuration with security hardening")
 
 
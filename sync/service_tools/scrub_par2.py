@@ -21,7 +21,7 @@ from typing import Optional, Any
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
 
 from lib.logging_utils import get_rotating_logger, log_message
-from lib.operation_log import create_operation_logger
+from lib.operation_log import create_operation_logger, install_signal_flush
 from lib.validation import validate_filesystem_path
 from lib.disk_utils import estimate_operation_duration
 from lib.progress_utils import ProgressTracker, ProgressMessage
@@ -731,6 +731,7 @@ def main():
     redundancy = int(sys.argv[3])
     log_file = sys.argv[4]
     verify = '--no-verify' not in sys.argv
+    install_signal_flush()
     
     try:
         scrub_directory(directory, database, redundancy, log_file, verify)
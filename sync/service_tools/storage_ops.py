@@ -28,7 +28,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../
 
 from lib.logging_utils import get_service_logger, log_event
 from lib.atomic_io import write_json_atomic
-from lib.notifications import send_notification_safe, parse_notification_args
+from lib.notifications import enable_notification_outbox, send_notification_safe, parse_notification_args
 from lib.machine_state import load_setup_config
 from lib.mount_utils import get_mount_ancestor
 from lib.task_utils import needs_mount_check
@@ -613,6 +613,9 @@ def main():
     if config_dict:
         notification_configs = parse_notification_args(config_dict.get('notify_specs', []))
         friendly_name = config_dict.get('friendly_name')
+    if notification_configs:
+        # Queue notifications so an unreachable target cannot stall operations.
+        enable_notification_outbox(logger=logger)
     
     # Acquire lock (non-blocking) - if another instance is running, exit cleanly
     with OperationLock(LOCK_FILE) as lock:
@@ -500,7 +500,6 @@ class TestCleanupHelpers(unittest.TestCase):
 
     @patch("common.service_tools.cleanup_maintenance.os.statvfs")
     @patch("common.service_tools.cleanup_maintenance.os.stat")
-    @patch("common.service_tools.cleanup_maintenance.get_disk_usage_details")
     @patch(
         "common.service_tools.cleanup_maintenance.discover_local_mount_points",
         return_value=["/", "/bind", "/srv/data"],
@@ -508,38 +507,38 @@ class TestCleanupHelpers(unittest.TestCase):
     def test_collect_local_storage_usage_deduplicates_bind_mounts_and_counts_inodes(
         self,
         _discover,
-        mock_disk_usage,
         mock_stat,
         mock_statvfs,
     ):
-        root_usage = {
-            "total_mb": 1000,
-            "used_mb": 500,
-            "free_mb": 500,
-            "usage_percent": 50,
-        }
-        data_usage = {
-            "total_mb": 2000,
-            "used_mb": 1500,
-            "free_mb": 500,
-            "usage_percent": 75,
-        }
-        mock_disk_usage.side_effect = [root_usage.copy(), root_usage.copy(), data_usage]
+        mb = 1024 * 1024
+        root_stats = SimpleNamespace(
+            f_frsize=mb, f_blocks=1000, f_bfree=500, f_bavail=450, f_files=100, f_ffree=5
+        )
+        data_stats = SimpleNamespace(
+            f_frsize=mb, f_blocks=2000, f_bfree=500, f_bavail=500, f_files=200, f_ffree=100
+        )
+        mock_statvfs.side_effect = [root_stats, root_stats, data_stats]
         mock_stat.side_effect = [
             SimpleNamespace(st_dev=1),
             SimpleNamespace(st_dev=1),
             SimpleNamespace(st_dev=2),
         ]
-        mock_statvfs.side_effect = [
-            SimpleNamespace(f_files=100, f_ffree=5),
-            SimpleNamespace(f_files=100, f_ffree=5),
-            SimpleNamespace(f_files=200, f_ffree=100),
-        ]
 
         usage = cleanup_maintenance.collect_local_storage_usage()
 
         self.assertEqual(set(usage), {"/", "/srv/data"})
-        self.assertEqual(usage["/"]["inode_usage_percent"], 95)
+        self.assertEqual(mock_statvfs.call_count, 3)
+        self.assertEqual(
+            usage["/"],
+            {
+                "total_mb": 1000,
+                "used_mb": 500,
+                "free_mb": 450,
+                "usage_percent": 50,
+                "inode_usage_percent": 95,
+            },
+        )
+        self.assertEqual(usage["/srv/data"]["usage_percent"], 75)
         self.assertEqual(usage["/srv/data"]["inode_usage_percent"], 50)
 
     @patch("common.service_tools.cleanup_maintenance.send_notification_safe")
@@ -675,5 +674,121 @@ class TestCleanupHelpers(unittest.TestCase):
         self.assertIn("Could not read temp directory usage", "\n".join(logs.output))
 
 
+def _hourly_samples(free_mb_values, start=1_700_000_000):
+    return [[start + index * 3600, free_mb] for index, free_mb in enumerate(free_mb_values)]
+
+
+class TestStorageForecast(unittest.TestCase):
+    def test_forecast_uses_robust_trend(self):
+        # Steady 100 MB/h decline with one short-lived dip that must not skew the trend.
+        samples = _hourly_samples([2000, 1900, 1800, 300, 1600, 1500, 1400, 1300])
+
+        hours = cleanup_maintenance.forecast_hours_until_full(samples)
+
+        self.assertAlmostEqual(hours, 13.0)
+
+    def test_forecast_requires_history_and_shrinking_space(self):
+        self.assertIsNone(cleanup_maintenance.forecast_hours_until_full(_hourly_samples([500, 400, 300])))
+        self.assertIsNone(
+            cleanup_maintenance.forecast_hours_until_full(_hourly_samples([500, 510, 520, 530, 540, 550, 560]))
+        )
+        minute_samples = [[1_700_000_000 + index * 60, 500 - index] for index in range(10)]
+        self.assertIsNone(cleanup_maintenance.forecast_hours_until_full(minute_samples))
+
+    def test_filling_mounts_are_limited_to_the_horizon(self):
+        filling = cleanup_maintenance.forecast_filling_mounts(
+            {
+                "/": _hourly_samples([700, 600, 500, 400, 300, 200, 100]),
+                "/srv": _hourly_samples([100_000, 99_990, 99_980, 99_970, 99_960, 99_950, 99_940]),
+            }
+        )
+
+        self.assertEqual(filling, {"/": 1.0})
+
+    def test_samples_are_bounded_and_drop_missing_mounts(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            samples_file = os.path.join(state_dir, "samples.json")
+            with patch.object(cleanup_maintenance, "STORAGE_SAMPLES_FILE", samples_file), \
+                    patch.object(cleanup_maintenance, "STORAGE_FORECAST_MAX_SAMPLES", 3):
+                for index in range(4):
+                    cleanup_maintenance.record_storage_samples(
+                        {"/": {"free_mb": 100 - index}, "/old": {"free_mb": 5}},
+                        now=1000 + index,
+                    )
+                samples = cleanup_maintenance.record_storage_samples({"/": {"free_mb": 90}}, now=2000)
+
+                self.assertEqual(samples, {"/": [[1002, 98], [1003, 97], [2000, 90]]})
+                self.assertEqual(cleanup_maintenance._load_storage_samples(), samples)
+                self.assertEqual(os.stat(samples_file).st_mode & 0o777, 0o600)
+
+    def test_malformed_samples_file_starts_fresh(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            samples_file = os.path.join(state_dir, "samples.json")
+            with open(samples_file, "w", encoding="utf-8") as handle:
+                handle.write('{"version": 1, "mounts": {"/": [[1, 2], ["x", 3], [4]], "/srv": 5}}')
+            with patch.object(cleanup_maintenance, "STORAGE_SAMPLES_FILE", samples_file):
+                self.assertEqual(cleanup_maintenance._load_storage_samples(), {"/": [[1, 2]]})
+
+    @patch("common.service_tools.cleanup_maintenance.notify_if_storage_filling")
+    @patch("common.service_tools.cleanup_maintenance.cleanup_stale_infra_tmp_artifacts", return_value=[])
+    @patch("common.service_tools.cleanup_maintenance.cleanup_apt_cache", return_value=[])
+    @patch("common.service_tools.cleanup_maintenance.forecast_filling_mounts", return_value={"/": 10.0})
+    @patch("common.service_tools.cleanup_maintenance.record_storage_samples", return_value={})
+    @patch("common.service_tools.cleanup_maintenance.collect_local_storage_usage", return_value={})
+    @patch("common.service_tools.cleanup_maintenance.load_notification_configs_from_state", return_value=["cfg"])
+    def test_forecast_run_cleans_early_when_filling(
+        self, _configs, _usage, _record, _filling, mock_apt, mock_tmp, mock_notify
+    ):
+        self.assertEqual(cleanup_maintenance.run_storage_forecast(), 0)
+
+        mock_apt.assert_called_once_with()
+        self.assertEqual(
+            [call.kwargs for call in mock_tmp.call_args_list],
+            [
+                {"tmp_dir": tmp_dir, "max_age_days": cleanup_maintenance.STORAGE_FORECAST_INFRA_TMP_MAX_AGE_DAYS}
+                for tmp_dir in cleanup_maintenance.INFRA_TMP_DIRS
+            ],
+        )
+        mock_notify.assert_called_once_with(["cfg"], {"/": 10.0}, {})
+
+    @patch("common.service_tools.cleanup_maintenance.notify_if_storage_filling")
+    @patch("common.service_tools.cleanup_maintenance.cleanup_apt_cache")
+    @patch("common.service_tools.cleanup_maintenance.forecast_filling_mounts", return_value={})
+    @patch("common.service_tools.cleanup_maintenance.record_storage_samples", return_value={})
+    @patch("common.service_tools.cleanup_maintenance.collect_local_storage_usage", return_value={})
+    @patch("common.service_tools.cleanup_maintenance.load_notification_configs_from_state", return_value=[])
+    def test_forecast_run_only_samples_when_stable(
+        self, _configs, _usage, _record, _filling, mock_apt, mock_notify
+    ):
+        self.assertEqual(cleanup_maintenance.run_storage_forecast(), 0)
+
+        mock_apt.assert_not_called()
+        mock_notify.assert_called_once_with([], {}, {})
+
+    @patch("common.service_tools.cleanup_maintenance.send_notification_safe", return_value=True)
+    def test_forecast_alert_is_deduplicated_and_resolved(self, mock_notify):
+        usage = {"/": {"free_mb": 800}}
+        with tempfile.TemporaryDirectory() as state_dir:
+            with patch.object(
+                cleanup_maintenance,
+                "STATE_FILE",
+                os.path.join(state_dir, "cleanup-state.json"),
+            ):
+                cleanup_maintenance.notify_if_storage_filling(["cfg"], {"/": 20.4}, usage)
+                cleanup_maintenance.notify_if_storage_filling(["cfg"], {"/": 18.0}, usage)
+                cleanup_maintenance.notify_if_storage_filling(["cfg"], {}, usage)
+
+        self.assertEqual(mock_notify.call_count, 2)
+        firing = mock_notify.call_args_list[0].kwargs
+        self.assertEqual(firing["state"], "firing")
+        self.assertIn("/: full in about 20 h", firing["details"])
+        self.assertIn("free=800 MB", firing["details"])
+        self.assertEqual(mock_notify.call_args_list[1].kwargs["state"], "resolved")
+
+    def test_forecast_flag_is_parsed(self):
+        self.assertTrue(cleanup_maintenance.parse_args(["--forecast"]).forecast)
+        self.assertFalse(cleanup_maintenance.parse_args([]).forecast)
+
+
 if __name__ == "__main__":
     unittest.main()
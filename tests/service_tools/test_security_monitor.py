@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import io
 import os
 import json
+import subprocess
 import sys
+import time
 import tempfile
+import threading
 import unittest
 from datetime import datetime, timedelta
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
 
@@ -17,16 +21,49 @@ from security.service_tools import security_monitor
 from lib.xrdp_certificate import XrdpCertificateHealth
 
 
+def _journal_process(stdout: str, returncode: int = 0, stderr: str = "") -> MagicMock:
+    process = MagicMock()
+    process.stdout = io.StringIO(stdout)
+    process.stderr = io.StringIO(stderr)
+    process.wait.return_value = returncode
+    return process
+
+
 class TestSecurityMonitor(unittest.TestCase):
+    def setUp(self):
+        # main() locks the state file; keep the lock out of /opt/infra_tools.
+        self._state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._state_dir.cleanup)
+        state_file = patch(
+            "security.service_tools.security_monitor._STATE_FILE",
+            os.path.join(self._state_dir.name, "security_monitor_state.json"),
+        )
+        state_file.start()
+        self.addCleanup(state_file.stop)
+
+    @patch("security.service_tools.security_monitor._check_once")
+    def test_check_is_skipped_while_another_monitor_holds_the_state(self, mock_check):
+        held = security_monitor._lock_state()
+        self.assertIsNotNone(held)
+        try:
+            self.assertEqual(security_monitor.main(), 0)
+        finally:
+            assert held is not None
+            held.close()
+        mock_check.assert_not_called()
+
+        mock_check.return_value = 1
+        self.assertEqual(security_monitor.main(), 1)
+
     @patch(
         "security.service_tools.security_monitor.inspect_xrdp_certificate",
         return_value=XrdpCertificateHealth("not_configured", "", ""),
     )
     @patch("security.service_tools.security_monitor._save_state")
     @patch("security.service_tools.security_monitor.send_notification_safe")
-    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None))
+    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None, None))
     @patch("security.service_tools.security_monitor._check_auditd", return_value=([], False, []))
-    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None))
+    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None, None))
     @patch("security.service_tools.security_monitor._load_state", return_value={})
     @patch("security.service_tools.security_monitor.load_notification_configs_from_state", return_value=[])
     def test_collects_and_advances_cursor_without_notification_targets(
@@ -47,7 +84,7 @@ class TestSecurityMonitor(unittest.TestCase):
     )
     @patch("security.service_tools.security_monitor._save_state")
     @patch("security.service_tools.security_monitor.send_notification_safe")
-    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None))
+    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None, None))
     @patch("security.service_tools.security_monitor._check_auditd", return_value=([], False, []))
     @patch("security.service_tools.security_monitor._check_fail2ban")
     @patch("security.service_tools.security_monitor._load_state")
@@ -57,7 +94,7 @@ class TestSecurityMonitor(unittest.TestCase):
         _certificate,
     ):
         mock_state.return_value = {"last_run": (datetime.now() + timedelta(days=1)).isoformat()}
-        mock_fail2ban.return_value = ([], [], None)
+        mock_fail2ban.return_value = ([], [], None, None)
 
         self.assertEqual(security_monitor.main(), 0)
 
@@ -73,9 +110,9 @@ class TestSecurityMonitor(unittest.TestCase):
     )
     @patch("security.service_tools.security_monitor._save_state")
     @patch("security.service_tools.security_monitor.send_notification_safe")
-    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, "SSH journal: denied"))
+    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, "SSH journal: denied", None))
     @patch("security.service_tools.security_monitor._check_auditd", return_value=([], False, []))
-    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None))
+    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None, None))
     @patch("security.service_tools.security_monitor._load_state", return_value={})
     @patch("security.service_tools.security_monitor.load_notification_configs_from_state", return_value=["cfg"])
     def test_collection_failure_notifies_once_and_retains_cursor(
@@ -102,9 +139,9 @@ class TestSecurityMonitor(unittest.TestCase):
     )
     @patch("security.service_tools.security_monitor._save_state")
     @patch("security.service_tools.security_monitor.send_notification_safe")
-    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, "SSH journal: denied"))
+    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, "SSH journal: denied", None))
     @patch("security.service_tools.security_monitor._check_auditd", return_value=([], False, []))
-    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None))
+    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None, None))
     @patch(
         "security.service_tools.security_monitor._load_state",
         return_value={"last_run": "2026-08-22T06:00:00", "collection_errors": ["SSH journal: denied"]},
@@ -128,9 +165,9 @@ class TestSecurityMonitor(unittest.TestCase):
     )
     @patch("security.service_tools.security_monitor._save_state")
     @patch("security.service_tools.security_monitor.send_notification_safe")
-    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None))
+    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None, None))
     @patch("security.service_tools.security_monitor._check_auditd", return_value=([], False, []))
-    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None))
+    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None, None))
     @patch(
         "security.service_tools.security_monitor._load_state",
         return_value={"last_run": "2026-08-22T06:00:00", "collection_errors": ["SSH journal: denied"]},
@@ -155,9 +192,9 @@ class TestSecurityMonitor(unittest.TestCase):
     )
     @patch("security.service_tools.security_monitor._save_state")
     @patch("security.service_tools.security_monitor.send_notification_safe")
-    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None))
+    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None, None))
     @patch("security.service_tools.security_monitor._check_auditd", return_value=(['privileged'], False, []))
-    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None))
+    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None, None))
     @patch("security.service_tools.security_monitor._load_state", return_value={})
     @patch("security.service_tools.security_monitor.load_notification_configs_from_state", return_value=["cfg"])
     def test_routine_privileged_audit_event_does_not_notify(
@@ -175,11 +212,11 @@ class TestSecurityMonitor(unittest.TestCase):
     )
     @patch("security.service_tools.security_monitor._save_state")
     @patch("security.service_tools.security_monitor.send_notification_safe")
-    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None))
+    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None, None))
     @patch("security.service_tools.security_monitor._check_auditd", return_value=([], False, []))
     @patch(
         "security.service_tools.security_monitor._check_fail2ban",
-        return_value=([], [{"type": "fail2ban", "action": "unban", "jail": "sshd", "source_ip": "192.0.2.4"}], None),
+        return_value=([], [{"type": "fail2ban", "action": "unban", "jail": "sshd", "source_ip": "192.0.2.4"}], None, None),
     )
     @patch("security.service_tools.security_monitor._load_state", return_value={})
     @patch("security.service_tools.security_monitor.load_notification_configs_from_state", return_value=["cfg"])
@@ -204,9 +241,9 @@ class TestSecurityMonitor(unittest.TestCase):
     )
     @patch("security.service_tools.security_monitor._save_state")
     @patch("security.service_tools.security_monitor.send_notification_safe")
-    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None))
+    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None, None))
     @patch("security.service_tools.security_monitor._check_auditd", return_value=([], False, []))
-    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None))
+    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None, None))
     @patch("security.service_tools.security_monitor._load_state", return_value={})
     @patch("security.service_tools.security_monitor.load_notification_configs_from_state", return_value=["cfg"])
     def test_new_certificate_failure_is_reported_and_persisted(
@@ -255,12 +292,10 @@ type=PATH msg=audit(124): name=\"/etc/sudoers.d/ops\"\ntype=SYSCALL msg=audit(12
         self.assertFalse(critical)
         self.assertEqual(errors, ["auditd: ausearch command unavailable"])
 
-    @patch("security.service_tools.security_monitor.subprocess.run")
-    def test_ssh_failures_are_aggregated_by_source_user_and_method(self, mock_run):
-        mock_run.return_value = SimpleNamespace(
-            returncode=0,
-            stderr="",
-            stdout="\n".join([
+    @patch("security.service_tools.security_monitor.subprocess.Popen")
+    def test_ssh_failures_are_aggregated_by_source_user_and_method(self, mock_popen):
+        mock_popen.return_value = _journal_process(
+            "\n".join([
                 json.dumps({
                     "MESSAGE": "Failed password for root from 192.0.2.4 port 22 ssh2",
                     "_SOURCE_REALTIME_TIMESTAMP": "1766400000000000",
@@ -275,7 +310,7 @@ type=PATH msg=audit(124): name=\"/etc/sudoers.d/ops\"\ntype=SYSCALL msg=audit(12
             ]),
         )
 
-        summary, error = security_monitor._check_ssh_failures(datetime.now())
+        summary, error, _cursor = security_monitor._check_ssh_failures(datetime.now())
 
         self.assertIsNone(error)
         self.assertEqual(summary["failure_count"], 3)
@@ -309,7 +344,7 @@ type=PATH msg=audit(124): name=\"/etc/sudoers.d/ops\"\ntype=SYSCALL msg=audit(12
                 )
 
             with patch("security.service_tools.security_monitor._FAIL2BAN_LOG", log_path):
-                bans, unbans, error = security_monitor._check_fail2ban(
+                bans, unbans, error, _cursor = security_monitor._check_fail2ban(
                     datetime(2026, 8, 22, 12, 0, 0)
                 )
 
@@ -318,6 +353,239 @@ type=PATH msg=audit(124): name=\"/etc/sudoers.d/ops\"\ntype=SYSCALL msg=audit(12
         self.assertEqual(bans[0]["source_ip"], "192.0.2.4")
         self.assertEqual(unbans[0]["action"], "unban")
 
+    def test_fail2ban_cursor_reads_only_appended_complete_lines(self):
+        ban = "2026-08-22 12:01:02,123 fail2ban.actions [1]: WARNING [sshd] Ban {ip}\n"
+        with tempfile.TemporaryDirectory() as log_dir:
+            log_path = os.path.join(log_dir, "fail2ban.log")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write(ban.format(ip="192.0.2.1"))
+
+            with patch("security.service_tools.security_monitor._FAIL2BAN_LOG", log_path):
+                since = datetime(2026, 8, 22, 12, 0, 0)
+                first, _unbans, _error, cursor = security_monitor._check_fail2ban(since)
+                with open(log_path, "a", encoding="utf-8") as log_file:
+                    log_file.write(ban.format(ip="192.0.2.2"))
+                    log_file.write(ban.format(ip="192.0.2.3").rstrip("\n"))
+                second, _unbans, _error, partial_cursor = security_monitor._check_fail2ban(
+                    since, cursor
+                )
+                with open(log_path, "a", encoding="utf-8") as log_file:
+                    log_file.write("\n")
+                third, _unbans, _error, _cursor = security_monitor._check_fail2ban(
+                    since, partial_cursor
+                )
+
+        self.assertEqual([event["source_ip"] for event in first], ["192.0.2.1"])
+        self.assertEqual([event["source_ip"] for event in second], ["192.0.2.2"])
+        self.assertEqual([event["source_ip"] for event in third], ["192.0.2.3"])
+        self.assertEqual(cursor["offset"], len(ban.format(ip="192.0.2.1")))
+
+    def test_fail2ban_cursor_follows_rotation_and_truncation(self):
+        ban = "2026-08-22 12:01:02,123 fail2ban.actions [1]: WARNING [sshd] Ban {ip}\n"
+        with tempfile.TemporaryDirectory() as log_dir:
+            log_path = os.path.join(log_dir, "fail2ban.log")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write(ban.format(ip="192.0.2.1"))
+
+            with patch("security.service_tools.security_monitor._FAIL2BAN_LOG", log_path):
+                since = datetime(2026, 8, 22, 12, 0, 0)
+                _bans, _unbans, _error, cursor = security_monitor._check_fail2ban(since)
+                with open(log_path, "a", encoding="utf-8") as log_file:
+                    log_file.write(ban.format(ip="192.0.2.2"))
+                os.rename(log_path, f"{log_path}.1")
+                with open(log_path, "w", encoding="utf-8") as log_file:
+                    log_file.write(ban.format(ip="192.0.2.3"))
+                rotated, _unbans, _error, cursor = security_monitor._check_fail2ban(
+                    since, cursor
+                )
+                with open(log_path, "w", encoding="utf-8") as log_file:
+                    log_file.write(ban.format(ip="192.0.2.4"))
+                truncated, _unbans, _error, _cursor = security_monitor._check_fail2ban(
+                    since, {"inode": cursor["inode"], "offset": cursor["offset"] + 100}
+                )
+
+        self.assertEqual(
+            [event["source_ip"] for event in rotated],
+            ["192.0.2.2", "192.0.2.3"],
+        )
+        self.assertEqual([event["source_ip"] for event in truncated], ["192.0.2.4"])
+
+    def test_fail2ban_cursor_ignores_since_filter(self):
+        line = "2026-08-22 11:00:00,000 fail2ban.actions [1]: WARNING [sshd] Ban 192.0.2.9\n"
+        with tempfile.TemporaryDirectory() as log_dir:
+            log_path = os.path.join(log_dir, "fail2ban.log")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write(line)
+            inode = os.stat(log_path).st_ino
+
+            with patch("security.service_tools.security_monitor._FAIL2BAN_LOG", log_path):
+                bans, _unbans, _error, cursor = security_monitor._check_fail2ban(
+                    datetime(2026, 8, 22, 12, 0, 0), {"inode": inode, "offset": 0}
+                )
+
+        self.assertEqual(len(bans), 1)
+        self.assertEqual(cursor, {"inode": inode, "offset": len(line)})
+
+    @patch("security.service_tools.security_monitor.subprocess.Popen")
+    def test_ssh_journal_resumes_after_cursor_and_returns_last_cursor(self, mock_popen):
+        mock_popen.return_value = _journal_process(
+            "\n".join([
+                json.dumps({"MESSAGE": "Failed password for root from 192.0.2.4 port 22 ssh2",
+                            "__CURSOR": "s=1;i=2"}),
+                json.dumps({"MESSAGE": "Connection closed by 192.0.2.4 port 22", "__CURSOR": "s=1;i=3"}),
+            ]),
+        )
+
+        summary, error, cursor = security_monitor._check_ssh_failures(datetime.now(), "s=1;i=1")
+
+        self.assertIsNone(error)
+        self.assertEqual(summary["failure_count"], 1)
+        self.assertEqual(cursor, "s=1;i=3")
+        command = mock_popen.call_args.args[0]
+        self.assertIn("--after-cursor", command)
+        self.assertIn("--output-fields=MESSAGE,_SOURCE_REALTIME_TIMESTAMP", command)
+        self.assertEqual(command[command.index("--after-cursor") + 1], "s=1;i=1")
+        self.assertNotIn("--since", command)
+
+    @patch("security.service_tools.security_monitor.subprocess.Popen")
+    def test_rejected_journal_cursor_falls_back_to_since(self, mock_popen):
+        mock_popen.side_effect = [
+            _journal_process("", returncode=1, stderr="Failed to seek to cursor"),
+            _journal_process(""),
+        ]
+
+        _summary, error, cursor = security_monitor._check_ssh_failures(datetime.now(), "bogus")
+
+        self.assertIsNone(error)
+        self.assertEqual(cursor, "bogus")
+        self.assertIn("--since", mock_popen.call_args.args[0])
+
+    def test_ssh_journal_drains_large_stderr_before_stdout_ends(self):
+        real_popen = subprocess.Popen
+        script = (
+            "import json, sys; sys.stderr.write('w' * 1048576); sys.stderr.flush(); "
+            "print(json.dumps({'MESSAGE': 'Failed password for root from 192.0.2.4 port 22 ssh2'}))"
+        )
+        with patch(
+            "security.service_tools.security_monitor.subprocess.Popen",
+            side_effect=lambda _command, **kwargs: real_popen([sys.executable, "-c", script], **kwargs),
+        ), patch("security.service_tools.security_monitor._JOURNAL_TIMEOUT_SECONDS", 10):
+            aggregator = security_monitor._SshFailureAggregator()
+            returncode, stderr = security_monitor._stream_ssh_journal([], aggregator)
+
+        self.assertEqual(returncode, 0)
+        self.assertEqual(len(stderr), 1048576)
+        self.assertEqual(aggregator.summary()["failure_count"], 1)
+
+    def test_ssh_prefilter_skips_unrelated_lines_without_decoding(self):
+        aggregator = security_monitor._SshFailureAggregator()
+
+        with patch("security.service_tools.security_monitor.json.loads") as mock_loads:
+            aggregator.add_line(json.dumps({
+                "MESSAGE": "Connection closed by 192.0.2.4 port 22 [preauth]",
+                "__CURSOR": "s=1;i=1",
+            }))
+
+        mock_loads.assert_not_called()
+        self.assertEqual(aggregator.summary()["failure_count"], 0)
+        self.assertEqual(aggregator.cursor(), "s=1;i=1")
+
+    def test_ssh_prefilter_accepts_every_parser_marker(self):
+        messages = [
+            *security_monitor._SSH_FAILURE_MARKERS,
+            *security_monitor._SSH_LOCKOUT_MARKERS,
+        ]
+        for message in messages:
+            with self.subTest(message=message):
+                self.assertTrue(security_monitor._may_be_ssh_event(message.upper()))
+
+    @patch("security.service_tools.security_monitor._JOURNAL_TIMEOUT_SECONDS", 0.01)
+    @patch("security.service_tools.security_monitor.subprocess.Popen")
+    def test_stalled_journal_read_is_killed_and_reported(self, mock_popen):
+        process = MagicMock()
+        released = threading.Event()
+
+        def _stalled_lines():
+            released.wait(5)
+            return iter(())
+
+        process.stdout.__iter__.side_effect = _stalled_lines
+        process.kill.side_effect = released.set
+        mock_popen.return_value = process
+
+        _summary, error, cursor = security_monitor._check_ssh_failures(datetime.now(), "s=1;i=1")
+
+        process.kill.assert_called_once()
+        self.assertIn("timed out", error or "")
+        self.assertEqual(cursor, "s=1;i=1")
+
+    def test_audit_field_values_skip_absent_fields(self):
+        self.assertEqual(security_monitor._audit_field_values("type=PATH name=/etc/x", "exe"), [])
+        self.assertEqual(
+            security_monitor._audit_field_values("type=SYSCALL auid=1000 uid=0", "uid"),
+            ["0"],
+        )
+
+    @patch(
+        "security.service_tools.security_monitor.inspect_xrdp_certificate",
+        return_value=XrdpCertificateHealth("not_configured", "", ""),
+    )
+    @patch("security.service_tools.security_monitor._save_state")
+    @patch("security.service_tools.security_monitor.send_notification_safe")
+    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, None, "s=1;i=9"))
+    @patch("security.service_tools.security_monitor._check_auditd", return_value=([], False, []))
+    @patch(
+        "security.service_tools.security_monitor._check_fail2ban",
+        return_value=([], [], None, {"inode": 7, "offset": 300}),
+    )
+    @patch(
+        "security.service_tools.security_monitor._load_state",
+        return_value={
+            "last_run": "2026-08-22T06:00:00",
+            "fail2ban_cursor": {"inode": 7, "offset": 100},
+            "journal_cursor": "s=1;i=5",
+        },
+    )
+    @patch("security.service_tools.security_monitor.load_notification_configs_from_state", return_value=[])
+    def test_main_passes_and_persists_read_cursors(
+        self, _configs, _state, mock_fail2ban, _audit, mock_ssh, _notify, mock_save,
+        _certificate,
+    ):
+        self.assertEqual(security_monitor.main(), 0)
+
+        self.assertEqual(mock_fail2ban.call_args.args[1], {"inode": 7, "offset": 100})
+        self.assertEqual(mock_ssh.call_args.args[1], "s=1;i=5")
+        saved_state = mock_save.call_args.args[0]
+        self.assertEqual(saved_state["fail2ban_cursor"], {"inode": 7, "offset": 300})
+        self.assertEqual(saved_state["journal_cursor"], "s=1;i=9")
+
+    @patch(
+        "security.service_tools.security_monitor.inspect_xrdp_certificate",
+        return_value=XrdpCertificateHealth("not_configured", "", ""),
+    )
+    @patch("security.service_tools.security_monitor._save_state")
+    @patch("security.service_tools.security_monitor.send_notification_safe")
+    @patch("security.service_tools.security_monitor._check_ssh_failures", return_value=(0, "SSH journal: denied", "s=1;i=5"))
+    @patch("security.service_tools.security_monitor._check_auditd", return_value=([], False, []))
+    @patch(
+        "security.service_tools.security_monitor._check_fail2ban",
+        return_value=([], [], None, {"inode": 7, "offset": 300}),
+    )
+    @patch(
+        "security.service_tools.security_monitor._load_state",
+        return_value={"fail2ban_cursor": {"inode": 7, "offset": 100}, "journal_cursor": "s=1;i=5"},
+    )
+    @patch("security.service_tools.security_monitor.load_notification_configs_from_state", return_value=[])
+    def test_collection_failure_retains_read_cursors(
+        self, _configs, _state, _fail2ban, _audit, _ssh, _notify, mock_save,
+        _certificate,
+    ):
+        self.assertEqual(security_monitor.main(), 1)
+
+        saved_state = mock_save.call_args.args[0]
+        self.assertEqual(saved_state["fail2ban_cursor"], {"inode": 7, "offset": 100})
+        self.assertEqual(saved_state["journal_cursor"], "s=1;i=5")
+
     def test_state_roundtrip_uses_atomic_writer(self):
         with tempfile.TemporaryDirectory() as state_dir:
             state_path = os.path.join(state_dir, "security-monitor.json")
@@ -393,5 +661,167 @@ type=PATH msg=audit(124): name=\"/etc/sudoers.d/ops\"\ntype=SYSCALL msg=audit(12
         self.assertEqual(state["rdp_certificate_fingerprint"], "aabbcc")
 
 
+
+def _failure_line(ip: str, index: int) -> str:
+    return json.dumps({
+        "MESSAGE": f"Failed password for root from {ip} port 22 ssh2",
+        "__CURSOR": f"s=1;i={index}",
+    })
+
+
+@patch("security.service_tools.security_monitor._save_state")
+@patch("security.service_tools.security_monitor.send_notification_safe")
+class TestSecurityMonitorDaemon(unittest.TestCase):
+    def _daemon(self, state: dict[str, object] | None = None):
+        return security_monitor._SecurityMonitorDaemon(["cfg"], state or {}, interval=60)
+
+    def test_ssh_window_alerts_once_per_threshold_crossing(self, mock_notify, _save):
+        daemon = self._daemon()
+        for index in range(security_monitor._SSH_FAILURE_THRESHOLD):
+            daemon.handle_journal_line(_failure_line("192.0.2.4", index), 100.0)
+
+        daemon.check_ssh(100.0)
+        daemon.handle_journal_line(_failure_line("192.0.2.4", 99), 101.0)
+        daemon.check_ssh(101.0)
+
+        mock_notify.assert_called_once()
+        self.assertIn("5 SSH failures", mock_notify.call_args.kwargs["subject"])
+        sources = mock_notify.call_args.kwargs["data"]["events"][0]["sources"]
+        self.assertEqual(sources[0]["source_ip"], "192.0.2.4")
+
+        daemon.check_ssh(101.0 + security_monitor._DAEMON_SSH_WINDOW_SECONDS)
+        self.assertFalse(daemon.ssh_alerted)
+
+    def test_lockouts_are_batched_into_the_next_tick(self, mock_notify, _save):
+        daemon = self._daemon()
+        lockout = json.dumps({
+            "MESSAGE": "pam_faillock(sshd:auth): user=root rhost=198.51.100.8 account temporarily locked",
+        })
+
+        daemon.handle_journal_line(lockout, 100.0)
+        daemon.handle_journal_line(lockout, 100.5)
+        daemon.check_ssh(101.0)
+        daemon.check_ssh(102.0)
+
+        mock_notify.assert_called_once()
+        lockouts = mock_notify.call_args.kwargs["data"]["events"]
+        self.assertEqual(lockouts[0]["type"], "account_lockout")
+        self.assertEqual(lockouts[0]["count"], 2)
+
+    def test_window_memory_is_bounded(self, _notify, _save):
+        window = security_monitor._SshFailureWindow(900, max_events=3)
+        for index in range(10):
+            window.add(100.0, {
+                "source_ip": f"192.0.2.{index}", "username": "root", "method": "password", "count": 1,
+            })
+
+        self.assertEqual(len(window), 3)
+        self.assertEqual(window.summary()["failure_count"], 3)
+        self.assertEqual(len(window.summary()["sources"]), 3)
+
+    def test_new_fail2ban_bans_are_reported(self, mock_notify, _save):
+        daemon = self._daemon()
+        ban = {"type": "fail2ban", "action": "ban", "jail": "sshd", "source_ip": "192.0.2.4"}
+
+        with patch(
+            "security.service_tools.security_monitor._check_fail2ban",
+            return_value=([ban], [], None, {"inode": 1, "offset": 80}),
+        ):
+            daemon.poll_fail2ban()
+
+        self.assertIn("1 fail2ban ban", mock_notify.call_args.kwargs["subject"])
+        self.assertEqual(daemon.fail2ban_cursor, {"inode": 1, "offset": 80})
+
+    def test_source_errors_notify_once_and_recovery_is_reported(self, mock_notify, _save):
+        daemon = self._daemon()
+
+        daemon.errors["fail2ban"] = "fail2ban log: denied"
+        daemon.sync_collection_errors()
+        daemon.sync_collection_errors()
+        daemon.errors.clear()
+        daemon.sync_collection_errors()
+
+        self.assertEqual(mock_notify.call_count, 2)
+        self.assertEqual(mock_notify.call_args_list[0].kwargs["status"], "error")
+        self.assertIn("monitor recovered", mock_notify.call_args_list[1].kwargs["subject"])
+
+    def test_checkpoint_persists_cursors_and_errors(self, _notify, mock_save):
+        daemon = self._daemon({"last_run": "2026-08-22T06:00:00"})
+        daemon.fail2ban_cursor = {"inode": 7, "offset": 300}
+        daemon.handle_journal_line(_failure_line("192.0.2.4", 42), 100.0)
+        daemon.reported_errors = ["SSH journal: denied"]
+
+        daemon.checkpoint()
+
+        saved = mock_save.call_args.args[0]
+        self.assertEqual(saved["last_run"], "2026-08-22T06:00:00")
+        self.assertEqual(saved["fail2ban_cursor"], {"inode": 7, "offset": 300})
+        self.assertEqual(saved["journal_cursor"], "s=1;i=42")
+        self.assertEqual(saved["collection_errors"], ["SSH journal: denied"])
+
+    @patch("security.service_tools.security_monitor._DAEMON_POLL_SECONDS", 0.01)
+    @patch(
+        "security.service_tools.security_monitor.inspect_xrdp_certificate",
+        return_value=XrdpCertificateHealth("not_configured", "", ""),
+    )
+    @patch("security.service_tools.security_monitor._check_auditd", return_value=([], False, []))
+    @patch("security.service_tools.security_monitor._check_fail2ban", return_value=([], [], None, None))
+    @patch("security.service_tools.security_monitor.subprocess.Popen")
+    def test_run_follows_journal_and_alerts_within_a_tick(
+        self, mock_popen, _fail2ban, _audit, _certificate, mock_notify, mock_save,
+    ):
+        daemon = self._daemon({"journal_cursor": "s=1;i=0"})
+        safety = threading.Timer(5, daemon.stop.set)
+        safety.start()
+        self.addCleanup(safety.cancel)
+
+        def _follow():
+            for index in range(1, 6):
+                yield _failure_line("192.0.2.4", index)
+            daemon.stop.wait(5)
+
+        process = MagicMock()
+        process.stdout = _follow()
+        mock_popen.return_value = process
+        mock_notify.side_effect = lambda *_args, **_kwargs: daemon.stop.set()
+
+        self.assertEqual(daemon.run(), 0)
+
+        command = mock_popen.call_args.args[0]
+        self.assertIn("--follow", command)
+        self.assertEqual(command[command.index("--after-cursor") + 1], "s=1;i=0")
+        self.assertIn("5 SSH failures", mock_notify.call_args.kwargs["subject"])
+        process.terminate.assert_called_once()
+        self.assertEqual(mock_save.call_args.args[0]["journal_cursor"], "s=1;i=5")
+
+    def test_follower_stderr_is_drained_and_its_tail_reported(self, _notify, _save):
+        real_popen = subprocess.Popen
+        script = (
+            "import sys; sys.stderr.write(('warning\\n' * 200000)); sys.stderr.flush(); "
+            "print('{}'); sys.stdout.flush(); sys.stderr.write('cursor rejected\\n'); sys.exit(1)"
+        )
+        daemon = self._daemon({"journal_cursor": "s=1;i=0"})
+        with patch(
+            "security.service_tools.security_monitor.subprocess.Popen",
+            side_effect=lambda _command, **kwargs: real_popen([sys.executable, "-c", script], **kwargs),
+        ):
+            daemon._start_journal()
+            deadline = time.monotonic() + 10
+            while "ssh_journal" not in daemon.errors and time.monotonic() < deadline:
+                daemon._drain_journal(1)
+
+        self.assertTrue(daemon.errors["ssh_journal"].endswith("warning\ncursor rejected"))
+        self.assertEqual(daemon.errors["ssh_journal"].count("\n"), 19)
+        self.assertIsNone(daemon.journal_cursor)
+
+    def test_parse_args_selects_daemon_mode(self, _notify, _save):
+        args = security_monitor.parse_args(["--daemon", "--interval", "120"])
+
+        self.assertTrue(args.daemon)
+        self.assertEqual(args.interval, 120)
+        self.assertFalse(security_monitor.parse_args([]).daemon)
+        with self.assertRaises(SystemExit), patch("sys.stderr", new_callable=io.StringIO):
+            security_monitor.parse_args(["--interval", "0"])
+
 if __name__ == "__main__":
     unittest.main()
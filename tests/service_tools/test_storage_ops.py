@@ -663,12 +663,13 @@ class TestOperationNotifications(unittest.TestCase):
 
 
 class TestStorageOpsMain(unittest.TestCase):
+    @patch("sync.service_tools.storage_ops.enable_notification_outbox")
     @patch("sync.service_tools.storage_ops.send_notification_safe", side_effect=RuntimeError("notify boom"))
     @patch("sync.service_tools.storage_ops.parse_notification_args", return_value=["cfg"])
     @patch("sync.service_tools.storage_ops.load_setup_config", return_value={"notify_specs": [["mailbox", "ops@example.com"]]})
     @patch("sync.service_tools.storage_ops.get_service_logger")
     def test_logs_structured_lock_notification_failure(
-        self, mock_get_logger, _load_config, _parse_notify, _send_notification
+        self, mock_get_logger, _load_config, _parse_notify, _send_notification, mock_outbox
     ):
         from sync.service_tools.storage_ops import main
 
@@ -686,6 +687,7 @@ class TestStorageOpsMain(unittest.TestCase):
         log_calls = [call.args[1] for call in logger_mock.log.call_args_list]
         self.assertIn("Another storage-ops instance is already running, skipping this run", log_calls)
         self.assertIn("Failed to send lock failure notification | error='notify boom'", log_calls)
+        mock_outbox.assert_called_once_with(logger=logger_mock)
 
 
 if __name__ == "__main__":
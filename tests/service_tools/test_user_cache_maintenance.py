@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
+import json
 import os
 import subprocess
 import sys
 import tempfile
 import time
 import unittest
+from collections import namedtuple
 from unittest.mock import patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
 
 from common.service_tools import user_cache_maintenance
+from lib.disk_utils import usage_percent
 
 
 class TestUserCacheHelpers(unittest.TestCase):
@@ -53,6 +56,115 @@ class TestUserCacheHelpers(unittest.TestCase):
             self.assertEqual(usage.size_bytes, 4)
             self.assertIsNotNone(usage.newest_mtime)
 
+    def _settled_tree(self, root: str) -> None:
+        """Create a small cache tree whose mtimes predate the settle window."""
+        os.makedirs(os.path.join(root, "a", "b"))
+        for relative, data in (("top", "1234"), ("a/one", "12"), ("a/b/two", "123")):
+            with open(os.path.join(root, relative), "w", encoding="utf-8") as handle:
+                handle.write(data)
+        old = time.time() - 3600
+        for directory, _dirs, files in os.walk(root):
+            for name in files:
+                os.utime(os.path.join(directory, name), (old, old))
+            os.utime(directory, (old, old))
+
+    def test_directory_summaries_skip_listing_unchanged_directories(self):
+        with tempfile.TemporaryDirectory() as home:
+            cache_dir = os.path.join(home, "cache")
+            summary_path = os.path.join(home, "summaries.json")
+            self._settled_tree(cache_dir)
+            first = user_cache_maintenance.DirectorySummaryCache(summary_path)
+            cold = user_cache_maintenance.cache_usage(cache_dir, first)
+            first.save()
+
+            warm_summaries = user_cache_maintenance.DirectorySummaryCache(summary_path)
+            with patch(
+                "common.service_tools.user_cache_maintenance.os.scandir",
+                side_effect=AssertionError("unchanged directory was listed"),
+            ):
+                warm = user_cache_maintenance.cache_usage(cache_dir, warm_summaries)
+
+            self.assertEqual(cold, warm)
+            self.assertEqual(warm.size_bytes, 9)
+            self.assertEqual(os.stat(summary_path).st_mode & 0o777, 0o600)
+
+    def test_directory_summaries_rescan_changed_directories(self):
+        with tempfile.TemporaryDirectory() as home:
+            cache_dir = os.path.join(home, "cache")
+            summary_path = os.path.join(home, "summaries.json")
+            self._settled_tree(cache_dir)
+            summaries = user_cache_maintenance.DirectorySummaryCache(summary_path)
+            user_cache_maintenance.cache_usage(cache_dir, summaries)
+            summaries.save()
+
+            with open(os.path.join(cache_dir, "a", "b", "new"), "w", encoding="utf-8") as handle:
+                handle.write("12345")
+            os.remove(os.path.join(cache_dir, "top"))
+            usage = user_cache_maintenance.cache_usage(
+                cache_dir,
+                user_cache_maintenance.DirectorySummaryCache(summary_path),
+            )
+
+            self.assertEqual(usage.size_bytes, 10)
+
+    def test_directory_summaries_supply_sizes_but_not_ages(self):
+        with tempfile.TemporaryDirectory() as home:
+            cache_dir = os.path.join(home, "cache")
+            summary_path = os.path.join(home, "summaries.json")
+            self._settled_tree(cache_dir)
+            summaries = user_cache_maintenance.DirectorySummaryCache(summary_path)
+            user_cache_maintenance.cache_usage(cache_dir, summaries)
+            summaries.save()
+
+            # An in-place rewrite leaves the directory mtime unchanged.
+            rewritten = os.path.join(cache_dir, "a", "one")
+            with open(rewritten, "r+", encoding="utf-8") as handle:
+                handle.write("34")
+            warm = user_cache_maintenance.cache_usage(
+                cache_dir,
+                user_cache_maintenance.DirectorySummaryCache(summary_path),
+            )
+            fresh = user_cache_maintenance.cache_usage(cache_dir)
+
+            self.assertEqual(warm, user_cache_maintenance.CacheUsage(9, None))
+            self.assertEqual(fresh.newest_mtime, os.stat(rewritten).st_mtime)
+
+    def test_directory_summaries_ignore_recent_and_mismatched_data(self):
+        with tempfile.TemporaryDirectory() as home:
+            summary_path = os.path.join(home, "summaries.json")
+            with open(summary_path, "w", encoding="utf-8") as handle:
+                handle.write('{"version": 0, "directories": {"/x": [1, 2, 3, [], 4]}}')
+            summaries = user_cache_maintenance.DirectorySummaryCache(summary_path)
+
+            self.assertIsNone(summaries.lookup("/x", 1))
+            summaries.store("/recent", time.time_ns(), 10, [])
+            summaries.save()
+            with open(summary_path, encoding="utf-8") as handle:
+                self.assertEqual(json.load(handle)["directories"], {})
+
+    def test_directory_summaries_rescan_in_weekly_rotation(self):
+        week = user_cache_maintenance._SECONDS_PER_WEEK
+        start = 3000 * week
+        directories = [f"/home/agent/.cache/d{index}" for index in range(40)]
+
+        scanned_at = dict.fromkeys(directories, start)
+        due_by_week: list[set[str]] = []
+        for offset in range(1, 5):
+            now = start + offset * week + 60
+            due = {
+                directory
+                for directory in directories
+                if user_cache_maintenance._summary_expired(directory, scanned_at[directory], now)
+            }
+            scanned_at.update(dict.fromkeys(due, now))
+            due_by_week.append(due)
+
+        self.assertEqual(sum(len(due) for due in due_by_week), len(directories))
+        self.assertTrue(all(len(due) < len(directories) for due in due_by_week))
+        self.assertTrue(
+            user_cache_maintenance._summary_expired(directories[0], start, start + 5 * week)
+        )
+
     def test_managed_path_must_remain_inside_home(self):
         with tempfile.TemporaryDirectory() as home, tempfile.TemporaryDirectory() as outside:
             context = self._context(home)
@@ -407,6 +519,204 @@ class TestUserCachePolicies(unittest.TestCase):
         self.assertFalse(any(".local/share/opencode" in path for path in managed_paths))
 
 
+_DiskUsage = namedtuple("_DiskUsage", "total used free")
+
+
+def _candidate(label, size_bytes, last_used, **kwargs):
+    return user_cache_maintenance.EvictionCandidate(
+        label, f"/home/agent/{label}", size_bytes, last_used, (label,), **kwargs
+    )
+
+
+class TestUserCacheEviction(unittest.TestCase):
+    DAY = 24 * 60 * 60
+
+    def test_plan_prefers_least_recently_used_then_largest(self):
+        old_small = _candidate("old-small", 100, 10 * self.DAY)
+        old_large = _candidate("old-large", 300, 10 * self.DAY + 60)
+        warm = _candidate("warm", 1000, 20 * self.DAY)
+
+        plan = user_cache_maintenance.plan_cache_eviction([warm, old_small, old_large], 250)
+
+        self.assertEqual(plan, [old_large])
+
+    def test_plan_drops_picks_made_redundant_by_larger_ones(self):
+        oldest = _candidate("oldest", 100, 1 * self.DAY)
+        older = _candidate("older", 500, 2 * self.DAY)
+        warm = _candidate("warm", 50, 3 * self.DAY)
+
+        plan = user_cache_maintenance.plan_cache_eviction([warm, older, oldest], 450)
+
+        self.assertEqual(plan, [older])
+
+    def test_plan_is_empty_when_target_is_unreachable(self):
+        candidates = [_candidate("a", 100, self.DAY), _candidate("b", 100, 2 * self.DAY)]
+
+        self.assertEqual(user_cache_maintenance.plan_cache_eviction(candidates, 1000), [])
+        self.assertEqual(user_cache_maintenance.plan_cache_eviction(candidates, 200), candidates)
+        self.assertEqual(user_cache_maintenance.plan_cache_eviction(candidates, 0), [])
+
+    @patch("common.service_tools.user_cache_maintenance.shutil.disk_usage")
+    def test_bytes_needed_matches_storage_warning_percent(self, mock_usage):
+        # 50 bytes are reserved for root, so free < total - used.
+        mock_usage.return_value = _DiskUsage(total=1000, used=780, free=170)
+        self.assertEqual(user_cache_maintenance.eviction_bytes_needed("/home/agent", 80), 0)
+
+        mock_usage.return_value = _DiskUsage(total=1000, used=850, free=100)
+        needed = user_cache_maintenance.eviction_bytes_needed("/home/agent", 80)
+
+        self.assertEqual(needed, 51)
+        self.assertGreaterEqual(usage_percent(850, 1000), 80)
+        self.assertLess(usage_percent(850 - needed, 1000), 80)
+        self.assertGreaterEqual(usage_percent(850 - needed + 1, 1000), 80)
+
+    @patch("common.service_tools.user_cache_maintenance.query_cache_path")
+    def test_candidates_skip_active_tools(self, mock_query):
+        module = "common.service_tools.user_cache_maintenance"
+        with tempfile.TemporaryDirectory() as home:
+            context = user_cache_maintenance.UserContext("agent", home, os.getuid())
+            npm_cache = os.path.join(home, ".npm")
+            opencode_cache = os.path.join(home, ".cache", "opencode")
+            codex_cache = os.path.join(home, ".codex", "cache")
+            for directory in (npm_cache, opencode_cache, codex_cache):
+                os.makedirs(directory)
+                with open(os.path.join(directory, "blob"), "wb") as handle:
+                    handle.write(b"x" * 10)
+            mock_query.side_effect = lambda _context, commands, _action, **_kwargs: (
+                (npm_cache, "npm", None) if commands[0][0] == "npm" else (None, None, None)
+            )
+            with patch(f"{module}.tool_is_active", side_effect=lambda names: "codex" in names):
+                candidates, failures = user_cache_maintenance.collect_eviction_candidates(context)
+
+        self.assertEqual(failures, [])
+        self.assertEqual([candidate.label for candidate in candidates], ["npm", "OpenCode"])
+        self.assertEqual(candidates[0].clean_command, ("npm", "cache", "clean", "--force"))
+        self.assertTrue(candidates[0].load_nvm)
+        self.assertEqual(candidates[1].clean_command, ())
+        self.assertEqual(candidates[1].size_bytes, 10)
+
+    @patch("common.service_tools.user_cache_maintenance.lower_io_priority")
+    @patch("common.service_tools.user_cache_maintenance.run_cleanup_command", return_value=None)
+    @patch("common.service_tools.user_cache_maintenance.eviction_bytes_needed", return_value=15)
+    def test_pressure_evicts_planned_idle_caches_at_low_priority(
+        self, _needed, mock_cleanup, mock_priority
+    ):
+        module = "common.service_tools.user_cache_maintenance"
+        with tempfile.TemporaryDirectory() as home:
+            context = user_cache_maintenance.UserContext("agent", home, os.getuid())
+            opencode_cache = os.path.join(home, ".cache", "opencode")
+            os.makedirs(opencode_cache)
+            candidates = [
+                _candidate("pip", 10, 1 * self.DAY, clean_command=("pip3", "cache", "purge")),
+                user_cache_maintenance.EvictionCandidate(
+                    "OpenCode", opencode_cache, 10, 2 * self.DAY, ("opencode",)
+                ),
+                _candidate("npm", 10, 3 * self.DAY, clean_command=("npm", "cache", "clean", "--force")),
+            ]
+            with patch(f"{module}.collect_eviction_candidates", return_value=(candidates, [])), \
+                    patch(f"{module}.tool_is_active", return_value=False):
+                failures = user_cache_maintenance.relieve_storage_pressure(context, dry_run=False)
+
+            self.assertFalse(os.path.exists(opencode_cache))
+
+        self.assertEqual(failures, [])
+        mock_priority.assert_called_once_with()
+        mock_cleanup.assert_called_once_with(
+            context,
+            ["pip3", "cache", "purge"],
+            "pip pressure eviction",
+            dry_run=False,
+            load_nvm=False,
+        )
+
+    @patch("common.service_tools.user_cache_maintenance.lower_io_priority")
+    @patch("common.service_tools.user_cache_maintenance.evict_cache")
+    @patch("common.service_tools.user_cache_maintenance.eviction_bytes_needed", return_value=15)
+    def test_pressure_defers_tools_started_after_inventory(self, _needed, mock_evict, _priority):
+        module = "common.service_tools.user_cache_maintenance"
+        context = user_cache_maintenance.UserContext("agent", "/home/agent", 1000)
+        candidates = [_candidate("pip", 10, self.DAY), _candidate("uv", 10, 2 * self.DAY)]
+        with patch(f"{module}.collect_eviction_candidates", return_value=(candidates, [])), \
+                patch(f"{module}.tool_is_active", side_effect=lambda names: names == ("pip",)):
+            user_cache_maintenance.relieve_storage_pressure(context, dry_run=False)
+
+        mock_evict.assert_called_once_with(context, candidates[1])
+
+    @patch("common.service_tools.user_cache_maintenance.lower_io_priority")
+    @patch("common.service_tools.user_cache_maintenance.evict_cache")
+    @patch("common.service_tools.user_cache_maintenance.eviction_bytes_needed", return_value=1000)
+    def test_pressure_keeps_caches_when_target_is_unreachable(self, _needed, mock_evict, mock_priority):
+        module = "common.service_tools.user_cache_maintenance"
+        context = user_cache_maintenance.UserContext("agent", "/home/agent", 1000)
+        candidates = [_candidate("pip", 10, self.DAY), _candidate("uv", 10, 2 * self.DAY)]
+        with patch(f"{module}.collect_eviction_candidates", return_value=(candidates, ["npm path query"])):
+            failures = user_cache_maintenance.relieve_storage_pressure(context, dry_run=False)
+
+        self.assertEqual(failures, ["npm path query"])
+        mock_evict.assert_not_called()
+        mock_priority.assert_not_called()
+
+    @patch("common.service_tools.user_cache_maintenance.collect_eviction_candidates")
+    @patch("common.service_tools.user_cache_maintenance.eviction_bytes_needed", return_value=0)
+    def test_no_pressure_skips_inventory(self, _needed, mock_collect):
+        context = user_cache_maintenance.UserContext("agent", "/home/agent", 1000)
+
+        self.assertEqual(user_cache_maintenance.relieve_storage_pressure(context, dry_run=False), [])
+        mock_collect.assert_not_called()
+
+    @patch("common.service_tools.user_cache_maintenance.evict_cache")
+    @patch("common.service_tools.user_cache_maintenance.eviction_bytes_needed", return_value=15)
+    def test_dry_run_plans_without_evicting(self, _needed, mock_evict):
+        module = "common.service_tools.user_cache_maintenance"
+        context = user_cache_maintenance.UserContext("agent", "/home/agent", 1000)
+        with patch(f"{module}.collect_eviction_candidates", return_value=([_candidate("pip", 20, 0)], [])):
+            user_cache_maintenance.relieve_storage_pressure(context, dry_run=True)
+
+        mock_evict.assert_not_called()
+
+    @patch("common.service_tools.user_cache_maintenance.subprocess.run")
+    @patch("common.service_tools.user_cache_maintenance.shutil.which", return_value="/usr/bin/ionice")
+    def test_lower_io_priority_uses_lowest_best_effort_level(self, _which, mock_run):
+        mock_run.return_value = subprocess.CompletedProcess([], 0, "", "")
+
+        user_cache_maintenance.lower_io_priority()
+
+        self.assertEqual(
+            mock_run.call_args.args[0],
+            ["/usr/bin/ionice", "-c", "2", "-n", "7", "-p", str(os.getpid())],
+        )
+
+
+def _go_failures(_context, *, cache_name, **_kwargs):
+    return ["go build failed"] if cache_name == "Go build cache" else []
+
+
+class TestUserCacheMaintenanceRun(unittest.TestCase):
+    def test_policies_share_summaries_and_report_failures_in_order(self):
+        context = user_cache_maintenance.UserContext("agent", "/home/agent", 1000)
+        module = "common.service_tools.user_cache_maintenance"
+        with tempfile.TemporaryDirectory() as home, \
+                patch(f"{module}.usage_summary_path", return_value=os.path.join(home, "s.json")), \
+                patch(f"{module}.cleanup_npm_cache", return_value=["npm failed"]) as npm, \
+                patch(f"{module}.cleanup_pip_cache", return_value=[]), \
+                patch(f"{module}.cleanup_uv_cache", return_value=["uv failed"]), \
+                patch(f"{module}.cleanup_go_cache", side_effect=_go_failures) as go, \
+                patch(f"{module}.cleanup_agent_caches", return_value=[]) as agents, \
+                patch(f"{module}.relieve_storage_pressure", return_value=["eviction failed"]) as evict:
+            failures = user_cache_maintenance.run_user_cache_maintenance(context, dry_run=True)
+
+            self.assertFalse(os.path.exists(os.path.join(home, "s.json")))
+            self.assertEqual(failures, ["npm failed", "uv failed", "go build failed", "eviction failed"])
+            self.assertNotIn("summaries", evict.call_args.kwargs)
+            self.assertNotIn("summaries", agents.call_args.kwargs)
+            self.assertEqual(go.call_count, 2)
+            self.assertIs(npm.call_args.kwargs["summaries"], go.call_args.kwargs["summaries"])
+            self.assertTrue(npm.call_args.kwargs["dry_run"])
+
+            user_cache_maintenance.run_user_cache_maintenance(context, dry_run=False)
+            self.assertTrue(os.path.exists(os.path.join(home, "s.json")))
+
+
 class TestUserCacheMain(unittest.TestCase):
     @patch("common.service_tools.user_cache_maintenance.run_user_cache_maintenance")
     @patch("common.service_tools.user_cache_maintenance.resolve_user_context")
@@ -108,10 +108,16 @@ class TestGenericUfwFiltering(unittest.TestCase):
     @patch("security.security_steps.is_container", return_value=False)
     @patch("security.security_steps.run")
     def test_generic_source_restricts_ssh_rdp_and_web_ports(self, mock_run, _container) -> None:
+        status = """Status: active
+[ 1] 22/tcp LIMIT IN Anywhere
+[ 2] 8080/tcp ALLOW IN Anywhere
+"""
+
         def run_side_effect(command: str, **_kwargs: object) -> SimpleNamespace:
-            if command.startswith("ufw status 2>"):
-                return SimpleNamespace(returncode=0, stdout="")
-            return SimpleNamespace(returncode=0, stdout="")
+            return SimpleNamespace(
+                returncode=0,
+                stdout=status if command == "ufw status numbered" else "",
+            )
 
         mock_run.side_effect = run_side_effect
         config = SetupConfig(
@@ -133,7 +139,7 @@ class TestGenericUfwFiltering(unittest.TestCase):
             "comment 'infra_tools SSH trusted source 192.168.1.0/24'"
         )
         self.assertIn(ssh_rule, commands)
-        self.assertLess(commands.index(ssh_rule), commands.index("ufw delete limit ssh"))
+        self.assertLess(commands.index(ssh_rule), commands.index("ufw --force delete 1"))
         self.assertIn(
             "ufw limit from 192.168.1.0/24 to any port 3389 proto tcp "
             "comment 'infra_tools RDP source 192.168.1.0/24'",
@@ -149,7 +155,8 @@ class TestGenericUfwFiltering(unittest.TestCase):
             "comment 'infra_tools web TCP 8080 source 192.168.1.0/24'"
         )
         self.assertIn(web_rule, commands)
-        self.assertLess(commands.index(web_rule), commands.index("ufw delete allow 8080/tcp"))
+        self.assertLess(commands.index(web_rule), commands.index("ufw --force delete 2"))
+        self.assertLess(commands.index("ufw --force delete 2"), commands.index("ufw --force delete 1"))
 
     @patch("security.security_steps.is_container", return_value=False)
     @patch("security.security_steps.run")
@@ -165,8 +172,6 @@ class TestGenericUfwFiltering(unittest.TestCase):
 """
 
         def run_side_effect(command: str, **_kwargs: object) -> SimpleNamespace:
-            if command.startswith("ufw status 2>"):
-                return SimpleNamespace(returncode=0, stdout="")
             return SimpleNamespace(
                 returncode=0,
                 stdout=status if command == "ufw status numbered" else "",
@@ -183,7 +188,7 @@ class TestGenericUfwFiltering(unittest.TestCase):
         )
 
         commands = [call.args[0] for call in mock_run.call_args_list]
-        self.assertIn(
+        self.assertNotIn(
             "ufw allow from 192.168.1.0/24 to any port 22 proto tcp "
             "comment 'infra_tools SSH trusted source 192.168.1.0/24'",
             commands,
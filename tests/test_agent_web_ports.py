@@ -178,8 +178,11 @@ class TestAgentWebPortFirewall(unittest.TestCase):
         _is_container,
     ) -> None:
         def run_side_effect(command: str, **_kwargs: object) -> SimpleNamespace:
-            if command.startswith("ufw status 2>"):
-                return SimpleNamespace(returncode=0, stdout="")
+            if command == "ufw status numbered":
+                return SimpleNamespace(
+                    returncode=0,
+                    stdout="Status: active\n[ 1] 80/tcp ALLOW IN Anywhere # infra_tools web TCP 80\n",
+                )
             return SimpleNamespace(returncode=0, stdout="")
 
         mock_run.side_effect = run_side_effect
@@ -195,7 +198,8 @@ class TestAgentWebPortFirewall(unittest.TestCase):
         configure_firewall(config)
 
         commands = [call.args[0] for call in mock_run.call_args_list]
-        for port in (80, 443, 3000, 8080, 8081):
+        self.assertNotIn("ufw allow 80/tcp comment 'infra_tools web TCP 80'", commands)
+        for port in (443, 3000, 8080, 8081):
             self.assertIn(
                 f"ufw allow {port}/tcp comment 'infra_tools web TCP {port}'",
                 commands,
@@ -218,8 +222,6 @@ class TestAgentWebPortFirewall(unittest.TestCase):
 """
 
         def run_side_effect(command: str, **_kwargs: object) -> SimpleNamespace:
-            if command.startswith("ufw status 2>"):
-                return SimpleNamespace(returncode=0, stdout="")
             if command == "ufw status numbered":
                 return SimpleNamespace(returncode=0, stdout=status_output)
             return SimpleNamespace(returncode=0, stdout="")
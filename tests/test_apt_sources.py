@@ -4,15 +4,22 @@ from __future__ import annotations
 
 import os
 import shutil
+import subprocess
 import tempfile
+import time
 import unittest
+from unittest.mock import MagicMock, patch
 
 from lib.apt_sources import (
     MANAGED_SOURCE_FILENAME,
+    AptMetadataTracker,
+    configure_apt_metadata_tracking,
     ensure_debian_package_sources,
     inspect_apt_sources,
     parse_apt_sources,
+    refresh_apt_metadata,
 )
+from lib.remote_utils import AptUsage
 
 
 class TestAptSources(unittest.TestCase):
@@ -261,3 +268,92 @@ class TestAptSources(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+class TestAptMetadataTracker(unittest.TestCase):
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temporary.cleanup)
+        root = self.temporary.name
+        self.apt_dir = os.path.join(root, "etc", "apt")
+        self.lists_dir = os.path.join(root, "lists")
+        os.makedirs(os.path.join(self.apt_dir, "sources.list.d"))
+        os.makedirs(self.lists_dir)
+        self.source = os.path.join(self.apt_dir, "sources.list.d", "debian.sources")
+        self._write_source("trixie")
+        self.state_file = os.path.join(root, "state", "apt-metadata.json")
+        self.usage = AptUsage()
+        usage_patch = patch("lib.apt_sources.apt_usage", return_value=self.usage)
+        usage_patch.start()
+        self.addCleanup(usage_patch.stop)
+        self.addCleanup(configure_apt_metadata_tracking, None)
+
+    def _write_source(self, suite: str) -> None:
+        with open(self.source, "w", encoding="utf-8") as file_obj:
+            file_obj.write(f"Types: deb\nURIs: https://deb.debian.org/debian\nSuites: {suite}\nComponents: main\n")
+
+    def _tracker(self, **kwargs) -> AptMetadataTracker:
+        return AptMetadataTracker(
+            self.state_file,
+            3600,
+            apt_dir=self.apt_dir,
+            lists_dir=self.lists_dir,
+            update_stamp=os.path.join(self.temporary.name, "missing-stamp"),
+            **kwargs,
+        )
+
+    def _age(self, path: str, seconds: float) -> None:
+        past = time.time() - seconds
+        os.utime(path, (past, past))
+
+    def test_skips_refresh_within_window_until_sources_change(self):
+        self._age(self.source, 7200)
+        self._age(self.lists_dir, 7200)
+        configure_apt_metadata_tracking(self._tracker())
+        mock_run = MagicMock(return_value=subprocess.CompletedProcess("apt-get update -qq", 0, "", ""))
+
+        refresh_apt_metadata(mock_run)
+        refresh_apt_metadata(mock_run)
+        self._write_source("trixie-updates")
+        refresh_apt_metadata(mock_run)
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(
+            self.usage.metadata_refreshes,
+            {"refreshed (stale)": 1, "skipped (fresh)": 1, "refreshed (sources changed)": 1},
+        )
+        self.assertIn("1 skipped (fresh)", self.usage.summary())
+
+    def test_recorded_refresh_survives_a_new_process(self):
+        self._age(self.source, 600)
+        self._age(self.lists_dir, 7200)
+        self._tracker().record_refresh()
+
+        self.assertIsNone(self._tracker().refresh_reason())
+        self.assertEqual(self._tracker(force=True).refresh_reason(), "requested")
+        self.assertEqual(self._tracker().refresh_reason(now=time.time() + 3600), "stale")
+
+    def test_recent_apt_lists_count_as_fresh_when_sources_are_older(self):
+        self._age(self.source, 7200)
+        self._age(self.lists_dir, 60)
+
+        self.assertIsNone(self._tracker().refresh_reason())
+        self._write_source("trixie")
+        self.assertEqual(self._tracker().refresh_reason(), "sources changed")
+
+    def test_failed_refresh_is_not_recorded(self):
+        configure_apt_metadata_tracking(self._tracker())
+        mock_run = MagicMock(return_value=subprocess.CompletedProcess("apt-get update -qq", 100, "", "err"))
+
+        self.assertEqual(refresh_apt_metadata(mock_run).returncode, 100)
+        self.assertFalse(os.path.exists(self.state_file))
+        self.assertEqual(self.usage.metadata_refreshes, {})
+
+    def test_untracked_refresh_always_runs(self):
+        mock_run = MagicMock(return_value=subprocess.CompletedProcess("apt-get update -qq", 0, "", ""))
+
+        refresh_apt_metadata(mock_run)
+        refresh_apt_metadata(mock_run)
+
+        self.assertEqual(mock_run.call_count, 2)
+        mock_run.assert_called_with("apt-get update -qq", check=False)
@@ -117,6 +117,11 @@ class TestHostedFlagParsing(unittest.TestCase):
         ])
         self.assertEqual(args.vm_image_storage, "fast-files")
 
+    def test_vm_template_opt_out_flag(self):
+        args = self.parser.parse_args(["10.0.0.50", "--no-vm-template"])
+        self.assertFalse(args.vm_template)
+        self.assertFalse(hasattr(self.parser.parse_args(["10.0.0.50"]), "vm_template"))
+
     def test_full_hosted_command(self):
         args = self.parser.parse_args([
             "10.0.0.50", "--provision-on", "10.0.0.1",
@@ -815,6 +815,36 @@ class TestExecutorStructuredLogging(unittest.TestCase):
             output,
         )
 
+    @patch("web.service_tools.cicd_executor.cleanup_stale_workspaces")
+    @patch("web.service_tools.cicd_executor.cleanup_old_build_logs")
+    @patch("web.service_tools.cicd_executor.load_config", return_value={})
+    @patch("web.service_tools.cicd_executor.process_job", return_value=True)
+    @patch(
+        "web.service_tools.cicd_executor.enable_notification_outbox",
+        side_effect=PermissionError("read-only file system"),
+    )
+    def test_main_delivers_directly_when_outbox_is_unwritable(
+        self, mock_outbox, mock_process, _mock_config, _mock_logs, _mock_workspaces
+    ):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            jobs_dir = os.path.join(tmpdir, "jobs")
+            with patch("web.service_tools.cicd_executor.STATE_DIR", tmpdir), \
+                 patch("web.service_tools.cicd_executor.JOBS_DIR", jobs_dir), \
+                 patch("web.service_tools.cicd_executor.WORKSPACES_DIR", os.path.join(tmpdir, "ws")), \
+                 patch("web.service_tools.cicd_executor.LOGS_DIR", os.path.join(tmpdir, "logs")), \
+                 patch("web.service_tools.cicd_executor.LOCK_FILE", os.path.join(tmpdir, "executor.lock")):
+                os.makedirs(jobs_dir)
+                with open(os.path.join(jobs_dir, "job.json"), "w") as f:
+                    f.write("{}")
+                with self.assertLogs(cicd_executor.logger, level="WARNING") as logs:
+                    result = cicd_executor.main()
+
+        self.assertEqual(result, 0)
+        mock_process.assert_called_once()
+        self.assertEqual(mock_outbox.call_args.args[0], cicd_executor.NOTIFICATION_OUTBOX_DIR)
+        self.assertTrue(cicd_executor.NOTIFICATION_OUTBOX_DIR.startswith("/var/lib/infra_tools/cicd/"))
+        self.assertIn("Notification outbox unavailable; delivering directly", "\n".join(logs.output))
+
 
 class TestCleanupOldBuildLogs(unittest.TestCase):
     """Test build log cleanup."""
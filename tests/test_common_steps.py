@@ -114,34 +114,30 @@ class TestDevelopmentToolPackages(unittest.TestCase):
         )
         self.assertTrue(set(CLI_TOOL_PACKAGES).isdisjoint(DATA_ANALYSIS_PACKAGES))
 
-    @patch("common.common_steps.run")
-    @patch("common.common_steps.is_package_installed")
+    @patch("lib.remote_utils.run")
+    @patch("lib.remote_utils.installed_packages")
     def test_cli_installer_requests_every_missing_baseline_package(
-        self, mock_is_installed, mock_run
+        self, mock_installed, mock_run
     ):
-        mock_is_installed.side_effect = (
-            [False] * len(CLI_TOOL_PACKAGES) + [True] * len(CLI_TOOL_PACKAGES)
-        )
+        mock_installed.side_effect = [set(), set(CLI_TOOL_PACKAGES)]
         mock_run.return_value = MagicMock(returncode=0)
 
         install_cli_tools(
             SetupConfig(host="testhost", username="agent", system_type="agent_vm")
         )
 
+        mock_run.assert_called_once()
         command = mock_run.call_args.args[0]
         for package in CLI_TOOL_PACKAGES:
             with self.subTest(package=package):
                 self.assertIn(f" {package}", command)
 
-    @patch("common.common_steps.run")
-    @patch("common.common_steps.is_package_installed")
+    @patch("lib.remote_utils.run")
+    @patch("lib.remote_utils.installed_packages")
     def test_data_analysis_installer_requests_only_opt_in_bundle(
-        self, mock_is_installed, mock_run
+        self, mock_installed, mock_run
     ):
-        mock_is_installed.side_effect = (
-            [False] * len(DATA_ANALYSIS_PACKAGES)
-            + [True] * len(DATA_ANALYSIS_PACKAGES)
-        )
+        mock_installed.side_effect = [set(), set(DATA_ANALYSIS_PACKAGES)]
         mock_run.return_value = MagicMock(returncode=0)
 
         install_data_analysis_tools(
@@ -161,14 +157,12 @@ class TestDevelopmentToolPackages(unittest.TestCase):
             with self.subTest(default_package=package):
                 self.assertNotIn(f" {package}", command)
 
-    @patch("common.common_steps.run")
-    @patch("common.common_steps.is_package_installed")
+    @patch("lib.remote_utils.run")
+    @patch("lib.remote_utils.installed_packages")
     def test_cli_installer_fails_when_a_package_remains_missing(
-        self, mock_is_installed, mock_run
+        self, mock_installed, mock_run
     ):
-        mock_is_installed.side_effect = (
-            [False] * len(CLI_TOOL_PACKAGES) + [False] * len(CLI_TOOL_PACKAGES)
-        )
+        mock_installed.return_value = set()
         mock_run.return_value = MagicMock(returncode=100)
 
         with self.assertRaisesRegex(RuntimeError, "CLI tool installation failed"):
@@ -7,14 +7,55 @@ import contextlib
 import io
 import json
 import os
+import stat
 import sys
+import tempfile
+import textwrap
 import unittest
 from unittest.mock import patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 import infra_tools
-from lib.github_maintenance import _release_tags_to_delete, discover_github_repos, run_maintenance_command
+from lib.github_maintenance import (
+    GitHubRepo,
+    SummaryCache,
+    _fetch_github_releases,
+    _git_remote_url,
+    _release_tags_to_delete,
+    discover_github_repos,
+    run_maintenance_command,
+    summarize_github_repos,
+)
+
+_STUB_GH = textwrap.dedent(
+    """\
+    #!{python}
+    import json, os, sys
+
+    args = sys.argv[1:]
+    with open(os.environ["STUB_GH_LOG"], "a", encoding="utf-8") as log:
+        log.write(json.dumps(args) + "\\n")
+    with open(os.environ["STUB_GH_RESPONSES"], encoding="utf-8") as handle:
+        responses = json.load(handle)
+    endpoint = args[-1].split("?")[0]
+    repo = endpoint.split("/")[3]
+    etag = '"' + repo + '-v1"'
+    body = responses.get(endpoint.rsplit("/", 1)[-1], [])
+    if "-H" in args and args[args.index("-H") + 1] == "If-None-Match: " + etag:
+        print("HTTP/2.0 304 Not Modified\\n")
+        sys.exit(0)
+    if "--include" in args:
+        print("HTTP/2.0 200 OK\\nEtag: " + etag + "\\n")
+    print(json.dumps(body))
+    """
+)
+
+
+def _write_git_config(repo_root: str, content: str) -> None:
+    os.makedirs(os.path.join(repo_root, ".git"))
+    with open(os.path.join(repo_root, ".git", "config"), "w", encoding="utf-8") as handle:
+        handle.write(content)
 
 
 class TestMaintenanceCli(unittest.TestCase):
@@ -68,5 +109,140 @@ class TestMaintenanceCli(unittest.TestCase):
         self.assertEqual([repo.full_name for repo in repos], ["bluehexagons/alpha", "bluehexagons/beta"])
 
 
+
+class TestGitConfigRemotes(unittest.TestCase):
+    def test_reads_origin_url_from_config(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            _write_git_config(
+                root,
+                '[core]\n\tbare = false\n'
+                '[remote "upstream"]\n\turl = git@github.com:other/fork.git\n'
+                '[remote "origin"]\n\turl = "git@github.com:bluehexagons/alpha.git" # main\n'
+                '\tfetch = +refs/heads/*:refs/remotes/origin/*\n',
+            )
+            self.assertEqual(_git_remote_url(root), "git@github.com:bluehexagons/alpha.git")
+
+    def test_follows_worktree_gitdir_pointer(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            main = os.path.join(root, "main")
+            _write_git_config(main, '[remote "origin"]\n\turl = https://github.com/o/r.git\n')
+            worktree_git_dir = os.path.join(main, ".git", "worktrees", "wt")
+            os.makedirs(worktree_git_dir)
+            with open(os.path.join(worktree_git_dir, "commondir"), "w", encoding="utf-8") as handle:
+                handle.write("../..\n")
+            worktree = os.path.join(root, "wt")
+            os.makedirs(worktree)
+            with open(os.path.join(worktree, ".git"), "w", encoding="utf-8") as handle:
+                handle.write(f"gitdir: {worktree_git_dir}\n")
+
+            self.assertEqual(_git_remote_url(worktree), "https://github.com/o/r.git")
+
+    @patch("lib.github_maintenance.subprocess.run")
+    def test_discovery_does_not_spawn_git(self, mock_run) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            _write_git_config(
+                os.path.join(root, "alpha"),
+                '[remote "origin"]\n\turl = https://github.com/bluehexagons/alpha.git\n',
+            )
+            repos = discover_github_repos([root])
+        self.assertEqual([repo.full_name for repo in repos], ["bluehexagons/alpha"])
+        mock_run.assert_not_called()
+
+
+class TestSummaryCacheWithStubGh(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        root = self._tmp.name
+        bin_dir = os.path.join(root, "bin")
+        os.makedirs(bin_dir)
+        gh_path = os.path.join(bin_dir, "gh")
+        with open(gh_path, "w", encoding="utf-8") as handle:
+            handle.write(_STUB_GH.format(python=sys.executable))
+        os.chmod(gh_path, os.stat(gh_path).st_mode | stat.S_IXUSR)
+        self.log_path = os.path.join(root, "gh.log")
+        responses_path = os.path.join(root, "responses.json")
+        with open(responses_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "releases": [{"tag_name": "v1", "assets": [{"size": 1024}]}],
+                    "artifacts": {"artifacts": [{"id": 1, "expired": True, "size_in_bytes": 10}]},
+                    "caches": {"actions_caches": []},
+                },
+                handle,
+            )
+        self.cache_path = os.path.join(root, "cache.json")
+        env = {
+            "PATH": bin_dir + os.pathsep + os.environ.get("PATH", ""),
+            "STUB_GH_LOG": self.log_path,
+            "STUB_GH_RESPONSES": responses_path,
+        }
+        self._env = patch.dict(os.environ, env)
+        self._env.start()
+        self.repos = [
+            GitHubRepo(root=f"/src/{name}", remote_url="", full_name=f"bluehexagons/{name}")
+            for name in ("alpha", "beta", "gamma")
+        ]
+
+    def tearDown(self) -> None:
+        self._env.stop()
+        self._tmp.cleanup()
+
+    def _calls(self) -> list[list[str]]:
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path, encoding="utf-8") as handle:
+            calls = [json.loads(line) for line in handle]
+        os.remove(self.log_path)
+        return calls
+
+    def test_unchanged_repos_are_served_from_cache(self) -> None:
+        cache = SummaryCache(self.cache_path)
+        first = summarize_github_repos(self.repos, max_workers=3, cache=cache)
+        cache.save()
+        self.assertEqual([summary.repo.full_name for summary in first], [r.full_name for r in self.repos])
+        self.assertEqual(first[0].release_size, 1024)
+        self.assertEqual(first[0].expired_artifact_count, 1)
+        self.assertEqual(len(self._calls()), 9)
+
+        second = summarize_github_repos(self.repos, max_workers=3, cache=SummaryCache(self.cache_path))
+
+        calls = self._calls()
+        self.assertEqual(len(calls), 9)
+        self.assertTrue(all("-H" in call for call in calls))
+        self.assertEqual([summary.to_dict() for summary in second], [summary.to_dict() for summary in first])
+
+    def test_change_past_first_page_is_not_hidden(self) -> None:
+        cache = SummaryCache(self.cache_path)
+        endpoint = "/repos/bluehexagons/alpha/releases"
+        cache.put("bluehexagons/alpha", endpoint, [
+            {"etag": '"p1"', "next": True, "items": [{"tag_name": "v2"}]},
+            {"etag": '"p2"', "next": False, "items": [{"tag_name": "v1"}]},
+        ])
+        responses = [
+            (304, '"p1"', False, []),
+            (200, '"p2b"', False, [[{"tag_name": "v0"}]]),
+        ]
+        with patch(
+            "lib.github_maintenance._gh_api_conditional", side_effect=responses
+        ) as mock_fetch:
+            releases = _fetch_github_releases("bluehexagons/alpha", cache)
+
+        self.assertEqual([release["tag_name"] for release in releases], ["v2", "v0"])
+        self.assertEqual(
+            [call.args for call in mock_fetch.call_args_list],
+            [
+                (f"{endpoint}?per_page=100&page=1", '"p1"'),
+                (f"{endpoint}?per_page=100&page=2", '"p2"'),
+            ],
+        )
+        self.assertEqual(cache.get("bluehexagons/alpha", endpoint)[1]["etag"], '"p2b"')
+
+    def test_without_cache_uses_paginated_requests(self) -> None:
+        summaries = summarize_github_repos(self.repos[:1], max_workers=1)
+
+        self.assertEqual(summaries[0].release_size, 1024)
+        self.assertTrue(all("--paginate" in call for call in self._calls()))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -27,6 +27,16 @@ class TestGodotWebHost(unittest.TestCase):
         self.assertIn("autoindex on", content)
         self.assertIn("gzip_static on", content)
         self.assertIn("application/wasm", content)
+        self.assertNotIn("brotli_static", content)
+
+    def test_nginx_host_serves_brotli_variants_when_module_is_available(self) -> None:
+        content = godot_web_steps.render_nginx_config(
+            "/certs/server.crt",
+            "/certs/server.key",
+            brotli_static=True,
+        )
+
+        self.assertIn("gzip_static on;\n    brotli_static on;", content)
 
     def test_certificate_identities_include_remote_and_loopback_access(self) -> None:
         self.assertEqual(
@@ -87,6 +97,7 @@ class TestGodotWebHost(unittest.TestCase):
                     ca_download,
                 ),
                 patch.object(godot_web_steps, "_ensure_nginx"),
+                patch.object(godot_web_steps, "_ensure_brotli_support", return_value=True),
                 patch.object(
                     godot_web_steps,
                     "_certificate_for_identities",
@@ -125,6 +136,7 @@ class TestGodotWebHost(unittest.TestCase):
             )
             chromium_trust.assert_called_once_with(["agent"])
             nginx.assert_called_once()
+            self.assertIn("brotli_static on", nginx.call_args.args[0])
 
     def test_web_policy_exposes_the_user_readable_ca_copy(self) -> None:
         with tempfile.TemporaryDirectory() as temporary_dir:
@@ -321,6 +333,7 @@ class TestGodotWebPublisher(unittest.TestCase):
                 patch.object(godot_web_publish, "GAMES_ROOT", games_root),
                 patch.object(godot_web_publish, "BASE_URL_FILE", url_file),
                 patch.object(godot_web_publish, "_current_account", return_value=account),
+                patch.object(godot_web_publish, "_available_codecs", return_value=("gzip",)),
                 patch.object(
                     godot_web_publish.subprocess,
                     "run",
@@ -328,6 +341,8 @@ class TestGodotWebPublisher(unittest.TestCase):
                 ) as run_export,
             ):
                 result = godot_web_publish.main(["demo", project_dir])
+                with open(os.path.join(user_root, "demo", ".infra-tools.json"), encoding="utf-8") as file_obj:
+                    metadata = json.load(file_obj)
 
             self.assertEqual(result, 0)
             published_file = os.path.join(user_root, "demo", "index.html")
@@ -337,6 +352,9 @@ class TestGodotWebPublisher(unittest.TestCase):
             self.assertTrue(os.path.isfile(os.path.join(user_root, "demo", "demo.wasm.gz")))
             self.assertTrue(os.path.isfile(os.path.join(user_root, "demo", ".infra-tools.json")))
             self.assertTrue(os.path.isfile(os.path.join(user_root, "index.html")))
+            self.assertEqual(metadata["precompressed"], ["demo.pck.gz", "demo.wasm.gz"])
+            self.assertEqual(metadata["compression"]["demo.wasm"]["size"], 4096)
+            self.assertFalse(metadata["compression"]["demo.wasm"]["variants"]["gzip"]["reused"])
             command = run_export.call_args.args[0]
             self.assertEqual(command[:2], ["godot", "--headless"])
             self.assertIn("--export-release", command)
@@ -383,5 +401,100 @@ class TestGodotWebPublisher(unittest.TestCase):
             self.assertTrue(os.path.isfile(os.path.join(user_root, "my-great-game", "index.html")))
 
 
+def _write_brotli_stub(source_path: str, destination_path: str) -> None:
+    with open(source_path, "rb") as source, open(destination_path, "wb") as destination:
+        destination.write(source.read()[:16])
+
+
+class TestGodotWebPrecompression(unittest.TestCase):
+    def _export(self, root: str, name: str, wasm: bytes) -> str:
+        export_dir = os.path.join(root, name)
+        os.makedirs(os.path.join(export_dir, "assets"))
+        with open(os.path.join(export_dir, "demo.wasm"), "wb") as file_obj:
+            file_obj.write(wasm)
+        with open(os.path.join(export_dir, "assets", "demo.pck"), "wb") as file_obj:
+            file_obj.write(os.urandom(4096))
+        with open(os.path.join(export_dir, "index.html"), "w", encoding="utf-8") as file_obj:
+            file_obj.write("game")
+        return export_dir
+
+    def test_emits_gzip_and_brotli_and_keeps_incompressible_originals(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_dir:
+            export_dir = self._export(temporary_dir, "export", b"wasm" * 4096)
+            with (
+                patch.object(godot_web_publish, "_available_codecs", return_value=("gzip", "br")),
+                patch.object(godot_web_publish, "_write_brotli", side_effect=_write_brotli_stub),
+            ):
+                report = godot_web_publish._precompress_export(export_dir)
+
+            self.assertEqual(
+                godot_web_publish._precompressed_files(report),
+                ["assets/demo.pck.br", "demo.wasm.br", "demo.wasm.gz"],
+            )
+            self.assertTrue(os.path.isfile(os.path.join(export_dir, "demo.wasm.br")))
+            self.assertFalse(os.path.exists(os.path.join(export_dir, "assets", "demo.pck.gz")))
+            self.assertFalse(report["assets/demo.pck"]["variants"]["gzip"]["kept"])
+            self.assertLess(report["demo.wasm"]["variants"]["gzip"]["ratio"], 0.05)
+            self.assertNotIn("index.html", report)
+
+    def test_unchanged_files_reuse_previous_variants(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary_dir:
+            previous_dir = self._export(temporary_dir, "previous", b"wasm" * 4096)
+            with patch.object(godot_web_publish, "_available_codecs", return_value=("gzip",)):
+                previous_report = godot_web_publish._precompress_export(previous_dir)
+            with open(os.path.join(previous_dir, ".infra-tools.json"), "w", encoding="utf-8") as file_obj:
+                json.dump({"compression": previous_report}, file_obj)
+            export_dir = self._export(temporary_dir, "export", b"wasm" * 4096)
+
+            with (
+                patch.object(godot_web_publish, "_available_codecs", return_value=("gzip",)),
+                patch.object(
+                    godot_web_publish,
+                    "_compress_variant",
+                    wraps=godot_web_publish._compress_variant,
+                ) as compress,
+            ):
+                report = godot_web_publish._precompress_export(export_dir, previous_dir)
+
+            # Only the randomized pack changed, so only it is compressed again.
+            compress.assert_called_once()
+            self.assertEqual(compress.call_args.args[0], os.path.join(export_dir, "assets", "demo.pck"))
+            self.assertTrue(report["demo.wasm"]["variants"]["gzip"]["reused"])
+            with open(os.path.join(export_dir, "demo.wasm.gz"), "rb") as reused, open(
+                os.path.join(previous_dir, "demo.wasm.gz"),
+                "rb",
+            ) as original:
+                self.assertEqual(reused.read(), original.read())
+
+    def test_report_lists_ratio_time_and_reuse(self) -> None:
+        lines = godot_web_publish._format_compression_report(
+            {
+                "demo.wasm": {
+                    "sha256": "0" * 64,
+                    "size": 100,
+                    "variants": {
+                        "br": {"kept": True, "ratio": 0.21, "reused": False, "seconds": 2.04, "size": 21},
+                        "gzip": {"kept": True, "ratio": 0.3, "reused": True, "seconds": 0.5, "size": 30},
+                    },
+                },
+                "demo.pck": {
+                    "sha256": "1" * 64,
+                    "size": 100,
+                    "variants": {
+                        "gzip": {"kept": False, "ratio": 0.99, "reused": False, "seconds": 0.01, "size": 99},
+                    },
+                },
+            }
+        )
+
+        self.assertEqual(
+            lines,
+            [
+                "  demo.pck: gzip 99% in 0.0s, original kept",
+                "  demo.wasm: br 21% in 2.0s; gzip 30% (unchanged)",
+            ],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -104,6 +104,20 @@ class TestInfraWebForwarding(unittest.TestCase):
         self.assertTrue(infra_web._ufw_rule_matches_port(line, 18444))
 
 
+    def test_failed_ufw_status_is_an_error_not_an_inactive_firewall(self) -> None:
+        failed = SimpleNamespace(returncode=1, stdout="", stderr="ERROR: You need to be root\n")
+        route = {"listen": 8444, "name": "preview"}
+        with patch.object(infra_web.shutil, "which", return_value="/usr/sbin/ufw"), patch.object(
+            infra_web.subprocess, "run", return_value=failed
+        ) as mock_run:
+            with self.assertRaisesRegex(RuntimeError, "Could not inspect UFW: ERROR: You need to be root"):
+                infra_web._reconcile_firewall([route], _policy())
+            with self.assertRaisesRegex(RuntimeError, "Could not inspect UFW"):
+                infra_web._reconcile_firewall([], _policy())
+
+        self.assertEqual(mock_run.call_args.args[0], ["ufw", "status", "numbered"])
+
+
 class TestInfraWebGames(unittest.TestCase):
     def test_remove_deletes_only_confirmed_owned_game(self) -> None:
         with tempfile.TemporaryDirectory() as temporary_dir:
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import io
 import os
 import sys
+import tempfile
 import unittest
 from subprocess import CompletedProcess
 from unittest.mock import patch
@@ -13,6 +16,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 import infra_tools
 from lib.local_cli import run_local_command
+from lib.operation_log import OperationLoggerManager
 
 
 class TestLocalCommandParser(unittest.TestCase):
@@ -114,5 +118,51 @@ class TestLocalCommandExecution(unittest.TestCase):
         print_output.assert_called_once_with("eth0 UP 192.168.1.2/24")
 
 
+
+class TestLocalOperationsCommand(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parser, _setup_parser, _patch_parser = infra_tools.create_infra_tools_parser()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log_dir = self._tmp.name
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _run(self, *argv: str) -> tuple[int, str]:
+        args = self.parser.parse_args(["local", "operations", "--log-dir", self.log_dir, *argv])
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):
+            exit_code = run_local_command(args)
+        return exit_code, buf.getvalue()
+
+    def test_lists_failed_operations_with_metric(self):
+        manager = OperationLoggerManager(self.log_dir)
+        scrub = manager.create_logger("scrub", directory="/mnt/backup")
+        scrub.log_metric("files_verified", 12, "count")
+        scrub.complete("failed")
+        manager.create_logger("sync").complete("completed")
+
+        exit_code, output = self._run("--status", "failed", "--since", "30d", "--metric", "files_verified")
+
+        self.assertEqual(exit_code, 0)
+        self.assertIn(scrub.operation_id, output)
+        self.assertIn("12 count", output)
+        self.assertNotIn(" sync ", output)
+
+    def test_missing_index_requires_rebuild(self):
+        exit_code, output = self._run()
+        self.assertEqual(exit_code, 1)
+        self.assertIn("--rebuild", output)
+
+        exit_code, output = self._run("--rebuild")
+        self.assertEqual(exit_code, 0)
+        self.assertIn("Rebuilt operation index from 0 operation(s)", output)
+
+    def test_rejects_invalid_since(self):
+        exit_code, output = self._run("--since", "last month")
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Invalid --since value", output)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -11,7 +11,7 @@ from unittest.mock import patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from lib.maintenance_systemd import configure_maintenance_timer
+from lib.maintenance_systemd import configure_maintenance_daemon, configure_maintenance_timer
 
 
 class TestConfigureMaintenanceTimer(unittest.TestCase):
@@ -107,6 +107,18 @@ class TestConfigureMaintenanceTimer(unittest.TestCase):
                 check_name="Test runtime",
             )
 
+    def test_rejects_injected_script_arguments(self):
+        with self.assertRaisesRegex(ValueError, "control characters"):
+            configure_maintenance_timer(
+                service_name="auto-update-test",
+                service_desc="Auto-update test runtime",
+                timer_desc="Auto-update test runtime weekly",
+                script_path="/opt/infra_tools/test/update.py",
+                script_args=("--check\nExecStartPost=/bin/false",),
+                schedule="weekly",
+                check_name="Test runtime",
+            )
+
     def test_supports_boot_and_calendar_triggers_without_network_dependency(self):
         with tempfile.TemporaryDirectory() as unit_dir, patch(
             "lib.maintenance_systemd.SYSTEMD_DIR", unit_dir
@@ -121,6 +133,7 @@ class TestConfigureMaintenanceTimer(unittest.TestCase):
                 on_boot_sec="30min",
                 check_name="Restart",
                 network_online=False,
+                script_args=("--check-only",),
             )
             with open(os.path.join(unit_dir, "restart-check.service"), encoding="utf-8") as handle:
                 service_content = handle.read()
@@ -128,10 +141,48 @@ class TestConfigureMaintenanceTimer(unittest.TestCase):
                 timer_content = handle.read()
 
         self.assertTrue(configured)
+        self.assertIn("ExecStart=/usr/bin/python3 /opt/infra_tools/check.py --check-only\n", service_content)
         self.assertNotIn("network-online.target", service_content)
         self.assertIn("OnBootSec=30min", timer_content)
         self.assertIn("OnCalendar=daily", timer_content)
 
 
+
+class TestConfigureMaintenanceDaemon(unittest.TestCase):
+    def test_writes_restarting_service_and_verifies_it(self):
+        with tempfile.TemporaryDirectory() as unit_dir, patch(
+            "lib.maintenance_systemd.SYSTEMD_DIR", unit_dir
+        ), patch("lib.maintenance_systemd.run") as mock_run:
+            mock_run.return_value = SimpleNamespace(returncode=0)
+
+            configured = configure_maintenance_daemon(
+                service_name="monitor-test-daemon",
+                service_desc="Monitor test daemon",
+                script_path="/opt/infra_tools/test/monitor.py",
+                script_args=("--daemon",),
+                check_name="Monitor test",
+            )
+
+            self.assertTrue(configured)
+            self.assertEqual(os.listdir(unit_dir), ["monitor-test-daemon.service"])
+            with open(os.path.join(unit_dir, "monitor-test-daemon.service"), encoding="utf-8") as handle:
+                service_content = handle.read()
+
+        self.assertIn("Type=simple", service_content)
+        self.assertIn("ExecStart=/usr/bin/python3 /opt/infra_tools/test/monitor.py --daemon", service_content)
+        self.assertIn("Restart=on-failure", service_content)
+        self.assertIn("WantedBy=multi-user.target", service_content)
+        self.assertEqual(
+            [call.args[0] for call in mock_run.call_args_list],
+            [
+                "systemctl daemon-reload",
+                "systemctl enable monitor-test-daemon.service",
+                "systemctl restart monitor-test-daemon.service",
+                "systemctl is-enabled monitor-test-daemon.service",
+                "systemctl is-active monitor-test-daemon.service",
+            ],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
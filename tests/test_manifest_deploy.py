@@ -21,8 +21,9 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from lib.deployment import DeploymentOrchestrator
 from lib.nginx_config import generate_merged_nginx_config
 from lib.operation_state import OperationStateError, OperationStateStore
+from lib.port_registry import PortRegistry
 from lib.project_manifest import Component, Manifest, parse_manifest
-from lib.systemd_service import generate_managed_service
+from lib.systemd_service import generate_managed_service, generate_managed_socket
 
 
 def _static_component(**overrides: object) -> Component:
@@ -92,6 +93,19 @@ class TestGenerateManagedService(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "privilege-control prefixes"):
             generate_managed_service("app-api", "+/bin/sh", "/srv")
 
+    def test_notify_readiness_waits_for_ready(self):
+        unit = generate_managed_service("app-api", "/bin/app", "/srv", readiness="notify")
+        self.assertIn("Type=notify", unit)
+        self.assertIn("NotifyAccess=main", unit)
+
+    def test_socket_readiness_requires_socket_unit(self):
+        unit = generate_managed_service("app-api", "/bin/app", "/srv", readiness="socket")
+        self.assertIn("Requires=app-api.socket", unit)
+        self.assertIn("Type=simple", unit)
+        socket_unit = generate_managed_socket("app-api", 8090)
+        self.assertIn("ListenStream=127.0.0.1:8090", socket_unit)
+        self.assertIn("WantedBy=sockets.target", socket_unit)
+
     def test_rejects_multiline_unit_values(self):
         with self.assertRaisesRegex(ValueError, "control characters"):
             generate_managed_service(
@@ -200,24 +214,51 @@ class TestServiceContext(unittest.TestCase):
         with tempfile.TemporaryDirectory() as base_dir:
             orchestrator = DeploymentOrchestrator(base_dir=base_dir)
             dest_path = os.path.join(base_dir, "shop")
-            with patch.object(orchestrator, '_get_used_ports', return_value=set()), \
-                 patch.object(orchestrator, '_find_free_port', return_value=8123) as find_port:
+            registry = PortRegistry(
+                os.path.join(base_dir, "ports.json"),
+                unit_dir=os.path.join(base_dir, "units"),
+            )
+            with patch.object(orchestrator, '_port_registry', return_value=registry), \
+                 patch('lib.port_registry._port_is_bindable', return_value=True) as probe:
                 resolved = orchestrator._resolve_manifest_ports(manifest, dest_path)
-                orchestrator._save_manifest_ports(dest_path, resolved)
                 repeated = orchestrator._resolve_manifest_ports(manifest, dest_path)
 
-        self.assertEqual(resolved.components[0].port, 8123)
-        self.assertEqual(repeated.components[0].port, 8123)
-        find_port.assert_called_once()
+        self.assertEqual(resolved.components[0].port, 8000)
+        self.assertEqual(repeated.components[0].port, 8000)
+        probe.assert_called_once_with(8000)
+
+    def test_legacy_port_assignment_is_migrated(self):
+        manifest = Manifest(version=1, components=[_service_component(port="auto")])
+        with tempfile.TemporaryDirectory() as base_dir:
+            orchestrator = DeploymentOrchestrator(base_dir=base_dir)
+            dest_path = os.path.join(base_dir, "shop")
+            legacy_path = orchestrator._legacy_port_state_path(dest_path)
+            os.makedirs(os.path.dirname(legacy_path))
+            with open(legacy_path, "w", encoding="utf-8") as handle:
+                json.dump({"api": 8123}, handle)
+            registry = PortRegistry(
+                os.path.join(base_dir, "ports.json"),
+                unit_dir=os.path.join(base_dir, "units"),
+            )
+            with patch.object(orchestrator, '_port_registry', return_value=registry):
+                resolved = orchestrator._resolve_manifest_ports(manifest, dest_path)
+
+            self.assertEqual(resolved.components[0].port, 8123)
+            self.assertEqual(registry.assignments(), {"app-shop-api": 8123})
 
     def test_duplicate_fixed_ports_are_rejected(self):
         manifest = Manifest(version=1, components=[
             _service_component(name="one", port=8123),
             _service_component(name="two", port=8123),
         ])
-        with patch.object(self.orch, '_get_used_ports', return_value=set()):
-            with self.assertRaisesRegex(RuntimeError, "already assigned"):
-                self.orch._resolve_manifest_ports(manifest, "/var/www/shop")
+        with tempfile.TemporaryDirectory() as base_dir:
+            registry = PortRegistry(
+                os.path.join(base_dir, "ports.json"),
+                unit_dir=os.path.join(base_dir, "units"),
+            )
+            with patch.object(self.orch, '_port_registry', return_value=registry):
+                with self.assertRaisesRegex(RuntimeError, "'two' cannot use port 8123"):
+                    self.orch._resolve_manifest_ports(manifest, "/var/www/shop")
 
     def test_sqlite_backup_uses_online_backup_and_retention(self):
         component = _service_component(
@@ -289,6 +330,86 @@ class TestServiceContext(unittest.TestCase):
         mock_service.assert_not_called()
 
 
+class TestServiceReadiness(unittest.TestCase):
+    def setUp(self):
+        self.orch = DeploymentOrchestrator(base_dir="/var/www")
+
+    @patch('lib.deployment.time.sleep')
+    @patch('urllib.request.urlopen')
+    def test_health_polling_backs_off_exponentially(self, mock_urlopen, mock_sleep):
+        import urllib.error
+
+        response = MagicMock(status=200)
+        response.__enter__.return_value = response
+        mock_urlopen.side_effect = [
+            urllib.error.URLError("refused"),
+            urllib.error.URLError("refused"),
+            urllib.error.URLError("refused"),
+            response,
+        ]
+
+        self.orch._poll_health(_service_component(health="/health"))
+
+        self.assertEqual(
+            [call.args[0] for call in mock_sleep.call_args_list],
+            [0.05, 0.1, 0.2],
+        )
+
+    @patch('urllib.request.urlopen')
+    def test_health_polling_stops_at_timeout(self, mock_urlopen):
+        import urllib.error
+
+        mock_urlopen.side_effect = urllib.error.URLError("refused")
+
+        with self.assertRaisesRegex(RuntimeError, "did not pass within 0.2s"):
+            self.orch._poll_health(_service_component(health="/health"), timeout=0.2)
+
+    def test_readiness_history_records_samples_and_flags_regressions(self):
+        component = _service_component()
+        with tempfile.TemporaryDirectory() as base_dir:
+            orchestrator = DeploymentOrchestrator(base_dir=base_dir)
+            dest_path = os.path.join(base_dir, "shop")
+            with patch('builtins.print') as mock_print:
+                for seconds in (0.4, 0.5, 0.45, 3.0):
+                    orchestrator._record_readiness(dest_path, component, seconds)
+
+            with open(orchestrator._readiness_history_path(dest_path), encoding="utf-8") as handle:
+                history = json.load(handle)
+
+        self.assertEqual([sample["seconds"] for sample in history["api"]], [0.4, 0.5, 0.45, 3.0])
+        self.assertIn("⚠ 'api' took 3.00s", mock_print.call_args.args[0])
+
+    @patch('lib.deployment.write_json_atomic', side_effect=OSError("read-only file system"))
+    def test_readiness_history_write_failure_only_warns(self, _mock_write):
+        with tempfile.TemporaryDirectory() as base_dir:
+            orchestrator = DeploymentOrchestrator(base_dir=base_dir)
+            with patch('builtins.print') as mock_print:
+                orchestrator._record_readiness(
+                    os.path.join(base_dir, "shop"), _service_component(), 0.4
+                )
+
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        self.assertTrue(any("Could not record readiness history for 'api'" in line for line in printed))
+        self.assertIn("✓ 'api' ready in 0.40s", printed[-1])
+
+    @patch.object(DeploymentOrchestrator, '_record_readiness')
+    @patch.object(DeploymentOrchestrator, '_ensure_service_user')
+    @patch('lib.deployment.create_managed_service')
+    @patch('lib.deployment.run')
+    def test_declared_readiness_is_passed_to_unit(
+        self, mock_run, mock_service, _mock_user, mock_record
+    ):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        component = _service_component(binary=None, exec="/srv/app", readiness="socket")
+        with tempfile.TemporaryDirectory() as base_dir:
+            orchestrator = DeploymentOrchestrator(base_dir=base_dir)
+            orchestrator._install_service_component(component, os.path.join(base_dir, "shop"))
+
+        self.assertEqual(mock_service.call_args.kwargs['readiness'], "socket")
+        self.assertEqual(mock_service.call_args.kwargs['port'], 8090)
+        mock_record.assert_called_once()
+
+
 class TestNginxIntegration(unittest.TestCase):
     """The descriptors must drive correct per-domain nginx config."""
 
@@ -846,6 +967,171 @@ class TestDeployManifest(unittest.TestCase):
 
         self.assertEqual([dep["domain"] for dep in deps], ["example.com"])
 
+    def _deploy(self) -> list[dict]:
+        return self.orch.deploy_manifest(
+            manifest=self.manifest,
+            source_path=self.source,
+            domain="example.com",
+            path="/",
+            git_url="https://git.example.com/shop.git",
+            commit_hash="abc123",
+            keep_source=True,
+        )
+
+    @staticmethod
+    def _build_commands(mock_run: MagicMock) -> list[str]:
+        return [
+            call.args[0]
+            for call in mock_run.call_args_list
+            if call.args[0].startswith("runuser") and "build" in call.args[0]
+        ]
+
+    @patch.object(DeploymentOrchestrator, '_stop_app_unit', return_value=False)
+    @patch.object(DeploymentOrchestrator, '_poll_health')
+    @patch('lib.deployment.create_managed_service')
+    @patch('lib.deployment.save_deployment_metadata')
+    @patch('lib.deployment.run')
+    def test_unchanged_components_reuse_active_artifacts(
+        self, mock_run, _mock_meta, _mock_service, _mock_health, _mock_stop
+    ):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        self._deploy()
+        self.assertEqual(len(self._build_commands(mock_run)), 2)
+        dest = os.path.join(self.base_dir, "example_com")
+        previous_binary = os.stat(os.path.join(dest, "server", "app"))
+
+        mock_run.reset_mock()
+        self._deploy()
+
+        self.assertEqual(self._build_commands(mock_run), [])
+        reused_binary = os.stat(os.path.join(dest, "server", "app"))
+        self.assertEqual(reused_binary.st_ino, previous_binary.st_ino)
+        fingerprint_path = os.path.join(dest, ".infra_tools_fingerprints.json")
+        with open(fingerprint_path, encoding="utf-8") as handle:
+            self.assertEqual(set(json.load(handle)), {"site", "api"})
+
+    @patch.object(DeploymentOrchestrator, '_stop_app_unit', return_value=False)
+    @patch.object(DeploymentOrchestrator, '_poll_health')
+    @patch('lib.deployment.create_managed_service')
+    @patch('lib.deployment.save_deployment_metadata')
+    @patch('lib.deployment.run')
+    def test_rolled_back_deploy_keeps_live_release_fingerprints(
+        self, mock_run, mock_meta, _mock_service, _mock_health, _mock_stop
+    ):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        self.manifest.components[0].inputs = ["dist"]
+        self.manifest.components[1].inputs = ["server"]
+        self._deploy()
+        dest = os.path.join(self.base_dir, "example_com")
+        fingerprint_path = os.path.join(dest, ".infra_tools_fingerprints.json")
+        with open(fingerprint_path, encoding="utf-8") as handle:
+            live = json.load(handle)
+
+        with open(os.path.join(self.source, "server", "main.go"), "w", encoding="utf-8") as handle:
+            handle.write("package main\n")
+        mock_meta.side_effect = OSError("disk full")
+        with self.assertRaises(OSError):
+            self._deploy()
+
+        with open(fingerprint_path, encoding="utf-8") as handle:
+            self.assertEqual(json.load(handle), live)
+
+    @patch.object(DeploymentOrchestrator, '_stop_app_unit', return_value=False)
+    @patch.object(DeploymentOrchestrator, '_poll_health')
+    @patch('lib.deployment.create_managed_service')
+    @patch('lib.deployment.save_deployment_metadata')
+    @patch('lib.deployment.run')
+    def test_failed_deploy_returns_its_port_reservations(
+        self, mock_run, mock_meta, _mock_service, _mock_health, _mock_stop
+    ):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        mock_meta.side_effect = OSError("disk full")
+        with self.assertRaises(OSError):
+            self._deploy()
+        self.assertEqual(self.orch._port_registry().assignments(), {})
+
+        mock_meta.side_effect = None
+        self._deploy()
+        live = self.orch._port_registry().assignments()
+        self.manifest.components[1].port = live[next(iter(live))] + 1
+        mock_meta.side_effect = OSError("disk full")
+        with self.assertRaises(OSError):
+            self._deploy()
+
+        self.assertEqual(self.orch._port_registry().assignments(), live)
+
+    @patch.object(DeploymentOrchestrator, '_stop_app_unit', return_value=False)
+    @patch.object(DeploymentOrchestrator, '_poll_health')
+    @patch('lib.deployment.create_managed_service')
+    @patch('lib.deployment.save_deployment_metadata')
+    @patch('lib.deployment.run')
+    def test_changed_input_rebuilds_only_its_component(
+        self, mock_run, _mock_meta, _mock_service, _mock_health, _mock_stop
+    ):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        self.manifest.components[0].inputs = ["dist"]
+        self.manifest.components[1].inputs = ["server"]
+        self._deploy()
+
+        with open(os.path.join(self.source, "server", "main.go"), "w", encoding="utf-8") as handle:
+            handle.write("package main\n")
+        mock_run.reset_mock()
+        self._deploy()
+
+        builds = self._build_commands(mock_run)
+        self.assertEqual(len(builds), 1)
+        self.assertIn("server/build.sh", builds[0])
+
+    @patch('lib.deployment.run')
+    @patch('lib.deployment.unshare_files', return_value=1)
+    def test_rebuilt_inputs_are_unshared_before_build(self, mock_unshare, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        self.manifest.components[0].inputs = ["dist"]
+        self.manifest.components[1].inputs = ["server"]
+
+        self.orch._unshare_build_inputs(self.manifest.components, self.source, "build-shop")
+        mock_unshare.assert_called_once_with(self.source, ["dist", "server"])
+        self.assertIn("-links 1", mock_run.call_args[0][0])
+
+        self.manifest.components[0].inputs = []
+        self.orch._unshare_build_inputs(self.manifest.components, self.source, "build-shop")
+        mock_unshare.assert_called_with(self.source, None)
+
+    @patch('lib.deployment.run')
+    def test_independent_components_build_concurrently(self, mock_run):
+        import threading
+
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        barrier = threading.Barrier(2, timeout=5)
+        original = self.orch._run_component_build
+
+        def build(component, staging_path, build_user):
+            barrier.wait()
+            original(component, staging_path, build_user)
+
+        self.manifest.components[0].inputs = ["dist"]
+        self.manifest.components[1].inputs = ["server"]
+        with patch.object(self.orch, "_run_component_build", side_effect=build):
+            self.orch._build_components(self.manifest.components, self.source, "build-shop")
+
+        self.assertEqual(len(mock_run.call_args_list), 2)
+
+    @patch('lib.deployment.run')
+    def test_dependent_components_build_in_order(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        self.manifest.components[0].depends_on = ["api"]
+        self.manifest.components[0].inputs = ["dist"]
+        self.manifest.components[1].inputs = ["server"]
+        order: list[str] = []
+        with patch.object(
+            self.orch,
+            "_run_component_build",
+            side_effect=lambda component, *_args: order.append(component.name),
+        ):
+            self.orch._build_components(self.manifest.components, self.source, "build-shop")
+
+        self.assertEqual(order, ["api", "site"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -10,6 +10,7 @@ import infra_tools
 from common import network_steps
 from lib.config import SetupConfig
 from lib.system_types import get_steps_for_system_type
+from lib.ufw_rules import UfwFirewall
 from security import security_steps
 
 
@@ -111,25 +112,34 @@ class TestMdnsSetup(unittest.TestCase):
 
     def test_reconciles_mdns_firewall_rule(self) -> None:
         config = _config(enable_mdns=True)
+        status = SimpleNamespace(
+            returncode=0,
+            stdout=(
+                "Status: active\n"
+                "[ 1] 22/tcp LIMIT IN Anywhere\n"
+                "[ 2] 5353/udp ALLOW IN Anywhere # infra_tools mDNS UDP legacy\n"
+            ),
+        )
 
         with (
             patch.object(
                 security_steps,
                 "run",
-                return_value=SimpleNamespace(returncode=0),
+                side_effect=lambda command, **_kwargs: (
+                    status if command == "ufw status numbered" else SimpleNamespace(returncode=0)
+                ),
             ) as run,
             patch.object(security_steps, "can_manage_mdns", return_value=True),
-            patch.object(security_steps, "_remove_stale_managed_rules") as remove,
         ):
-            security_steps._configure_mdns_firewall(config)
+            security_steps._reconcile_firewall_rules(UfwFirewall(security_steps.run), config)
 
-        run.assert_called_once_with(
-            "ufw allow 5353/udp comment 'infra_tools mDNS UDP'",
-            check=False,
-        )
-        remove.assert_called_once_with(
-            "infra_tools mDNS UDP",
-            {"infra_tools mDNS UDP"},
+        commands = [call.args[0] for call in run.call_args_list]
+        self.assertEqual(
+            [command for command in commands if command != "ufw status numbered"],
+            [
+                "ufw allow 5353/udp comment 'infra_tools mDNS UDP'",
+                "ufw --force delete 2",
+            ],
         )
 
 
@@ -12,6 +12,7 @@ from lib.network_firewall import (
     build_proxmox_control_plane_lockdown_plan,
     format_proxmox_firewall_plan,
     format_rendered_proxmox_plan,
+    plan_firewall_changes,
     render_proxmox_firewall_plan,
 )
 from lib.network_inventory import NetworkProfile
@@ -125,5 +126,25 @@ class TestProxmoxFirewallPlan(unittest.TestCase):
         self.assertIn("[OPTIONS]", text)
 
 
+class TestPlanFirewallChanges(unittest.TestCase):
+    def test_only_owned_missing_entries_are_removed(self) -> None:
+        plan = plan_firewall_changes(
+            ["10.0.0.0/8", "192.0.2.0/24", "198.51.100.0/24"],
+            ["203.0.113.0/24", "192.0.2.0/24", "203.0.113.0/24"],
+            owned=["10.0.0.0/8", "192.0.2.0/24"],
+        )
+
+        self.assertEqual(plan.additions, ["203.0.113.0/24"])
+        self.assertEqual(plan.removals, ["10.0.0.0/8"])
+        self.assertEqual(plan.unchanged, ["192.0.2.0/24"])
+        self.assertTrue(plan.changed)
+
+    def test_matching_state_is_unchanged(self) -> None:
+        plan = plan_firewall_changes(["a", "b"], ["b", "a"])
+
+        self.assertFalse(plan.changed)
+        self.assertEqual(plan.to_dict(), {"additions": [], "removals": [], "unchanged": ["b", "a"]})
+
+
 if __name__ == "__main__":
     unittest.main()
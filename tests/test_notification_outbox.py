@@ -0,0 +1,142 @@
+"""Tests for lib/notification_outbox.py: queueing, retry, and collapsing."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.notification_outbox import NotificationOutbox, retry_delay
+from lib.notifications import Notification, NotificationConfig, NotificationSender
+
+
+class _StubWebhookServer:
+    """Local HTTP endpoint that records payloads and can fail on demand."""
+
+    def __init__(self) -> None:
+        self.received: list[tuple[str, str]] = []
+        self.failures: dict[str, int] = {}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if stub.failures.get(self.path, 0) > 0:
+                    stub.failures[self.path] -= 1
+                    self.send_response(500)
+                else:
+                    stub.received.append((self.path, body["operator"]["subject"]))
+                    self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _notification(subject: str, dedup_key: str | None = None) -> Notification:
+    return Notification(subject=subject, job="storage-ops", status="warning", message=subject, dedup_key=dedup_key)
+
+
+class TestNotificationOutbox(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.stub = _StubWebhookServer()
+        self.config = NotificationConfig(type="webhook", target=self.stub.url("/hook"))
+        self.outbox = NotificationOutbox(
+            os.path.join(self._tmp.name, "outbox"),
+            NotificationSender([]).deliver,
+            retry_base=10,
+        )
+
+    def tearDown(self) -> None:
+        self.stub.close()
+        self._tmp.cleanup()
+
+    def test_delivers_in_append_order_and_empties_outbox(self) -> None:
+        for subject in ("first", "second", "third"):
+            self.outbox.append(_notification(subject), [self.config])
+
+        self.assertIsNone(self.outbox.flush())
+
+        self.assertEqual([subject for _path, subject in self.stub.received], ["first", "second", "third"])
+        self.assertEqual(self.outbox.pending_count(), 0)
+
+    def test_failed_target_backs_off_and_keeps_order(self) -> None:
+        self.stub.failures["/hook"] = 1
+        self.outbox.append(_notification("first"), [self.config])
+        self.outbox.append(_notification("second"), [self.config])
+
+        next_due = self.outbox.flush(now=1000.0)
+
+        self.assertEqual(next_due, 1010.0)
+        self.assertEqual(self.stub.received, [])
+        self.assertIsNotNone(self.outbox.flush(now=1005.0))
+        self.assertEqual(self.stub.received, [])
+
+        self.assertIsNone(self.outbox.flush(now=1010.0))
+        self.assertEqual([subject for _path, subject in self.stub.received], ["first", "second"])
+
+    def test_dead_target_does_not_block_other_targets(self) -> None:
+        dead = NotificationConfig(type="webhook", target=self.stub.url("/dead"))
+        self.stub.failures["/dead"] = 100
+        self.outbox.append(_notification("first"), [dead, self.config])
+
+        self.outbox.flush(now=1000.0)
+
+        self.assertEqual(self.stub.received, [("/hook", "first")])
+        self.assertEqual(self.outbox.pending_count(), 1)
+
+    def test_gives_up_after_max_attempts(self) -> None:
+        self.outbox.max_attempts = 2
+        self.stub.failures["/hook"] = 100
+        self.outbox.append(_notification("first"), [self.config])
+
+        self.outbox.flush(now=1000.0)
+        self.outbox.flush(now=2000.0)
+
+        self.assertEqual(self.outbox.pending_count(), 0)
+
+    def test_collapses_queued_messages_with_same_dedup_key(self) -> None:
+        self.outbox.append(_notification("storage low", dedup_key="cleanup:storage"), [self.config])
+        self.outbox.append(_notification("unrelated"), [self.config])
+        self.outbox.append(_notification("storage recovered", dedup_key="cleanup:storage"), [self.config])
+
+        self.outbox.flush()
+
+        self.assertEqual(
+            [subject for _path, subject in self.stub.received],
+            ["unrelated", "storage recovered"],
+        )
+
+    def test_sender_queues_and_background_flusher_delivers(self) -> None:
+        sender = NotificationSender([self.config], outbox=self.outbox)
+
+        self.outbox.start()
+        self.assertTrue(sender.send(_notification("queued")))
+        self.outbox.close()
+
+        self.assertEqual(self.stub.received, [("/hook", "queued")])
+
+    def test_retry_delay_is_exponential_and_capped(self) -> None:
+        self.assertEqual([retry_delay(n, 5, 30) for n in (1, 2, 3, 4)], [5, 10, 20, 30])
+
+
+if __name__ == '__main__':
+    unittest.main()
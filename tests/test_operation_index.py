@@ -0,0 +1,88 @@
+"""Tests for lib/operation_index.py: live indexing, queries, and rebuilds."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.operation_index import INDEX_FILENAME, OperationIndex, rebuild_operation_index
+from lib.operation_log import OperationLoggerManager
+
+
+class TestOperationIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log_dir = self._tmp.name
+        self.manager = OperationLoggerManager(self.log_dir)
+        self.index = OperationIndex(os.path.join(self.log_dir, INDEX_FILENAME))
+
+        backup = self.manager.create_logger("sync", source="/srv/data", destination="/mnt/backup")
+        backup.log_metric("files_transferred", 10, "count")
+        backup.log_metric("files_transferred", 5, "count")
+        backup.complete("completed")
+
+        other = self.manager.create_logger("sync", source="/srv/data", destination="/mnt/offsite")
+        other.complete("completed")
+
+        scrub = self.manager.create_logger("scrub", directory="/mnt/backup")
+        scrub.log_error("par2_verify_failed", "damaged block")
+        scrub.complete("failed")
+
+        self.running = self.manager.create_logger("scrub", directory="/mnt/archive")
+
+    def tearDown(self):
+        self.running.complete()
+        self._tmp.cleanup()
+
+    def test_records_operations_as_they_complete(self):
+        failed = self.index.query(status="failed")
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed[0]["operation_type"], "scrub")
+        self.assertEqual(failed[0]["error_count"], 1)
+        self.assertIsNotNone(failed[0]["duration_seconds"])
+
+        running = self.index.query(status="running")
+        self.assertEqual([row["operation_id"] for row in running], [self.running.operation_id])
+
+    def test_filters_by_context_and_reports_metric(self):
+        rows = self.index.query(
+            operation_type="sync",
+            context={"destination": "/mnt/backup"},
+            metric="files_transferred",
+        )
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["metric_last"], 5)
+        self.assertEqual(rows[0]["metric_total"], 15)
+        self.assertEqual(rows[0]["metric_count"], 2)
+
+    def test_since_excludes_older_operations(self):
+        self.assertEqual(self.index.query(since=time.time() + 60), [])
+        self.assertEqual(len(self.index.query(since=time.time() - 60)), 4)
+
+    def test_rebuild_from_raw_logs_matches_live_index(self):
+        self.running.flush()
+        live = self.index.query(metric="files_transferred")
+        os.remove(os.path.join(self.log_dir, INDEX_FILENAME))
+
+        self.assertEqual(rebuild_operation_index(self.log_dir), 4)
+
+        rebuilt = self.index.query(metric="files_transferred")
+        key = lambda row: row["operation_id"]
+        fields = ("operation_type", "status", "error_count", "context", "metric_total", "duration_seconds")
+        self.assertEqual(
+            [{field: row[field] for field in fields} for row in sorted(rebuilt, key=key)],
+            [{field: row[field] for field in fields} for row in sorted(live, key=key)],
+        )
+
+    def test_cleanup_prunes_index_rows(self):
+        self.manager.cleanup_old_logs(days_to_keep=-1)
+        self.assertEqual(self.index.query(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
+import json
 import os
+import signal
 import sys
 import tempfile
 import time
 import unittest
 import uuid
+from unittest.mock import patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from lib.operation_log import (
+    _flush_then_reraise,
+    flush_operation_logs,
     OperationLogger,
     OperationLoggerManager,
 )
@@ -160,5 +165,82 @@ class TestOperationLoggerManager(unittest.TestCase):
             self.assertTrue(os.path.exists(recent_log))
 
 
+
+class TestBufferedOperationEvents(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self._tmp.name, 'op.log')
+        self.logger = OperationLogger(f'buffered-{uuid.uuid4().hex[:8]}', self.log_file)
+
+    def tearDown(self):
+        self.logger.complete()
+        self._tmp.cleanup()
+
+    def _events(self):
+        with open(self.log_file, encoding='utf-8') as handle:
+            return [json.loads(line.split(' - ', 3)[3]) for line in handle]
+
+    def test_routine_events_are_batched_until_flush(self):
+        self.logger.log_metric('files_checked', 1, 'count')
+        self.logger.log_step('verify', 'completed')
+        self.assertEqual([event['event_type'] for event in self._events()], ['operation_start'])
+
+        self.logger.flush()
+
+        self.assertEqual(
+            [event['event_type'] for event in self._events()],
+            ['operation_start', 'metric', 'step'],
+        )
+
+    def test_errors_flush_pending_events_immediately(self):
+        self.logger.log_metric('files_checked', 1, 'count')
+        self.logger.log_error('IOError', 'disk vanished')
+
+        self.assertEqual(
+            [event['event_type'] for event in self._events()],
+            ['operation_start', 'metric', 'error'],
+        )
+
+    def test_lines_keep_standard_log_format(self):
+        self.logger.log_metric('files_checked', 1, 'count')
+        self.logger.flush()
+        with open(self.log_file, encoding='utf-8') as handle:
+            line = handle.readlines()[-1]
+        timestamp, level, name, _message = line.split(' - ', 3)
+        time.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
+        self.assertEqual(level, 'INFO    ')
+        self.assertEqual(name, self.logger.logger.name)
+
+    @patch('lib.operation_log.FLUSH_MAX_EVENTS', 3)
+    def test_size_threshold_writes_one_batch(self):
+        for index in range(3):
+            self.logger.log_metric('files_checked', index, 'count')
+        self.assertEqual(len(self._events()), 4)
+
+    def test_exit_flush_writes_every_open_operation(self):
+        self.logger.log_metric('files_checked', 1, 'count')
+        flush_operation_logs()
+        self.assertEqual(self._events()[-1]['value'], 1)
+
+    def test_non_blocking_flush_skips_busy_writer(self):
+        self.logger.log_metric('files_checked', 1, 'count')
+        with self.logger._writer._lock:
+            flush_operation_logs(blocking=False)
+            self.assertEqual(len(self._events()), 1)
+        flush_operation_logs(blocking=False)
+        self.assertEqual(self._events()[-1]['value'], 1)
+
+    def test_signal_handlers_are_opt_in(self):
+        self.assertNotEqual(signal.getsignal(signal.SIGTERM), _flush_then_reraise)
+
+    def test_complete_writes_remaining_events(self):
+        self.logger.log_metric('files_checked', 1, 'count')
+        self.logger.complete()
+        self.assertEqual(
+            [event['event_type'] for event in self._events()],
+            ['operation_start', 'metric', 'operation_complete'],
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -10,9 +10,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from lib.plugin_registry import (
     PluginDefinition,
+    RESOURCE_APT,
+    StepResources,
     SystemTypeDefinition,
     build_plugin_registry,
     get_plugin_registry,
+    get_step_resources,
     resolve_custom_step,
     resolve_validator,
     get_system_type_definition,
@@ -173,6 +176,28 @@ class TestPluginRegistry(unittest.TestCase):
             resolve_custom_step("install_ruby")
         self.assertTrue(callable(resolve_custom_step("configure_smb_mount")))
 
+    def test_step_resources_are_resolved_for_registered_step_functions(self):
+        resources = get_step_resources(resolve_custom_step("install_cli_tools"))
+        self.assertIsNotNone(resources)
+        self.assertEqual(resources.writes, (RESOURCE_APT,))
+
+        def install_cli_tools(_config):
+            return None
+
+        self.assertIsNone(get_step_resources(install_cli_tools))
+        self.assertIsNone(get_step_resources(resolve_custom_step("configure_firewall")))
+
+    def test_step_resources_must_name_the_plugins_own_steps(self):
+        plugin = PluginDefinition(
+            name="one",
+            module="plugins.one",
+            custom_steps=("own_step",),
+            custom_step_provider="plugins.one:get_custom_step_functions",
+            step_resources=(StepResources("other_step", writes=(RESOURCE_APT,)),),
+        )
+        with self.assertRaisesRegex(ValueError, "not one of its custom steps"):
+            build_plugin_registry([plugin])
+
     def test_plugin_validator_resolution_is_plugin_owned(self):
         self.assertTrue(callable(resolve_validator("parse_sync_spec")))
         self.assertTrue(callable(resolve_validator("validate_samba_share_credentials")))
@@ -0,0 +1,102 @@
+"""Tests for lib/port_registry.py."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.port_registry import PortConflictError, PortRegistry, scan_unit_ports
+
+
+class TestPortRegistry(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.unit_dir = os.path.join(self._tmp.name, "units")
+        os.makedirs(self.unit_dir)
+        self.registry = PortRegistry(
+            os.path.join(self._tmp.name, "state", "ports.json"),
+            unit_dir=self.unit_dir,
+        )
+        patcher = patch('lib.port_registry._port_is_bindable', return_value=True)
+        self.probe = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write_unit(self, name: str, content: str) -> None:
+        with open(os.path.join(self.unit_dir, f"{name}.service"), "w", encoding="utf-8") as handle:
+            handle.write(content)
+
+    def test_assignments_are_sticky(self):
+        first = self.registry.reserve({"app-shop-api": None, "app-shop-worker": None})
+        second = self.registry.reserve({"app-shop-worker": None, "app-shop-api": None})
+
+        self.assertEqual(first, {"app-shop-api": 8000, "app-shop-worker": 8001})
+        self.assertEqual(second, first)
+
+    def test_cursor_skips_ports_of_unmanaged_units(self):
+        self._write_unit("node-legacy", "ExecStart=/usr/bin/node server.js --port 8000\n")
+        self._write_unit("app-other-api", 'Environment="PORT=8001"\n')
+        self._write_unit("nginx", "PORT=8002\n")
+
+        assigned = self.registry.reserve({"app-shop-api": None})
+
+        self.assertEqual(assigned, {"app-shop-api": 8002})
+
+    def test_unit_files_rescanned_only_when_directory_changes(self):
+        self.registry.reserve({"app-shop-api": None})
+        with patch('lib.port_registry.scan_unit_ports', return_value={}) as scan:
+            self.registry.reserve({"app-shop-api": None})
+            scan.assert_not_called()
+            self._write_unit("app-other-api", 'Environment="PORT=9000"\n')
+            os.utime(self.unit_dir, ns=(1, 1))
+            self.registry.reserve({"app-shop-api": None})
+            scan.assert_called_once_with(self.unit_dir)
+
+    def test_fixed_port_conflict_names_owner(self):
+        self.registry.reserve({"app-shop-api": 8100})
+
+        with self.assertRaises(PortConflictError) as ctx:
+            self.registry.reserve({"app-blog-api": 8100})
+
+        self.assertEqual(ctx.exception.owner, "app-blog-api")
+        self.assertEqual(ctx.exception.port, 8100)
+
+    def test_own_unit_ports_can_be_reused(self):
+        self._write_unit("app-shop-api", 'Environment="PORT=8100"\n')
+
+        self.assertEqual(self.registry.reserve({"app-shop-api": 8100}), {"app-shop-api": 8100})
+
+    def test_release_frees_port(self):
+        self.registry.reserve({"app-shop-api": 8100})
+        self.registry.release(["app-shop-api"])
+
+        self.assertEqual(self.registry.reserve({"app-blog-api": 8100}), {"app-blog-api": 8100})
+
+    def test_restore_returns_owners_to_earlier_assignments(self):
+        self.registry.reserve({"app-shop-api": 8100})
+        self.registry.reserve({"app-shop-api": 8200, "app-shop-worker": 8201})
+
+        self.registry.restore({"app-shop-api": 8100, "app-shop-worker": None})
+
+        self.assertEqual(self.registry.assignments(), {"app-shop-api": 8100})
+
+    def test_unbindable_port_is_skipped(self):
+        self.probe.side_effect = lambda port: port != 8000
+
+        self.assertEqual(self.registry.reserve({"app-shop-api": None}), {"app-shop-api": 8001})
+
+
+class TestScanUnitPorts(unittest.TestCase):
+    def test_missing_directory_returns_empty(self):
+        self.assertEqual(scan_unit_ports("/nonexistent/infra-tools-units"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -124,6 +124,25 @@ class TestValidParse(unittest.TestCase):
         ).components[0]
         self.assertEqual(comp.runtime_env["APP_DATABASE"], "{{data_dir}}/app.sqlite3")
 
+    def test_service_readiness_fields(self):
+        comp = parse_manifest(
+            _manifest(_service(readiness="notify", health="/health", health_timeout=90))
+        ).components[0]
+        self.assertEqual(comp.readiness, "notify")
+        self.assertEqual(comp.health_timeout, 90)
+
+    def test_inputs_and_depends_on(self):
+        manifest = parse_manifest(
+            _manifest(
+                _static(inputs=["frontend/", "package.json"]),
+                _service(inputs=["server"], depends_on=["site"]),
+            )
+        )
+        site, api = manifest.components
+        self.assertEqual(site.inputs, ["frontend", "package.json"])
+        self.assertEqual(site.depends_on, [])
+        self.assertEqual(api.depends_on, ["site"])
+
 
 class TestRejects(unittest.TestCase):
     def _assert_rejected(self, data: object, needle: str = "") -> None:
@@ -277,6 +296,24 @@ class TestRejects(unittest.TestCase):
     def test_sqlite_backup_must_be_absolute_or_templated(self):
         self._assert_rejected(_manifest(_service(sqlite_backup="data/app.db")), "absolute")
 
+    def test_readiness_mode_validated(self):
+        self._assert_rejected(_manifest(_service(readiness="dbus")), "readiness")
+        self._assert_rejected(_manifest(_service(health_timeout=0)), "health_timeout")
+
+    def test_inputs_must_stay_in_repo(self):
+        self._assert_rejected(_manifest(_static(inputs=["../shared"])), "escape")
+        self._assert_rejected(_manifest(_static(inputs=[])), "inputs")
+
+    def test_depends_on_must_reference_known_components(self):
+        self._assert_rejected(_manifest(_static(depends_on=["missing"])), "unknown component")
+        self._assert_rejected(_manifest(_static(depends_on=["site"])), "itself")
+
+    def test_depends_on_cycle_rejected(self):
+        self._assert_rejected(
+            _manifest(_static(depends_on=["api"]), _service(depends_on=["site"])),
+            "cycle",
+        )
+
     def test_backup_retention_is_bounded(self):
         self._assert_rejected(_manifest(_service(backup_retention=0)), "backup_retention")
 
@@ -162,6 +162,18 @@ class TestProxmoxCliHosts(_CliFixture):
             reboot_timeout=180,
         )
 
+    @patch("lib.proxmox_cli.run_vm_batch_provision", return_value=0)
+    def test_provision_dispatches_to_batch_provisioner(self, mock_provision) -> None:
+        rc, _ = self._run("provision", "vm1", "vm2", "--max-node-operations", "3")
+
+        self.assertEqual(rc, 0)
+        mock_provision.assert_called_once_with(
+            ["vm1", "vm2"],
+            workspace=self.workspace,
+            dry_run=False,
+            max_node_operations=3,
+        )
+
 
 class TestProxmoxCliContainerOps(_CliFixture):
     def setUp(self) -> None:
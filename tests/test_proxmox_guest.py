@@ -17,6 +17,7 @@ from lib.proxmox_guest import (
     _get_guest_gateway,
     _get_host_nameservers,
     _parse_corosync_config,
+    _reserve_vmids,
     ProvisionError,
     enroll_provisioned_guest_host_keys,
     ensure_guest_ipv4_route,
@@ -381,6 +382,35 @@ class TestGuestNetworkDefaults(unittest.TestCase):
         self.assertIn("resolvectl dns sdn-private", mock_run.call_args.args[3])
 
 
+class TestReserveVmids(unittest.TestCase):
+    @patch("lib.proxmox_guest._ssh_run")
+    def test_reserves_ids_in_one_call_above_floor(self, mock_run) -> None:
+        mock_run.return_value = subprocess.CompletedProcess([], 0, "205\n207\n", "")
+
+        with patch("builtins.print"):
+            vmids = _reserve_vmids("10.0.0.10", "root", [], 2, floor=205)
+
+        self.assertEqual(vmids, [205, 207])
+        mock_run.assert_called_once()
+        script = mock_run.call_args.args[3]
+        self.assertIn("pvesh get /cluster/nextid --vmid $id", script)
+        self.assertIn("id=205", script)
+
+    @patch("lib.proxmox_guest._ssh_run")
+    def test_raises_when_too_few_ids_are_free(self, mock_run) -> None:
+        mock_run.return_value = subprocess.CompletedProcess([], 0, "205\n", "")
+
+        with self.assertRaisesRegex(ProvisionError, "reserve 2 VMID"):
+            _reserve_vmids("10.0.0.10", "root", [], 2)
+
+    @patch("lib.proxmox_guest._ssh_run")
+    def test_dry_run_does_not_contact_the_node(self, mock_run) -> None:
+        vmids = _reserve_vmids("10.0.0.10", "root", [], 3, floor=120, dry_run=True)
+
+        self.assertEqual(vmids, [120, 121, 122])
+        mock_run.assert_not_called()
+
+
 class TestProbeProxmoxHost(unittest.TestCase):
     @patch("lib.proxmox_guest._ssh_run")
     def test_discovers_defaults_and_storage_content(self, mock_run) -> None:
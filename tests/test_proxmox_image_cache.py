@@ -0,0 +1,74 @@
+"""Tests for the content-addressed Proxmox cloud image cache."""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lib.proxmox_guest import ProvisionError
+from lib.proxmox_image_cache import (
+    IMAGE_CACHE_DIR,
+    ImageFetch,
+    fetch_cached_image,
+    render_image_fetch_script,
+)
+
+_SHA512 = "b" * 128
+_PATH = "/var/lib/vz/import/debian.qcow2"
+
+
+class TestRenderImageFetchScript(unittest.TestCase):
+    def test_script_reuses_recorded_digest_before_peers_and_download(self) -> None:
+        script = render_image_fetch_script("https://example.com/debian.qcow2", _SHA512, _PATH)
+
+        cached = script.index("infra_tools-image cached 0")
+        peers = script.index("/etc/pve/corosync.conf")
+        download = script.index("wget -q --https-only")
+        self.assertLess(cached, peers)
+        self.assertLess(peers, download)
+        self.assertIn(f"index={IMAGE_CACHE_DIR}/{_SHA512}", script)
+        self.assertIn("sha512sum -c --status", script)
+        self.assertIn("flock 9", script)
+        # The peer copy must not read the rest of the script from stdin.
+        self.assertIn('ssh -n -o BatchMode=yes', script)
+
+    def test_rejects_unpinned_digest(self) -> None:
+        with self.assertRaises(ProvisionError):
+            render_image_fetch_script("https://example.com/debian.qcow2", "abc", _PATH)
+
+
+class TestFetchCachedImage(unittest.TestCase):
+    @patch("lib.proxmox_image_cache._ssh_run")
+    def test_cached_image_reports_no_transfer(self, mock_run: MagicMock) -> None:
+        mock_run.return_value = MagicMock(returncode=0, stdout="infra_tools-image cached 0 4096\n", stderr="")
+
+        fetched = fetch_cached_image("https://example.com/debian.qcow2", _SHA512, _PATH, "10.0.0.10", "root", [])
+
+        self.assertEqual(fetched.origin, "cached")
+        self.assertEqual(fetched.bytes_transferred, 0)
+        self.assertEqual(fetched.size, 4096)
+        self.assertEqual(mock_run.call_count, 1)
+
+    @patch("lib.proxmox_image_cache._ssh_run")
+    def test_checksum_failure_is_reported(self, mock_run: MagicMock) -> None:
+        mock_run.return_value = MagicMock(
+            returncode=2,
+            stdout="",
+            stderr="downloaded image does not match the pinned SHA-512",
+        )
+
+        with self.assertRaisesRegex(ProvisionError, "SHA-512 verification failed"):
+            fetch_cached_image("https://example.com/debian.qcow2", _SHA512, _PATH, "10.0.0.10", "root", [])
+
+    def test_describes_transfer_source_and_size(self) -> None:
+        fetched = ImageFetch(_PATH, "peer:10.0.0.11", 3 * 1024 * 1024, 1.25)
+
+        self.assertEqual(fetched.describe(), "copied 3.0 MiB from cluster peer 10.0.0.11 in 1.2s")
+
+
+if __name__ == "__main__":
+    unittest.main()
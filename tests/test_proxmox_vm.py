@@ -103,7 +103,7 @@ class TestImageStorage(unittest.TestCase):
             "root",
             [],
             dry_run=True,
-        )
+        ).path
 
         self.assertEqual(path, "/var/lib/vz/import/debian.qcow2")
 
@@ -123,7 +123,7 @@ class TestImageStorage(unittest.TestCase):
             "root",
             [],
             dry_run=True,
-        )
+        ).path
 
         self.assertEqual(path, "/var/lib/vz/template/iso/debian.img")
 
@@ -153,7 +153,7 @@ class TestImageStorage(unittest.TestCase):
             "root",
             [],
             dry_run=False,
-        )
+        ).path
 
         self.assertEqual(path, "/var/lib/vz/template/iso/debian.img")
         self.assertIn(
@@ -161,6 +161,35 @@ class TestImageStorage(unittest.TestCase):
             mock_run.call_args_list[0].args[3],
         )
 
+    @patch("lib.proxmox_image_cache._ssh_run")
+    @patch("lib.proxmox_vm._ssh_run")
+    def test_pinned_image_is_fetched_and_verified_in_one_call(self, mock_run, mock_cache_run):
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout="/var/lib/vz/import/debian.qcow2\n",
+            stderr="",
+        )
+        mock_cache_run.return_value = MagicMock(
+            returncode=0,
+            stdout="infra_tools-image peer:10.0.0.11 1048576 1048576\n",
+            stderr="",
+        )
+        image = _ResolvedImage(
+            url="https://example.com/debian.qcow2",
+            sha512="a" * 128,
+            filename="debian.qcow2",
+            storage_ref=None,
+        )
+
+        fetched = _download_image_to_host(
+            image, "local", "import", "10.0.0.10", "root", [], dry_run=False
+        )
+
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(mock_cache_run.call_count, 1)
+        self.assertEqual(fetched.origin, "peer:10.0.0.11")
+        self.assertEqual(fetched.bytes_transferred, 1048576)
+
 
 class TestGuestAgentWait(unittest.TestCase):
     @patch("lib.proxmox_vm.time.sleep")
@@ -404,6 +433,76 @@ class TestVMHardwareProfile(unittest.TestCase):
         ])
 
 
+class TestVMTemplateClone(unittest.TestCase):
+    def _create(self, **overrides):
+        kwargs = dict(
+            vmid=120,
+            target_ip="10.0.0.60",
+            image_remote_path=None,
+            storage_ref=None,
+            memory_mb=2048,
+            balloon_min_mb=2048,
+            cores=2,
+            root_pool="local-lvm",
+            disk_size_gib=20,
+            data_disk_specs=[],
+            cidr_prefix="24",
+            bridge="vmbr0",
+            gateway="10.0.0.1",
+            nameservers=["10.0.0.1"],
+            hostname="clone-vm",
+            user_data_path=None,
+            user_data_ref="local:snippets/infra_tools-clone-vm.yaml",
+            graphical_console=False,
+            node_ip="10.0.0.10",
+            user="root",
+            ssh_opts=[],
+            template_vmid=9000,
+        )
+        kwargs.update(overrides)
+        return _create_vm(**kwargs)
+
+    @patch("lib.proxmox_vm._ssh_run")
+    def test_linked_clone_gets_per_vm_settings_without_disk_import(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+
+        root_disk = self._create()
+
+        commands = [call.args[3] for call in mock_run.call_args_list]
+        self.assertEqual(root_disk, "linked clone")
+        self.assertEqual(commands[0], "qm clone 9000 120 --name clone-vm")
+        self.assertTrue(commands[1].startswith("qm set 120 --name clone-vm"))
+        self.assertIn("--cicustom user=local:snippets/infra_tools-clone-vm.yaml", commands[1])
+        self.assertIn("ip=10.0.0.60/24", commands[1])
+        self.assertEqual(commands[2], "qm resize 120 scsi0 20G")
+        self.assertEqual(commands[3], "qm start 120")
+        self.assertFalse(any("qm disk import" in command for command in commands))
+
+    @patch("lib.proxmox_vm._ssh_run")
+    def test_storage_without_linked_clones_falls_back_to_full_clone(self, mock_run):
+        ok = MagicMock(returncode=0, stdout="", stderr="")
+        mock_run.side_effect = [
+            MagicMock(
+                returncode=255,
+                stdout="",
+                stderr="Linked clone feature is not supported for drive 'scsi0'",
+            ),
+            ok,
+            ok,
+            ok,
+            ok,
+        ]
+
+        with patch("builtins.print"):
+            root_disk = self._create()
+
+        self.assertEqual(root_disk, "full clone")
+        self.assertEqual(
+            mock_run.call_args_list[1].args[3],
+            "qm clone 9000 120 --name clone-vm --full 1 --storage local-lvm",
+        )
+
+
 class TestVMCleanup(unittest.TestCase):
     @patch("lib.proxmox_vm._ssh_run")
     def test_cleanup_reports_failed_stop_or_destroy(self, mock_run):
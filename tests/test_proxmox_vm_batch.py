@@ -0,0 +1,151 @@
+"""Tests for concurrent Proxmox VM batch provisioning."""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lib.config import SetupConfig
+from lib.proxmox_vm import NodeBatch, VMAlreadyExists, _retry_vmid
+from lib.proxmox_vm_batch import provision_vms, run_vm_batch_provision
+
+
+def _config(host: str, node: str = "10.0.0.10") -> SetupConfig:
+    return SetupConfig(
+        host=host,
+        username="admin",
+        system_type="server_web",
+        machine_type="vm",
+        hosted_node=node,
+    )
+
+
+class TestProvisionVms(unittest.TestCase):
+    @patch("lib.proxmox_vm_batch._reserve_vmids")
+    def test_reserves_distinct_ids_per_node_before_provisioning(self, mock_reserve) -> None:
+        mock_reserve.side_effect = [[200, 201], [205]]
+        targets = [
+            ("vm1", _config("10.0.1.1")),
+            ("vm2", _config("10.0.1.2", node="10.0.0.11")),
+            ("vm3", _config("10.0.1.3")),
+        ]
+        seen: dict[str, int] = {}
+
+        def fake_provision(config, *, image, vmid, node_batch) -> None:
+            seen[config.host] = vmid
+
+        with patch("lib.proxmox_vm_batch.provision_vm", side_effect=fake_provision):
+            results = provision_vms(targets)
+
+        self.assertEqual(seen, {"10.0.1.1": 200, "10.0.1.3": 201, "10.0.1.2": 205})
+        self.assertEqual([call.args[3] for call in mock_reserve.call_args_list], [2, 1])
+        self.assertEqual(mock_reserve.call_args_list[1].kwargs["floor"], 202)
+        self.assertEqual([result.status for result in results], ["created"] * 3)
+
+    @patch("lib.proxmox_vm_batch._reserve_vmids", return_value=[300, 301, 302, 303])
+    def test_waits_overlap_while_node_operations_are_capped(self, _mock_reserve) -> None:
+        targets = [(f"vm{index}", _config(f"10.0.1.{index}")) for index in range(4)]
+        # Every VM must reach its boot wait at the same time for the barrier to open.
+        booted = threading.Barrier(4, timeout=5)
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def fake_provision(config, *, image, vmid, node_batch: NodeBatch) -> None:
+            nonlocal active, peak
+            with node_batch.operations:
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                threading.Event().wait(0.02)
+                with lock:
+                    active -= 1
+            booted.wait()
+
+        with patch("lib.proxmox_vm_batch.provision_vm", side_effect=fake_provision):
+            results = provision_vms(targets, max_node_operations=2)
+
+        self.assertEqual(peak, 2)
+        self.assertEqual([result.status for result in results], ["created"] * 4)
+
+    @patch("lib.proxmox_vm_batch._reserve_vmids", return_value=[400, 401])
+    def test_existing_and_failed_vms_are_reported_per_target(self, _mock_reserve) -> None:
+        def fake_provision(config, *, image, vmid, node_batch) -> None:
+            if config.host == "10.0.1.1":
+                raise VMAlreadyExists("exists")
+            raise RuntimeError("qm create failed")
+
+        with patch("lib.proxmox_vm_batch.provision_vm", side_effect=fake_provision):
+            results = provision_vms([("vm1", _config("10.0.1.1")), ("vm2", _config("10.0.1.2"))])
+
+        self.assertEqual([result.status for result in results], ["exists", "failed"])
+        self.assertIsNone(results[0].vmid)
+        self.assertEqual(results[1].details, "qm create failed")
+
+    @patch("lib.proxmox_vm_batch._reserve_vmids")
+    def test_batch_vmids_are_shared_and_output_is_prefixed(self, mock_reserve) -> None:
+        mock_reserve.side_effect = [[500], [501]]
+        batches: list[NodeBatch] = []
+
+        def fake_provision(config, *, image, vmid, node_batch) -> None:
+            batches.append(node_batch)
+            print(f"creating {vmid}")
+
+        output = io.StringIO()
+        with redirect_stdout(output), patch("lib.proxmox_vm_batch.provision_vm", side_effect=fake_provision):
+            provision_vms(
+                [("vm1", _config("10.0.1.1")), ("vm2", _config("10.0.1.2", node="10.0.0.11"))]
+            )
+
+        self.assertIs(batches[0].batch_vmids, batches[1].batch_vmids)
+        self.assertEqual(batches[0].batch_vmids, {500, 501})
+        self.assertIn("[vm1] creating 500\n", output.getvalue())
+        self.assertIn("[vm2] creating 501\n", output.getvalue())
+
+
+class TestRetryVmid(unittest.TestCase):
+    @patch("lib.proxmox_vm._reserve_vmids")
+    def test_retry_ids_skip_every_id_assigned_to_the_batch(self, mock_reserve) -> None:
+        mock_reserve.side_effect = [[206], [207]]
+        batch = NodeBatch(operations=threading.BoundedSemaphore(1), batch_vmids={200, 205})
+
+        first = _retry_vmid("10.0.0.10", "root", [], batch)
+        second = _retry_vmid("10.0.0.10", "root", [], batch)
+
+        self.assertEqual((first, second), (206, 207))
+        self.assertEqual([call.kwargs["floor"] for call in mock_reserve.call_args_list], [206, 207])
+        self.assertEqual(batch.batch_vmids, {200, 205, 206, 207})
+
+
+class TestRunVmBatchProvision(unittest.TestCase):
+    @patch("lib.proxmox_vm_batch.provision_vms")
+    @patch("lib.proxmox_vm_batch.prepare_validated_runtime_config")
+    @patch("lib.proxmox_vm_batch.load_setup_command")
+    def test_rejects_non_vm_setups_before_provisioning(
+        self,
+        mock_load,
+        _mock_prepare,
+        mock_provision,
+    ) -> None:
+        container = _config("10.0.1.2")
+        container.machine_type = "lxc"
+        mock_load.side_effect = [_config("10.0.1.1"), container]
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            rc = run_vm_batch_provision(["vm1", "ct1"])
+
+        self.assertEqual(rc, 1)
+        mock_provision.assert_not_called()
+        self.assertIn("not a Proxmox VM", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
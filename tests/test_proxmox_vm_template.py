@@ -0,0 +1,91 @@
+"""Tests for catalog image VM templates."""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lib.proxmox_guest import ProvisionError
+from lib.proxmox_vm_template import (
+    build_vm_template,
+    find_vm_template,
+    render_template_build_script,
+    template_marker,
+)
+
+_SHA512 = "c" * 128
+_PATH = "/var/lib/vz/import/debian.qcow2"
+
+
+class TestFindVmTemplate(unittest.TestCase):
+    @patch("lib.proxmox_vm_template._ssh_run")
+    def test_matches_digest_and_pool(self, mock_run: MagicMock) -> None:
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout=(
+                f"9000 {template_marker('d' * 128, 'local-lvm')}\n"
+                f"9001 {template_marker(_SHA512, 'fast.pool')}\n"
+                f"9002 {template_marker(_SHA512, 'local-lvm')}\n"
+            ),
+            stderr="",
+        )
+
+        self.assertEqual(find_vm_template(_SHA512, "local-lvm", "10.0.0.10", "root", []), 9002)
+        self.assertIsNone(find_vm_template(_SHA512, "other", "10.0.0.10", "root", []))
+
+
+class TestTemplateBuildScript(unittest.TestCase):
+    def test_rechecks_under_lock_before_building(self) -> None:
+        script = render_template_build_script(_PATH, _SHA512, "local-lvm", catalog_digests=["c" * 16])
+
+        lock = script.index("flock 9")
+        recheck = script.index("infra_tools-template existing")
+        create = script.index("qm create $id")
+        self.assertLess(lock, recheck)
+        self.assertLess(recheck, create)
+        self.assertIn(f"qm disk import $id {_PATH} local-lvm", script)
+        self.assertIn("qm template $id", script)
+        self.assertIn(f"--description {template_marker(_SHA512, 'local-lvm')}", script)
+        self.assertIn('current=" cccccccccccccccc "', script)
+
+
+class TestBuildVmTemplate(unittest.TestCase):
+    @patch("lib.proxmox_vm_template._ssh_run")
+    def test_reports_built_template_and_kept_outdated_ones(self, mock_run: MagicMock) -> None:
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout="infra_tools-template kept 9000\ninfra_tools-template built 9003\n",
+            stderr="",
+        )
+
+        with patch("builtins.print") as mock_print:
+            template = build_vm_template(_PATH, _SHA512, "local-lvm", "10.0.0.10", "root", [])
+
+        self.assertEqual(template.vmid, 9003)
+        self.assertTrue(template.built)
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertTrue(any("Kept outdated template 9000" in str(call) for call in mock_print.call_args_list))
+
+    @patch("lib.proxmox_vm_template._ssh_run")
+    def test_existing_template_built_concurrently_is_reused(self, mock_run: MagicMock) -> None:
+        mock_run.return_value = MagicMock(returncode=0, stdout="infra_tools-template existing 9002\n", stderr="")
+
+        template = build_vm_template(_PATH, _SHA512, "local-lvm", "10.0.0.10", "root", [])
+
+        self.assertEqual(template.vmid, 9002)
+        self.assertFalse(template.built)
+
+    @patch("lib.proxmox_vm_template._ssh_run")
+    def test_failed_build_raises(self, mock_run: MagicMock) -> None:
+        mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="import failed")
+
+        with self.assertRaisesRegex(ProvisionError, "import failed"):
+            build_vm_template(_PATH, _SHA512, "local-lvm", "10.0.0.10", "root", [])
+
+
+if __name__ == "__main__":
+    unittest.main()
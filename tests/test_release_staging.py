@@ -0,0 +1,139 @@
+"""Tests for lib/release_staging.py."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.release_staging import (
+    link_tree,
+    ownership_fix_command,
+    stage_release_tree,
+    unshare_files,
+)
+
+
+def _write(path: str, content: str, mode: int = 0o644) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(content)
+    os.chmod(path, mode)
+
+
+class TestStageReleaseTree(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.source = os.path.join(self.root, "source")
+        self.previous = os.path.join(self.root, "previous")
+        self.staging = os.path.join(self.root, "staging")
+        os.makedirs(self.staging)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_links_unchanged_files_and_copies_changed_ones(self):
+        _write(os.path.join(self.source, "index.html"), "<html></html>")
+        _write(os.path.join(self.source, "assets", "app.js"), "new")
+        _write(os.path.join(self.previous, "index.html"), "<html></html>")
+        _write(os.path.join(self.previous, "assets", "app.js"), "old")
+
+        stats = stage_release_tree(self.source, self.staging, self.previous)
+
+        self.assertEqual(
+            os.stat(os.path.join(self.staging, "index.html")).st_ino,
+            os.stat(os.path.join(self.previous, "index.html")).st_ino,
+        )
+        staged_js = os.path.join(self.staging, "assets", "app.js")
+        self.assertNotEqual(
+            os.stat(staged_js).st_ino,
+            os.stat(os.path.join(self.previous, "assets", "app.js")).st_ino,
+        )
+        with open(staged_js, encoding="utf-8") as handle:
+            self.assertEqual(handle.read(), "new")
+        self.assertEqual((stats.linked_files, stats.copied_files), (1, 1))
+        self.assertIn("1 unchanged file(s) linked", stats.summary())
+
+    def test_executable_bit_change_is_not_linked(self):
+        _write(os.path.join(self.source, "run.sh"), "#!/bin/sh\n", 0o755)
+        _write(os.path.join(self.previous, "run.sh"), "#!/bin/sh\n", 0o644)
+
+        stats = stage_release_tree(self.source, self.staging, self.previous)
+
+        self.assertEqual(stats.linked_files, 0)
+        self.assertTrue(os.access(os.path.join(self.staging, "run.sh"), os.X_OK))
+
+    def test_without_previous_release_copies_everything(self):
+        _write(os.path.join(self.source, "a.txt"), "a")
+        os.symlink("a.txt", os.path.join(self.source, "b.txt"))
+
+        stats = stage_release_tree(self.source, self.staging, None)
+
+        self.assertEqual((stats.linked_files, stats.copied_files), (0, 1))
+        self.assertEqual(os.readlink(os.path.join(self.staging, "b.txt")), "a.txt")
+
+    def test_link_tree_shares_inodes(self):
+        _write(os.path.join(self.previous, "dist", "index.html"), "x")
+        target = os.path.join(self.staging, "dist")
+
+        link_tree(os.path.join(self.previous, "dist"), target)
+
+        self.assertEqual(
+            os.stat(os.path.join(target, "index.html")).st_ino,
+            os.stat(os.path.join(self.previous, "dist", "index.html")).st_ino,
+        )
+
+
+class TestUnshareFiles(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.previous = os.path.join(self.root, "previous")
+        self.staging = os.path.join(self.root, "staging")
+        for name in ("src/app.js", "static/logo.svg"):
+            _write(os.path.join(self.previous, name), "live")
+        stage_release_tree(self.previous, self.staging, self.previous)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_rewriting_unshared_file_leaves_live_release_intact(self):
+        self.assertEqual(unshare_files(self.staging, ["src"]), 1)
+
+        with open(os.path.join(self.staging, "src", "app.js"), "w", encoding="utf-8") as handle:
+            handle.write("built")
+
+        with open(os.path.join(self.previous, "src", "app.js"), encoding="utf-8") as handle:
+            self.assertEqual(handle.read(), "live")
+        self.assertEqual(os.stat(os.path.join(self.staging, "src", "app.js")).st_nlink, 1)
+        self.assertEqual(os.stat(os.path.join(self.staging, "static", "logo.svg")).st_nlink, 2)
+        self.assertEqual(sorted(os.listdir(os.path.join(self.staging, "src"))), ["app.js"])
+
+    def test_without_paths_unshares_whole_tree(self):
+        self.assertEqual(unshare_files(self.staging), 2)
+        self.assertEqual(unshare_files(self.staging), 0)
+
+
+class TestOwnershipFixCommand(unittest.TestCase):
+    def test_only_touches_mismatched_inodes(self):
+        command = ownership_fix_command("/var/www/site", "web-deploy", "web-deploy")
+        self.assertIn("! -user web-deploy -o ! -group web-deploy", command)
+        self.assertIn("-type f -perm /111 ! -perm 0755 -exec chmod 0755", command)
+        self.assertIn("-type f ! -perm /111 ! -perm 0644 -exec chmod 0644", command)
+        self.assertNotIn("chown -R", command)
+
+    def test_unshared_only_skips_hardlinked_files(self):
+        command = ownership_fix_command(
+            "/var/www/.site.build-x", "build-site", "build-site",
+            modes=False, unshared_only=True,
+        )
+        self.assertIn(r"\( -type d -o -links 1 \)", command)
+        self.assertNotIn("chmod", command)
+
+
+if __name__ == "__main__":
+    unittest.main()
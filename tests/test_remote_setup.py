@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 import remote_setup
 from lib.config import SetupConfig
 from lib.operation_state import OperationStateError, OperationStateStore
+from lib.plugin_registry import RESOURCE_APT, StepResources
 from lib.remote_utils import set_dry_run
 
 
@@ -66,6 +67,64 @@ class TestRemoteSetupArgsFile(unittest.TestCase):
         save_machine.assert_called_once()
         save_config.assert_called_once()
 
+    def test_unchanged_steps_are_skipped_until_forced(self):
+        args = SimpleNamespace(
+            deploy_latest=False,
+            dry_run=False,
+            custom_steps=None,
+            system_type="server_lite",
+        )
+        step = MagicMock()
+        resources = StepResources("install_cli_tools", writes=(RESOURCE_APT,))
+
+        def run_setup(**overrides):
+            config = SetupConfig(
+                host="localhost",
+                username="root",
+                system_type="server_lite",
+                **overrides,
+            )
+            with patch.object(
+                remote_setup, "create_setup_argument_parser"
+            ) as create_parser, patch.object(
+                remote_setup, "config_from_remote_args", return_value=config
+            ), patch.object(
+                remote_setup, "detect_os", return_value="Debian"
+            ), patch.object(
+                remote_setup, "print_setup_summary"
+            ), patch.object(
+                remote_setup, "get_steps_for_system_type", return_value=[("Install tools", step)]
+            ), patch.object(
+                remote_setup, "get_step_resources", return_value=resources
+            ), patch.object(
+                remote_setup, "project_code_version", return_value="code"
+            ), patch.object(
+                remote_setup, "save_machine_state"
+            ), patch.object(
+                remote_setup, "save_setup_config"
+            ):
+                create_parser.return_value.parse_args.return_value = args
+                self.assertEqual(remote_setup._run_main(), 0)
+
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(
+            remote_setup,
+            "SETUP_OPERATION_FILE",
+            os.path.join(tmpdir, "setup-operation.json"),
+        ), patch.object(
+            remote_setup,
+            "STEP_STATE_FILE",
+            os.path.join(tmpdir, "setup-steps.json"),
+        ):
+            run_setup()
+            run_setup()
+            self.assertEqual(step.call_count, 1)
+
+            run_setup(force_steps=["install_cli_tools"])
+            self.assertEqual(step.call_count, 2)
+
+            run_setup(timezone="Europe/Berlin")
+            self.assertEqual(step.call_count, 3)
+
     def test_main_records_failed_setup_for_next_invocation(self):
         config = SetupConfig(
             host="localhost",
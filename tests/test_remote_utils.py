@@ -26,6 +26,9 @@ from lib.remote_utils import (
     file_contains,
     detect_os,
     confirm_unsupported_environment,
+    AptUsage,
+    ensure_apt_packages,
+    installed_packages,
 )
 from lib.validators import validate_username
 
@@ -352,6 +355,108 @@ class TestFileContains(unittest.TestCase):
             os.unlink(path)
 
 
+class TestAptFacade(unittest.TestCase):
+    @patch("lib.remote_utils.subprocess.run")
+    def test_installed_packages_uses_one_dpkg_query(self, mock_run):
+        mock_run.return_value = subprocess.CompletedProcess(
+            args=[],
+            returncode=1,
+            stdout=(
+                "curl\tcurl\tinstall ok installed\n"
+                "libc6:amd64\tlibc6\tinstall ok installed\n"
+                "jq\tjq\tdeinstall ok config-files\n"
+            ),
+            stderr="dpkg-query: no packages found matching missing-tool\n",
+        )
+
+        found = installed_packages(["curl", "libc6", "jq", "missing-tool", "curl"])
+
+        self.assertEqual(found, {"curl", "libc6"})
+        mock_run.assert_called_once()
+        self.assertEqual(mock_run.call_args.args[0][-4:], ["curl", "libc6", "jq", "missing-tool"])
+
+    @patch("lib.remote_utils.run")
+    @patch("lib.remote_utils.installed_packages")
+    def test_missing_packages_install_in_one_transaction(self, mock_installed, mock_run):
+        mock_installed.side_effect = [{"curl"}, {"jq", "tmux"}]
+        mock_run.return_value = subprocess.CompletedProcess(args=[], returncode=0)
+
+        result = ensure_apt_packages(["curl", "jq", "tmux"])
+
+        self.assertEqual(result.already_installed, ("curl",))
+        self.assertEqual(result.installed, ("jq", "tmux"))
+        self.assertEqual(result.failed, ())
+        mock_run.assert_called_once_with("apt-get install -y -qq jq tmux", check=False)
+
+    @patch("lib.remote_utils.run")
+    @patch("lib.remote_utils.installed_packages")
+    def test_failed_transaction_bisects_to_isolate_bad_package(self, mock_installed, mock_run):
+        mock_installed.side_effect = [set(), {"jq", "tmux", "zip"}]
+
+        def apt_install(command, check, capture_output=False):
+            del check, capture_output
+            if "broken" not in command:
+                return subprocess.CompletedProcess(args=[], returncode=0)
+            return subprocess.CompletedProcess(
+                args=[], returncode=100, stdout="", stderr="E: Unable to locate package broken\n"
+            )
+
+        mock_run.side_effect = apt_install
+
+        result = ensure_apt_packages(["jq", "broken", "tmux", "zip"])
+
+        self.assertEqual(result.failed, ("broken",))
+        self.assertEqual(result.installed, ("jq", "tmux", "zip"))
+        self.assertEqual(
+            [call.args[0] for call in mock_run.call_args_list],
+            [
+                "apt-get install -y -qq jq broken tmux zip",
+                "apt-get install --simulate -qq jq broken tmux zip",
+                "apt-get install -y -qq jq broken",
+                "apt-get install --simulate -qq jq broken",
+                "apt-get install -y -qq jq",
+                "apt-get install -y -qq broken",
+                "apt-get install -y -qq tmux zip",
+            ],
+        )
+
+    @patch("lib.remote_utils.run")
+    @patch("lib.remote_utils.installed_packages")
+    def test_failure_not_blamed_on_packages_is_not_bisected(self, mock_installed, mock_run):
+        mock_installed.side_effect = [set(), set()]
+
+        def apt_install(command, check, capture_output=False):
+            del check, capture_output
+            if "--simulate" in command:
+                return subprocess.CompletedProcess(args=[], returncode=0, stdout="Inst jq\n", stderr="")
+            return subprocess.CompletedProcess(args=[], returncode=100)
+
+        mock_run.side_effect = apt_install
+
+        result = ensure_apt_packages(["jq", "tmux", "zip", "curl"])
+
+        self.assertEqual(result.failed, ("jq", "tmux", "zip", "curl"))
+        self.assertEqual(
+            [call.args[0] for call in mock_run.call_args_list],
+            [
+                "apt-get install -y -qq jq tmux zip curl",
+                "apt-get install --simulate -qq jq tmux zip curl",
+            ],
+        )
+
+    def test_usage_summary_estimates_time_saved_by_batching(self):
+        usage = AptUsage()
+        self.assertIsNone(usage.summary())
+        usage.record("apt-get", 10.0)
+        usage.record("apt-get", 20.0)
+        usage.record_avoided("apt-get", 4)
+
+        self.assertEqual(
+            usage.summary(),
+            "APT: 2 apt-get run(s) in 30.0s; batching avoided 4 invocation(s), about 60.0s",
+        )
+
+
 class TestUserHome(unittest.TestCase):
     @patch("lib.remote_utils.pwd.getpwnam")
     def test_returns_home_recorded_for_account(self, mock_getpwnam):
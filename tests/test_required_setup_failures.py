@@ -60,8 +60,8 @@ class TestRequiredFirewallMutations(unittest.TestCase):
         self, mock_run, _container
     ) -> None:
         def run_side_effect(command: str, **kwargs: object) -> SimpleNamespace:
-            if command.startswith("ufw status 2>"):
-                return SimpleNamespace(returncode=1, stdout="")
+            if command == "ufw status numbered":
+                return SimpleNamespace(returncode=0, stdout="Status: inactive\n")
             if command == "ufw default deny incoming":
                 self.assertTrue(kwargs["check"])
                 raise RuntimeError("default policy failed")
@@ -81,8 +81,7 @@ class TestRequiredFirewallMutations(unittest.TestCase):
             return SimpleNamespace(
                 returncode=(
                     1
-                    if command.startswith("ufw status 2>")
-                    or command == "ufw --force enable"
+                    if command in ("ufw status numbered", "ufw --force enable")
                     else 0
                 ),
                 stdout="",
@@ -102,8 +101,7 @@ class TestRequiredFirewallMutations(unittest.TestCase):
             return SimpleNamespace(
                 returncode=(
                     1
-                    if command.startswith("ufw status 2>")
-                    or command == "ufw --force enable"
+                    if command in ("ufw status numbered", "ufw --force enable")
                     else 0
                 ),
                 stdout="",
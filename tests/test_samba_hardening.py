@@ -85,7 +85,7 @@ class TestConfigureSambaGlobalSettings(unittest.TestCase):
         self.assertEqual(global_section.count("server min protocol"), 1)
         self.assertIn("server min protocol = NT1", archive_section)
         self.assertTrue(any(command.startswith("testparm -s ") for command in commands))
-        self.assertIn("systemctl reload smbd", commands)
+        self.assertIn("smbcontrol smbd reload-config", commands)
 
     def test_restores_previous_config_when_testparm_fails(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -110,7 +110,7 @@ class TestConfigureSambaGlobalSettings(unittest.TestCase):
             with open(smb_conf) as file_obj:
                 self.assertEqual(file_obj.read(), original)
 
-        self.assertNotIn("systemctl reload smbd", commands)
+        self.assertNotIn("smbcontrol smbd reload-config", commands)
 
 
 class TestSambaFail2banFilter(unittest.TestCase):
@@ -298,6 +298,7 @@ class TestReconcileSambaShares(unittest.TestCase):
         self,
         original: str,
         shares: list[list[str]] | None,
+        force_steps: list[str] | None = None,
     ) -> tuple[str, list[tuple[str, dict[str, object]]]]:
         calls: list[tuple[str, dict[str, object]]] = []
 
@@ -311,6 +312,7 @@ class TestReconcileSambaShares(unittest.TestCase):
             with open(smb_conf, "w", encoding="utf-8") as file_obj:
                 file_obj.write(original)
             config = _make_config(samba_shares=shares)
+            config.force_steps = force_steps
             with patch.object(samba_steps, "SMB_CONF_PATH", smb_conf), \
                  patch.object(samba_steps, "run", side_effect=fake_run), \
                  patch.object(samba_steps.os, "makedirs"):
@@ -341,7 +343,12 @@ class TestReconcileSambaShares(unittest.TestCase):
         self.assertIn(samba_steps.MANAGED_SHARES_BEGIN, configured)
         commands = [command for command, _kwargs in calls]
         self.assertIn("groupdel smb_docs_read", commands)
-        self.assertEqual(commands.count("systemctl reload smbd"), 1)
+        self.assertEqual(commands.count("smbcontrol smbd reload-config"), 1)
+        self.assertEqual(
+            sum(command.startswith("testparm -s ") for command in commands),
+            1,
+        )
+        self.assertIn("server min protocol = SMB3", configured)
 
     def test_membership_is_replaced_not_only_appended(self) -> None:
         original = """[global]
@@ -390,16 +397,83 @@ class TestReconcileSambaShares(unittest.TestCase):
         ]
         self.assertEqual(password_calls[0]["input_data"], "very-secret\nvery-secret\n")
 
-    def test_recursive_permission_changes_preserve_filesystem_root(self) -> None:
+    def test_permission_fixes_only_touch_differing_entries(self) -> None:
         _configured, calls = self._run_reconcile(
             "[global]\n",
             [["write", "docs", "/srv/docs", "alice:very-secret"]],
         )
 
         commands = [command for command, _ in calls]
-        self.assertIn("chgrp -R --preserve-root smb_docs_write /srv/docs", commands)
-        self.assertIn("chmod -R --preserve-root 2775 /srv/docs", commands)
+        self.assertIn(
+            "find /srv/docs ! -type l ! -group smb_docs_write -exec chgrp smb_docs_write {} +",
+            commands,
+        )
+        self.assertIn("find /srv/docs ! -type l ! -perm 2775 -exec chmod 2775 {} +", commands)
+        self.assertFalse(any(" -R " in command for command in commands))
+
+    def test_unchanged_share_tree_is_not_walked_again(self) -> None:
+        original = """[global]
+
+[docs_write]
+   path = /srv/docs
+   valid users = @smb_docs_write
+   force group = smb_docs_write
+"""
+        with patch.object(samba_steps, "_share_root_matches", return_value=True) as root_matches:
+            _configured, calls = self._run_reconcile(
+                original,
+                [["write", "docs", "/srv/docs", "alice:secret"]],
+            )
+
+        root_matches.assert_called_once_with("/srv/docs", "smb_docs_write", 0o2775)
+        self.assertFalse(any(command.startswith("find ") for command, _ in calls))
+
+    def test_forced_step_walks_unchanged_share_tree(self) -> None:
+        original = """[global]
+
+[docs_write]
+   path = /srv/docs
+   valid users = @smb_docs_write
+   force group = smb_docs_write
+"""
+        with patch.object(samba_steps, "_share_root_matches", return_value=True):
+            _configured, calls = self._run_reconcile(
+                original,
+                [["write", "docs", "/srv/docs", "alice:secret"]],
+                force_steps=["reconcile_samba_shares"],
+            )
 
+        self.assertTrue(any(command.startswith("find /srv/docs ") for command, _ in calls))
+
+    def test_moved_share_path_is_walked(self) -> None:
+        original = """[global]
+
+[docs_write]
+   path = /srv/old-docs
+   valid users = @smb_docs_write
+   force group = smb_docs_write
+"""
+        with patch.object(samba_steps, "_share_root_matches", return_value=True):
+            _configured, calls = self._run_reconcile(
+                original,
+                [["write", "docs", "/srv/docs", "alice:secret"]],
+            )
+
+        self.assertTrue(any(command.startswith("find /srv/docs ") for command, _ in calls))
+
+    def test_rendered_config_is_not_rewritten_or_reloaded(self) -> None:
+        configured, _calls = self._run_reconcile(
+            "[global]\n",
+            [["read", "docs", "/srv/docs", "alice:secret"]],
+        )
+        _unchanged, calls = self._run_reconcile(
+            configured,
+            [["read", "docs", "/srv/docs", "alice:secret"]],
+        )
+
+        commands = [command for command, _ in calls]
+        self.assertFalse(any(command.startswith("testparm -s ") for command in commands))
+        self.assertNotIn("smbcontrol smbd reload-config", commands)
 
 if __name__ == '__main__':
     unittest.main()
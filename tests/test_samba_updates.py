@@ -111,6 +111,7 @@ class TestRunSharesCommand(unittest.TestCase):
             dry_run=True,
             username=None,
             ssh_key=None,
+            fix_permissions=True,
         )
         sent: list[SetupConfig] = []
 
@@ -127,6 +128,7 @@ class TestRunSharesCommand(unittest.TestCase):
         self.assertIsNone(sent[0].deploy_specs)
         self.assertIsNone(sent[0].smb_mounts)
         self.assertEqual(sent[0].samba_shares, cached.samba_shares)
+        self.assertIn("--force-step reconcile_samba_shares", sent[0].to_remote_args())
 
 
 if __name__ == "__main__":
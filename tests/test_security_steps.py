@@ -329,8 +329,8 @@ class TestConfigureFirewall(unittest.TestCase):
     @patch("security.security_steps.run")
     def test_rate_limits_ssh_and_rdp_when_rdp_enabled(self, mock_run, _ic):
         def run_side_effect(command, **_kwargs):
-            if command.startswith("ufw status 2>"):
-                return SimpleNamespace(returncode=1, stdout="")
+            if command == "ufw status numbered":
+                return SimpleNamespace(returncode=0, stdout="Status: inactive\n")
             return SimpleNamespace(returncode=0, stdout="")
 
         mock_run.side_effect = run_side_effect
@@ -345,12 +345,86 @@ class TestConfigureFirewall(unittest.TestCase):
         )
         self.assertNotIn("ufw allow 3389/tcp", run_commands)
 
+    @patch("security.security_steps.is_container", return_value=False)
+    @patch("security.security_steps.run")
+    def test_inactive_firewall_removes_saved_broad_and_stale_rules(self, mock_run, _ic):
+        saved_rules = """Added user rules (see 'ufw status' for running firewall):
+ufw limit 22/tcp
+ufw allow 8080/tcp
+ufw allow 9090/tcp comment 'infra_tools web TCP 9090'
+"""
+
+        def run_side_effect(command, **_kwargs):
+            if command == "ufw status numbered":
+                return SimpleNamespace(returncode=0, stdout="Status: inactive\n")
+            if command == "ufw show added":
+                return SimpleNamespace(returncode=0, stdout=saved_rules)
+            return SimpleNamespace(returncode=0, stdout="")
+
+        mock_run.side_effect = run_side_effect
+        config = SetupConfig(
+            username="u",
+            host="h",
+            system_type="server_web",
+            access_sources=["10.0.0.0/8"],
+            web_ports=[8080],
+            default_web_ports=False,
+        )
+
+        configure_firewall(config)
+
+        commands = [args[0] for args, _ in mock_run.call_args_list]
+        added = commands.index(
+            "ufw allow from 10.0.0.0/8 to any port 22 proto tcp "
+            "comment 'infra_tools SSH trusted source 10.0.0.0/8'"
+        )
+        for deleted in (
+            "ufw --force delete limit 22/tcp",
+            "ufw --force delete allow 8080/tcp",
+            "ufw --force delete allow 9090/tcp",
+        ):
+            self.assertGreater(commands.index(deleted), added)
+        self.assertEqual(commands[-1], "ufw --force enable")
+
+    @patch("security.security_steps.is_container", return_value=False)
+    @patch("security.security_steps.run")
+    def test_unchanged_rules_cause_no_ufw_changes(self, mock_run, _ic):
+        status_output = """Status: active
+[ 1] 22/tcp                     LIMIT IN    Anywhere
+[ 2] 3389/tcp                   LIMIT IN    Anywhere                   # infra_tools RDP global
+[ 3] 22/tcp (v6)                LIMIT IN    Anywhere (v6)
+[ 4] 3389/tcp (v6)              LIMIT IN    Anywhere (v6)              # infra_tools RDP global
+"""
+        mock_run.return_value = SimpleNamespace(returncode=0, stdout=status_output)
+        config = SetupConfig(
+            username="u",
+            host="h",
+            system_type="workstation_dev",
+            enable_rdp=True,
+            web_ports=[],
+            default_web_ports=False,
+        )
+
+        with patch("builtins.print") as mock_print:
+            configure_firewall(config)
+
+        commands = [args[0] for args, _ in mock_run.call_args_list]
+        self.assertEqual(commands, ["ufw status numbered"])
+        mock_print.assert_any_call("  ✓ UFW rules unchanged (0 ruleset reload(s))")
+
     @patch("security.security_steps.is_container", return_value=False)
     @patch("security.security_steps.run")
     def test_installs_restricted_rules_before_removing_global_access(self, mock_run, _ic):
+        status_output = """Status: active
+[ 1] 22/tcp                     LIMIT IN    Anywhere
+[ 2] 3389/tcp                   LIMIT IN    Anywhere
+[ 3] 22/tcp (v6)                LIMIT IN    Anywhere (v6)
+[ 4] 3389/tcp (v6)              LIMIT IN    Anywhere (v6)
+"""
+
         def run_side_effect(command, **_kwargs):
-            if command.startswith("ufw status 2>"):
-                return SimpleNamespace(returncode=0, stdout="")
+            if command == "ufw status numbered":
+                return SimpleNamespace(returncode=0, stdout=status_output)
             return SimpleNamespace(returncode=0, stdout="")
 
         mock_run.side_effect = run_side_effect
@@ -369,13 +443,20 @@ class TestConfigureFirewall(unittest.TestCase):
             "ufw limit from 10.0.0.0/24 to any port 3389 proto tcp "
             "comment 'infra_tools RDP source 10.0.0.0/24'"
         )
-        delete_global_rule = commands.index("ufw delete limit 3389/tcp")
-        self.assertLess(first_source_rule, delete_global_rule)
+        delete_global_rules = [
+            commands.index("ufw --force delete 4"),
+            commands.index("ufw --force delete 2"),
+        ]
+        self.assertLess(first_source_rule, min(delete_global_rules))
+        self.assertLess(delete_global_rules[0], delete_global_rules[1])
         self.assertIn(
             "ufw limit from 2001:db8::10 to any port 3389 proto tcp "
             "comment 'infra_tools RDP source 2001:db8::10'",
             commands,
         )
+        self.assertNotIn("ufw --force delete 1", commands)
+        self.assertNotIn("ufw --force delete 3", commands)
+        self.assertNotIn("ufw limit ssh", commands)
 
     @patch("security.security_steps.is_container", return_value=False)
     @patch("security.security_steps.run")
@@ -388,8 +469,6 @@ class TestConfigureFirewall(unittest.TestCase):
 """
 
         def run_side_effect(command, **_kwargs):
-            if command.startswith("ufw status 2>"):
-                return SimpleNamespace(returncode=0, stdout="")
             if command == "ufw status numbered":
                 return SimpleNamespace(returncode=0, stdout=status_output)
             return SimpleNamespace(returncode=0, stdout="")
@@ -414,8 +493,11 @@ class TestConfigureFirewall(unittest.TestCase):
     @patch("security.security_steps.run")
     def test_keeps_global_access_if_restricted_rule_install_fails(self, mock_run, _ic):
         def run_side_effect(command, **_kwargs):
-            if command.startswith("ufw status 2>"):
-                return SimpleNamespace(returncode=0, stdout="")
+            if command == "ufw status numbered":
+                return SimpleNamespace(
+                    returncode=0,
+                    stdout="Status: active\n[ 1] 3389/tcp LIMIT IN Anywhere\n",
+                )
             if command.startswith("ufw limit from"):
                 return SimpleNamespace(returncode=1, stdout="")
             return SimpleNamespace(returncode=0, stdout="")
@@ -433,8 +515,7 @@ class TestConfigureFirewall(unittest.TestCase):
             configure_firewall(config)
 
         commands = [args[0] for args, _ in mock_run.call_args_list]
-        self.assertNotIn("ufw delete allow 3389/tcp", commands)
-        self.assertNotIn("ufw delete limit 3389/tcp", commands)
+        self.assertNotIn("ufw --force delete 1", commands)
 
 
 class TestConfigureAutoUpdates(unittest.TestCase):
@@ -506,12 +587,15 @@ class TestConfigureMaintenanceTimers(unittest.TestCase):
                 SetupConfig(username="u", host="h", system_type="server_lite")
             )
 
+    @patch("security.security_steps.cleanup_service")
     @patch("security.security_steps.configure_maintenance_timer")
     @patch("security.security_steps.is_hardware", return_value=False)
     @patch("security.security_steps.is_vm", return_value=True)
-    def test_security_monitor_uses_shared_timer(self, _vm, _hardware, mock_configure):
+    def test_security_monitor_uses_shared_timer(self, _vm, _hardware, mock_configure, mock_cleanup):
         configure_security_monitor(SetupConfig(username="u", host="h", system_type="server_lite"))
 
+        mock_cleanup.assert_called_once_with("security-monitor-daemon")
+
         mock_configure.assert_called_once_with(
             service_name="security-monitor",
             service_desc="Security event monitor",
@@ -524,6 +608,29 @@ class TestConfigureMaintenanceTimers(unittest.TestCase):
             purpose="monitor",
         )
 
+    @patch("security.security_steps.cleanup_service")
+    @patch("security.security_steps.configure_maintenance_timer")
+    @patch("security.security_steps.configure_maintenance_daemon", return_value=True)
+    @patch("security.security_steps.is_hardware", return_value=False)
+    @patch("security.security_steps.is_vm", return_value=True)
+    def test_security_monitor_daemon_replaces_timer(
+        self, _vm, _hardware, mock_daemon, mock_timer, mock_cleanup
+    ):
+        configure_security_monitor(SetupConfig(
+            username="u", host="h", system_type="server_lite", security_monitor_daemon=True,
+        ))
+
+        mock_daemon.assert_called_once_with(
+            service_name="security-monitor-daemon",
+            service_desc="Security event monitor daemon",
+            script_path="/opt/infra_tools/security/service_tools/security_monitor.py",
+            script_args=("--daemon",),
+            check_name="Security event monitor",
+            purpose="monitor",
+        )
+        mock_timer.assert_not_called()
+        mock_cleanup.assert_called_once_with("security-monitor")
+
     @patch("security.security_steps.configure_maintenance_timer")
     @patch("security.security_steps.can_modify_kernel", return_value=True)
     def test_auto_restart_uses_shared_timer(self, _kernel, mock_configure):
@@ -567,7 +674,20 @@ class TestConfigureMaintenanceTimers(unittest.TestCase):
         self.assertIn(f"SystemMaxUse={JOURNAL_MAX_USE}", written_text)
         self.assertIn(f"RuntimeMaxUse={JOURNAL_MAX_USE}", written_text)
         mock_run.assert_called_once_with("systemctl restart systemd-journald", check=False)
-        self.assertEqual(mock_configure.call_count, 2)
+        self.assertEqual(mock_configure.call_count, 3)
+        mock_configure.assert_any_call(
+            service_name="storage-forecast",
+            service_desc="Sample local storage usage and clean up early when filling",
+            timer_desc="Sample local storage usage (hourly)",
+            script_path="/opt/infra_tools/common/service_tools/cleanup_maintenance.py",
+            script_args=("--forecast",),
+            schedule="hourly",
+            check_name="Storage forecast",
+            randomized_delay="5min",
+            timeout="30min",
+            network_online=False,
+            purpose="check",
+        )
         mock_configure.assert_any_call(
             service_name="cleanup-maintenance",
             service_desc="Cleanup temporary files and package caches",
@@ -614,6 +734,22 @@ class TestConfigureMaintenanceTimers(unittest.TestCase):
     @patch("security.security_steps.run")
     @patch("security.security_steps.open", new_callable=mock_open)
     @patch("security.security_steps.os.makedirs")
+    def test_storage_forecast_verification_failure_stops_setup(
+        self, _makedirs, _file, mock_run, _configure
+    ):
+        mock_run.return_value = SimpleNamespace(returncode=0)
+        with self.assertRaisesRegex(RuntimeError, "Storage forecast timer failed verification"):
+            configure_cleanup_maintenance(
+                SetupConfig(username="u", host="h", system_type="server_lite")
+            )
+
+    @patch(
+        "security.security_steps.configure_maintenance_timer",
+        side_effect=[True, True, False],
+    )
+    @patch("security.security_steps.run")
+    @patch("security.security_steps.open", new_callable=mock_open)
+    @patch("security.security_steps.os.makedirs")
     def test_user_cache_verification_failure_stops_setup(
         self, _makedirs, _file, mock_run, _configure
     ):
@@ -639,10 +775,9 @@ class TestConfigureMaintenanceTimers(unittest.TestCase):
             SetupConfig(username="root", host="h", system_type="server_proxmox")
         )
 
-        self.assertEqual(mock_configure.call_count, 1)
         self.assertEqual(
-            mock_configure.call_args.kwargs["service_name"],
-            "cleanup-maintenance",
+            [call.kwargs["service_name"] for call in mock_configure.call_args_list],
+            ["cleanup-maintenance", "storage-forecast"],
         )
 
 
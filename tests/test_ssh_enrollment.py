@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -120,6 +122,41 @@ class TestSshEnrollment(unittest.TestCase):
             )
             self.assertEqual(path.stat().st_mode & 0o777, 0o600)
 
+    @patch("lib.ssh_enrollment.get_workspace_known_hosts_path")
+    @patch("lib.ssh_enrollment.subprocess.run")
+    def test_concurrent_replacements_keep_every_host_key(self, run, known_hosts):
+        def fake_run(command, **_kwargs):
+            if "-F" in command:
+                # Widen the read-modify-write window between hosts.
+                time.sleep(0.01)
+                return type("Result", (), {"returncode": 1, "stdout": "", "stderr": ""})()
+            return type("Result", (), {"returncode": 0, "stdout": "256 SHA256:key", "stderr": ""})()
+
+        run.side_effect = fake_run
+        hosts = [f"192.0.2.{index}" for index in range(1, 13)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "known_hosts"
+            path.write_text("other ssh-ed25519 KEEP\n", encoding="utf-8")
+            known_hosts.return_value = str(path)
+            threads = [
+                threading.Thread(
+                    target=replace_scanned_host_keys,
+                    args=(host, f"{host} ssh-ed25519 KEY{host}"),
+                )
+                for host in hosts
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            lines = path.read_text(encoding="utf-8").splitlines()
+
+        self.assertEqual(
+            sorted(lines),
+            sorted(["other ssh-ed25519 KEEP", *(f"{host} ssh-ed25519 KEY{host}" for host in hosts)]),
+        )
+
     @patch("lib.ssh_enrollment.subprocess.run")
     def test_replace_rejects_a_scan_for_another_host(self, run):
         with self.assertRaisesRegex(RuntimeError, "unexpected host"):
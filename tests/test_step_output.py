@@ -0,0 +1,109 @@
+"""Tests for step-name prefixes on concurrent setup output."""
+
+from __future__ import annotations
+
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.remote_utils import CommandTimeoutError, run
+from lib.step_output import current_step_prefix, prefixed_step_output, step_output_prefix
+
+
+class TestStepOutput(unittest.TestCase):
+    def test_concurrent_steps_keep_whole_prefixed_lines(self):
+        captured = io.StringIO()
+        both_writing = threading.Barrier(2, timeout=5)
+
+        def step(name: str) -> None:
+            with step_output_prefix(name):
+                print("first ", end="")
+                both_writing.wait()
+                print("half")
+                print("unterminated", end="")
+
+        with patch("sys.stdout", captured), prefixed_step_output():
+            threads = [threading.Thread(target=step, args=(name,)) for name in ("a", "b")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            print("scheduler")
+
+        lines = captured.getvalue().splitlines()
+        self.assertEqual(
+            sorted(lines),
+            sorted(["[a] first half", "[a] unterminated", "[b] first half", "[b] unterminated", "scheduler"]),
+        )
+
+    def test_prefix_is_inactive_without_prefixed_stdout(self):
+        with step_output_prefix("a"):
+            self.assertIsNone(current_step_prefix())
+
+    def test_run_relays_command_output_with_the_step_prefix(self):
+        captured = io.StringIO()
+        with patch("sys.stdout", captured), prefixed_step_output(), step_output_prefix("demo"):
+            result = run("echo hello; echo oops >&2")
+
+        self.assertEqual(result.returncode, 0)
+        self.assertIsNone(result.stdout)
+        self.assertIn("[demo] hello\n", captured.getvalue())
+        self.assertIn("[demo] oops\n", captured.getvalue())
+        self.assertIn("[demo]   Running: echo hello; echo oops >&2\n", captured.getvalue())
+
+    def _script(self, directory: str, body: str) -> str:
+        path = os.path.join(directory, "step.py")
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(body)
+        return f"{sys.executable} -u {path}"
+
+    def test_run_streams_command_output_before_the_command_exits(self):
+        captured = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            release = os.path.join(tmp, "release")
+            command = self._script(
+                tmp,
+                "import os, time\n"
+                "print('early')\n"
+                f"while not os.path.exists({release!r}):\n"
+                "    time.sleep(0.05)\n"
+                "print('late')\n",
+            )
+
+            def step() -> None:
+                with step_output_prefix("demo"):
+                    run(command)
+
+            with patch("sys.stdout", captured), prefixed_step_output():
+                worker = threading.Thread(target=step)
+                worker.start()
+                deadline = time.monotonic() + 5
+                while "[demo] early\n" not in captured.getvalue() and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                streamed = captured.getvalue()
+                open(release, "w", encoding="utf-8").close()
+                worker.join()
+
+        self.assertIn("[demo] early\n", streamed)
+        self.assertNotIn("late", streamed)
+        self.assertIn("[demo] late\n", captured.getvalue())
+
+    def test_run_relays_output_printed_before_a_timeout(self):
+        captured = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            command = self._script(tmp, "import time\nprint('partial')\ntime.sleep(30)\n")
+            with patch("sys.stdout", captured), prefixed_step_output(), step_output_prefix("demo"):
+                with self.assertRaises(CommandTimeoutError):
+                    run(command, timeout=1)
+
+        self.assertIn("[demo] partial\n", captured.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
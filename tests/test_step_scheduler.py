@@ -0,0 +1,106 @@
+"""Tests for dependency-aware setup step scheduling."""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.plugin_registry import RESOURCE_APT, RESOURCE_USERS, StepResources, path_resource
+from lib.step_scheduler import (
+    StepTiming,
+    build_step_dependencies,
+    critical_path,
+    resources_conflict,
+    run_step_graph,
+)
+
+
+class TestStepDependencies(unittest.TestCase):
+    def test_writers_conflict_with_readers_and_writers(self):
+        apt = StepResources("a", writes=(RESOURCE_APT,))
+        other_apt = StepResources("b", writes=(RESOURCE_APT,))
+        user_reader = StepResources("c", reads=(RESOURCE_USERS,))
+        user_writer = StepResources("d", writes=(RESOURCE_USERS,))
+
+        self.assertTrue(resources_conflict(apt, other_apt))
+        self.assertTrue(resources_conflict(user_reader, user_writer))
+        self.assertFalse(resources_conflict(apt, user_reader))
+        self.assertFalse(resources_conflict(user_reader, StepResources("e", reads=(RESOURCE_USERS,))))
+
+    def test_path_resources_conflict_with_their_descendants(self):
+        parent = StepResources("a", writes=(path_resource("/etc/nginx/"),))
+        child = StepResources("b", reads=(path_resource("/etc/nginx/sites-enabled"),))
+        sibling = StepResources("c", writes=(path_resource("/etc/nginxfoo"),))
+
+        self.assertTrue(resources_conflict(parent, child))
+        self.assertFalse(resources_conflict(parent, sibling))
+
+    def test_undeclared_steps_depend_on_and_block_every_other_step(self):
+        apt = StepResources("apt", writes=(RESOURCE_APT,))
+        gai = StepResources("gai", writes=(path_resource("/etc/gai.conf"),))
+
+        dependencies = build_step_dependencies([apt, gai, None, apt, gai])
+
+        self.assertEqual(dependencies, [(), (), (0, 1), (0, 2), (1, 2)])
+
+
+class TestRunStepGraph(unittest.TestCase):
+    def test_independent_steps_overlap_and_dependent_steps_wait(self):
+        both_running = threading.Barrier(2, timeout=5)
+        order: list[str] = []
+
+        def run_step(index: int) -> None:
+            if index < 2:
+                both_running.wait()
+            order.append(f"done-{index}")
+
+        timings = run_step_graph(["a", "b", "c"], [(), (), (0, 1)], run_step, max_workers=2)
+
+        self.assertEqual(order[-1], "done-2")
+        self.assertEqual(sorted(timing.name for timing in timings), ["a", "b", "c"])
+
+    def test_failure_stops_scheduling_and_reraises_after_running_steps_finish(self):
+        ran: list[int] = []
+
+        def run_step(index: int) -> None:
+            ran.append(index)
+            if index == 0:
+                raise RuntimeError("boom")
+
+        with self.assertRaisesRegex(RuntimeError, "boom"):
+            run_step_graph(["a", "b"], [(), (0,)], run_step, max_workers=2)
+
+        self.assertEqual(ran, [0])
+
+    def test_single_worker_runs_steps_in_list_order(self):
+        started: list[int] = []
+
+        run_step_graph(
+            ["a", "b", "c"],
+            [(), (), ()],
+            lambda index: None,
+            max_workers=1,
+            on_start=started.append,
+        )
+
+        self.assertEqual(started, [0, 1, 2])
+
+    def test_critical_path_follows_longest_dependency_chain(self):
+        timings = [
+            StepTiming(0, "update", 0.0, 10.0),
+            StepTiming(1, "gai", 0.0, 1.0),
+            StepTiming(2, "install", 10.0, 15.0),
+            StepTiming(3, "timer", 1.0, 3.0),
+        ]
+
+        path = critical_path([(), (), (0,), (1,)], timings)
+
+        self.assertEqual([timing.name for timing in path], ["update", "install"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""Tests for recorded setup step fingerprints."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from lib.config import SetupConfig
+from lib.plugin_registry import StepResources, path_resource
+from lib.step_state import StepStateStore, project_code_version, step_fingerprint
+
+
+def _config(**overrides) -> SetupConfig:
+    return SetupConfig(host="localhost", username="agent", system_type="server_lite", **overrides)
+
+
+class TestStepFingerprint(unittest.TestCase):
+    def test_fingerprint_tracks_config_code_and_declared_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tracked = os.path.join(tmpdir, "gai.conf")
+            resources = StepResources("configure_ipv4_preference", writes=(path_resource(tracked),))
+            baseline = step_fingerprint(resources, _config(), "code-1")
+
+            self.assertEqual(baseline, step_fingerprint(resources, _config(), "code-1"))
+            self.assertNotEqual(baseline, step_fingerprint(resources, _config(timezone="Europe/Berlin"), "code-1"))
+            self.assertNotEqual(baseline, step_fingerprint(resources, _config(), "code-2"))
+
+            with open(tracked, "w", encoding="utf-8") as file_obj:
+                file_obj.write("precedence ::ffff:0:0/96  100\n")
+            self.assertNotEqual(baseline, step_fingerprint(resources, _config(), "code-1"))
+
+    def test_directory_contents_do_not_change_the_fingerprint(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            resources = StepResources("setup_user", reads=(path_resource(tmpdir),))
+            before = step_fingerprint(resources, _config(), "code")
+            with open(os.path.join(tmpdir, "other-step"), "w", encoding="utf-8") as file_obj:
+                file_obj.write("x")
+
+            self.assertEqual(before, step_fingerprint(resources, _config(), "code"))
+
+    def test_code_version_covers_python_sources_only(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            module = os.path.join(tmpdir, "steps.py")
+            with open(module, "w", encoding="utf-8") as file_obj:
+                file_obj.write("VALUE = 1\n")
+            before = project_code_version(tmpdir)
+            with open(os.path.join(tmpdir, "notes.txt"), "w", encoding="utf-8") as file_obj:
+                file_obj.write("ignored")
+            self.assertEqual(before, project_code_version(tmpdir))
+
+            with open(module, "w", encoding="utf-8") as file_obj:
+                file_obj.write("VALUE = 2\n")
+            self.assertNotEqual(before, project_code_version(tmpdir))
+
+
+class TestStepStateStore(unittest.TestCase):
+    def test_recorded_success_persists_and_failure_forgets_it(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "state", "setup-steps.json")
+            store = StepStateStore(path)
+            store.record_success("install_go", "abc")
+
+            reloaded = StepStateStore(path)
+            self.assertTrue(reloaded.is_current("install_go", "abc"))
+            self.assertFalse(reloaded.is_current("install_go", "def"))
+
+            reloaded.forget("install_go")
+            self.assertFalse(StepStateStore(path).is_current("install_go", "abc"))
+
+    def test_unreadable_state_is_treated_as_empty(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "setup-steps.json")
+            with open(path, "w", encoding="utf-8") as file_obj:
+                file_obj.write("{not json")
+
+            self.assertFalse(StepStateStore(path).is_current("install_go", "abc"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -70,6 +70,8 @@ class TestCleanupFunctions(unittest.TestCase):
                 call("systemctl disable demo.timer", check=False),
                 call("systemctl stop demo.path", check=False),
                 call("systemctl disable demo.path", check=False),
+                call("systemctl stop demo.socket", check=False),
+                call("systemctl disable demo.socket", check=False),
                 call("systemctl stop demo.service", check=False),
                 call("systemctl disable demo.service", check=False),
                 call("systemctl daemon-reload", check=False),
@@ -79,6 +81,7 @@ class TestCleanupFunctions(unittest.TestCase):
             [
                 call("/etc/systemd/system/demo.timer"),
                 call("/etc/systemd/system/demo.path"),
+                call("/etc/systemd/system/demo.socket"),
                 call("/etc/systemd/system/demo.service"),
             ]
         )
@@ -148,6 +151,7 @@ class TestCleanupFunctions(unittest.TestCase):
         return_value=[
             "security-monitor.service",
             "security-monitor.timer",
+            "security-monitor-daemon.service",
             "cleanup-maintenance.service",
             "cleanup-maintenance.timer",
             "user-cache-maintenance.service",
@@ -166,6 +170,7 @@ class TestCleanupFunctions(unittest.TestCase):
             "cleanup-maintenance.timer",
             "user-cache-maintenance.timer",
             "security-monitor.service",
+            "security-monitor-daemon.service",
             "cleanup-maintenance.service",
             "user-cache-maintenance.service",
         ):
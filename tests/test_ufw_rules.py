@@ -0,0 +1,206 @@
+"""Tests for diff-based UFW rule reconciliation."""
+
+from __future__ import annotations
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from lib import remote_utils
+from lib.ufw_rules import (
+    DesiredUfwRule,
+    UfwFirewall,
+    UfwRuleError,
+    UfwSnapshotCache,
+    configure_ufw_snapshot_sharing,
+    parse_ufw_added,
+    parse_ufw_status,
+)
+
+_STATUS = """Status: active
+
+     To                         Action      From
+     --                         ------      ----
+[ 1] 22/tcp                     LIMIT IN    Anywhere
+[ 2] 22                         ALLOW IN    192.168.1.0/24             # infra_tools SSH trusted source 192.168.1.0/24
+[ 3] 8080/tcp                   ALLOW IN    Anywhere                   # infra_tools web TCP 8080
+[ 4] 22/tcp (v6)                LIMIT IN    Anywhere (v6)
+[ 5] 8080/tcp (v6)              ALLOW IN    Anywhere (v6)              # infra_tools web TCP 8080
+"""
+
+
+def _runner(stdout: str) -> MagicMock:
+    def run(command: str, **_kwargs: object) -> SimpleNamespace:
+        return SimpleNamespace(returncode=0, stdout=stdout if command == "ufw status numbered" else "")
+
+    return MagicMock(side_effect=run)
+
+
+class TestParseUfwStatus(unittest.TestCase):
+    def test_parses_padded_rules_comments_and_ipv6_markers(self) -> None:
+        status = parse_ufw_status(_STATUS)
+
+        self.assertTrue(status.active)
+        self.assertEqual([rule.number for rule in status.rules], [1, 2, 3, 4, 5])
+        self.assertEqual(status.rules[1].comment, "infra_tools SSH trusted source 192.168.1.0/24")
+        self.assertEqual(status.rules[1].source, "192.168.1.0/24")
+        self.assertEqual(status.rules[3].target, "22/tcp")
+        self.assertTrue(status.rules[3].is_untagged_global("22/tcp", ("LIMIT IN",)))
+        self.assertFalse(status.rules[4].is_untagged_global("8080/tcp", ("ALLOW IN",)))
+        self.assertTrue(status.rules[4].has_comment_prefix("infra_tools web TCP"))
+
+    def test_inactive_status_has_no_rules(self) -> None:
+        status = parse_ufw_status("Status: inactive\n")
+
+        self.assertFalse(status.active)
+        self.assertEqual(status.rules, ())
+
+
+    def test_parses_rules_saved_by_an_inactive_firewall(self) -> None:
+        rules = parse_ufw_added(
+            "Added user rules (see 'ufw status' for running firewall):\n"
+            "ufw limit 22/tcp\n"
+            "ufw allow from 10.0.0.0/8 to any port 22 proto tcp comment 'infra_tools SSH x'\n"
+            "ufw route allow in on eth0\n"
+        )
+
+        self.assertEqual(len(rules), 2)
+        self.assertTrue(rules[0].is_untagged_global("22/tcp", ("LIMIT IN",)))
+        self.assertEqual(rules[0].spec, "limit 22/tcp")
+        self.assertEqual((rules[1].target, rules[1].source), ("22/tcp", "10.0.0.0/8"))
+        self.assertEqual(rules[1].comment, "infra_tools SSH x")
+        self.assertEqual(rules[1].spec, "allow from 10.0.0.0/8 to any port 22 proto tcp")
+
+
+class TestUfwFirewall(unittest.TestCase):
+    def test_present_rules_are_not_added_again(self) -> None:
+        run = _runner(_STATUS)
+        firewall = UfwFirewall(run)
+
+        self.assertTrue(firewall.ensure(DesiredUfwRule("allow 8080/tcp", "infra_tools web TCP 8080")))
+        self.assertTrue(firewall.ensure(DesiredUfwRule("limit ssh", target="22/tcp", action="LIMIT IN")))
+
+        run.assert_called_once_with("ufw status numbered", check=False, capture_output=True)
+        self.assertEqual(firewall.reloads, 0)
+        self.assertEqual(firewall.summary(), "UFW rules unchanged (0 ruleset reload(s))")
+
+    def test_deletes_from_one_snapshot_highest_number_first(self) -> None:
+        run = _runner(_STATUS)
+        firewall = UfwFirewall(run)
+
+        deleted = firewall.delete(lambda rule: rule.has_comment_prefix("infra_tools web TCP"))
+
+        self.assertEqual(deleted, 2)
+        commands = [call.args[0] for call in run.call_args_list]
+        self.assertEqual(
+            commands,
+            ["ufw status numbered", "ufw --force delete 5", "ufw --force delete 3"],
+        )
+        self.assertEqual(firewall.reloads, 2)
+
+    def test_changes_before_enable_do_not_count_as_reloads(self) -> None:
+        run = _runner("Status: inactive\n")
+        firewall = UfwFirewall(run)
+
+        firewall.change("default deny incoming", check=True)
+        firewall.ensure(DesiredUfwRule("allow 443/tcp", "infra_tools web TCP 443"))
+        firewall.enable()
+
+        self.assertIn("ufw allow 443/tcp comment 'infra_tools web TCP 443'", [call.args[0] for call in run.call_args_list])
+        self.assertEqual(firewall.reloads, 1)
+        self.assertEqual(firewall.summary(), "UFW rules: 1 added, 0 removed (1 ruleset reload(s))")
+
+    def test_reconcile_adds_missing_and_removes_only_owned_stale_rules(self) -> None:
+        run = _runner(_STATUS)
+        firewall = UfwFirewall(run)
+
+        plan = firewall.reconcile(
+            [
+                DesiredUfwRule("allow 8080/tcp", "infra_tools web TCP 8080"),
+                DesiredUfwRule("allow 8443/tcp", "infra_tools web TCP 8443"),
+            ],
+            owned=lambda rule: rule.has_comment_prefix("infra_tools SSH"),
+        )
+
+        self.assertEqual(plan.additions, ["infra_tools web TCP 8443"])
+        self.assertEqual(plan.removals, ["infra_tools SSH trusted source 192.168.1.0/24"])
+        commands = [call.args[0] for call in run.call_args_list]
+        self.assertIn("ufw allow 8443/tcp comment 'infra_tools web TCP 8443'", commands)
+        self.assertEqual(commands[-1], "ufw --force delete 2")
+        self.assertNotIn("ufw --force delete 1", commands)
+
+    def test_reconcile_adds_planned_rules_without_rereading_status(self) -> None:
+        run = _runner(_STATUS)
+        firewall = UfwFirewall(run)
+        desired = [DesiredUfwRule(f"allow {port}/tcp", f"infra_tools web TCP {port}") for port in (8443, 9000, 9443)]
+
+        firewall.reconcile(desired + desired[:1], owned=lambda _rule: False)
+
+        commands = [call.args[0] for call in run.call_args_list]
+        # One read to plan and one for the (empty) deletion pass.
+        self.assertEqual(commands.count("ufw status numbered"), 2)
+        self.assertEqual(commands.count("ufw allow 8443/tcp comment 'infra_tools web TCP 8443'"), 1)
+        self.assertEqual(firewall.added, 3)
+
+    def test_reconcile_reports_the_rejected_rule(self) -> None:
+        def run(command: str, **_kwargs: object) -> SimpleNamespace:
+            stdout = _STATUS if command == "ufw status numbered" else ""
+            return SimpleNamespace(returncode=1 if command.startswith("ufw allow") else 0, stdout=stdout)
+
+        rule = DesiredUfwRule("allow 8443/tcp", "infra_tools web TCP 8443", failure="web rule failed")
+        with self.assertRaisesRegex(UfwRuleError, "web rule failed") as raised:
+            UfwFirewall(run).reconcile([rule], owned=lambda _rule: False)
+
+        self.assertIs(raised.exception.rule, rule)
+
+    def test_reconcile_verifies_retained_rules_when_requested(self) -> None:
+        firewall = UfwFirewall(_runner(_STATUS))
+
+        with self.assertRaisesRegex(RuntimeError, "did not retain"):
+            firewall.reconcile(
+                [DesiredUfwRule("allow 8443/tcp", "infra_tools web TCP 8443")],
+                owned=lambda _rule: False,
+                verify=True,
+            )
+
+
+class TestSharedUfwSnapshot(unittest.TestCase):
+    def tearDown(self) -> None:
+        configure_ufw_snapshot_sharing(None)
+
+    def test_firewalls_reuse_one_snapshot_until_a_write(self) -> None:
+        cache = UfwSnapshotCache()
+        configure_ufw_snapshot_sharing(cache)
+        run = _runner(_STATUS)
+
+        UfwFirewall(run).status()
+        UfwFirewall(run).status()
+        UfwFirewall(run).change("allow 443/tcp")
+        UfwFirewall(run).status()
+
+        commands = [call.args[0] for call in run.call_args_list]
+        self.assertEqual(commands.count("ufw status numbered"), 2)
+        self.assertEqual(cache.summary(), "UFW: 2 status read(s), 2 served from the shared snapshot")
+
+    def test_ufw_writes_through_run_invalidate_the_snapshot(self) -> None:
+        cache = UfwSnapshotCache()
+        configure_ufw_snapshot_sharing(cache)
+        firewall = UfwFirewall(_runner(_STATUS))
+        firewall.status()
+        process = MagicMock(returncode=0)
+        process.communicate.return_value = ("", "")
+
+        with patch("lib.remote_utils.subprocess.Popen", return_value=process), patch(
+            "lib.remote_utils.is_dry_run", return_value=False
+        ):
+            remote_utils.run("ufw status verbose", check=False)
+            firewall.status()
+            self.assertEqual(cache.reads, 1)
+            remote_utils.run("ufw allow 445/tcp", check=False)
+            firewall.status()
+
+        self.assertEqual(cache.reads, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
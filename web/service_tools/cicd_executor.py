@@ -27,7 +27,11 @@ from typing import Optional
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..'))
 
 from lib.logging_utils import get_service_logger, log_event
-from lib.notifications import load_notification_configs_from_state, send_notification_safe
+from lib.notifications import (
+    enable_notification_outbox,
+    load_notification_configs_from_state,
+    send_notification_safe,
+)
 from web.service_tools.cicd_security import (
     MAX_JOB_FILE_BYTES,
     get_workspace_name,
@@ -45,6 +49,8 @@ JOBS_DIR = os.path.join(STATE_DIR, "jobs")
 WORKSPACES_DIR = os.path.join(STATE_DIR, "workspaces")
 LOGS_DIR = os.path.join(STATE_DIR, "logs")
 LOCK_FILE = os.path.join(STATE_DIR, "executor.lock")
+# The executor unit may only write below STATE_DIR, so its outbox lives there.
+NOTIFICATION_OUTBOX_DIR = os.path.join(STATE_DIR, "notification-outbox")
 
 
 def get_build_home() -> str:
@@ -706,6 +712,17 @@ def main():
             return 0
         
         log_event(logger, "Found pending jobs", pending_jobs=len(job_files))
+        # Queue notifications so an unreachable target cannot stall builds.
+        try:
+            enable_notification_outbox(NOTIFICATION_OUTBOX_DIR, logger=logger)
+        except OSError as e:
+            log_event(
+                logger,
+                "Notification outbox unavailable; delivering directly",
+                level=30,
+                outbox_dir=NOTIFICATION_OUTBOX_DIR,
+                error=str(e),
+            )
         
         success_count = 0
         failure_count = 0
@@ -6,6 +6,7 @@ import shlex
 from typing import Optional
 from lib.types import StrList, Deployments
 
+from lib.apt_sources import refresh_apt_metadata
 from lib.config import SetupConfig
 from lib.remote_utils import run, install_package
 
@@ -50,7 +51,7 @@ def _certificate_is_usable(cert_path: str, key_path: str, domains: StrList) -> b
 
 def install_certbot(config: SetupConfig) -> None:
     print("Installing certbot...")
-    run("apt-get update -qq", check=False)
+    refresh_apt_metadata(run)
     install_package("certbot", "certbot", "apt-get install -y -qq certbot python3-certbot-nginx")
 
 